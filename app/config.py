@@ -6,13 +6,113 @@ MIN_LENGTH_FRAMES = 5
 LENGTH_KEYPOINTS = 1662
 MODEL_FRAMES = 15
 
+# TRAINING
+MODEL_ARCHITECTURE = "lstm"  # Arquitectura del modelo: "lstm", "gru" o "conv1d"
+TRAINING_BATCH_SIZE = 8
+TRAINING_SHUFFLE_BUFFER = 1024  # Muestras en el buffer de mezcla de tf.data
+TRAINING_AUGMENT = False  # Aumentación de secuencias durante el entrenamiento
+TRAINING_SAMPLING = "shuffle"  # "shuffle": orden natural | "balanced": batches balanceados por palabra | "temperature": pesos n^(1/T)
+TRAINING_SAMPLING_TEMPERATURE = 2.0  # Temperatura del muestreo "temperature" (1: natural, mayor: más balanceado)
+TRAINING_CLASS_WEIGHTS = False  # Pesar la loss por la inversa de las muestras de cada palabra
+AUGMENT_NOISE_STD = 0.01  # Desvío del ruido gaussiano sumado a los keypoints
+AUGMENT_SCALE_RANGE = 0.05  # Escala aleatoria en [1 - rango, 1 + rango]
+EARLY_STOPPING_PATIENCE = 30  # Épocas sin mejora de val_loss antes de detener el entrenamiento
+EARLY_STOPPING_MIN_DELTA = 1e-4  # Mejora mínima de val_loss para considerarla
+CHECKPOINT_EVERY = 10  # Épocas entre checkpoints periódicos (con estado del optimizador)
+FINE_TUNE_EPOCHS = 50  # Épocas máximas del ajuste incremental
+FINE_TUNE_LEARNING_RATE = 1e-4  # Tasa de aprendizaje del ajuste incremental
+FINE_TUNE_PATIENCE = 10  # Épocas sin mejora antes de detener el ajuste incremental
+REPLAY_SAMPLES_PER_CLASS = 20  # Muestras por palabra ya conocida en el replay buffer
+TRAINING_CANCEL_TIMEOUT = 10  # Segundos de espera antes de terminar un entrenamiento cancelado
+TRAINING_JOBS_KEEP = 20  # Entrenamientos terminados que se conservan para consultar su estado
+
+# TRAINING RUNTIME
+TRAINING_INTRA_OP_THREADS = 0  # Hilos por operación de TensorFlow (0: automático)
+TRAINING_INTER_OP_THREADS = 0  # Operaciones de TensorFlow en paralelo (0: automático)
+TRAINING_MIXED_PRECISION = False  # Precisión mixta bfloat16 si la CPU la soporta
+TRAINING_XLA = False  # Compilar el paso de entrenamiento con XLA
+TRAINING_SEED = None  # Semilla para entrenamientos reproducibles (None: aleatorio)
+TRAINING_DETERMINISTIC = False  # Operaciones deterministas de TensorFlow (más lento)
+
+# HYPERPARAMETER SEARCH
+SEARCH_WORKERS = 2  # Procesos que entrenan trials en paralelo
+SEARCH_THREADS_PER_TRIAL = 2  # Hilos de cómputo por trial
+SEARCH_MAX_EPOCHS = 100  # Épocas máximas por trial
+SEARCH_PATIENCE = 10  # Épocas sin mejora antes de detener un trial
+SEARCH_PRUNE_WARMUP = 5  # Épocas antes de podar trials peores que la mediana
+SEARCH_VALIDATION_SPLIT = 0.15  # Fracción de muestras de validación, común a todos los trials
+
+# CROSS VALIDATION
+CV_FOLDS = 5  # Cantidad de folds estratificados
+CV_WORKERS = 2  # Procesos que entrenan folds en paralelo
+CV_THREADS_PER_FOLD = 2  # Hilos de cómputo por fold
+CV_EPOCHS = 200  # Épocas máximas por fold
+CV_PATIENCE = 20  # Épocas sin mejora antes de detener un fold
+
+# VIDEO SAMPLING
+VIDEO_SAMPLING_MODE = "full"  # "full": todos los frames | "seek": solo intervalos con manos
+SEEK_STRIDE = 5  # Cada cuántos frames se analiza el video en la pasada rápida
+SEEK_SCALE = 0.25  # Escala de resolución usada en la pasada rápida
+
+# UPLOADS
+ALLOWED_VIDEO_EXTENSIONS = (".mp4", ".mov", ".avi", ".mkv")
+MAX_UPLOAD_BYTES = 1024 * 1024 * 1024  # 1 GiB por video
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # Bloques de 1 MiB al escribir a disco
+
+# STREAM SESSIONS
+STREAM_SESSION_IDLE_SECONDS = 60  # Segundos sin frames antes de cerrar una sesión de cámara
+
+# LATENCY
+LATENCY_TRACKING = False  # Medir la latencia de cada etapa de los flujos de cámara
+LATENCY_WINDOW = 300  # Mediciones guardadas por etapa (buffer circular)
+LATENCY_OVERLAY = False  # Dibujar las latencias y los FPS sobre cada frame
+
+# METRICS
+# Carpeta compartida por los workers WSGI para agregar las métricas de /metrics; si no
+# está definida, cada proceso expone solo las suyas (ver `app.services.metrics`)
+METRICS_MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+# SPEECH
+SPEECH_ENGINE = "pyttsx3"  # Motor de voz: "pyttsx3" (sin conexión) o "gtts" (requiere internet)
+SPEECH_QUEUE_SIZE = 3  # Palabras pendientes máximas antes de descartar la más vieja
+SPEECH_WARM_UP = True  # Generar el audio de todo el vocabulario al iniciar Flask
+
 # PATHS
 ROOT_PATH = os.getcwd()
 VIDEO_EXPORT_PATH = os.path.join(ROOT_PATH, "data/video_exports")
 FRAME_ACTIONS_PATH = os.path.join(ROOT_PATH, "data/frame_actions")
 DATA_PATH = os.path.join(ROOT_PATH, "data")
 MODEL_FOLDER_PATH = os.path.join(ROOT_PATH, "data/models")
-MODEL_PATH = os.path.join(MODEL_FOLDER_PATH, f"actions_{MODEL_FRAMES}.keras")
+MODEL_NAME = f"actions_{MODEL_FRAMES}"
+MODEL_PATH = os.path.join(MODEL_FOLDER_PATH, f"{MODEL_NAME}.keras")  # Modelo previo al registro
+MODEL_REGISTRY_PATH = os.path.join(MODEL_FOLDER_PATH, "registry")
+AUTO_PROMOTE_MODELS = True  # Promover a producción cada modelo recién entrenado
+MODEL_RELOAD_CHECK_FRAMES = 30  # Frames entre revisiones de la versión en producción
+MODEL_CACHE_CHECK_SECONDS = 2.0  # Segundos mínimos entre revisiones del modelo en caché
+MODEL_WARM_UP = True  # Precargar y calentar el modelo de predicción al iniciar Flask
+PREDICTION_XLA = True  # Compilar con XLA el forward de la predicción en vivo
+PREDICTION_ENGINE = "keras"  # Motor de la predicción en vivo: "keras" o "tflite"
+TFLITE_QUANTIZATION = None  # Cuantización del modelo TFLite: None, "dynamic" o "float16"
+TFLITE_THREADS = 1  # Hilos del intérprete TFLite por flujo de predicción
+PREDICTION_MODE = "segment"  # "segment" (al bajar las manos) o "sliding" (continuo)
+STREAM_FRAME_STEP = 2  # Frames de cámara por paso de la ventana deslizante
+STREAM_INFERENCE_EVERY = 2  # Pasos de la ventana entre inferencias
+STREAM_VOTES = 4  # Salidas recientes consideradas en la votación
+STREAM_MIN_VOTES = 3  # Votos mínimos para emitir una palabra
+STREAM_IDLE_FRAMES = 10  # Frames sin manos antes de reiniciar el reconocedor
+STREAM_INCREMENTAL = False  # Avanzar el estado de la LSTM/GRU un paso por frame en "sliding"
+STREAM_INCREMENTAL_MAX_WINDOWS = 2  # Ventanas de MODEL_FRAMES pasos sin emitir antes de reiniciar el estado
+PREDICTION_BATCHING = False  # Clasificar las señas de todos los flujos en un servidor por lotes
+BATCH_MAX_SIZE = 16  # Secuencias máximas por lote del servidor de inferencia
+BATCH_MAX_WAIT_MS = 2.0  # Espera máxima de una secuencia antes de ejecutar su lote
+BATCH_RESULT_TIMEOUT = 30.0  # Segundos máximos que un flujo espera el resultado de su lote
+SEARCH_PATH = os.path.join(ROOT_PATH, "data/hyperparameter_search")
+CROSS_VALIDATION_PATH = os.path.join(ROOT_PATH, "data/cross_validation")
+CHECKPOINT_PATH = os.path.join(ROOT_PATH, "data/checkpoints")
+TRAINING_JOBS_PATH = os.path.join(CHECKPOINT_PATH, "jobs")  # Estado compartido entre workers
+DATASET_SNAPSHOT_PATH = os.path.join(ROOT_PATH, "data/snapshots")
+SPEECH_CACHE_PATH = os.path.join(ROOT_PATH, "data/speech_cache")  # Audio de cada palabra
+SNAPSHOT_COMPACT_EVERY = 20  # Actualizaciones incrementales antes de reconstruir el snapshot
 
 # DATABASE
 DB_PROD_CONFIG = {
@@ -6,15 +6,17 @@ Este módulo contiene funciones auxiliares para insertar, consultar y manejar da
 - `words`: Palabras registradas con su categoría.
 - `samples`: Muestras capturadas por palabra.
 - `keypoints`: Vectores de keypoints por frame de cada muestra.
+- `ingestion_ledger`: Hashes de contenido ya ingerido (videos y muestras).
 
 También incluye un ejecutor de queries `_execute_query()` para centralizar la ejecución SQL.
 """
 
-import json, hashlib
+import json, time, hashlib
 import numpy as np
 
 
 from app.database.connection import get_connection
+from app.services.metrics import KEYPOINT_FRAMES, KEYPOINTS_INSERT_SECONDS, observe_query
 from ml.utils.common_utils import clean_word
 
 
@@ -25,6 +27,7 @@ def _execute_query(
     Ejecuta una consulta SQL utilizando la conexión de base de datos.
 
     Permite ejecutar tanto consultas de modificación como de lectura, con manejo de errores.
+    Cada consulta se registra en las métricas de `/metrics` (`app.services.metrics`).
 
     Args:
         query (str): Consulta SQL a ejecutar.
@@ -35,6 +38,7 @@ def _execute_query(
     Returns:
         any | None: Resultado(s) de la consulta si es SELECT; None en otros casos.
     """
+    start = time.perf_counter()
     try:
         conn = get_connection()
         cur = conn.cursor()
@@ -50,8 +54,10 @@ def _execute_query(
         cur.close()
         conn.close()
 
+        observe_query(query, "ok", time.perf_counter() - start)
         return result
     except Exception as e:
+        observe_query(query, "error", time.perf_counter() - start)
         print("❌ Error al ejecutar la consulta:", e)
         raise
 
@@ -101,6 +107,7 @@ def insert_keypoints(word_id, sample_id, keypoints_sequence):
 
     print(f"🟡 Recibidos {len(keypoints_sequence)} frames para sample {sample_id}")
 
+    start = time.perf_counter()
     for frame_index, keypoints_data in enumerate(keypoints_sequence, start=1):
         print(
             f"🟢 Insertando frame {frame_index} (sample {sample_id}, word_id {word_id})"
@@ -111,7 +118,9 @@ def insert_keypoints(word_id, sample_id, keypoints_sequence):
         """
         params = (word_id, sample_id, frame_index, json.dumps(keypoints_data.tolist()))
         _execute_query(query, params)
+        KEYPOINT_FRAMES.inc()
 
+    KEYPOINTS_INSERT_SECONDS.observe(time.perf_counter() - start)
     print(f"✅ Insertados {len(keypoints_sequence)} frames en la base.")
 
 
@@ -142,6 +151,28 @@ def fetch_keypoints_by_words(word_ids):
         params=tuple(word_ids),
     )
 
+def fetch_keypoints_since(keypoints_id):
+    """
+    Recupera los keypoints insertados después de un `keypoints_id` dado.
+
+    Permite leer solo los registros nuevos desde la última vez que se consultó la tabla,
+    usando el mayor `keypoints_id` leído como marca de agua.
+
+    Args:
+        keypoints_id (int): Último `keypoints_id` ya procesado.
+
+    Returns:
+        list[tuple]: Lista de tuplas (keypoints_id, word_id, sample_id, frame, keypoints) ordenadas por ID.
+    """
+    query = """
+        SELECT keypoints_id, word_id, sample_id, frame, keypoints
+        FROM keypoints
+        WHERE keypoints_id > %s
+        ORDER BY keypoints_id;
+    """
+    return _execute_query(query, (keypoints_id,), fetch_all=True) or []
+
+
 def count_unique_samples_per_word(word_ids):
     """
     Calcula la cantidad de sample_id distintos por cada palabra (word_id).
@@ -169,6 +200,24 @@ def count_unique_samples_per_word(word_ids):
     return counts
 
 
+def fetch_keypoints_stats():
+    """
+    Obtiene el mayor `keypoints_id` y la cantidad total de registros de la tabla `keypoints`.
+
+    Se usa como huella barata del contenido de la tabla: si ninguno de los dos valores
+    cambió, no se insertaron ni eliminaron keypoints.
+
+    Returns:
+        tuple[int, int]: (máximo keypoints_id, cantidad de registros). (0, 0) si la tabla está vacía.
+    """
+    query = """
+        SELECT COALESCE(MAX(keypoints_id), 0), COUNT(*)
+        FROM keypoints;
+    """
+    result = _execute_query(query, fetch_one=True)
+    return (int(result[0]), int(result[1])) if result else (0, 0)
+
+
 def fetch_word_ids_with_keypoints():
     """
     Devuelve los word_id que tienen al menos un registro en la tabla `keypoints`.
@@ -282,6 +331,75 @@ def search_word_id(word_id):
     return _execute_query(query, (word_id,), fetch_one=True)
 
 
+# ----- TABLA INGESTION_LEDGER
+
+
+def fetch_ingestion_record(content_hash, word_id):
+    """
+    Busca un contenido ya ingerido para una palabra a partir de su hash.
+
+    Args:
+        content_hash (bytes): Hash SHA256 del contenido (video o secuencia de keypoints).
+        word_id (bytes): Identificador único de la palabra.
+
+    Returns:
+        tuple | None: Tupla (kind, sample_id, source, created_at) si existe; None en caso contrario.
+    """
+    query = """
+        SELECT kind, sample_id, source, created_at
+        FROM ingestion_ledger
+        WHERE content_hash = %s AND word_id = %s;
+    """
+    return _execute_query(query, (content_hash, word_id), fetch_one=True)
+
+
+def insert_ingestion_record(content_hash, word_id, kind, sample_id=None, source=None):
+    """
+    Registra un contenido ingerido en la tabla `ingestion_ledger`.
+
+    Si el hash ya estaba registrado para la palabra, no se modifica el registro existente,
+    salvo para completar el `sample_id` de un registro que no lo tenía.
+
+    Args:
+        content_hash (bytes): Hash SHA256 del contenido.
+        word_id (bytes): Identificador único de la palabra.
+        kind (str): Tipo de contenido (`video` o `sample`).
+        sample_id (int, optional): Sample generado a partir del contenido. Default: None.
+        source (str, optional): Nombre del archivo de origen. Default: None.
+
+    Returns:
+        None: Esta función no retorna ningún valor.
+    """
+    query = """
+        INSERT INTO ingestion_ledger (content_hash, word_id, kind, sample_id, source)
+        VALUES (%s, %s, %s, %s, %s)
+        ON CONFLICT (content_hash, word_id) DO UPDATE
+        SET sample_id = EXCLUDED.sample_id, source = EXCLUDED.source
+        WHERE ingestion_ledger.sample_id IS NULL AND EXCLUDED.sample_id IS NOT NULL;
+    """
+    _execute_query(query, (content_hash, word_id, kind, sample_id, source))
+
+
+def fetch_video_sample_ids(word_id, source):
+    """
+    Devuelve los samples registrados a partir de un video.
+
+    Args:
+        word_id (bytes): Identificador único de la palabra.
+        source (str): Nombre del archivo del video.
+
+    Returns:
+        list[int]: IDs de los samples cuyo registro de tipo `sample` tiene ese origen.
+    """
+    query = """
+        SELECT sample_id
+        FROM ingestion_ledger
+        WHERE word_id = %s AND kind = 'sample' AND source = %s
+        ORDER BY sample_id;
+    """
+    return [row[0] for row in _execute_query(query, (word_id, source), fetch_all=True)]
+
+
 # ----- TABLA CATEGORIES
 
 
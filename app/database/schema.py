@@ -10,6 +10,7 @@ Tablas creadas:
 - `words`: Contiene las palabras registradas, asociadas a una categoría.
 - `samples`: Registra cada muestra capturada para una palabra.
 - `keypoints`: Almacena los vectores de keypoints por frame.
+- `ingestion_ledger`: Registro de hashes de contenido ya ingerido (videos y muestras).
 
 La función `create_all_tables()` permite crear todo el esquema completo con una sola llamada.
 """
@@ -147,11 +148,44 @@ def create_keypoints_table():
     _execute_query(query, "keypoints")
 
 
+def create_ingestion_ledger_table():
+    """
+    Crea la tabla `ingestion_ledger` si no existe.
+
+    Registra el hash de contenido (SHA256) de cada video subido y de cada secuencia
+    de keypoints insertada, para detectar contenido repetido antes de reprocesarlo.
+
+    Columnas:
+    - `content_hash` (BYTEA): Hash SHA256 del contenido.
+    - `word_id` (BYTEA): Clave foránea a `words`.
+    - `kind` (VARCHAR): Tipo de contenido (`video` o `sample`).
+    - `sample_id` (INT): Sample generado; para un `video`, la primera de sus muestras.
+    - `source` (VARCHAR): Nombre del archivo de origen, si corresponde (las muestras de un
+      video guardan el nombre del video).
+    - `created_at` (TIMESTAMP): Fecha de registro.
+
+    Returns:
+        None
+    """
+    query = """
+    CREATE TABLE IF NOT EXISTS ingestion_ledger (
+        content_hash BYTEA NOT NULL,
+        word_id BYTEA NOT NULL REFERENCES words(word_id),
+        kind VARCHAR(10) NOT NULL,
+        sample_id INT REFERENCES samples(sample_id),
+        source VARCHAR(255),
+        created_at TIMESTAMP DEFAULT NOW(),
+        PRIMARY KEY (content_hash, word_id)
+    );
+    """
+    _execute_query(query, "ingestion_ledger")
+
+
 def create_all_tables():
     """
     Ejecuta la creación de todas las tablas necesarias para el sistema.
 
-    Crea las tablas `categories`, `words`, `samples` y `keypoints`
+    Crea las tablas `categories`, `words`, `samples`, `keypoints` e `ingestion_ledger`
     de forma secuencial y segura.
 
     Returns:
@@ -161,3 +195,4 @@ def create_all_tables():
     create_words_table()
     create_samples_table()
     create_keypoints_table()
+    create_ingestion_ledger_table()
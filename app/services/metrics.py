@@ -0,0 +1,287 @@
+"""
+Métricas de la aplicación para Prometheus.
+
+Las métricas se registran en el proceso con `prometheus_client` y se exponen en
+`/metrics` en el formato de texto de Prometheus (`generate_metrics`):
+
+- HTTP: peticiones por método, ruta y código de respuesta, y su duración. En las rutas
+  de streaming la duración llega hasta que Flask entrega la respuesta, no hasta que
+  termina el stream.
+- Base de datos: consultas de `_execute_query` por operación SQL (`SELECT`, `INSERT`,
+  ...) y resultado, y su duración.
+- Ingesta: frames de keypoints insertados, duración de `insert_keypoints` por muestra,
+  y muestras procesadas por `save_keypoints` (insertadas, duplicadas o sin keypoints)
+  con su duración.
+- Entrenamiento: ejecuciones de `training_model` por resultado y su duración, en el
+  proceso que entrena, y jobs en segundo plano por estado final y su duración, medidos
+  desde Flask (`app.services.training_jobs`).
+- Predicción: latencia de cada inferencia y señas reconocidas (aceptadas o rechazadas
+  por el umbral) de los dos loops de predicción. En `PREDICTION_MODE = "sliding"` el
+  reconocedor solo emite las palabras aceptadas, y con `STREAM_INCREMENTAL = True` los
+  pasos incrementales no pasan por la función de predicción medida.
+
+Con varios workers WSGI (por ejemplo, gunicorn), cada worker es un proceso con sus
+propias métricas. Para que `/metrics` devuelva la suma de todos, se define la variable
+de entorno `PROMETHEUS_MULTIPROC_DIR` con una carpeta vacía antes de iniciar el servidor
+(`METRICS_MULTIPROC_DIR`): cada proceso escribe sus valores en esa carpeta y
+`generate_metrics` los agrega. Así también se incluyen las métricas del proceso de
+entrenamiento en segundo plano, que sin esa carpeta no llegan a `/metrics`.
+
+La aplicación no limpia esa carpeta: quien opera el servidor debe vaciarla antes de
+cada inicio (antes de que arranquen los workers), porque los archivos `*.db` que quedan
+de ejecuciones anteriores se sumarían a los valores actuales. Además, al terminar cada
+worker se debe llamar a `mark_process_dead`. Por ejemplo, en la configuración de
+gunicorn:
+
+    import os, shutil
+
+    def on_starting(server):
+        folder = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+        shutil.rmtree(folder, ignore_errors=True)
+        os.makedirs(folder)
+
+    def child_exit(server, worker):
+        from app.services.metrics import mark_process_dead
+
+        mark_process_dead(worker.pid)
+
+Funciones:
+- `observe_query`: registra una consulta SQL ejecutada.
+- `observe_http_request`: registra una petición HTTP atendida.
+- `track_training`: decorador que mide las ejecuciones de entrenamiento.
+- `observe_training_job`: registra un entrenamiento en segundo plano terminado.
+- `timed_predictor`: envuelve una función de predicción midiendo cada inferencia.
+- `count_prediction`: registra una seña reconocida por un loop de predicción.
+- `generate_metrics`: métricas en el formato de texto de Prometheus.
+- `mark_process_dead`: descarta los valores de un worker terminado (modo multiproceso).
+"""
+
+import time, functools
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from app.config import METRICS_MULTIPROC_DIR
+
+SQL_OPERATIONS = ("SELECT", "INSERT", "UPDATE", "DELETE", "CREATE", "ALTER", "DROP", "WITH")
+
+# ----- HTTP
+HTTP_REQUESTS = Counter(
+    "pojoaju_http_requests_total",
+    "Peticiones HTTP atendidas",
+    ["method", "endpoint", "status"],
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "pojoaju_http_request_duration_seconds",
+    "Duración de las peticiones HTTP",
+    ["method", "endpoint"],
+)
+
+# ----- BASE DE DATOS
+DB_QUERIES = Counter(
+    "pojoaju_db_queries_total",
+    "Consultas SQL ejecutadas",
+    ["operation", "status"],
+)
+DB_QUERY_SECONDS = Histogram(
+    "pojoaju_db_query_duration_seconds",
+    "Duración de las consultas SQL",
+    ["operation"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+# ----- INGESTA
+KEYPOINT_FRAMES = Counter(
+    "pojoaju_keypoint_frames_inserted_total",
+    "Frames de keypoints insertados en la base de datos",
+)
+KEYPOINTS_INSERT_SECONDS = Histogram(
+    "pojoaju_keypoints_insert_duration_seconds",
+    "Duración de la inserción de los keypoints de una muestra",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+SAMPLES_PROCESSED = Counter(
+    "pojoaju_samples_processed_total",
+    "Muestras procesadas por save_keypoints",
+    ["result"],
+)
+SAMPLE_SECONDS = Histogram(
+    "pojoaju_sample_processing_duration_seconds",
+    "Duración de la extracción y el guardado de los keypoints de una muestra",
+    buckets=(0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0),
+)
+
+# ----- ENTRENAMIENTO
+TRAINING_BUCKETS = (60, 300, 600, 1800, 3600, 7200, 14400, 28800)
+TRAINING_RUNS = Counter(
+    "pojoaju_training_runs_total",
+    "Ejecuciones de training_model",
+    ["status"],
+)
+TRAINING_SECONDS = Histogram(
+    "pojoaju_training_duration_seconds",
+    "Duración de las ejecuciones de training_model",
+    ["status"],
+    buckets=TRAINING_BUCKETS,
+)
+TRAINING_JOBS = Counter(
+    "pojoaju_training_jobs_total",
+    "Entrenamientos en segundo plano terminados",
+    ["status"],
+)
+TRAINING_JOB_SECONDS = Histogram(
+    "pojoaju_training_job_duration_seconds",
+    "Duración de los entrenamientos en segundo plano",
+    ["status"],
+    buckets=TRAINING_BUCKETS,
+)
+
+# ----- PREDICCIÓN
+INFERENCE_SECONDS = Histogram(
+    "pojoaju_inference_duration_seconds",
+    "Duración de cada inferencia del modelo",
+    ["loop"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+PREDICTIONS = Counter(
+    "pojoaju_predictions_total",
+    "Señas reconocidas por los loops de predicción",
+    ["loop", "mode", "result"],
+)
+
+
+def observe_query(query, status, seconds):
+    """
+    Registra una consulta SQL ejecutada.
+
+    La operación es la primera palabra de la consulta; las que no están en
+    `SQL_OPERATIONS` se agrupan como `OTHER` para no crear una serie por consulta.
+
+    Args:
+        query (str): Consulta SQL.
+        status (str): `"ok"` o `"error"`.
+        seconds (float): Duración de la consulta.
+    """
+    words = query.split(None, 1)
+    operation = words[0].upper() if words else "OTHER"
+    if operation not in SQL_OPERATIONS:
+        operation = "OTHER"
+    DB_QUERIES.labels(operation, status).inc()
+    DB_QUERY_SECONDS.labels(operation).observe(seconds)
+
+
+def observe_http_request(method, endpoint, status, seconds):
+    """
+    Registra una petición HTTP atendida.
+
+    Args:
+        method (str): Método HTTP.
+        endpoint (str): Regla de la ruta (por ejemplo `/models/promote/<version>`), para
+            no crear una serie por URL.
+        status (int): Código de respuesta.
+        seconds (float): Duración de la petición.
+    """
+    HTTP_REQUESTS.labels(method, endpoint, str(status)).inc()
+    HTTP_REQUEST_SECONDS.labels(method, endpoint).observe(seconds)
+
+
+def track_training(function):
+    """
+    Decorador que mide las ejecuciones de una función de entrenamiento.
+
+    El resultado es `completed`, `no_data` (la función devolvió un diccionario con
+    `error`) o `error` (la función lanzó una excepción, incluida la cancelación).
+    """
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        status = "error"
+        try:
+            result = function(*args, **kwargs)
+            status = "no_data" if "error" in result else "completed"
+            return result
+        finally:
+            TRAINING_RUNS.labels(status).inc()
+            TRAINING_SECONDS.labels(status).observe(time.perf_counter() - start)
+
+    return wrapper
+
+
+def observe_training_job(status, seconds):
+    """
+    Registra un entrenamiento en segundo plano terminado (`done`, `error` o `cancelled`).
+    """
+    TRAINING_JOBS.labels(status).inc()
+    TRAINING_JOB_SECONDS.labels(status).observe(seconds)
+
+
+def timed_predictor(loop, predict):
+    """
+    Envuelve una función de predicción registrando la duración de cada inferencia.
+
+    Args:
+        loop (str): Loop de predicción (`"console"` o `"stream"`).
+        predict (Callable): Función de predicción (`make_predictor`).
+
+    Returns:
+        Callable: La misma función, midiendo cada llamada.
+    """
+    histogram = INFERENCE_SECONDS.labels(loop)
+
+    def timed(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return predict(*args, **kwargs)
+        finally:
+            histogram.observe(time.perf_counter() - start)
+
+    return timed
+
+
+def count_prediction(loop, mode, accepted):
+    """
+    Registra una seña reconocida por un loop de predicción.
+
+    Args:
+        loop (str): `"console"` o `"stream"`.
+        mode (str): Modo de reconocimiento (`"segment"` o `"sliding"`).
+        accepted (bool): Si la confianza superó el umbral.
+    """
+    PREDICTIONS.labels(loop, mode, "accepted" if accepted else "rejected").inc()
+
+
+def generate_metrics():
+    """
+    Devuelve las métricas en el formato de texto de Prometheus.
+
+    Con `METRICS_MULTIPROC_DIR` definida, suma los valores escritos por todos los
+    procesos en esa carpeta; si no, devuelve los del proceso actual.
+
+    Returns:
+        tuple[bytes, str]: Texto de las métricas y su `Content-Type`.
+    """
+    if METRICS_MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry, path=METRICS_MULTIPROC_DIR)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid):
+    """
+    Descarta los valores de un proceso terminado (solo en modo multiproceso).
+
+    Args:
+        pid (int): PID del worker terminado.
+    """
+    if METRICS_MULTIPROC_DIR:
+        multiprocess.mark_process_dead(pid, METRICS_MULTIPROC_DIR)
@@ -0,0 +1,199 @@
+"""
+Sesiones de captura y predicción por navegador.
+
+Antes, la captura se detenía con una variable global del módulo, por lo que solo una
+captura por proceso se podía controlar, y la ruta `/stop_capture` cambiaba una copia
+propia que no llegaba al generador. Este módulo da a cada sesión del navegador (cookie
+de Flask) su propia sesión de captura y de predicción:
+
+- Cada sesión tiene su evento de parada (`stop_event`), que el generador revisa en
+  cada frame; detener una sesión no afecta a las demás.
+- El estado del segmentador, los buffers de frames y keypoints, el reconocedor y la
+  cámara viven dentro del generador de la sesión, por lo que no se comparten entre
+  operadores, y se liberan al cerrarlo.
+- Abrir una sesión del mismo tipo en el mismo navegador (por ejemplo, al recargar la
+  página) detiene la anterior, para que dos generadores no compitan por la cámara.
+- Una sesión que no entrega frames durante `STREAM_SESSION_IDLE_SECONDS` (el cliente
+  dejó de leer el stream) se detiene y se quita del registro; la limpieza se hace al
+  abrir cada sesión nueva y desde `cleanup_idle_sessions`.
+
+Clases:
+- `StreamSession`: sesión de captura o predicción de un navegador.
+
+Funciones:
+- `open_stream_session`: registra una sesión nueva, deteniendo la anterior del mismo tipo.
+- `get_stream_session`: devuelve la sesión activa de un navegador.
+- `stop_stream_session`: detiene la sesión de un navegador.
+- `cleanup_idle_sessions`: detiene las sesiones inactivas.
+- `list_stream_sessions`: estado de las sesiones activas.
+"""
+
+import time, threading
+
+from app.config import STREAM_SESSION_IDLE_SECONDS
+
+SESSION_KINDS = ("capture", "prediction")
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+class StreamSession:
+    """
+    Sesión de captura o predicción de un navegador.
+
+    Args:
+        session_id (str): Identificador de la sesión del navegador.
+        kind (str): `"capture"` o `"prediction"`.
+    """
+
+    def __init__(self, session_id, kind):
+        self.session_id = session_id
+        self.kind = kind
+        self.stop_event = threading.Event()
+        self.started_at = time.monotonic()
+        self.last_seen = self.started_at
+        self.frames = 0
+
+    def stop(self):
+        """
+        Pide al generador de la sesión que termine en el próximo frame.
+        """
+        self.stop_event.set()
+
+    def is_idle(self, now=None, timeout=STREAM_SESSION_IDLE_SECONDS):
+        """
+        Indica si la sesión no entregó frames durante `timeout` segundos.
+        """
+        return (now or time.monotonic()) - self.last_seen > timeout
+
+    def stream(self, frames):
+        """
+        Entrega los frames de un generador, registrando la actividad de la sesión.
+
+        Al terminar (fin del generador, parada o desconexión del cliente) cierra el
+        generador, lo que libera la cámara y MediaPipe, y quita la sesión del registro.
+
+        Args:
+            frames (Iterator[bytes]): Generador de frames de la sesión.
+
+        Yields:
+            bytes: Los frames del generador.
+        """
+        try:
+            for frame in frames:
+                self.last_seen = time.monotonic()
+                self.frames += 1
+                yield frame
+                if self.stop_event.is_set():
+                    break
+        finally:
+            close = getattr(frames, "close", None)
+            if close is not None:
+                close()
+            with _sessions_lock:
+                if _sessions.get((self.session_id, self.kind)) is self:
+                    del _sessions[(self.session_id, self.kind)]
+
+    def status(self):
+        """
+        Devuelve el estado de la sesión en formato serializable a JSON.
+        """
+        now = time.monotonic()
+        return {
+            "session": self.session_id[:8],
+            "kind": self.kind,
+            "frames": self.frames,
+            "seconds": round(now - self.started_at, 1),
+            "idle_seconds": round(now - self.last_seen, 1),
+            "stopping": self.stop_event.is_set(),
+        }
+
+
+def cleanup_idle_sessions(now=None, timeout=STREAM_SESSION_IDLE_SECONDS):
+    """
+    Detiene y quita del registro las sesiones sin actividad.
+
+    Args:
+        now (float, optional): Instante de referencia (`time.monotonic`). Default: ahora.
+        timeout (float, optional): Segundos sin frames. Default: `STREAM_SESSION_IDLE_SECONDS`.
+
+    Returns:
+        int: Cantidad de sesiones detenidas.
+    """
+    now = now or time.monotonic()
+    with _sessions_lock:
+        idle = [key for key, session in _sessions.items() if session.is_idle(now, timeout)]
+        sessions = [_sessions.pop(key) for key in idle]
+    for session in sessions:
+        session.stop()
+        print(f"⏹️ Sesión de {session.kind} {session.session_id[:8]} cerrada por inactividad")
+    return len(sessions)
+
+
+def open_stream_session(session_id, kind):
+    """
+    Registra una sesión nueva para un navegador.
+
+    Si el navegador ya tenía una sesión del mismo tipo, la detiene. También limpia las
+    sesiones inactivas de otros navegadores.
+
+    Args:
+        session_id (str): Identificador de la sesión del navegador.
+        kind (str): `"capture"` o `"prediction"`.
+
+    Returns:
+        StreamSession: Sesión nueva.
+
+    Raises:
+        ValueError: Si el tipo de sesión no existe.
+    """
+    if kind not in SESSION_KINDS:
+        raise ValueError(f"Tipo de sesión desconocido: {kind}")
+
+    cleanup_idle_sessions()
+    session = StreamSession(session_id, kind)
+    with _sessions_lock:
+        previous = _sessions.get((session_id, kind))
+        _sessions[(session_id, kind)] = session
+    if previous is not None:
+        previous.stop()
+    return session
+
+
+def get_stream_session(session_id, kind):
+    """
+    Devuelve la sesión activa de un navegador, o None si no tiene.
+    """
+    with _sessions_lock:
+        return _sessions.get((session_id, kind))
+
+
+def stop_stream_session(session_id, kind):
+    """
+    Detiene la sesión de un navegador, sin afectar a las de otros navegadores.
+
+    Args:
+        session_id (str): Identificador de la sesión del navegador.
+        kind (str): `"capture"` o `"prediction"`.
+
+    Returns:
+        bool: True si había una sesión activa.
+    """
+    with _sessions_lock:
+        session = _sessions.pop((session_id, kind), None)
+    if session is None:
+        return False
+    session.stop()
+    return True
+
+
+def list_stream_sessions():
+    """
+    Devuelve el estado de las sesiones activas.
+
+    Returns:
+        list[dict]: Estado de cada sesión (ver `StreamSession.status`).
+    """
+    with _sessions_lock:
+        return [session.status() for session in _sessions.values()]
@@ -1,27 +1,331 @@
 """
-Conversión de texto a voz con pyttsx3.
+Servicio de voz para las palabras reconocidas.
 
-Este módulo proporciona una función que utiliza el motor de texto a voz (TTS) local
-`pyttsx3` para reproducir texto en voz alta. Es útil para aplicaciones accesibles
-que no dependen de conexión a internet.
+Antes, la predicción por consola reproducía cada palabra de forma sincrónica (el loop
+de video se detenía mientras hablaba), la predicción en streaming creaba un hilo por
+palabra que llamaba a gTTS por internet y escribía un MP3 temporal, y este módulo
+iniciaba `pyttsx3` en cada llamada. Ahora un único servicio por proceso:
+
+- Tiene un solo hilo de trabajo de larga vida, que crea el motor de voz una vez (los
+  motores de `pyttsx3` no se pueden usar desde varios hilos).
+- Recibe las palabras en una cola acotada (`SPEECH_QUEUE_SIZE`): una palabra que ya está
+  pendiente o sonando no se vuelve a encolar, y si la cola está llena se descarta la
+  palabra pendiente más vieja, que ya quedó desactualizada.
+- Usa por defecto un motor sin conexión (`SPEECH_ENGINE = "pyttsx3"`); `"gtts"` usa la
+  voz de Google y requiere internet.
+- Guarda el audio de cada palabra en disco (`SPEECH_CACHE_PATH/<motor>/`), por lo que
+  cada palabra se sintetiza una sola vez. `start_speech_warm_up` genera al iniciar Flask
+  el audio de todo el vocabulario, en los momentos en que no hay nada para reproducir.
+
+`text_to_speech` solo encola la palabra y vuelve de inmediato: reproducir una palabra
+reconocida nunca detiene el procesamiento de frames.
+
+Clases:
+- `SpeechService`: cola, caché de audio y reproducción en un hilo propio.
+
+Funciones:
+- `get_speech_service`: devuelve el servicio de voz del proceso.
+- `text_to_speech`: encola un texto para reproducirlo.
+- `warm_up_speech_cache`: genera el audio de las palabras del vocabulario.
+- `start_speech_warm_up`: genera el audio del vocabulario en segundo plano.
 """
 
-import pyttsx3
+import os, hashlib, threading
+
+from collections import deque
+
+from app.config import SPEECH_CACHE_PATH, SPEECH_ENGINE, SPEECH_QUEUE_SIZE
+
+SPEECH_ENGINES = {"pyttsx3": ".wav", "gtts": ".mp3"}
+
+_lock = threading.Lock()
+_service = {"instance": None}
+
+
+def _play_audio(path):
+    """
+    Reproduce un archivo de audio y espera a que termine.
+    """
+    from playsound import playsound
+
+    playsound(path)
+
+
+class SpeechService:
+    """
+    Reproduce textos en un hilo propio, con cola acotada y caché de audio en disco.
+
+    Args:
+        engine (str, optional): `"pyttsx3"` (sin conexión) o `"gtts"`. Default: `SPEECH_ENGINE`.
+        cache_path (str, optional): Carpeta de la caché de audio. Default: `SPEECH_CACHE_PATH`.
+        max_pending (int, optional): Textos pendientes máximos. Default: `SPEECH_QUEUE_SIZE`.
+        play (Callable[[str], None], optional): Reproduce un archivo de audio. Default: playsound.
+
+    Raises:
+        ValueError: Si el motor no es uno de `SPEECH_ENGINES`.
+    """
+
+    def __init__(
+        self,
+        engine=SPEECH_ENGINE,
+        cache_path=SPEECH_CACHE_PATH,
+        max_pending=SPEECH_QUEUE_SIZE,
+        play=_play_audio,
+    ):
+        if engine not in SPEECH_ENGINES:
+            raise ValueError(
+                f"Motor de voz desconocido: {engine}. Opciones: {list(SPEECH_ENGINES)}"
+            )
+
+        self.engine = engine
+        self.cache_path = os.path.join(cache_path, engine)
+        self.play = play
+        self.pending = deque()
+        self.max_pending = max_pending
+        self.warm_up_words = deque()
+        self.current = None  # Texto que está sonando
+        self.busy = False  # El hilo está generando o reproduciendo un audio
+        self.stopped = False
+        self.counters = dict.fromkeys(
+            ("spoken", "coalesced", "dropped", "synthesized", "errors"), 0
+        )
+
+        self._condition = threading.Condition()
+        self._pyttsx3 = None  # Motor creado dentro del hilo de trabajo
+        self._thread = None
+
+    def _ensure_worker(self):
+        """
+        Inicia el hilo de trabajo la primera vez que se necesita.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def audio_path(self, text):
+        """
+        Devuelve la ruta del audio en caché de un texto (exista o no).
+        """
+        key = hashlib.sha1(text.strip().lower().encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_path, key + SPEECH_ENGINES[self.engine])
+
+    def _synthesize(self, text, path):
+        """
+        Genera el audio de un texto en `path` con el motor configurado.
+        """
+        if self.engine == "gtts":
+            from gtts import gTTS
+
+            gTTS(text=text, lang="es").save(path)
+            return
+
+        if self._pyttsx3 is None:
+            import pyttsx3
+
+            self._pyttsx3 = pyttsx3.init()
+        self._pyttsx3.save_to_file(text, path)
+        self._pyttsx3.runAndWait()
+
+    def cached_audio(self, text):
+        """
+        Devuelve el audio de un texto, sintetizándolo si no está en la caché.
+
+        El archivo se escribe con otro nombre y se renombra al final, para que una
+        síntesis interrumpida no deje un audio incompleto en la caché.
+
+        Returns:
+            str: Ruta del archivo de audio.
+        """
+        path = self.audio_path(text)
+        if not os.path.exists(path):
+            os.makedirs(self.cache_path, exist_ok=True)
+            partial = path + ".part" + SPEECH_ENGINES[self.engine]
+            self._synthesize(text, partial)
+            os.replace(partial, path)
+            self.counters["synthesized"] += 1
+        return path
+
+    def _next_task(self):
+        """
+        Espera la próxima tarea: primero las palabras a reproducir, después el precalentamiento.
+
+        Returns:
+            tuple[str, bool] | None: Texto y si hay que reproducirlo, o None al detenerse.
+        """
+        with self._condition:
+            while not (self.pending or self.warm_up_words or self.stopped):
+                self._condition.wait()
+            if self.stopped:
+                return None
+            self.busy = True
+            if self.pending:
+                self.current = self.pending.popleft()
+                return self.current, True
+            return self.warm_up_words.popleft(), False
+
+    def _run(self):
+        """
+        Loop del hilo de trabajo.
+        """
+        while True:
+            task = self._next_task()
+            if task is None:
+                return
+            text, play = task
+            try:
+                path = self.cached_audio(text)
+                if play:
+                    print(f"🔊 DICIENDO: {text}")
+                    self.play(path)
+                    self.counters["spoken"] += 1
+            except Exception as e:
+                self.counters["errors"] += 1
+                print(f"⚠️ No se pudo generar o reproducir el audio de '{text}': {e}")
+            finally:
+                with self._condition:
+                    self.current, self.busy = None, False
+                    self._condition.notify_all()
+
+    def speak(self, text):
+        """
+        Encola un texto para reproducirlo, sin esperar.
+
+        Args:
+            text (str): Texto a reproducir.
+
+        Returns:
+            bool: False si el texto ya estaba pendiente o sonando y no se encoló.
+        """
+        with self._condition:
+            if text == self.current or text in self.pending:
+                self.counters["coalesced"] += 1
+                return False
+            if len(self.pending) >= self.max_pending:
+                self.pending.popleft()
+                self.counters["dropped"] += 1
+            self.pending.append(text)
+            self._ensure_worker()
+            self._condition.notify_all()
+        return True
+
+    def warm_up(self, words):
+        """
+        Agrega palabras a generar en la caché cuando no haya nada para reproducir.
+
+        Args:
+            words (Iterable[str]): Palabras del vocabulario.
+
+        Returns:
+            int: Palabras que todavía no estaban en la caché.
+        """
+        missing = [word for word in words if not os.path.exists(self.audio_path(word))]
+        with self._condition:
+            self.warm_up_words.extend(missing)
+            if missing:
+                self._ensure_worker()
+                self._condition.notify_all()
+        return len(missing)
+
+    def wait_idle(self, timeout=None):
+        """
+        Espera a que no queden textos pendientes ni palabras por precalentar.
+
+        Args:
+            timeout (float, optional): Segundos máximos de espera. Default: sin límite.
+
+        Returns:
+            bool: True si el servicio quedó sin tareas.
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not (self.pending or self.warm_up_words or self.busy), timeout
+            )
+
+    def stop(self):
+        """
+        Detiene el hilo de trabajo; los textos pendientes se descartan.
+        """
+        with self._condition:
+            self.stopped = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+
+    def stats(self):
+        """
+        Devuelve los contadores del servicio.
+
+        Returns:
+            dict: Textos reproducidos, coalescidos, descartados, audios sintetizados,
+            errores y textos pendientes.
+        """
+        with self._condition:
+            return {**self.counters, "pending": len(self.pending)}
+
+
+def get_speech_service():
+    """
+    Devuelve el servicio de voz del proceso, creándolo la primera vez.
+
+    Returns:
+        SpeechService: Servicio de voz compartido.
+    """
+    with _lock:
+        if _service["instance"] is None:
+            _service["instance"] = SpeechService()
+        return _service["instance"]
 
 
 def text_to_speech(text):
     """
-    Convierte texto a voz utilizando la librería pyttsx3.
+    Encola un texto para reproducirlo en voz alta con el servicio de voz del proceso.
 
-    Usa un motor TTS local para reproducir el texto recibido. No requiere conexión a internet
-    y funciona en sistemas operativos compatibles con los motores de voz del sistema.
+    Vuelve de inmediato; el audio se genera (o se toma de la caché) y se reproduce en el
+    hilo del servicio.
 
     Args:
         text (str): Texto que se desea reproducir en voz.
 
     Returns:
-        None: Esta función no retorna ningún valor. Solo ejecuta la reproducción de audio.
+        bool: False si el texto ya estaba pendiente o sonando y no se encoló.
     """
-    engine = pyttsx3.init()
-    engine.say(text)
-    engine.runAndWait()
+    return get_speech_service().speak(text)
+
+
+def warm_up_speech_cache(words=None):
+    """
+    Genera en segundo plano el audio de las palabras que todavía no están en la caché.
+
+    Args:
+        words (Iterable[str], optional): Palabras a generar. Default: todas las palabras
+            de la base de datos.
+
+    Returns:
+        int: Palabras agregadas al precalentamiento.
+    """
+    if words is None:
+        from app.database.database_utils import fetch_all_words
+
+        words = [word for _, word, _ in fetch_all_words()]
+    missing = get_speech_service().warm_up(words)
+    print(f"🔊 Generando audio de {missing} palabras del vocabulario")
+    return missing
+
+
+def start_speech_warm_up():
+    """
+    Precalienta la caché de audio del vocabulario en un hilo en segundo plano.
+
+    Returns:
+        threading.Thread: Hilo que consulta el vocabulario y encola las palabras.
+    """
+
+    def warm_up():
+        try:
+            warm_up_speech_cache()
+        except Exception as e:
+            print(f"⚠️ No se pudo precalentar la caché de voz: {e}")
+
+    thread = threading.Thread(target=warm_up, daemon=True)
+    thread.start()
+    return thread
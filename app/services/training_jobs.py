@@ -0,0 +1,536 @@
+"""
+Entrenamientos del modelo en segundo plano.
+
+El entrenamiento puede durar varios minutos, por lo que no se ejecuta dentro de la
+petición HTTP. Cada entrenamiento corre como un *job* en un proceso separado
+(`multiprocessing` con `spawn`), así TensorFlow no comparte memoria ni hilos con Flask.
+
+El proceso de entrenamiento publica eventos en una cola:
+- `epoch`: métricas de la época terminada (enviadas por `ProgressReporter`).
+- `done`: métricas finales devueltas por `training_model()`.
+- `error` / `cancelled`: fin anticipado del entrenamiento.
+
+En el proceso de Flask, un hilo por job vacía la cola y actualiza el estado del job, que
+las rutas exponen por polling o Server-Sent Events. Al terminar, el estado final y la
+duración del job se registran en las métricas de `/metrics` desde el proceso de Flask.
+
+Con varios workers WSGI, cada petición puede llegar a otro proceso, así que el estado se
+comparte en disco (`TRAINING_JOBS_PATH`):
+- `<job_id>.json`: estado público del job, que el worker dueño reescribe con cada evento
+  y los demás leen para `/train_model/status` y `/train_model/events`.
+- `<modelo>.lock`: entrenamiento activo de cada modelo, creado de forma atómica; así
+  solo puede haber un entrenamiento activo por modelo entre todos los workers (y no se
+  pisan los checkpoints). Un lock cuyo worker ya no existe se descarta.
+- `<job_id>.cancel`: pedido de cancelación desde otro worker, que el dueño revisa
+  mientras espera eventos.
+
+Se conservan los últimos `TRAINING_JOBS_KEEP` jobs terminados; los más viejos se
+descartan de la memoria y del disco al lanzar un entrenamiento nuevo.
+
+Funciones:
+- `start_training_job`: lanza un entrenamiento en segundo plano.
+- `cancel_training_job`: solicita la cancelación de un entrenamiento.
+- `get_job` / `get_active_job`: consultan los jobs registrados.
+- `job_status`: devuelve el estado de un job en formato serializable a JSON.
+"""
+
+import os, json, time, uuid, inspect, threading, queue
+import multiprocessing as mp
+
+from datetime import datetime
+
+from app.config import (
+    MODEL_NAME,
+    TRAINING_CANCEL_TIMEOUT,
+    TRAINING_JOBS_KEEP,
+    TRAINING_JOBS_PATH,
+)
+from app.services.metrics import observe_training_job
+
+ACTIVE_STATUSES = ("pending", "running", "cancelling")
+
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+
+def _job_file(name):
+    return os.path.join(TRAINING_JOBS_PATH, name)
+
+
+def _public_status(job):
+    """
+    Devuelve los campos públicos de un job (sin los que empiezan con `_`).
+    """
+    return {key: value for key, value in job.items() if not key.startswith("_")}
+
+
+def _save_job(job):
+    """
+    Escribe el estado público del job en disco, de forma atómica, para los demás workers.
+    """
+    os.makedirs(TRAINING_JOBS_PATH, exist_ok=True)
+    path = _job_file(f"{job['id']}.json")
+    partial = f"{path}.{os.getpid()}.tmp"
+    with open(partial, "w") as f:
+        json.dump(_public_status(job), f)
+    os.replace(partial, path)
+
+
+def _read_json(path):
+    """
+    Lee un archivo JSON de estado, o devuelve None si no existe o está incompleto.
+    """
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _pid_alive(pid):
+    """
+    Indica si existe un proceso con el PID dado.
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def _acquire_model_lock(model_name, job_id):
+    """
+    Registra `job_id` como el entrenamiento activo del modelo entre todos los workers.
+
+    El lock se crea con contenido completo de forma atómica (`os.link` falla si ya
+    existe). Si el lock existente es de un worker que ya no existe, o de un job que ya
+    terminó, se descarta y se vuelve a intentar.
+
+    Returns:
+        str | None: None si se tomó el lock; si no, el ID del job activo.
+    """
+    os.makedirs(TRAINING_JOBS_PATH, exist_ok=True)
+    path = _job_file(f"{model_name}.lock")
+    partial = f"{path}.{job_id}.tmp"
+    with open(partial, "w") as f:
+        json.dump({"job_id": job_id, "pid": os.getpid()}, f)
+    try:
+        for _ in range(3):
+            try:
+                os.link(partial, path)
+                return None
+            except FileExistsError:
+                owner = _read_json(path)
+            if owner is None:
+                return "?"  # Otro worker lo está reemplazando
+            state = _read_json(_job_file(f"{owner['job_id']}.json"))
+            if _pid_alive(owner["pid"]) and state and state["status"] in ACTIVE_STATUSES:
+                return owner["job_id"]
+            print(f"🧹 Se descarta el lock abandonado del entrenamiento {owner['job_id']}")
+            if _read_json(path) == owner:
+                _remove(path)
+        return owner["job_id"]
+    finally:
+        _remove(partial)
+
+
+def _release_model_lock(model_name, job_id):
+    """
+    Libera el lock del modelo si pertenece a `job_id`.
+    """
+    path = _job_file(f"{model_name}.lock")
+    owner = _read_json(path)
+    if owner is not None and owner["job_id"] == job_id:
+        _remove(path)
+
+
+def _prune_jobs():
+    """
+    Descarta los jobs terminados más viejos, en memoria y en disco, dejando los últimos
+    `TRAINING_JOBS_KEEP`. Debe llamarse con `_jobs_lock` tomado.
+    """
+    finished = sorted(
+        (job for job in _jobs.values() if job["status"] not in ACTIVE_STATUSES),
+        key=lambda job: job["started_at"],
+    )
+    for job in finished[: max(len(finished) - TRAINING_JOBS_KEEP, 0)]:
+        del _jobs[job["id"]]
+
+    if not os.path.isdir(TRAINING_JOBS_PATH):
+        return
+    states = sorted(
+        (entry for entry in os.scandir(TRAINING_JOBS_PATH) if entry.name.endswith(".json")),
+        key=lambda entry: entry.stat().st_mtime,
+    )
+    finished = [
+        entry
+        for entry in states
+        if (_read_json(entry.path) or {}).get("status") not in ACTIVE_STATUSES
+    ]
+    for entry in finished[: max(len(finished) - TRAINING_JOBS_KEEP, 0)]:
+        _remove(entry.path)
+
+
+def _accepted_options(train, options):
+    """
+    Filtra las opciones que no acepta la función de entrenamiento.
+
+    Por ejemplo, `resume` solo aplica al entrenamiento completo; el ajuste incremental
+    siempre parte del modelo en producción.
+
+    Args:
+        train (Callable): `training_model` o `fine_tune_model`.
+        options (dict): Opciones recibidas.
+
+    Returns:
+        dict: Opciones que son parámetros de `train`.
+    """
+    parameters = inspect.signature(train).parameters
+    ignored = sorted(key for key in options if key not in parameters)
+    if ignored:
+        print(f"⚠️ Opciones ignoradas para {train.__name__}: {', '.join(ignored)}")
+    return {key: value for key, value in options.items() if key in parameters}
+
+
+def _training_worker(events, cancel_event, options):
+    """
+    Punto de entrada del proceso de entrenamiento.
+
+    Se ejecuta en un proceso nuevo, por lo que importa el módulo de entrenamiento
+    (y TensorFlow) recién aquí.
+
+    Args:
+        events (multiprocessing.Queue): Cola donde se publican los eventos del job.
+        cancel_event (multiprocessing.Event): Evento que solicita la cancelación.
+        options (dict): Argumentos para `training_model()`. Si incluye `mode="fine_tune"`,
+            se ejecuta `fine_tune_model()` en su lugar.
+    """
+    from ml.training.training_model import training_model
+    from ml.training.fine_tune import fine_tune_model
+    from ml.training.callbacks import CancelOnEvent, ProgressReporter, TrainingCancelled
+
+    options = dict(options)
+    train = fine_tune_model if options.pop("mode", "full") == "fine_tune" else training_model
+    options = _accepted_options(train, options)
+
+    events.put({"type": "running"})
+    reporter = ProgressReporter(
+        lambda epoch, metrics: events.put(
+            {"type": "epoch", "epoch": epoch, "metrics": metrics}
+        )
+    )
+    try:
+        result = train(**options, callbacks=[reporter, CancelOnEvent(cancel_event)])
+        if "error" in result:
+            events.put({"type": "error", "error": result["error"]})
+        else:
+            events.put({"type": "done", "result": result})
+    except TrainingCancelled:
+        events.put({"type": "cancelled"})
+    except Exception as e:
+        events.put({"type": "error", "error": str(e)})
+
+
+def _apply_event(job, event):
+    """
+    Actualiza el estado de un job a partir de un evento del proceso de entrenamiento.
+
+    Args:
+        job (dict): Job a actualizar.
+        event (dict): Evento recibido desde la cola.
+    """
+    kind = event["type"]
+    if kind == "running":
+        if job["status"] == "pending":
+            job["status"] = "running"
+    elif kind == "epoch":
+        job["history"].append({"epoch": event["epoch"], **event["metrics"]})
+    elif kind == "done":
+        job["status"] = "done"
+        job["result"] = event["result"]
+    elif kind == "error":
+        job["status"] = "error"
+        job["error"] = event["error"]
+    elif kind == "cancelled":
+        job["status"] = "cancelled"
+
+    if job["status"] not in ACTIVE_STATUSES and job["finished_at"] is None:
+        job["finished_at"] = datetime.now().isoformat(timespec="seconds")
+        observe_training_job(job["status"], time.monotonic() - job["_started"])
+        _release_model_lock(job["model"], job["id"])
+        _remove(_job_file(f"{job['id']}.cancel"))
+    _save_job(job)
+
+
+def _collect_events(job):
+    """
+    Vacía la cola de eventos de un job hasta que su proceso termina.
+
+    Si el proceso termina sin informar un estado final (por ejemplo, porque fue
+    terminado a la fuerza), el job se marca como cancelado o con error.
+
+    Args:
+        job (dict): Job cuyo proceso se está supervisando.
+    """
+    process, events = job["_process"], job["_events"]
+
+    while True:
+        # Cancelación pedida desde otro worker
+        if job["status"] in ("pending", "running") and os.path.exists(
+            _job_file(f"{job['id']}.cancel")
+        ):
+            cancel_training_job(job["id"])
+        try:
+            event = events.get(timeout=0.5)
+        except queue.Empty:
+            if process.is_alive():
+                continue
+            break
+        with _jobs_lock:
+            _apply_event(job, event)
+
+    process.join()
+    with _jobs_lock:
+        if job["status"] in ACTIVE_STATUSES:
+            if job["_cancel"].is_set():
+                _apply_event(job, {"type": "cancelled"})
+            else:
+                _apply_event(
+                    job,
+                    {
+                        "type": "error",
+                        "error": f"El proceso terminó inesperadamente (código {process.exitcode})",
+                    },
+                )
+
+
+def _spawn_worker(job, options):
+    """
+    Crea el proceso de entrenamiento y el hilo que recoge sus eventos.
+
+    Args:
+        job (dict): Job recién registrado.
+        options (dict): Argumentos para `training_model()`.
+    """
+    context = mp.get_context("spawn")
+    job["_events"] = context.Queue()
+    job["_cancel"] = context.Event()
+    job["_process"] = context.Process(
+        target=_training_worker,
+        args=(job["_events"], job["_cancel"], options),
+        daemon=True,
+    )
+    job["_process"].start()
+    threading.Thread(target=_collect_events, args=(job,), daemon=True).start()
+
+
+def start_training_job(model_name=MODEL_NAME, **options):
+    """
+    Lanza un entrenamiento del modelo en un proceso separado.
+
+    Args:
+        model_name (str, optional): Modelo a entrenar. Default: `MODEL_NAME`.
+        **options: Argumentos para `training_model()` (`epochs`, `batch_size`, `augment`,
+            `resume`), y `mode="fine_tune"` para un ajuste incremental (`fine_tune_model()`).
+
+    Returns:
+        dict: Estado inicial del job (ver `job_status`).
+
+    Raises:
+        RuntimeError: Si ya hay un entrenamiento activo para el mismo modelo, en este
+            worker o en otro.
+    """
+    with _jobs_lock:
+        active = _find_active(model_name)
+        if active is not None:
+            raise RuntimeError(
+                f"Ya hay un entrenamiento en curso para el modelo {model_name}"
+            )
+        job = {
+            "id": uuid.uuid4().hex,
+            "model": model_name,
+            "status": "pending",
+            "options": options,
+            "history": [],
+            "result": None,
+            "error": None,
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "finished_at": None,
+            "_started": time.monotonic(),
+        }
+        # El estado se escribe antes del lock, para que otro worker que lea el lock
+        # encuentre el job activo
+        _save_job(job)
+        if _acquire_model_lock(model_name, job["id"]) is not None:
+            _remove(_job_file(f"{job['id']}.json"))
+            raise RuntimeError(
+                f"Ya hay un entrenamiento en curso para el modelo {model_name}"
+            )
+        _jobs[job["id"]] = job
+        _prune_jobs()
+
+    try:
+        _spawn_worker(job, options)
+    except Exception as e:
+        with _jobs_lock:
+            _apply_event(job, {"type": "error", "error": str(e)})
+
+    print(f"🚀 Entrenamiento {job['id']} iniciado para el modelo {model_name}")
+    return job_status(job["id"])
+
+
+def _terminate_if_alive(job):
+    """
+    Termina a la fuerza el proceso de un job si sigue vivo.
+
+    Args:
+        job (dict): Job a terminar.
+    """
+    process = job.get("_process")
+    if process is not None and process.is_alive():
+        print(f"🛑 Terminando el proceso del entrenamiento {job['id']}")
+        process.terminate()
+
+
+def cancel_training_job(job_id):
+    """
+    Solicita la cancelación de un entrenamiento en curso.
+
+    El proceso se detiene al terminar el batch actual. Si no responde en
+    `TRAINING_CANCEL_TIMEOUT` segundos (por ejemplo, mientras construye el snapshot),
+    se termina a la fuerza. Si el job es de otro worker, se deja el pedido en disco y
+    ese worker lo cancela en menos de un segundo.
+
+    Args:
+        job_id (str): ID del job.
+
+    Returns:
+        bool: True si se solicitó la cancelación, False si el job no existe o ya terminó.
+    """
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        if job is None:
+            state = _read_json(_job_file(f"{job_id}.json"))
+            if state is None or state["status"] not in ACTIVE_STATUSES:
+                return False
+            open(_job_file(f"{job_id}.cancel"), "w").close()
+            return True
+        if job["status"] not in ACTIVE_STATUSES:
+            return False
+        job["status"] = "cancelling"
+        _save_job(job)
+
+    job["_cancel"].set()
+    timer = threading.Timer(TRAINING_CANCEL_TIMEOUT, _terminate_if_alive, args=(job,))
+    timer.daemon = True
+    timer.start()
+    return True
+
+
+def _find_active(model_name):
+    """
+    Busca el job activo de un modelo. Debe llamarse con `_jobs_lock` tomado.
+    """
+    for job in _jobs.values():
+        if job["model"] == model_name and job["status"] in ACTIVE_STATUSES:
+            return job
+    return None
+
+
+def get_job(job_id):
+    """
+    Devuelve el job con el ID dado, o None si no existe.
+    """
+    with _jobs_lock:
+        return _jobs.get(job_id)
+
+
+def get_active_job(model_name=MODEL_NAME):
+    """
+    Devuelve el estado del entrenamiento activo de un modelo, o None si no hay ninguno.
+
+    Si el entrenamiento es de otro worker, se busca a partir del lock del modelo.
+
+    Args:
+        model_name (str, optional): Nombre del modelo. Default: `MODEL_NAME`.
+
+    Returns:
+        dict | None: Estado del job (ver `job_status`).
+    """
+    with _jobs_lock:
+        job = _find_active(model_name)
+        job_id = job["id"] if job else None
+    if job_id is None:
+        job_id = (_read_json(_job_file(f"{model_name}.lock")) or {}).get("job_id")
+    status = job_status(job_id) if job_id else None
+    return status if status and status["active"] else None
+
+
+def job_status(job_id, since_epoch=0):
+    """
+    Devuelve el estado de un job en formato serializable a JSON.
+
+    Los jobs de otros workers se leen del estado compartido en disco.
+
+    Args:
+        job_id (str): ID del job.
+        since_epoch (int, optional): Solo incluye en `history` las épocas posteriores
+            a este número. Default: 0 (todo el historial).
+
+    Returns:
+        dict | None: Estado público del job, o None si no existe. `epochs_done` es el
+        número de la última época terminada; en un entrenamiento retomado desde un
+        checkpoint las épocas siguen la numeración original (por ejemplo 41, 42, ...).
+    """
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        status = _public_status(job) if job is not None else None
+    if status is None:
+        status = _read_json(_job_file(f"{job_id}.json"))
+        if status is None:
+            return None
+
+    history = status["history"]
+    status["history"] = [entry for entry in history if entry["epoch"] > since_epoch]
+    status["epochs_done"] = history[-1]["epoch"] if history else 0
+    status["active"] = status["status"] in ACTIVE_STATUSES
+    return status
+
+
+def iter_job_events(job_id, poll_interval=0.5):
+    """
+    Genera actualizaciones del estado de un job hasta que termina.
+
+    Cada actualización incluye solo las épocas nuevas desde la anterior, y se
+    emite únicamente cuando hay cambios.
+
+    Args:
+        job_id (str): ID del job.
+        poll_interval (float, optional): Segundos entre revisiones. Default: 0.5.
+
+    Yields:
+        dict: Estado parcial del job (ver `job_status`).
+    """
+    last_epoch, last_status = 0, None
+    while True:
+        status = job_status(job_id, since_epoch=last_epoch)
+        if status is None:
+            return
+        if status["history"] or status["status"] != last_status:
+            yield status
+            last_epoch = status["epochs_done"]
+            last_status = status["status"]
+        if not status["active"]:
+            return
+        time.sleep(poll_interval)
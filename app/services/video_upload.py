@@ -0,0 +1,127 @@
+"""
+Recepción de videos subidos directamente a disco.
+
+Este módulo permite guardar videos grandes sin cargarlos completos en memoria:
+el cuerpo de la petición se lee por bloques y cada bloque se escribe a disco a medida
+que llega. En la misma pasada se calcula el hash SHA256 del contenido, que luego se usa
+para detectar videos repetidos en `ingestion_ledger` sin volver a leer el archivo.
+
+Incluye:
+- `is_allowed_video`: valida la extensión del archivo antes de leer el cuerpo.
+- `build_video_path`: genera la ruta final del video con timestamp, organizada por palabra.
+- `save_stream_to_disk`: escribe el flujo por bloques aplicando el límite de tamaño.
+- `UploadTooLarge`: excepción lanzada cuando el video supera el tamaño máximo.
+- `EmptyUpload`: excepción lanzada cuando el video llega vacío.
+"""
+
+import os, hashlib
+
+from datetime import datetime
+from werkzeug.utils import secure_filename
+
+from app.config import (
+    ALLOWED_VIDEO_EXTENSIONS,
+    MAX_UPLOAD_BYTES,
+    UPLOAD_CHUNK_SIZE,
+    VIDEO_EXPORT_PATH,
+)
+
+
+class UploadTooLarge(ValueError):
+    """
+    Se lanza cuando el video recibido supera `MAX_UPLOAD_BYTES`.
+    """
+
+
+class EmptyUpload(ValueError):
+    """
+    Se lanza cuando el video recibido no tiene contenido.
+    """
+
+
+def is_allowed_video(filename):
+    """
+    Verifica si el nombre de archivo tiene una extensión de video permitida.
+
+    Args:
+        filename (str): Nombre original del archivo.
+
+    Returns:
+        bool: True si la extensión está en `ALLOWED_VIDEO_EXTENSIONS`, False si no.
+    """
+    return bool(filename) and filename.lower().endswith(ALLOWED_VIDEO_EXTENSIONS)
+
+
+def build_video_path(word, filename, base_path=VIDEO_EXPORT_PATH):
+    """
+    Genera la ruta donde se guardará un video subido para una palabra.
+
+    El nombre se sanitiza y se le agrega un timestamp para evitar sobreescrituras.
+    La carpeta de la palabra se crea si no existe.
+
+    Args:
+        word (str): Palabra a la que pertenece el video.
+        filename (str): Nombre original del archivo.
+        base_path (str, optional): Carpeta base de videos. Default: `VIDEO_EXPORT_PATH`.
+
+    Returns:
+        str: Ruta completa del archivo de video.
+    """
+    name, ext = os.path.splitext(secure_filename(filename))
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    word_folder = os.path.join(base_path, word)
+    os.makedirs(word_folder, exist_ok=True)
+    return os.path.join(word_folder, f"{name}_{timestamp}{ext}")
+
+
+def save_stream_to_disk(
+    stream, video_path, max_bytes=MAX_UPLOAD_BYTES, chunk_size=UPLOAD_CHUNK_SIZE
+):
+    """
+    Escribe un flujo de bytes a disco por bloques y calcula su hash SHA256.
+
+    Los bloques se escriben en un archivo temporal (`.part`) que solo se renombra a la
+    ruta final cuando el flujo terminó correctamente. Si el contenido supera `max_bytes`,
+    la escritura se corta en ese momento y el archivo parcial se elimina.
+
+    Args:
+        stream: Objeto con método `read(size)` (por ejemplo `request.stream` de Flask).
+        video_path (str): Ruta final del archivo.
+        max_bytes (int, optional): Tamaño máximo permitido en bytes. Default: `MAX_UPLOAD_BYTES`.
+        chunk_size (int, optional): Tamaño de cada bloque en bytes. Default: `UPLOAD_CHUNK_SIZE`.
+
+    Returns:
+        tuple[int, bytes]: Cantidad de bytes escritos y digest SHA256 del contenido.
+
+    Raises:
+        UploadTooLarge: Si el contenido supera `max_bytes`.
+        EmptyUpload: Si el contenido llega vacío.
+    """
+    partial_path = f"{video_path}.part"
+    digest = hashlib.sha256()
+    written = 0
+
+    try:
+        with open(partial_path, "wb") as file:
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+                written += len(chunk)
+                if written > max_bytes:
+                    raise UploadTooLarge(
+                        f"El video supera el tamaño máximo de {max_bytes // (1024 * 1024)} MB."
+                    )
+                digest.update(chunk)
+                file.write(chunk)
+
+        if written == 0:
+            raise EmptyUpload("El video recibido está vacío.")
+    except BaseException:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+
+    os.replace(partial_path, video_path)
+    return written, digest.digest()
@@ -12,8 +12,9 @@ El flujo incluye integración con la base de datos PostgreSQL y visualización w
 mediante plantillas HTML.
 """
 
-import os
+import os, re, json, time, uuid
 
+from urllib.parse import unquote
 from flask import (
     Flask,
     render_template,
@@ -23,33 +24,133 @@ from flask import (
     request,
     jsonify,
     flash,
+    session,
+    g,
 )
-from werkzeug.utils import secure_filename
-from datetime import datetime
 
 from ml.features.pipelines import (
     create_samples_from_camera,
     create_samples_from_video,
     save_keypoints,
     predict_model_from_camera_stream,
-    train_model as run_training_pipeline,
     generate_visualization_image,
 )
 from app.database.database_utils import (
     fetch_all_words,
     fetch_all_categories,
     insert_words,
-    count_unique_samples_per_word
+    count_unique_samples_per_word,
+    fetch_ingestion_record,
+    fetch_video_sample_ids,
+)
+from app.services.video_upload import (
+    EmptyUpload,
+    UploadTooLarge,
+    is_allowed_video,
+    build_video_path,
+    save_stream_to_disk,
+)
+from app.services.stream_sessions import (
+    open_stream_session,
+    stop_stream_session,
+    list_stream_sessions,
+)
+from app.services.training_jobs import (
+    start_training_job,
+    cancel_training_job,
+    get_active_job,
+    job_status,
+    iter_job_events,
+)
+from ml.training.model_registry import list_versions, promote_model
+from ml.prediction.model_cache import start_model_warm_up
+from app.services.text_to_speech import start_speech_warm_up
+from ml.prediction.batch_server import get_batch_server_stats
+from ml.utils.common_utils import hash_file
+from ml.utils.latency_utils import latency_report
+from app.services.metrics import generate_metrics, observe_http_request
+from app.config import (
+    FRAME_ACTIONS_PATH,
+    ALLOWED_VIDEO_EXTENSIONS,
+    MAX_UPLOAD_BYTES,
+    MODEL_WARM_UP,
+    SPEECH_WARM_UP,
+    USE_TEST_DB,
 )
-from app.config import FRAME_ACTIONS_PATH, VIDEO_EXPORT_PATH
 
 
 # -------- VARIABLES
 app = Flask(__name__)
-stop_capture = False  # Flag global para detener la captura de datos
 app.secret_key = (
     "9f2b3d41a0cd53d0cf99b8f63b867987"  # 🔐 Necesaria para mensajes flash y sesiones
 )
+app.config["MAX_CONTENT_LENGTH"] = MAX_UPLOAD_BYTES  # Rechaza subidas grandes antes de leerlas
+
+# El primer cliente de /video_feed_prediction no espera la carga del modelo
+if MODEL_WARM_UP and not USE_TEST_DB:
+    start_model_warm_up()
+
+# La primera vez que se reconoce cada palabra no se espera la síntesis de su audio
+if SPEECH_WARM_UP and not USE_TEST_DB:
+    start_speech_warm_up()
+
+
+@app.before_request
+def _start_request_timer():
+    """
+    Guarda el inicio de la petición para medir su duración en `/metrics`.
+    """
+    g.request_start = time.perf_counter()
+
+
+@app.after_request
+def _record_request_metrics(response):
+    """
+    Registra la petición en las métricas de `/metrics`, agrupada por la regla de la ruta.
+
+    Args:
+        response (Response): Respuesta de la ruta.
+
+    Returns:
+        Response: La misma respuesta.
+    """
+    start = g.pop("request_start", None)
+    if start is not None:
+        endpoint = request.url_rule.rule if request.url_rule else "<sin ruta>"
+        observe_http_request(
+            request.method, endpoint, response.status_code, time.perf_counter() - start
+        )
+    return response
+
+
+def _parse_word_id(word_id):
+    """
+    Convierte el `word_id` recibido en la URL (hexadecimal) a bytes.
+
+    Args:
+        word_id (str): ID de la palabra en formato hexadecimal (64 caracteres).
+
+    Returns:
+        bytes | None: ID en formato binario, o None si el formato no es válido.
+    """
+    if word_id and re.fullmatch(r"[0-9a-f]{64}", word_id):
+        return bytes.fromhex(word_id)
+    return None
+
+
+def _stream_session_id():
+    """
+    Devuelve el identificador de la sesión del navegador, creándolo si no existe.
+
+    Cada navegador tiene sus propias sesiones de captura y predicción
+    (`app.services.stream_sessions`), guardadas por este identificador.
+
+    Returns:
+        str: Identificador hexadecimal de la sesión.
+    """
+    if "stream_id" not in session:
+        session["stream_id"] = uuid.uuid4().hex
+    return session["stream_id"]
 
 
 @app.route("/")
@@ -105,8 +206,13 @@ def capture(word_id, word):
 
 @app.route("/stop_capture", methods=["POST"])
 def stop_capture_route():
-    global stop_capture
-    stop_capture = True
+    """
+    Detiene la captura de la sesión del navegador, sin afectar a otros operadores.
+
+    Returns:
+        Response: Redirección al guardado de muestras de la palabra, o al entrenamiento.
+    """
+    stop_stream_session(_stream_session_id(), "capture")
 
     word = request.form.get("word")
     word_id = request.form.get("word_id")
@@ -128,12 +234,72 @@ def video_feed(word):
     Returns:
         Response: Flujo continuo de frames JPEG para visualización en vivo.
     """
+    stream = open_stream_session(_stream_session_id(), "capture")
     return Response(
-        create_samples_from_camera(word, FRAME_ACTIONS_PATH),
+        stream.stream(
+            create_samples_from_camera(
+                word, FRAME_ACTIONS_PATH, stop_event=stream.stop_event
+            )
+        ),
         mimetype="multipart/x-mixed-replace; boundary=frame",
     )
 
 
+def _ingest_video(word_id, word, video_path, content_hash=None):
+    """
+    Ejecuta el pipeline de captura sobre un video ya guardado en disco.
+
+    Si el video ya generó muestras para la palabra (tabla `ingestion_ledger`), descarta
+    el archivo, no vuelve a ejecutar MediaPipe e informa las muestras existentes. En caso
+    contrario procesa el video y devuelve la ruta del procesamiento de keypoints, que
+    lleva el hash del video: el registro del video se escribe en `save_keypoints` recién
+    cuando se inserta al menos una muestra.
+
+    Args:
+        word_id (str): ID único de la palabra (hexadecimal).
+        word (str): Nombre textual de la palabra.
+        video_path (str): Ruta al video guardado.
+        content_hash (bytes, optional): Hash SHA256 ya calculado; si es None se calcula. Default: None.
+
+    Returns:
+        str: URL a la que se debe redirigir al usuario.
+    """
+    word_id_bytes = _parse_word_id(word_id)
+    if word_id_bytes:
+        content_hash = content_hash or hash_file(video_path)
+        record = fetch_ingestion_record(content_hash, word_id_bytes)
+        # Registros anteriores sin muestras vinculadas no impiden volver a procesarlo
+        if record and record[1] is not None:
+            os.remove(video_path)
+            sample_ids = fetch_video_sample_ids(word_id_bytes, record[2]) or [record[1]]
+            flash(
+                f'Este video ya fue procesado para "{word}". Sus {len(sample_ids)} '
+                f"muestras ya están registradas (samples {', '.join(map(str, sample_ids))}).",
+                "info",
+            )
+            return url_for("upload_video", word_id=word_id, word=word)
+
+    # Ejecuta el pipeline con el video subido
+    create_samples_from_video(
+        word_name=word,
+        video_path=video_path,
+        root_path=FRAME_ACTIONS_PATH,
+        debug_value=False,
+    )
+
+    if word and word_id_bytes:
+        return url_for(
+            "save_samples",
+            word=word,
+            word_id=word_id,
+            video=content_hash.hex(),
+            source=os.path.basename(video_path),
+        )
+    if word and word_id:
+        return url_for("save_samples", word=word, word_id=word_id)
+    return url_for("upload_video", word_id=word_id, word=word)
+
+
 @app.route("/training/upload_video/process/<word_id>/<word>", methods=["POST"])
 def process_uploaded_video(word_id, word):
     """
@@ -142,6 +308,10 @@ def process_uploaded_video(word_id, word):
     Guarda el archivo de video con un nombre único (timestamp), lo procesa para
     extraer muestras usando MediaPipe y luego redirige al procesamiento de keypoints.
 
+    Antes de procesar, calcula el hash SHA256 del video: si el mismo contenido ya fue
+    ingerido para la palabra (tabla `ingestion_ledger`), descarta el archivo y no vuelve
+    a ejecutar MediaPipe.
+
     Args:
         word_id (str): ID único de la palabra.
         word (str): Nombre textual de la palabra.
@@ -152,32 +322,65 @@ def process_uploaded_video(word_id, word):
 
     file = request.files.get("video_file")
 
-    if file and file.filename.lower().endswith((".mp4", ".mov", ".avi", ".mkv")):
-        filename = secure_filename(file.filename)
+    if file and is_allowed_video(file.filename):
+        # Guarda el archivo en una carpeta específica por palabra, con timestamp
+        video_path = build_video_path(word, file.filename)
+        file.save(video_path)
+        return redirect(_ingest_video(word_id, word, video_path))
 
-        # Agrega timestamp al nombre del archivo
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        name, ext = os.path.splitext(filename)
-        filename_timestamped = f"{name}_{timestamp}{ext}"
+    return redirect(url_for("upload_video", word_id=word_id, word=word))
 
-        # Guarda el archivo en una carpeta específica por palabra
-        word_folder = os.path.join(VIDEO_EXPORT_PATH, word)
-        os.makedirs(word_folder, exist_ok=True)
-        video_path = os.path.join(word_folder, filename_timestamped)
-        file.save(video_path)
 
-        # Ejecuta el pipeline con el video subido
-        create_samples_from_video(
-            word_name=word,
-            video_path=video_path,
-            root_path=FRAME_ACTIONS_PATH,
-            debug_value=False,
+@app.route("/training/upload_video/stream/<word_id>/<word>", methods=["POST"])
+def stream_uploaded_video(word_id, word):
+    """
+    Recibe un video como flujo de bytes y lo escribe a disco a medida que llega.
+
+    A diferencia de `process_uploaded_video`, el archivo no pasa por `request.files`:
+    el cuerpo de la petición se lee por bloques de `UPLOAD_CHUNK_SIZE` y se escribe
+    directamente en la carpeta de la palabra, calculando el hash en la misma pasada.
+    El nombre original se envía codificado (URL encoding) en el encabezado `X-Filename`.
+
+    Los límites se validan lo antes posible:
+    - La extensión se verifica antes de leer el cuerpo.
+    - `Content-Length` se compara con `MAX_UPLOAD_BYTES` antes de leer el cuerpo.
+    - El tamaño real se controla bloque a bloque y la escritura se corta al superarlo
+      (413); un cuerpo vacío se rechaza con 400.
+
+    Args:
+        word_id (str): ID único de la palabra.
+        word (str): Nombre textual de la palabra.
+
+    Returns:
+        Response: JSON con `success`, `redirect` (URL siguiente) y `error`.
+    """
+    filename = unquote(request.headers.get("X-Filename", ""))
+    if not is_allowed_video(filename):
+        formatos = ", ".join(ALLOWED_VIDEO_EXTENSIONS)
+        return (
+            jsonify(success=False, redirect="", error=f"Formato no permitido ({formatos})."),
+            400,
         )
 
-        if word and word_id:
-            return redirect(url_for("save_samples", word=word, word_id=word_id))
+    if request.content_length and request.content_length > MAX_UPLOAD_BYTES:
+        return (
+            jsonify(success=False, redirect="", error="El video supera el tamaño máximo."),
+            413,
+        )
 
-    return redirect(url_for("upload_video", word_id=word_id, word=word))
+    video_path = build_video_path(word, filename)
+    try:
+        _, content_hash = save_stream_to_disk(request.stream, video_path)
+    except UploadTooLarge as e:
+        return jsonify(success=False, redirect="", error=str(e)), 413
+    except EmptyUpload as e:
+        return jsonify(success=False, redirect="", error=str(e)), 400
+
+    return jsonify(
+        success=True,
+        redirect=_ingest_video(word_id, word, video_path, content_hash),
+        error="",
+    )
 
 
 @app.route("/save_samples/<word>/<word_id>")
@@ -190,6 +393,9 @@ def save_samples(word, word_id):
     - Extrae los keypoints usando MediaPipe Holistic
     - Guarda los resultados en la base de datos (tabla `keypoints`)
 
+    Si las muestras vienen de un video subido, la URL lleva su hash (`video`) y nombre
+    (`source`) para registrar el video junto con sus muestras.
+
     Args:
         word (str): Palabra que fue capturada y debe procesarse.
         word_id (str): ID correspondiente a la palabra en la base de datos.
@@ -197,7 +403,15 @@ def save_samples(word, word_id):
     Returns:
         str: Render de la plantilla `save_samples.html` al completar el proceso.
     """
-    save_keypoints(word, word_id, FRAME_ACTIONS_PATH)
+    video = request.args.get("video", "")
+    video_hash = bytes.fromhex(video) if re.fullmatch(r"[0-9a-f]{64}", video) else None
+    save_keypoints(
+        word,
+        word_id,
+        FRAME_ACTIONS_PATH,
+        video_hash=video_hash,
+        video_source=request.args.get("source") if video_hash else None,
+    )
     return render_template("save_samples.html", word=word, word_id=word_id)
 
 
@@ -353,36 +567,189 @@ def train_model_page():
     Página para iniciar el entrenamiento del modelo de predicción.
 
     Renderiza la plantilla `train_model.html` que permite al usuario
-    lanzar el entrenamiento desde la interfaz web.
+    lanzar el entrenamiento desde la interfaz web. Si ya hay un entrenamiento
+    en curso, la página se conecta a su progreso en lugar de iniciar otro.
 
     Returns:
         str: Render de la plantilla con el botón para entrenar el modelo.
     """
-    return render_template("train_model.html")
+    return render_template("train_model.html", active_job=get_active_job())
 
 
 @app.route("/train_model", methods=["POST"])
 def train_model():
     """
-    Ejecuta el pipeline de entrenamiento del modelo desde una petición POST.
+    Lanza el entrenamiento del modelo en segundo plano.
+
+    El entrenamiento corre en un proceso separado (`app.services.training_jobs`),
+    por lo que la respuesta es inmediata. El progreso se consulta con
+    `/train_model/status/<job_id>` o `/train_model/events/<job_id>`.
 
-    Corre la función `run_training_pipeline()` que:
-    - Recupera datos desde la base.
-    - Preprocesa las secuencias.
-    - Entrena el modelo LSTM.
-    - Devuelve los resultados o errores en formato JSON.
+    Acepta opcionalmente un JSON con `epochs`, `batch_size`, `augment`, `resume`
+    (continuar desde el último checkpoint de un entrenamiento interrumpido), `mode`
+    (`"fine_tune"` para ajustar el modelo en producción a las palabras nuevas), `sampling`
+    (`"shuffle"`, `"balanced"` o `"temperature"`) y `class_weights`.
 
     Returns:
-        Response: Objeto JSON con el estado del entrenamiento (`success`, `output`, `error`).
-    """
+        Response: Objeto JSON con el estado del job (`success`, `output`, `error`).
+        Código 409 si ya hay un entrenamiento en curso.
+    """
+    data = request.get_json(silent=True) or {}
+    options = {
+        key: data[key]
+        for key in (
+            "epochs",
+            "batch_size",
+            "augment",
+            "resume",
+            "mode",
+            "sampling",
+            "class_weights",
+        )
+        if key in data
+    }
     try:
-        results = run_training_pipeline()
-        print(results)
-        if "error" in results:
-            return jsonify(success=False, output="", error=results["error"])
-        return jsonify(success=True, output=results, error="")
+        job = start_training_job(**options)
+        return jsonify(success=True, output=job, error="")
+    except RuntimeError as e:
+        return jsonify(success=False, output=get_active_job(), error=str(e)), 409
     except Exception as e:
-        return jsonify(success=False, output="", error=str(e))
+        return jsonify(success=False, output="", error=str(e)), 500
+
+
+@app.route("/train_model/status/<job_id>")
+def train_model_status(job_id):
+    """
+    Devuelve el estado y las métricas por época de un entrenamiento (polling).
+
+    Args:
+        job_id (str): ID del entrenamiento.
+
+    Query params:
+        since (int, optional): Solo devuelve las épocas posteriores a este número.
+
+    Returns:
+        Response: JSON con el estado del job, o 404 si no existe.
+    """
+    status = job_status(job_id, since_epoch=request.args.get("since", 0, type=int))
+    if status is None:
+        return jsonify(success=False, error="Entrenamiento no encontrado"), 404
+    return jsonify(status)
+
+
+@app.route("/train_model/events/<job_id>")
+def train_model_events(job_id):
+    """
+    Transmite el progreso de un entrenamiento mediante Server-Sent Events.
+
+    Cada evento contiene el estado del job y las épocas nuevas desde el evento anterior.
+    El flujo se cierra cuando el entrenamiento termina.
+
+    Args:
+        job_id (str): ID del entrenamiento.
+
+    Returns:
+        Response: Flujo `text/event-stream`, o 404 si el job no existe.
+    """
+    if job_status(job_id) is None:
+        return jsonify(success=False, error="Entrenamiento no encontrado"), 404
+
+    def stream():
+        for status in iter_job_events(job_id):
+            yield f"data: {json.dumps(status)}\n\n"
+
+    return Response(
+        stream(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.route("/train_model/cancel/<job_id>", methods=["POST"])
+def train_model_cancel(job_id):
+    """
+    Cancela un entrenamiento en curso. El modelo anterior no se reemplaza.
+
+    Args:
+        job_id (str): ID del entrenamiento.
+
+    Returns:
+        Response: JSON con `success`, o 404 si el job no existe o ya terminó.
+    """
+    if not cancel_training_job(job_id):
+        return jsonify(success=False, error="No hay un entrenamiento activo con ese ID"), 404
+    return jsonify(success=True, error="")
+
+
+@app.route("/models")
+def models():
+    """
+    Lista las versiones del modelo guardadas en el registro.
+
+    Returns:
+        Response: JSON con los manifiestos de cada versión (`word_ids`, métricas,
+        huella del dataset y si está en producción).
+    """
+    return jsonify(versions=list_versions())
+
+
+@app.route("/models/promote/<version>", methods=["POST"])
+def promote_model_route(version):
+    """
+    Promueve una versión del registro a producción.
+
+    Las predicciones en curso recargan el modelo sin reiniciar Flask.
+
+    Args:
+        version (str): Versión a promover (por ejemplo, `v0003`).
+
+    Returns:
+        Response: JSON con `success`, o 404 si la versión no existe o no es compatible.
+    """
+    try:
+        manifest = promote_model(version)
+        return jsonify(success=True, output=manifest, error="")
+    except ValueError as e:
+        return jsonify(success=False, output="", error=str(e)), 404
+
+
+@app.route("/prediction/stats")
+def prediction_stats():
+    """
+    Métricas del servidor de inferencia por lotes (`PREDICTION_BATCHING`).
+
+    Returns:
+        Response: JSON con `enabled`, secuencias y lotes atendidos, profundidad de la cola
+        e histogramas de tamaño de lote y profundidad de la cola.
+    """
+    return jsonify(get_batch_server_stats())
+
+
+@app.route("/latency")
+def latency():
+    """
+    Latencias por etapa de los flujos de captura y predicción activos (`LATENCY_TRACKING`).
+
+    Returns:
+        Response: JSON con `enabled` y, por tipo de flujo, flujos activos, FPS y
+        percentiles p50/p95/p99 de cada etapa en milisegundos.
+    """
+    return jsonify(latency_report())
+
+
+@app.route("/metrics")
+def metrics():
+    """
+    Métricas de la aplicación en el formato de texto de Prometheus (`app.services.metrics`).
+
+    Con varios workers y `PROMETHEUS_MULTIPROC_DIR` definida, suma las métricas de todos.
+
+    Returns:
+        Response: Texto con contadores e histogramas de peticiones HTTP, consultas SQL,
+        ingesta, entrenamiento e inferencia.
+    """
+    body, content_type = generate_metrics()
+    return Response(body, content_type=content_type)
 
 
 @app.route("/translate", methods=["GET"])
@@ -410,12 +777,35 @@ def video_feed_prediction():
     Returns:
         Response: Stream de imágenes tipo MJPEG (`multipart/x-mixed-replace`).
     """
+    stream = open_stream_session(_stream_session_id(), "prediction")
     return Response(
-        predict_model_from_camera_stream(),
+        stream.stream(predict_model_from_camera_stream(stop_event=stream.stop_event)),
         mimetype="multipart/x-mixed-replace; boundary=frame",
     )
 
 
+@app.route("/stop_prediction", methods=["POST"])
+def stop_prediction_route():
+    """
+    Detiene la predicción en vivo de la sesión del navegador.
+
+    Returns:
+        Response: JSON con `success` (False si la sesión no tenía una predicción activa).
+    """
+    return jsonify(success=stop_stream_session(_stream_session_id(), "prediction"))
+
+
+@app.route("/sessions")
+def sessions():
+    """
+    Lista las sesiones de captura y predicción activas de todos los navegadores.
+
+    Returns:
+        Response: JSON con el tipo, frames entregados y segundos de inactividad de cada sesión.
+    """
+    return jsonify(sessions=list_stream_sessions())
+
+
 # @app.route("/text_to_sign")
 # def visualize_sign(word):
 #     """
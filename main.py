@@ -13,6 +13,7 @@ from app.database.schema import (
     create_words_table,
     create_keypoints_table,
     create_samples_table,
+    create_ingestion_ledger_table,
 )
 from app.database.database_utils import (
     insert_words,
@@ -44,6 +45,7 @@ def initialize_database():
     create_words_table()
     create_samples_table()
     create_keypoints_table()
+    create_ingestion_ledger_table()
     insert_categories(categories)
     insert_words(words)
     print("✅ Base de datos lista.\n")
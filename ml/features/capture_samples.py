@@ -10,7 +10,10 @@ Se puede usar en dos modos:
 - Modo servidor (`debug=False`): genera frames JPEG para transmitir por Flask (`video_feed`).
 
 Esta funcionalidad es utilizada por la app web (ruta `/video_feed/<word>`) y forma
-parte del flujo de entrenamiento en vivo desde cámara.
+parte del flujo de entrenamiento en vivo desde cámara. Cada captura web se detiene con
+el evento de su sesión (`app.services.stream_sessions`), sin afectar a las demás.
+Con `LATENCY_TRACKING = True` se mide la latencia de cada etapa del frame
+(`ml.utils.latency_utils`).
 """
 
 import os, cv2
@@ -20,12 +23,10 @@ from mediapipe.python.solutions.holistic import Holistic
 
 from ml.utils.capture_utils import save_frames, draw_keypoints
 from ml.utils.common_utils import create_folder, mediapipe_detection, there_hand
+from ml.utils.latency_utils import create_tracker
 from app.config import FONT, FONT_POS, FONT_SIZE
 
 
-stop_capture = False  # Usado por la ruta Flask '/stop_capture' para detener la grabación en tiempo real
-
-
 def _save_sample(frames, path, margin_frames, delay_frames):
     """
     Guarda una muestra recortada (frames) en una carpeta con timestamp.
@@ -55,7 +56,13 @@ def _save_sample(frames, path, margin_frames, delay_frames):
 
 
 def capture_samples_from_camera(
-    path, margin_frames=1, min_frames=5, delay_frames=3, debug=False, camera_index=0
+    path,
+    margin_frames=1,
+    min_frames=5,
+    delay_frames=3,
+    debug=False,
+    camera_index=0,
+    stop_event=None,
 ):
     """
     Captura muestras desde la cámara y guarda las secuencias válidas.
@@ -75,79 +82,86 @@ def capture_samples_from_camera(
         delay_frames (int, optional): Frames adicionales antes de cortar la muestra. Default: 3.
         debug (bool, optional): Modo visual. Si True, muestra ventana OpenCV. Default: False.
         camera_index (int, optional): Índice del dispositivo de cámara. Default: 0.
+        stop_event (threading.Event, optional): Evento de la sesión que detiene la captura
+            (`app.services.stream_sessions`). Default: None.
 
     Returns:
         generator | None:
             - En modo Flask (`debug=False`): generador de imágenes JPEG.
             - En modo consola (`debug=True`): no retorna nada.
     """
-
-    global stop_capture
-
     create_folder(path)
     frames, frame_count, fix_frames = [], 0, 0
     recording = False
+    tracker = create_tracker("capture")
 
     with Holistic() as model:
         cap = cv2.VideoCapture(1)
 
-        while cap.isOpened():
-            if stop_capture:  # Detener la captura desde Flask
-                break
-
-            ret, frame = cap.read()
-            if not ret:
-                break
-
-            results = mediapipe_detection(frame, model)
-            image = frame.copy()
+        try:
+            while cap.isOpened():
+                if stop_event is not None and stop_event.is_set():  # Detenida desde Flask
+                    break
 
-            if there_hand(results) or recording:
-                recording = False
-                frame_count += 1
-                if frame_count > margin_frames:
+                tracker.start_frame()
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                tracker.lap("read")
+
+                results = mediapipe_detection(frame, model)
+                image = frame.copy()
+                tracker.lap("mediapipe")
+
+                if there_hand(results) or recording:
+                    recording = False
+                    frame_count += 1
+                    if frame_count > margin_frames:
+                        if debug:
+                            cv2.putText(
+                                image,
+                                "Capturando...",
+                                FONT_POS,
+                                FONT,
+                                FONT_SIZE,
+                                (255, 50, 0),
+                            )
+                        frames.append(frame)
+                else:
+                    if len(frames) >= min_frames + margin_frames:
+                        fix_frames += 1
+                        if fix_frames < delay_frames:
+                            recording = True
+                            continue
+                        _save_sample(frames, path, margin_frames, delay_frames)
+
+                    recording, fix_frames, frames, frame_count = False, 0, [], 0
                     if debug:
                         cv2.putText(
                             image,
-                            "Capturando...",
+                            "Listo para capturar...",
                             FONT_POS,
                             FONT,
                             FONT_SIZE,
-                            (255, 50, 0),
+                            (0, 220, 100),
                         )
-                    frames.append(frame)
-            else:
-                if len(frames) >= min_frames + margin_frames:
-                    fix_frames += 1
-                    if fix_frames < delay_frames:
-                        recording = True
-                        continue
-                    _save_sample(frames, path, margin_frames, delay_frames)
-
-                recording, fix_frames, frames, frame_count = False, 0, [], 0
-                if debug:
-                    cv2.putText(
-                        image,
-                        "Listo para capturar...",
-                        FONT_POS,
-                        FONT,
-                        FONT_SIZE,
-                        (0, 220, 100),
-                    )
+                tracker.lap("segment")
 
+                if debug:
+                    draw_keypoints(image, results)
+                    cv2.imshow(f'Toma de muestras para "{os.path.basename(path)}"', image)
+                    if cv2.waitKey(10) & 0xFF == ord("q"):
+                        break
+                else:
+                    draw_keypoints(image, results)
+                    tracker.draw_overlay(image)
+                    tracker.lap("draw")
+                    ret, buffer = cv2.imencode(".jpg", image)
+                    frame = buffer.tobytes()
+                    tracker.lap("encode")
+                    tracker.end_frame()
+                    yield (b"--frame\r\nContent-Type: image/jpeg\r\n\r\n" + frame + b"\r\n")
+        finally:
+            cap.release()
             if debug:
-                draw_keypoints(image, results)
-                cv2.imshow(f'Toma de muestras para "{os.path.basename(path)}"', image)
-                if cv2.waitKey(10) & 0xFF == ord("q"):
-                    break
-            else:
-                draw_keypoints(image, results)
-                ret, buffer = cv2.imencode(".jpg", image)
-                frame = buffer.tobytes()
-                yield (b"--frame\r\nContent-Type: image/jpeg\r\n\r\n" + frame + b"\r\n")
-
-        cap.release()
-        if debug:
-            cv2.destroyAllWindows()
-
-        stop_capture = False  # Se resetea al finalizar la captura
+                cv2.destroyAllWindows()
@@ -8,6 +8,11 @@ frames relevantes mediante MediaPipe Holistic. Cuando se detecta actividad váli
 Incluye:
 - `_save_sample`: guarda la secuencia de frames como imágenes numeradas en una subcarpeta.
 - `capture_samples_from_video`: procesa frame por frame el video, detecta actividad y guarda muestras válidas.
+- `find_hand_intervals`: pasada rápida (stride y resolución bajos) que ubica los intervalos con manos.
+- `capture_samples_from_video_seek`: decodifica solo los intervalos con manos y guarda una muestra por intervalo.
+
+El modo `seek` evita decodificar y procesar con Holistic completo el video entero, por lo
+que el ahorro es proporcional a la fracción del video sin señas.
 
 Usos comunes:
 - Entrenamiento offline desde grabaciones
@@ -21,7 +26,14 @@ from mediapipe.python.solutions.holistic import Holistic
 
 from ml.utils.capture_utils import save_frames, draw_keypoints
 from ml.utils.common_utils import create_folder, mediapipe_detection, there_hand
-from app.config import FONT, FONT_POS, FONT_SIZE
+from app.config import (
+    FONT,
+    FONT_POS,
+    FONT_SIZE,
+    MODEL_FRAMES,
+    SEEK_SCALE,
+    SEEK_STRIDE,
+)
 
 
 def _save_sample(frames, path, margin_frames, delay_frames):
@@ -41,13 +53,206 @@ def _save_sample(frames, path, margin_frames, delay_frames):
         None: Los archivos son guardados en disco, no se retorna valor.
     """
     trimmed = frames[: -(margin_frames + delay_frames)]
+    _write_sample(trimmed, path)
+
+
+def _write_sample(frames, path):
+    """
+    Guarda una lista de frames como imágenes numeradas en una carpeta nueva con timestamp.
+
+    Args:
+        frames (list[np.ndarray]): Frames a guardar.
+        path (str): Carpeta donde se crea la subcarpeta de la muestra.
+
+    Returns:
+        None: Los archivos son guardados en disco, no se retorna valor.
+    """
     folder = os.path.join(path, f"sample_{datetime.now().strftime('%y%m%d%H%M%S%f')}")
     create_folder(folder)
-    save_frames(trimmed, folder)
+    save_frames(frames, folder)
+
+
+def _merge_hits(hits, stride, total_frames, gap=0):
+    """
+    Agrupa los índices de frames con manos en intervalos continuos.
+
+    Dos detecciones separadas por no más de `stride + gap` frames pertenecen al mismo
+    intervalo. Cada intervalo se extiende `stride` frames hacia ambos lados, ya que el inicio y el fin
+    reales de la seña quedan entre dos frames analizados.
+
+    Args:
+        hits (list[int]): Índices (ordenados) de los frames donde se detectó una mano.
+        stride (int): Separación entre frames analizados.
+        total_frames (int): Cantidad total de frames del video (0 si es desconocida).
+        gap (int, optional): Frames sin manos adicionales tolerados dentro de un intervalo. Default: 0.
+
+    Returns:
+        list[tuple[int, int]]: Intervalos `(inicio, fin)` inclusivos.
+    """
+    intervals = []
+    for index in hits:
+        if intervals and index - intervals[-1][1] <= stride + gap:
+            intervals[-1][1] = index
+        else:
+            intervals.append([index, index])
+
+    last_frame = total_frames - 1 if total_frames > 0 else None
+    padded = []
+    for start, end in intervals:
+        start = max(0, start - stride)
+        end = end + stride if last_frame is None else min(last_frame, end + stride)
+        padded.append((start, end))
+    return padded
+
+
+def find_hand_intervals(video_path, stride=SEEK_STRIDE, scale=SEEK_SCALE, gap=0):
+    """
+    Ubica los intervalos del video en los que aparecen manos con una pasada de bajo costo.
+
+    Analiza un frame cada `stride` (los intermedios se saltean con `grab()`, sin
+    convertirlos a imagen), reduce su resolución según `scale` y usa Holistic en su
+    versión más liviana (`model_complexity=0`) para detectar manos.
+
+    Args:
+        video_path (str): Ruta al archivo de video.
+        stride (int, optional): Cada cuántos frames se analiza uno. Default: `SEEK_STRIDE`.
+        scale (float, optional): Factor de escala de la imagen analizada. Default: `SEEK_SCALE`.
+        gap (int, optional): Frames sin manos adicionales tolerados dentro de un intervalo. Default: 0.
+
+    Returns:
+        list[tuple[int, int]]: Intervalos `(inicio, fin)` de frames con manos, inclusivos.
+    """
+    stride = max(1, int(stride))
+    cap = cv2.VideoCapture(video_path)
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+    hits, index = [], 0
+
+    with Holistic(model_complexity=0) as model:
+        while cap.isOpened():
+            ret, frame = cap.read()
+            if not ret:
+                break
+
+            small = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+            if there_hand(mediapipe_detection(small, model)):
+                hits.append(index)
+
+            skipped = 0
+            while skipped < stride - 1 and cap.grab():
+                skipped += 1
+            index += skipped + 1
+            if skipped < stride - 1:
+                break
+
+    cap.release()
+    return _merge_hits(hits, stride, total_frames, gap=gap)
+
+
+def capture_samples_from_video_seek(
+    video_path,
+    path,
+    min_frames=5,
+    margin_frames=1,
+    delay_frames=3,
+    debug=False,
+    stride=SEEK_STRIDE,
+    scale=SEEK_SCALE,
+):
+    """
+    Captura muestras decodificando solo los intervalos del video que contienen manos.
+
+    Primero ejecuta `find_hand_intervals` para ubicar las señas. Luego, para cada
+    intervalo, salta directamente a su inicio y decodifica solo los frames necesarios
+    para obtener alrededor de `MODEL_FRAMES` frames por muestra. Sobre esos frames corre
+    Holistic completo y descarta los que no tienen manos; si después de quitar
+    `margin_frames` frames de cada extremo quedan al menos `min_frames`, los guarda
+    como una muestra.
+
+    Como en el modo completo, una seña no se corta por `delay_frames` frames sin manos
+    o menos: esos huecos no separan intervalos.
+
+    Args:
+        video_path (str): Ruta al archivo de video a procesar.
+        path (str): Carpeta base donde guardar las muestras.
+        min_frames (int, optional): Mínimo de frames con manos para guardar una muestra. Default: 5.
+        margin_frames (int, optional): Frames con manos descartados al inicio y al fin de cada muestra. Default: 1.
+        delay_frames (int, optional): Frames sin manos tolerados dentro de una misma muestra. Default: 3.
+        debug (bool, optional): Si es True, muestra los frames procesados en una ventana OpenCV. Default: False.
+        stride (int, optional): Separación entre frames en la pasada rápida. Default: `SEEK_STRIDE`.
+        scale (float, optional): Escala de resolución en la pasada rápida. Default: `SEEK_SCALE`.
+
+    Returns:
+        int: Cantidad de muestras guardadas.
+    """
+    intervals = find_hand_intervals(
+        video_path, stride=stride, scale=scale, gap=delay_frames
+    )
+    print(f"🔎 Intervalos con manos encontrados: {intervals}")
+
+    saved, decoded, stopped = 0, 0, False
+    cap = cv2.VideoCapture(video_path)
+    with Holistic() as model:
+        for start, end in intervals:
+            if stopped:
+                break
+            step = max(1, (end - start + 1) // MODEL_FRAMES)
+            cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+
+            frames = []
+            for offset in range(end - start + 1):
+                if offset % step:
+                    if not cap.grab():
+                        break
+                    continue
+
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                decoded += 1
+                results = mediapipe_detection(frame, model)
+                if there_hand(results):
+                    frames.append(frame)
+
+                if debug:
+                    display_img = frame.copy()
+                    cv2.putText(
+                        display_img,
+                        "Capturando...",
+                        FONT_POS,
+                        FONT,
+                        FONT_SIZE,
+                        (255, 50, 0),
+                    )
+                    draw_keypoints(display_img, results)
+                    cv2.imshow(
+                        f'Procesando vídeo "{os.path.basename(video_path)}"',
+                        display_img,
+                    )
+                    if cv2.waitKey(10) & 0xFF == ord("q"):
+                        stopped = True
+                        break
+
+            if margin_frames > 0:
+                frames = frames[margin_frames:-margin_frames]
+            if len(frames) >= min_frames:
+                _write_sample(frames, path)
+                saved += 1
+
+    cap.release()
+    if debug:
+        cv2.destroyAllWindows()
+    print(f"✅ {saved} muestras guardadas ({decoded} frames procesados con Holistic completo)")
+    return saved
 
 
 def capture_samples_from_video(
-    video_path, path, margin_frames=1, min_frames=5, delay_frames=3, debug=False
+    video_path,
+    path,
+    margin_frames=1,
+    min_frames=5,
+    delay_frames=3,
+    debug=False,
+    sampling="full",
 ):
     """
     Captura muestras de lenguaje de señas a partir de un video previamente grabado.
@@ -58,6 +263,9 @@ def capture_samples_from_video(
 
     En modo `debug=True`, muestra los frames en tiempo real con anotaciones.
 
+    Con `sampling="seek"` delega en `capture_samples_from_video_seek`, que solo decodifica
+    los intervalos con manos (útil para videos largos con mucho tiempo sin señas).
+
     Args:
         video_path (str): Ruta al archivo de video a procesar.
         path (str): Carpeta base donde guardar las muestras.
@@ -65,10 +273,22 @@ def capture_samples_from_video(
         min_frames (int, optional): Mínimo de frames válidos requeridos para guardar una muestra. Default: 5.
         delay_frames (int, optional): Cantidad de frames de retardo antes de cortar una muestra. Default: 3.
         debug (bool, optional): Si es True, muestra el procesamiento en una ventana OpenCV. Default: False.
+        sampling (str, optional): `"full"` procesa todos los frames; `"seek"` solo los intervalos con manos. Default: "full".
 
     Returns:
         None: Procesa los frames y guarda las muestras en disco.
     """
+    if sampling == "seek":
+        capture_samples_from_video_seek(
+            video_path,
+            path,
+            min_frames=min_frames,
+            margin_frames=margin_frames,
+            delay_frames=delay_frames,
+            debug=debug,
+        )
+        return
+
     frames, frame_count, fix_frames = [], 0, 0
     recording = False
 
@@ -9,24 +9,28 @@ Este módulo permite:
 Es compatible tanto con ejecución en consola como desde una interfaz web Flask.
 """
 
-import os, re, shutil
+import os, re, time, shutil
 
 from ml.features.capture_samples import capture_samples_from_camera
 from ml.features.capture_samples_video import capture_samples_from_video
 from ml.features.normalize_samples import normalize_samples
 from ml.features.create_keypoints import get_keypoints
 from ml.features.visualizer import visualize_keypoints
-from ml.utils.common_utils import create_folder
+from ml.utils.common_utils import create_folder, hash_keypoints
 from ml.training.training_model import training_model
 from ml.prediction.predict_model_from_camera import predict_model_from_camera_stream
+from app.config import VIDEO_SAMPLING_MODE
+from app.services.metrics import SAMPLE_SECONDS, SAMPLES_PROCESSED
 from app.database.database_utils import (
     insert_sample,
     insert_keypoints,
     get_average_keypoints_by_word,
+    fetch_ingestion_record,
+    insert_ingestion_record,
 )
 
 
-def create_samples_from_camera(word_name, root_path, debug_value=False):
+def create_samples_from_camera(word_name, root_path, debug_value=False, stop_event=None):
     """
     Inicia la captura de muestras para una palabra desde la cámara.
 
@@ -38,6 +42,7 @@ def create_samples_from_camera(word_name, root_path, debug_value=False):
         word_name (str): Palabra que se desea grabar.
         root_path (str): Carpeta base donde se almacenarán las muestras por palabra.
         debug_value (bool): Indica si se ejecuta en consola (`True`) o en servidor Flask (`False`).
+        stop_event (threading.Event, optional): Evento de la sesión que detiene la captura. Default: None.
 
     Returns:
         Generator[bytes] | None: En modo Flask, retorna un generador de imágenes JPEG para streaming. En modo consola, no retorna nada.
@@ -45,7 +50,9 @@ def create_samples_from_camera(word_name, root_path, debug_value=False):
     word_path = os.path.join(root_path, word_name)
     create_folder(word_path)
     print(f"\n📸 Iniciando captura para la palabra: {word_name}")
-    generator = capture_samples_from_camera(path=word_path, debug=debug_value)
+    generator = capture_samples_from_camera(
+        path=word_path, debug=debug_value, stop_event=stop_event
+    )
 
     if debug_value:
         # Modo consola: consume el generador internamente
@@ -56,17 +63,31 @@ def create_samples_from_camera(word_name, root_path, debug_value=False):
         return generator
 
 
-def save_keypoints(word_name, word_id, root_path):
+def save_keypoints(word_name, word_id, root_path, video_hash=None, video_source=None):
     """
     Normaliza las muestras y extrae los keypoints para una palabra.
 
     Este pipeline ajusta la longitud de cada muestra a una cantidad fija de frames
     y luego guarda los vectores de keypoints extraídos en la base de datos.
 
+    Cada secuencia se identifica por el hash de sus keypoints: si la misma secuencia
+    ya fue registrada para la palabra en `ingestion_ledger`, se omite la inserción
+    para no duplicar filas en el set de entrenamiento.
+
+    Si las muestras vienen de un video subido (`video_hash`), el video se registra en
+    `ingestion_ledger` recién cuando al menos una muestra quedó registrada, vinculado a
+    la primera, y cada muestra guarda el nombre del video como origen. Así, un video que
+    no llegó a generar muestras se puede volver a subir.
+
+    Cada muestra se cuenta en las métricas de `/metrics` como insertada, duplicada o
+    vacía, junto con la duración de su procesamiento.
+
     Args:
         word_name (str): Nombre de la palabra (debe coincidir con la carpeta de muestras).
         word_id (str | bytes): ID único de la palabra usado para la base de datos.
         root_path (str): Ruta donde se encuentran las carpetas de muestras.
+        video_hash (bytes, optional): Hash SHA256 del video de origen. Default: None.
+        video_source (str, optional): Nombre del archivo del video de origen. Default: None.
 
     Returns:
         None: Esta función no retorna ningún valor. Inserta los datos procesados en la base de datos y elimina las carpetas temporales.
@@ -98,7 +119,9 @@ def save_keypoints(word_name, word_id, root_path):
         ]
     )
 
+    linked_samples = []
     for folder in sample_folders:
+        start = time.perf_counter()
         full_path = os.path.join(word_path, folder)
         from mediapipe.python.solutions.holistic import Holistic
 
@@ -107,18 +130,42 @@ def save_keypoints(word_name, word_id, root_path):
 
         if keypoints_sequence is None or len(keypoints_sequence) == 0:
             print(f"⚠️ No se generaron keypoints para {folder}, se omite.")
+            SAMPLES_PROCESSED.labels("empty").inc()
+            continue
+
+        content_hash = hash_keypoints(keypoints_sequence)
+        record = fetch_ingestion_record(content_hash, word_id)
+        if record:
+            print(f"♻️ Muestra {folder} ya registrada, se omite la inserción.")
+            if record[1] is not None:
+                linked_samples.append(record[1])
+            shutil.rmtree(full_path)
+            SAMPLES_PROCESSED.labels("duplicate").inc()
             continue
 
         sample_id = insert_sample(word_id)
         insert_keypoints(word_id, sample_id, keypoints_sequence)
+        insert_ingestion_record(
+            content_hash, word_id, "sample", sample_id=sample_id, source=video_source
+        )
+        linked_samples.append(sample_id)
 
         # Eliminar carpeta de muestra una vez procesada
         shutil.rmtree(full_path)
+        SAMPLES_PROCESSED.labels("inserted").inc()
+        SAMPLE_SECONDS.observe(time.perf_counter() - start)
+
+    if video_hash and linked_samples:
+        insert_ingestion_record(
+            video_hash, word_id, "video", sample_id=linked_samples[0], source=video_source
+        )
 
     print("\n✅ Proceso completado con éxito.")
 
 
-def create_samples_from_video(word_name, root_path, video_path, debug_value=False):
+def create_samples_from_video(
+    word_name, root_path, video_path, debug_value=False, sampling=VIDEO_SAMPLING_MODE
+):
     """
     Inicia la captura de muestras para una palabra a partir de un archivo de video.
 
@@ -131,6 +178,7 @@ def create_samples_from_video(word_name, root_path, video_path, debug_value=Fals
         root_path (str): Carpeta base donde se almacenarán las muestras por palabra.
         video_path (str): Ruta al archivo de video que contiene la muestra.
         debug_value (bool, optional): Si es True, se ejecuta en consola. Si es False, retorna generador. Default: False.
+        sampling (str, optional): Modo de muestreo del video (`"full"` o `"seek"`). Default: `VIDEO_SAMPLING_MODE`.
 
     Returns:
         Generator[bytes] | None:
@@ -142,7 +190,7 @@ def create_samples_from_video(word_name, root_path, video_path, debug_value=Fals
     create_folder(word_path)
     print(f"\n📸 Iniciando captura para la palabra: {word_name}")
     generator = capture_samples_from_video(
-        path=word_path, video_path=video_path, debug=debug_value
+        path=word_path, video_path=video_path, debug=debug_value, sampling=sampling
     )
 
     if debug_value:
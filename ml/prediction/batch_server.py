@@ -0,0 +1,449 @@
+"""
+Servidor de inferencia por lotes compartido por los flujos de predicción.
+
+Cada cliente de `/video_feed_prediction` clasifica sus señas con su propio predictor, de
+a una secuencia por vez: con varios usuarios simultáneos, cada inferencia paga el costo
+fijo del forward y los flujos compiten por los núcleos. Con `PREDICTION_BATCHING = True`
+los flujos envían sus secuencias a un único servidor dentro del proceso, que:
+
+- Recibe las secuencias de todos los flujos en una cola.
+- Arma micro-lotes: espera como máximo `BATCH_MAX_WAIT_MS` desde la secuencia más vieja
+  del lote, o hasta juntar `BATCH_MAX_SIZE` secuencias, lo que ocurra primero.
+- Ejecuta el lote con un forward compilado compartido, rellenando el lote hasta la
+  siguiente potencia de dos para que solo se compilen unas pocas formas de entrada
+  (todas se compilan al iniciar el servidor).
+- Devuelve a cada flujo las probabilidades de su secuencia.
+- Registra histogramas de la profundidad de la cola y del tamaño de los lotes (`stats`,
+  expuestos en `/prediction/stats`).
+
+Ningún flujo queda esperando un resultado que nunca llega: encolar y detener el servidor
+comparten un lock, por lo que toda secuencia encolada se ejecuta antes de que el hilo
+termine; si el hilo falla (por ejemplo, al compilar los tamaños de lote), los pedidos
+pendientes reciben el error; y `predict` espera como máximo `BATCH_RESULT_TIMEOUT`.
+
+Para los flujos el servidor es transparente: `make_predictor` devuelve `predict` del
+servidor, con la misma interfaz que el predictor de una secuencia. La extracción de
+keypoints (MediaPipe Holistic) sigue siendo por flujo, porque su seguimiento depende de
+los frames anteriores de cada cámara. Cuando cambia el modelo en producción se crea un
+servidor nuevo y el anterior termina los lotes pendientes antes de detenerse.
+
+Uso de la prueba de carga:
+    python -m ml.prediction.batch_server --streams 8 --requests 50
+
+Clases:
+- `BatchInferenceServer`: cola, micro-lotes y métricas de un modelo.
+
+Funciones:
+- `get_batch_server`: devuelve el servidor del proceso para un modelo.
+- `get_batch_server_stats`: métricas del servidor del proceso.
+- `stop_batch_server`: detiene el servidor del proceso.
+- `load_test`: simula N flujos y compara contra un predictor por flujo.
+"""
+
+import time, queue, argparse, threading
+import numpy as np
+import tensorflow as tf
+
+from collections import Counter
+from concurrent.futures import Future
+
+from app.config import (
+    BATCH_MAX_SIZE,
+    BATCH_MAX_WAIT_MS,
+    BATCH_RESULT_TIMEOUT,
+    LENGTH_KEYPOINTS,
+    MODEL_ARCHITECTURE,
+    MODEL_FRAMES,
+    PREDICTION_XLA,
+)
+
+_lock = threading.Lock()
+_server = {"instance": None}
+
+
+def _bucket_sizes(max_batch_size):
+    """
+    Tamaños de lote compilados: potencias de dos hasta `max_batch_size` (incluido).
+    """
+    sizes = [1]
+    while sizes[-1] < max_batch_size:
+        sizes.append(min(sizes[-1] * 2, max_batch_size))
+    return sizes
+
+
+class BatchInferenceServer:
+    """
+    Ejecuta en micro-lotes las secuencias que envían varios flujos de predicción.
+
+    Args:
+        model (keras.Model): Modelo compartido por todos los flujos.
+        max_batch_size (int, optional): Secuencias máximas por lote. Default: `BATCH_MAX_SIZE`.
+        max_wait_ms (float, optional): Espera máxima de una secuencia antes de ejecutar su
+            lote, en milisegundos. Default: `BATCH_MAX_WAIT_MS`.
+        jit_compile (bool, optional): Compilar el forward con XLA. Default: `PREDICTION_XLA`.
+    """
+
+    def __init__(
+        self,
+        model,
+        max_batch_size=BATCH_MAX_SIZE,
+        max_wait_ms=BATCH_MAX_WAIT_MS,
+        jit_compile=PREDICTION_XLA,
+    ):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.buckets = _bucket_sizes(max_batch_size)
+        self.forward = tf.function(
+            lambda sequences: model(sequences, training=False),
+            input_signature=[tf.TensorSpec((None, MODEL_FRAMES, LENGTH_KEYPOINTS), tf.float32)],
+            jit_compile=jit_compile,
+            reduce_retracing=True,
+        )
+
+        self.requests = queue.Queue()
+        self.stopped = False
+        self._submit_lock = threading.Lock()  # Encolar y detener no se intercalan
+        self.ready = threading.Event()
+        self._stats_lock = threading.Lock()
+        self.batch_sizes = Counter()
+        self.queue_depths = Counter()
+        self.total_requests = 0
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        """
+        Inicia el hilo del servidor.
+
+        Returns:
+            BatchInferenceServer: El propio servidor.
+        """
+        self.thread.start()
+        return self
+
+    def stop(self, wait=True):
+        """
+        Detiene el servidor después de ejecutar las secuencias que ya están en la cola.
+
+        Args:
+            wait (bool, optional): Esperar a que termine el hilo. Default: True.
+        """
+        with self._submit_lock:
+            if not self.stopped:
+                self.stopped = True
+                self.requests.put(None)
+        if wait and self.thread.is_alive():
+            self.thread.join()
+
+    def _run_batch(self, sequences):
+        """
+        Ejecuta un lote, rellenado hasta el siguiente tamaño compilado.
+        """
+        size = next(bucket for bucket in self.buckets if bucket >= len(sequences))
+        batch = np.zeros((size, MODEL_FRAMES, LENGTH_KEYPOINTS), dtype="float32")
+        batch[: len(sequences)] = sequences
+        return self.forward(batch).numpy()[: len(sequences)]
+
+    def _collect(self, first):
+        """
+        Junta secuencias de la cola hasta llenar el lote o agotar la espera de la primera.
+
+        Returns:
+            tuple[list, bool]: Pedidos del lote y si se recibió la señal de detenerse.
+        """
+        batch = [first]
+        deadline = first[2] + self.max_wait
+        while len(batch) < self.max_batch_size:
+            try:
+                request = self.requests.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            if request is None:
+                return batch, True
+            batch.append(request)
+        return batch, False
+
+    def _serve(self):
+        """
+        Compila los tamaños de lote y atiende la cola hasta recibir la señal de detenerse.
+        """
+        for size in self.buckets:
+            self._run_batch(np.zeros((size, MODEL_FRAMES, LENGTH_KEYPOINTS), dtype="float32"))
+        self.ready.set()
+
+        finished = False
+        while not finished:
+            first = self.requests.get()
+            if first is None:
+                break
+            depth = self.requests.qsize() + 1
+            batch, finished = self._collect(first)
+
+            try:
+                outputs = self._run_batch([sequence for sequence, _, _ in batch])
+                for (_, future, _), output in zip(batch, outputs):
+                    future.set_result(output)
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+
+            with self._stats_lock:
+                self.queue_depths[depth] += 1
+                self.batch_sizes[len(batch)] += 1
+                self.total_requests += len(batch)
+
+    def _run_now(self, sequence, future, error=None):
+        """
+        Resuelve un pedido fuera de los lotes, o con `error` si el servidor falló.
+        """
+        if error is not None:
+            future.set_exception(error)
+            return
+        try:
+            future.set_result(self._run_batch([sequence])[0])
+        except Exception as e:
+            future.set_exception(e)
+
+    def _run(self):
+        """
+        Hilo del servidor: atiende la cola y, al terminar o fallar, resuelve los pendientes.
+        """
+        error = None
+        try:
+            self._serve()
+        except Exception as e:
+            error = e
+            print(f"❌ El servidor de inferencia por lotes se detuvo por un error: {e}")
+        finally:
+            # Después de esto `submit` ya no encola, así que la cola no vuelve a crecer
+            with self._submit_lock:
+                self.stopped = True
+            self.ready.set()
+            while True:
+                try:
+                    request = self.requests.get_nowait()
+                except queue.Empty:
+                    break
+                if request is not None:
+                    self._run_now(request[0], request[1], error)
+
+    def submit(self, sequence):
+        """
+        Encola una secuencia sin esperar el resultado.
+
+        Args:
+            sequence (array-like): Secuencia `(MODEL_FRAMES, LENGTH_KEYPOINTS)`.
+
+        Returns:
+            concurrent.futures.Future: Futuro con la probabilidad de cada palabra.
+        """
+        future = Future()
+        sequence = np.asarray(sequence, dtype="float32")
+        with self._submit_lock:
+            if not self.stopped:
+                self.requests.put((sequence, future, time.monotonic()))
+                return future
+        # Un flujo que todavía tiene el predictor de un modelo reemplazado
+        self._run_now(sequence, future)
+        return future
+
+    def predict(self, sequence, timeout=BATCH_RESULT_TIMEOUT):
+        """
+        Clasifica una secuencia y espera el resultado de su lote.
+
+        Tiene la misma interfaz que `ml.prediction.inference.make_predictor`.
+
+        Args:
+            sequence (array-like): Secuencia `(MODEL_FRAMES, LENGTH_KEYPOINTS)`.
+            timeout (float, optional): Segundos máximos de espera. Default: `BATCH_RESULT_TIMEOUT`.
+
+        Returns:
+            np.ndarray: Probabilidad de cada palabra.
+
+        Raises:
+            concurrent.futures.TimeoutError: Si el resultado no llega a tiempo.
+        """
+        return self.submit(sequence).result(timeout=timeout)
+
+    def stats(self):
+        """
+        Devuelve las métricas del servidor.
+
+        Returns:
+            dict: Secuencias y lotes atendidos, tamaño medio de lote, profundidad actual
+            de la cola e histogramas `batch_size_histogram` y `queue_depth_histogram`
+            (valor → cantidad de lotes).
+        """
+        with self._stats_lock:
+            batches = sum(self.batch_sizes.values())
+            return {
+                "requests": self.total_requests,
+                "batches": batches,
+                "mean_batch_size": round(self.total_requests / batches, 2) if batches else 0.0,
+                "queue_depth": self.requests.qsize(),
+                "batch_size_histogram": dict(sorted(self.batch_sizes.items())),
+                "queue_depth_histogram": dict(sorted(self.queue_depths.items())),
+            }
+
+
+def get_batch_server(model):
+    """
+    Devuelve el servidor por lotes del proceso para un modelo.
+
+    Si el servidor en marcha es de otro modelo (por ejemplo, tras promover una versión),
+    se inicia uno nuevo y el anterior se detiene al terminar sus lotes pendientes.
+
+    Args:
+        model (keras.Model): Modelo de predicción.
+
+    Returns:
+        BatchInferenceServer: Servidor iniciado para `model`.
+    """
+    with _lock:
+        server = _server["instance"]
+        if server is None or server.model is not model:
+            if server is not None:
+                server.stop(wait=False)
+            server = BatchInferenceServer(model).start()
+            _server["instance"] = server
+        return server
+
+
+def get_batch_server_stats():
+    """
+    Devuelve las métricas del servidor por lotes del proceso.
+
+    Returns:
+        dict: `enabled` (si hay un servidor en marcha) y las métricas de `BatchInferenceServer.stats`.
+    """
+    server = _server["instance"]
+    if server is None:
+        return {"enabled": False}
+    return {"enabled": True, **server.stats()}
+
+
+def stop_batch_server():
+    """
+    Detiene el servidor por lotes del proceso, si hay uno.
+    """
+    with _lock:
+        server, _server["instance"] = _server["instance"], None
+    if server is not None:
+        server.stop()
+
+
+def _run_streams(predict_for_stream, streams, requests_per_stream, interval):
+    """
+    Ejecuta `streams` hilos que clasifican secuencias y devuelve latencias y duración.
+    """
+    latencies = [[] for _ in range(streams)]
+    sequence = np.random.rand(MODEL_FRAMES, LENGTH_KEYPOINTS).astype("float32")
+
+    def stream(index):
+        predict = predict_for_stream()
+        for _ in range(requests_per_stream):
+            start = time.perf_counter()
+            predict(sequence)
+            latencies[index].append((time.perf_counter() - start) * 1000)
+            if interval:
+                time.sleep(interval)
+
+    threads = [threading.Thread(target=stream, args=(i,)) for i in range(streams)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return np.concatenate(latencies), time.perf_counter() - start
+
+
+def load_test(
+    model=None,
+    streams=8,
+    requests_per_stream=50,
+    interval_ms=0.0,
+    num_classes=20,
+    architecture=MODEL_ARCHITECTURE,
+    max_batch_size=BATCH_MAX_SIZE,
+    max_wait_ms=BATCH_MAX_WAIT_MS,
+):
+    """
+    Simula N flujos concurrentes y compara un predictor por flujo contra el servidor por lotes.
+
+    Args:
+        model (keras.Model, optional): Modelo a usar. Default: un modelo nuevo de `architecture`.
+        streams (int, optional): Flujos simulados. Default: 8.
+        requests_per_stream (int, optional): Secuencias que clasifica cada flujo. Default: 50.
+        interval_ms (float, optional): Pausa de cada flujo entre secuencias. Default: 0.
+        num_classes (int, optional): Palabras de salida del modelo nuevo. Default: 20.
+        architecture (str, optional): Arquitectura del modelo nuevo. Default: `MODEL_ARCHITECTURE`.
+        max_batch_size (int, optional): Secuencias máximas por lote. Default: `BATCH_MAX_SIZE`.
+        max_wait_ms (float, optional): Espera máxima por lote. Default: `BATCH_MAX_WAIT_MS`.
+
+    Returns:
+        dict: Para `per_stream` y `batched`: `throughput` (secuencias/s), `p50_ms` y
+        `p99_ms`; además `stats` del servidor.
+    """
+    from ml.prediction.inference import make_predictor
+
+    if model is None:
+        from ml.training.model import get_model
+
+        model = get_model(num_classes, architecture=architecture)
+
+    make_predictor(model, batching=False)(np.zeros((MODEL_FRAMES, LENGTH_KEYPOINTS)))
+    server = BatchInferenceServer(model, max_batch_size, max_wait_ms).start()
+    server.ready.wait()
+
+    report = {}
+    for method, predict_for_stream in (
+        ("per_stream", lambda: make_predictor(model, batching=False)),
+        ("batched", lambda: server.predict),
+    ):
+        latencies, duration = _run_streams(
+            predict_for_stream, streams, requests_per_stream, interval_ms / 1000
+        )
+        report[method] = {
+            "throughput": round(len(latencies) / duration, 1),
+            "p50_ms": round(float(np.percentile(latencies, 50)), 3),
+            "p99_ms": round(float(np.percentile(latencies, 99)), 3),
+        }
+    report["stats"] = server.stats()
+    server.stop()
+
+    print(f"{streams} flujos x {requests_per_stream} secuencias")
+    print("modo | secuencias/s | p50 ms | p99 ms")
+    for method in ("per_stream", "batched"):
+        result = report[method]
+        print(f"{method} | {result['throughput']} | {result['p50_ms']} | {result['p99_ms']}")
+    print(f"Tamaño medio de lote: {report['stats']['mean_batch_size']}")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prueba de carga del servidor por lotes")
+    parser.add_argument("--streams", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--interval-ms", type=float, default=0.0)
+    parser.add_argument("--architecture", default=MODEL_ARCHITECTURE)
+    parser.add_argument("--max-batch-size", type=int, default=BATCH_MAX_SIZE)
+    parser.add_argument("--max-wait-ms", type=float, default=BATCH_MAX_WAIT_MS)
+    parser.add_argument(
+        "--production", action="store_true", help="Usar el modelo en producción del registro"
+    )
+    args = parser.parse_args()
+
+    model = None
+    if args.production:
+        from ml.prediction.model_cache import load_prediction_model
+
+        model = load_prediction_model()[0]
+    load_test(
+        model,
+        args.streams,
+        args.requests,
+        args.interval_ms,
+        architecture=args.architecture,
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+    )
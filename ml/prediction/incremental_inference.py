@@ -0,0 +1,295 @@
+"""
+Inferencia incremental de los modelos recurrentes, un paso de tiempo por vez.
+
+En el reconocimiento continuo (`ml.prediction.streaming_recognizer`) la ventana avanza
+un paso cada pocos frames, y volver a ejecutar la LSTM sobre los `MODEL_FRAMES` pasos de
+la ventana repite casi todo el cálculo de la inferencia anterior. Este módulo arma, a
+partir de los pesos del modelo entrenado (`get_model`, arquitecturas `lstm` y `gru`), un
+predictor que guarda el estado de cada capa recurrente entre frames y avanza un solo paso
+por cada vector de keypoints nuevo, por lo que el costo de cada frame es constante y no
+depende del largo de la ventana.
+
+El cálculo se hace con NumPy en float32 sobre pesos copiados del modelo: cada paso son
+unas pocas multiplicaciones de matrices chicas, sin el costo fijo de invocar un grafo de
+TensorFlow. Dropout no se aplica, como en cualquier inferencia.
+
+A diferencia de la ventana deslizante, el estado resume toda la seña desde el último
+reinicio y no solo los últimos `MODEL_FRAMES` pasos; por eso el reconocedor lo reinicia
+cuando se bajan las manos, después de emitir cada palabra y tras
+`STREAM_INCREMENTAL_MAX_WINDOWS` ventanas sin emitir, y solo vota cuando el estado
+acumuló al menos `MODEL_FRAMES` pasos, como las secuencias de entrenamiento. Se elige
+con `STREAM_INCREMENTAL = True` (solo en `PREDICTION_MODE = "sliding"`).
+
+Uso del benchmark:
+    python -m ml.prediction.incremental_inference --runs 500
+
+Clases:
+- `IncrementalPredictor`: estado recurrente de un flujo y su paso de inferencia.
+
+Funciones:
+- `supports_incremental`: indica si un modelo se puede ejecutar paso a paso.
+- `make_incremental_predictor`: crea un predictor incremental, o None si no se puede.
+- `benchmark_incremental`: compara el costo por frame contra volver a ejecutar la ventana.
+"""
+
+import argparse
+import numpy as np
+
+from app.config import LENGTH_KEYPOINTS, MODEL_ARCHITECTURE, MODEL_FRAMES
+
+RECURRENT_LAYERS = ("LSTM", "GRU")
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+ACTIVATIONS = {
+    "tanh": np.tanh,
+    "sigmoid": _sigmoid,
+    "relu": lambda x: np.maximum(x, 0.0),
+    "softmax": lambda x: np.exp(x - x.max()) / np.exp(x - x.max()).sum(),
+    "linear": lambda x: x,
+}
+
+
+def _activation(function):
+    """
+    Devuelve la versión NumPy de una activación de Keras.
+
+    Raises:
+        ValueError: Si la activación no está en `ACTIVATIONS`.
+    """
+    name = getattr(function, "__name__", str(function))
+    if name not in ACTIVATIONS:
+        raise ValueError(f"Activación sin versión incremental: {name}")
+    return ACTIVATIONS[name]
+
+
+def _float32(weights):
+    return [np.asarray(weight, dtype="float32") for weight in weights]
+
+
+def _lstm_step(layer):
+    """
+    Arma el paso de una capa LSTM de Keras (compuertas i, f, c, o).
+    """
+    kernel, recurrent_kernel, bias = _float32(layer.get_weights())
+    activation = _activation(layer.activation)
+    recurrent_activation = _activation(layer.recurrent_activation)
+    units = layer.units
+
+    def step(x, state):
+        h, c = state
+        z = x @ kernel + h @ recurrent_kernel + bias
+        i = recurrent_activation(z[:units])
+        f = recurrent_activation(z[units : 2 * units])
+        c = f * c + i * activation(z[2 * units : 3 * units])
+        h = recurrent_activation(z[3 * units :]) * activation(c)
+        return h, (h, c)
+
+    return step, lambda: (np.zeros(units, "float32"), np.zeros(units, "float32"))
+
+
+def _gru_step(layer):
+    """
+    Arma el paso de una capa GRU de Keras (compuertas z, r, h; `reset_after`).
+
+    Raises:
+        ValueError: Si la capa no usa `reset_after=True` (el valor por defecto).
+    """
+    if not layer.reset_after:
+        raise ValueError("Solo se admiten capas GRU con reset_after=True")
+    kernel, recurrent_kernel, bias = _float32(layer.get_weights())
+    input_bias, recurrent_bias = bias
+    activation = _activation(layer.activation)
+    recurrent_activation = _activation(layer.recurrent_activation)
+    units = layer.units
+
+    def step(x, h):
+        x_z, x_r, x_h = np.split(x @ kernel + input_bias, 3)
+        h_z, h_r, h_h = np.split(h @ recurrent_kernel + recurrent_bias, 3)
+        z = recurrent_activation(x_z + h_z)
+        r = recurrent_activation(x_r + h_r)
+        h = z * h + (1.0 - z) * activation(x_h + r * h_h)
+        return h, h
+
+    return step, lambda: np.zeros(units, "float32")
+
+
+def _dense(layer):
+    """
+    Arma la aplicación de una capa Dense de Keras.
+    """
+    kernel, bias = _float32(layer.get_weights())
+    activation = _activation(layer.activation)
+    return lambda x: activation(x @ kernel + bias)
+
+
+def supports_incremental(model):
+    """
+    Indica si un modelo se puede ejecutar paso a paso con `IncrementalPredictor`.
+
+    Se admiten los modelos secuenciales formados por capas LSTM/GRU, seguidas de capas
+    Dense, con Dropout en cualquier posición (arquitecturas `lstm` y `gru`).
+
+    Args:
+        model (keras.Model | bytes): Modelo de predicción.
+
+    Returns:
+        bool: True si el modelo tiene pasos recurrentes y ninguna capa no admitida.
+    """
+    layers = [
+        type(layer).__name__
+        for layer in getattr(model, "layers", [])
+        if type(layer).__name__ not in ("InputLayer", "Dropout")
+    ]
+    recurrent = [name for name in layers if name in RECURRENT_LAYERS]
+    return (
+        bool(recurrent)
+        and layers[: len(recurrent)] == recurrent
+        and all(name == "Dense" for name in layers[len(recurrent) :])
+    )
+
+
+class IncrementalPredictor:
+    """
+    Ejecuta un modelo recurrente de a un paso, guardando el estado entre llamadas.
+
+    Los pesos se copian del modelo al crearlo, por lo que un modelo recargado necesita
+    un predictor nuevo. Cada flujo de predicción crea el suyo; no se comparte entre hilos.
+
+    Args:
+        model (keras.Model): Modelo entrenado de arquitectura `lstm` o `gru`.
+
+    Raises:
+        ValueError: Si el modelo no se puede ejecutar paso a paso (`supports_incremental`).
+    """
+
+    def __init__(self, model):
+        if not supports_incremental(model):
+            raise ValueError(f"El modelo {model.name} no se puede ejecutar paso a paso")
+
+        self.recurrent, self.initial_states, self.dense = [], [], []
+        for layer in model.layers:
+            name = type(layer).__name__
+            if name == "LSTM":
+                step, initial_state = _lstm_step(layer)
+            elif name == "GRU":
+                step, initial_state = _gru_step(layer)
+            else:
+                if name == "Dense":
+                    self.dense.append(_dense(layer))
+                continue
+            self.recurrent.append(step)
+            self.initial_states.append(initial_state)
+        self.reset()
+
+    def reset(self):
+        """
+        Vuelve el estado de todas las capas recurrentes a cero.
+        """
+        self.states = [initial_state() for initial_state in self.initial_states]
+        self.steps = 0
+
+    def step(self, keypoints):
+        """
+        Avanza un paso de tiempo con un vector de keypoints nuevo.
+
+        Args:
+            keypoints (array-like): Vector de keypoints (`LENGTH_KEYPOINTS`).
+
+        Returns:
+            np.ndarray: Probabilidad de cada palabra para la secuencia vista desde el
+            último reinicio.
+        """
+        x = np.asarray(keypoints, dtype="float32")
+        for i, step in enumerate(self.recurrent):
+            x, self.states[i] = step(x, self.states[i])
+        for dense in self.dense:
+            x = dense(x)
+        self.steps += 1
+        return x
+
+
+def make_incremental_predictor(model):
+    """
+    Crea un predictor incremental para el modelo, si su arquitectura lo permite.
+
+    Args:
+        model (keras.Model | bytes): Modelo de predicción.
+
+    Returns:
+        IncrementalPredictor | None: Predictor incremental, o None si el modelo no es
+        recurrente (por ejemplo `conv1d`) o es un modelo TFLite.
+    """
+    if not supports_incremental(model):
+        print("⚠️ El modelo no admite inferencia incremental, se usa la ventana completa.")
+        return None
+    return IncrementalPredictor(model)
+
+
+def benchmark_incremental(model=None, num_classes=20, runs=200, architecture=MODEL_ARCHITECTURE):
+    """
+    Compara el costo por frame de volver a ejecutar la ventana con el forward compilado
+    (`ml.prediction.inference`) contra avanzar un paso con `IncrementalPredictor`.
+
+    Args:
+        model (keras.Model, optional): Modelo a medir. Default: un modelo nuevo de `architecture`.
+        num_classes (int, optional): Palabras de salida del modelo nuevo. Default: 20.
+        runs (int, optional): Frames medidos por método. Default: 200.
+        architecture (str, optional): Arquitectura del modelo nuevo. Default: `MODEL_ARCHITECTURE`.
+
+    Returns:
+        list[dict]: `method`, `p50_ms`, `p99_ms` y `speedup` (p50 de la ventana / p50).
+    """
+    from ml.prediction.inference import _latencies_ms, make_predictor
+
+    if model is None:
+        from ml.training.model import get_model
+
+        model = get_model(num_classes, architecture=architecture)
+
+    window = np.random.rand(MODEL_FRAMES, LENGTH_KEYPOINTS).astype("float32")
+    predict = make_predictor(model, batching=False)
+    incremental = IncrementalPredictor(model)
+
+    results = []
+    for method, function in (
+        ("ventana", lambda: predict(window)),
+        ("incremental", lambda: incremental.step(window[incremental.steps % MODEL_FRAMES])),
+    ):
+        times = _latencies_ms(function, runs)
+        results.append(
+            {
+                "method": method,
+                "p50_ms": round(float(np.percentile(times, 50)), 3),
+                "p99_ms": round(float(np.percentile(times, 99)), 3),
+            }
+        )
+
+    baseline = results[0]["p50_ms"]
+    print("método | p50 ms | p99 ms | speedup")
+    for result in results:
+        result["speedup"] = round(baseline / result["p50_ms"], 1)
+        print(
+            f"{result['method']} | {result['p50_ms']} | {result['p99_ms']} | {result['speedup']}x"
+        )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de la inferencia incremental")
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--architecture", default=MODEL_ARCHITECTURE)
+    parser.add_argument(
+        "--production", action="store_true", help="Medir el modelo en producción del registro"
+    )
+    args = parser.parse_args()
+
+    model = None
+    if args.production:
+        from ml.prediction.model_cache import load_prediction_model
+
+        model = load_prediction_model()[0]
+    benchmark_incremental(model=model, runs=args.runs, architecture=args.architecture)
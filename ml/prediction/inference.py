@@ -0,0 +1,194 @@
+"""
+Inferencia de baja latencia de una sola secuencia.
+
+`model.predict` está pensado para datasets grandes: en cada llamada arma un adaptador
+de datos, una barra de progreso y un loop de batches, lo que para una sola secuencia
+cuesta mucho más que el propio forward del modelo. En la predicción en vivo se clasifica
+una seña a la vez, así que este módulo:
+
+- Compila el forward del modelo con `tf.function` y una firma de entrada fija
+  `(1, MODEL_FRAMES, LENGTH_KEYPOINTS)` en float32, opcionalmente con XLA
+  (`PREDICTION_XLA`). La firma fija hace que se trace una sola vez.
+- Guarda la función compilada por modelo, por lo que todos los flujos que comparten el
+  modelo de la caché (`ml.prediction.model_cache`) comparten también el grafo.
+- Entrega a cada flujo un predictor con su propio buffer de entrada preasignado, en el
+  que se copia la secuencia sin crear arrays nuevos en cada seña.
+- Con `PREDICTION_BATCHING = True`, el predictor envía las secuencias al servidor por
+  lotes compartido por todos los flujos (`ml.prediction.batch_server`).
+
+Uso del benchmark:
+    python -m ml.prediction.inference --runs 500
+
+Funciones:
+- `compile_forward`: devuelve el forward compilado de un modelo.
+- `make_predictor`: crea un predictor de una secuencia con buffer propio.
+- `benchmark_inference`: compara la latencia p50/p99 contra `model.predict`.
+"""
+
+import time, weakref, argparse, threading
+import numpy as np
+import tensorflow as tf
+
+from app.config import (
+    LENGTH_KEYPOINTS,
+    MODEL_ARCHITECTURE,
+    MODEL_FRAMES,
+    PREDICTION_BATCHING,
+    PREDICTION_XLA,
+)
+
+_forward_functions = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def compile_forward(model, jit_compile=PREDICTION_XLA):
+    """
+    Devuelve el forward del modelo compilado con `tf.function` para una sola secuencia.
+
+    La función se crea una vez por modelo y configuración de XLA, y se reutiliza en las
+    llamadas siguientes. Solo guarda una referencia débil al modelo, para que un modelo
+    reemplazado por una recarga se libere junto con su grafo.
+
+    Args:
+        model (keras.Model): Modelo entrenado.
+        jit_compile (bool, optional): Compilar el forward con XLA. Default: `PREDICTION_XLA`.
+
+    Returns:
+        tf.types.experimental.PolymorphicFunction: Función que recibe un tensor
+        `(1, MODEL_FRAMES, LENGTH_KEYPOINTS)` float32 y devuelve las probabilidades.
+    """
+    with _lock:
+        functions = _forward_functions.setdefault(model, {})
+        if jit_compile not in functions:
+            model_ref = weakref.ref(model)
+            functions[jit_compile] = tf.function(
+                lambda sequence: model_ref()(sequence, training=False),
+                input_signature=[
+                    tf.TensorSpec((1, MODEL_FRAMES, LENGTH_KEYPOINTS), tf.float32)
+                ],
+                jit_compile=jit_compile,
+                reduce_retracing=True,
+            )
+        return functions[jit_compile]
+
+
+def make_predictor(model, jit_compile=PREDICTION_XLA, batching=PREDICTION_BATCHING):
+    """
+    Crea un predictor de una secuencia con un buffer de entrada propio.
+
+    Cada flujo de predicción debe crear su propio predictor, ya que el buffer no se
+    comparte entre hilos. El forward compilado sí se comparte (`compile_forward`).
+    Si `model` es un modelo TensorFlow Lite (`bytes`, con `PREDICTION_ENGINE = "tflite"`),
+    el predictor usa un intérprete propio (`ml.prediction.tflite_engine`). Con `batching`,
+    un modelo Keras se ejecuta en el servidor por lotes del proceso
+    (`ml.prediction.batch_server`).
+
+    Args:
+        model (keras.Model | bytes): Modelo entrenado o modelo TFLite.
+        jit_compile (bool, optional): Compilar el forward con XLA. Default: `PREDICTION_XLA`.
+        batching (bool, optional): Usar el servidor por lotes. Default: `PREDICTION_BATCHING`.
+
+    Returns:
+        Callable[[array-like], np.ndarray]: Función que recibe una secuencia
+        `(MODEL_FRAMES, LENGTH_KEYPOINTS)` y devuelve la probabilidad de cada palabra.
+    """
+    if isinstance(model, bytes):
+        from ml.prediction.tflite_engine import make_tflite_predictor
+
+        return make_tflite_predictor(model)
+    if batching:
+        from ml.prediction.batch_server import get_batch_server
+
+        return get_batch_server(model).predict
+
+    forward = compile_forward(model, jit_compile)
+    buffer = np.zeros((1, MODEL_FRAMES, LENGTH_KEYPOINTS), dtype="float32")
+
+    def predict(sequence):
+        buffer[0] = sequence
+        return forward(buffer)[0].numpy()
+
+    return predict
+
+
+def _latencies_ms(function, runs, warmup=10):
+    """
+    Mide la latencia de `function()` en milisegundos, descartando las primeras llamadas.
+    """
+    for _ in range(warmup):
+        function()
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def benchmark_inference(model=None, num_classes=20, runs=200, architecture=MODEL_ARCHITECTURE):
+    """
+    Compara la latencia de inferencia de una secuencia entre `model.predict`, la llamada
+    directa al modelo y el forward compilado, con y sin XLA.
+
+    Args:
+        model (keras.Model, optional): Modelo a medir. Default: un modelo nuevo de `architecture`.
+        num_classes (int, optional): Palabras de salida del modelo nuevo. Default: 20.
+        runs (int, optional): Inferencias medidas por método. Default: 200.
+        architecture (str, optional): Arquitectura del modelo nuevo. Default: `MODEL_ARCHITECTURE`.
+
+    Returns:
+        list[dict]: `method`, `p50_ms`, `p99_ms` y `speedup` (p50 de `model.predict` / p50).
+    """
+    if model is None:
+        from ml.training.model import get_model
+
+        model = get_model(num_classes, architecture=architecture)
+
+    sequence = np.random.rand(MODEL_FRAMES, LENGTH_KEYPOINTS).astype("float32")
+    batch = np.expand_dims(sequence, axis=0)
+    predict = make_predictor(model, jit_compile=False, batching=False)
+    predict_xla = make_predictor(model, jit_compile=True, batching=False)
+
+    methods = [
+        ("model.predict", lambda: model.predict(batch, verbose=0)),
+        ("model(x)", lambda: model(batch, training=False)),
+        ("tf.function", lambda: predict(sequence)),
+        ("tf.function+xla", lambda: predict_xla(sequence)),
+    ]
+
+    results = []
+    for method, function in methods:
+        times = _latencies_ms(function, runs)
+        results.append(
+            {
+                "method": method,
+                "p50_ms": round(float(np.percentile(times, 50)), 3),
+                "p99_ms": round(float(np.percentile(times, 99)), 3),
+            }
+        )
+
+    baseline = results[0]["p50_ms"]
+    print("método | p50 ms | p99 ms | speedup")
+    for result in results:
+        result["speedup"] = round(baseline / result["p50_ms"], 1)
+        print(
+            f"{result['method']} | {result['p50_ms']} | {result['p99_ms']} | {result['speedup']}x"
+        )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de inferencia de una secuencia")
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--architecture", default=MODEL_ARCHITECTURE)
+    parser.add_argument(
+        "--production", action="store_true", help="Medir el modelo en producción del registro"
+    )
+    args = parser.parse_args()
+
+    model = None
+    if args.production:
+        from ml.prediction.model_cache import load_prediction_model
+
+        model = load_prediction_model()[0]
+    benchmark_inference(model=model, runs=args.runs, architecture=args.architecture)
@@ -0,0 +1,209 @@
+"""
+Caché del modelo de predicción compartida por todo el proceso.
+
+Cargar el modelo (`load_model`) y reconstruir el diccionario índice → palabra toma
+varios segundos, y la primera inferencia de un modelo recién cargado paga además el
+trazado del grafo. Este módulo carga el modelo una sola vez por proceso y lo comparte
+entre todos los flujos de predicción (consola y cada cliente de `/video_feed_prediction`):
+
+- Al cargar un modelo se ejecuta una inferencia de calentamiento con una secuencia
+  vacía, antes de publicarlo, para que ningún flujo pague el trazado del forward
+  compilado (`ml.prediction.inference`).
+- El modelo solo se recarga si cambia la versión en producción del registro o la fecha
+  de modificación del archivo. La revisión es de archivos pequeños y se hace como
+  máximo cada `MODEL_CACHE_CHECK_SECONDS`.
+- Una sola recarga ocurre a la vez. Mientras se carga la versión nueva, los demás flujos
+  siguen usando la anterior; el reemplazo es una única asignación, por lo que nunca se
+  ve un modelo con el diccionario de otra versión.
+- `start_model_warm_up` precarga el modelo en segundo plano al iniciar Flask
+  (`MODEL_WARM_UP`).
+
+Funciones:
+- `load_prediction_model`: carga el modelo en producción y su orden de palabras.
+- `warm_up_model`: ejecuta una inferencia de calentamiento.
+- `get_prediction_model`: devuelve el modelo de la caché, recargándolo si cambió.
+- `start_model_warm_up`: precarga el modelo en un hilo en segundo plano.
+- `clear_model_cache`: vacía la caché.
+"""
+
+import os, time, threading
+import numpy as np
+
+from keras.models import load_model
+
+from app.database.database_utils import fetch_word_ids_with_keypoints, search_word_id
+from app.config import (
+    LENGTH_KEYPOINTS,
+    MODEL_CACHE_CHECK_SECONDS,
+    MODEL_FRAMES,
+    MODEL_PATH,
+    PREDICTION_ENGINE,
+    TFLITE_QUANTIZATION,
+)
+from ml.prediction.inference import make_predictor
+from ml.prediction.tflite_engine import load_tflite_model
+from ml.training.export_tflite import convert_to_tflite
+from ml.training.model_registry import load_production_manifest, model_file_path
+
+_lock = threading.Lock()
+_state = {"entry": None, "source": None, "checked_at": 0.0}
+
+
+def _build_idx_to_word(word_ids):
+    """
+    Construye el diccionario índice de salida → palabra a partir de los `word_ids` ordenados.
+
+    Args:
+        word_ids (list[bytes]): IDs de palabras en el orden de las salidas del modelo.
+
+    Returns:
+        dict[int, str]: Palabra correspondiente a cada índice de salida.
+    """
+    idx_to_word = {}
+    for i, word_id in enumerate(word_ids):
+        result = search_word_id(word_id)
+        if result:
+            _, word, _ = result
+            idx_to_word[i] = word
+    return idx_to_word
+
+
+def _model_source(manifest):
+    """
+    Identifica el modelo vigente por versión, ruta y fecha de modificación del archivo.
+    """
+    path = MODEL_PATH if manifest is None else model_file_path(manifest)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        mtime = None
+    return (manifest["version"] if manifest else None, path, mtime)
+
+
+def load_prediction_model(manifest=None):
+    """
+    Carga el modelo en producción y el orden de palabras de su manifiesto.
+
+    Si todavía no hay ninguna versión en producción en el registro, usa el modelo
+    previo en `MODEL_PATH` con el orden de palabras actual de la base de datos.
+    Con `PREDICTION_ENGINE = "tflite"` devuelve el modelo TensorFlow Lite de la versión
+    (`ml.prediction.tflite_engine`) en lugar del modelo Keras.
+
+    Args:
+        manifest (dict, optional): Manifiesto ya leído de la versión en producción;
+            si es None se lee del registro. Default: None.
+
+    Returns:
+        tuple[keras.Model | bytes, dict[int, str], str | None]: Modelo, diccionario
+        índice → palabra y versión cargada (None si se usó `MODEL_PATH`).
+    """
+    manifest = manifest or load_production_manifest()
+    if manifest is None:
+        print("⚠️ No hay un modelo en producción en el registro, se usa MODEL_PATH.")
+        word_ids = fetch_word_ids_with_keypoints()
+        model = load_model(MODEL_PATH)
+        if PREDICTION_ENGINE == "tflite":
+            model = convert_to_tflite(model, TFLITE_QUANTIZATION)
+        return model, _build_idx_to_word(word_ids), None
+
+    word_ids = [bytes.fromhex(word_id) for word_id in manifest["word_ids"]]
+    if PREDICTION_ENGINE == "tflite":
+        model = load_tflite_model(manifest)
+    else:
+        model = load_model(model_file_path(manifest))
+    print(f"🧠 Modelo {manifest['model_name']} {manifest['version']} cargado")
+    return model, _build_idx_to_word(word_ids), manifest["version"]
+
+
+def warm_up_model(model):
+    """
+    Ejecuta una inferencia con una secuencia de ceros para trazar el forward compilado.
+
+    Además de evitar que la primera seña reconocida pague el trazado (y la compilación
+    XLA), crea la función compilada antes de compartir el modelo entre hilos.
+
+    Args:
+        model (keras.Model | bytes): Modelo recién cargado.
+    """
+    start = time.perf_counter()
+    make_predictor(model)(np.zeros((MODEL_FRAMES, LENGTH_KEYPOINTS), dtype="float32"))
+    print(f"🔥 Modelo calentado en {time.perf_counter() - start:.2f} s")
+
+
+def get_prediction_model(check=True):
+    """
+    Devuelve el modelo de predicción compartido por el proceso.
+
+    La primera llamada carga y calienta el modelo. Las siguientes lo devuelven desde
+    la caché y, si pasaron `MODEL_CACHE_CHECK_SECONDS` desde la última revisión, lo
+    recargan solo si cambió la versión en producción o el archivo del modelo. Si otro
+    hilo ya está recargando, se devuelve el modelo anterior sin esperar. Si la recarga
+    falla (por ejemplo, una versión promovida dañada), se sigue usando el modelo anterior
+    y se vuelve a intentar en la próxima revisión.
+
+    Args:
+        check (bool, optional): Si es False, no revisa si el modelo cambió. Default: True.
+
+    Returns:
+        tuple[keras.Model, dict[int, str], str | None]: Modelo, diccionario índice → palabra
+        y versión cargada.
+
+    Raises:
+        Exception: Si falla la primera carga, cuando todavía no hay un modelo para usar.
+    """
+    entry = _state["entry"]
+    if entry is not None and (
+        not check or time.monotonic() - _state["checked_at"] < MODEL_CACHE_CHECK_SECONDS
+    ):
+        return entry
+
+    # Sin modelo hay que esperar la carga; con modelo, otro hilo ya lo está revisando
+    if not _lock.acquire(blocking=entry is None):
+        return entry
+    try:
+        if _state["entry"] is not None and entry is None:
+            return _state["entry"]
+
+        try:
+            manifest = load_production_manifest()
+            source = _model_source(manifest)
+            if source != _state["source"]:
+                model, idx_to_word, version = load_prediction_model(manifest)
+                warm_up_model(model)
+                _state["entry"] = (model, idx_to_word, version)
+                _state["source"] = source
+        except Exception as e:
+            if _state["entry"] is None:
+                raise
+            print(f"❌ No se pudo recargar el modelo, se sigue usando el anterior: {e}")
+        _state["checked_at"] = time.monotonic()
+        return _state["entry"]
+    finally:
+        _lock.release()
+
+
+def start_model_warm_up():
+    """
+    Precarga y calienta el modelo en un hilo en segundo plano.
+
+    Returns:
+        threading.Thread: Hilo de la precarga.
+    """
+
+    def warm_up():
+        try:
+            get_prediction_model()
+        except Exception as e:
+            print(f"⚠️ No se pudo precargar el modelo de predicción: {e}")
+
+    thread = threading.Thread(target=warm_up, daemon=True)
+    thread.start()
+    return thread
+
+
+def clear_model_cache():
+    """
+    Vacía la caché; la próxima llamada a `get_prediction_model` vuelve a cargar el modelo.
+    """
+    with _lock:
+        _state.update(entry=None, source=None, checked_at=0.0)
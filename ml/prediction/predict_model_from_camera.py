@@ -9,28 +9,47 @@ Incluye dos formas de ejecución:
 - `predict_model_from_camera`: para ejecución en consola con OpenCV.
 - `predict_model_from_camera_stream`: para streaming desde Flask.
 
-Además, se incluye una función de texto a voz (`text_to_speech`) para reproducir
-la palabra reconocida mediante audio. Se ejecuta en segundo plano con
-`text_to_speech_async` para evitar bloqueo de la interfaz web.
+Y dos modos de reconocimiento (`PREDICTION_MODE`):
+- `"segment"`: la seña se clasifica cuando las manos desaparecen, normalizando todos
+  sus frames a `MODEL_FRAMES`.
+- `"sliding"`: reconocimiento continuo con ventana deslizante y votación
+  (`ml.prediction.streaming_recognizer`), que emite cada palabra en cuanto su
+  predicción se estabiliza, sin esperar a que se bajen las manos.
+
+Cada seña se clasifica con el forward compilado del modelo (`ml.prediction.inference`)
+en lugar de `model.predict`, que es mucho más lento para una sola secuencia.
+
+El modelo se obtiene de la caché del proceso (`ml.prediction.model_cache`), que carga
+una sola vez la versión en producción del registro de modelos junto con el orden de
+palabras de su manifiesto, y la comparte entre todos los flujos. Durante la predicción
+se consulta periódicamente la caché, que recarga el modelo sin reiniciar Flask solo si
+se promovió otra versión.
+
+Cada palabra reconocida se reproduce en voz alta con el servicio de voz del proceso
+(`app.services.text_to_speech`), que solo la encola: el audio sale de una caché en disco
+y se reproduce en otro hilo, sin detener el procesamiento de frames.
+
+Con `LATENCY_TRACKING = True`, la predicción en streaming mide la latencia de cada
+etapa del frame (`ml.utils.latency_utils`), consultable en `/latency`. Además, los dos
+loops registran la duración de cada inferencia y las señas aceptadas o rechazadas en las
+métricas de `/metrics` (`app.services.metrics`).
 """
 
-import os
 import cv2
 import numpy as np
-import threading
-import tempfile
 
 from mediapipe.python.solutions.holistic import Holistic
-from keras.models import load_model
-from gtts import gTTS
-from playsound import playsound
 
-from app.database.database_utils import fetch_word_ids_with_keypoints, search_word_id
-from app.config import MODEL_PATH, MODEL_FRAMES
+from app.config import MODEL_FRAMES, MODEL_RELOAD_CHECK_FRAMES, PREDICTION_MODE
 from app.services.text_to_speech import text_to_speech
+from app.services.metrics import count_prediction, timed_predictor
 from ml.utils.keypoints_utils import mediapipe_detection, extract_keypoints
 from ml.utils.common_utils import there_hand
 from ml.utils.capture_utils import draw_keypoints
+from ml.prediction.model_cache import get_prediction_model
+from ml.prediction.inference import make_predictor
+from ml.prediction.streaming_recognizer import SlidingWindowRecognizer
+from ml.utils.latency_utils import create_tracker
 
 # ----- CONSTANTES
 FONT = cv2.FONT_HERSHEY_SIMPLEX
@@ -77,7 +96,7 @@ def normalize_keypoints(keypoints, target_length=15):
         return [keypoints[i] for i in indices]
 
 
-def predict_model_from_camera(threshold=0.5):
+def predict_model_from_camera(threshold=0.5, mode=PREDICTION_MODE):
     """
     Ejecuta el flujo de predicción desde cámara en consola.
 
@@ -87,23 +106,20 @@ def predict_model_from_camera(threshold=0.5):
 
     Args:
         threshold (float, optional): Umbral de confianza para aceptar la predicción. Default: 0.5.
+        mode (str, optional): `"segment"` (clasifica al bajar las manos) o `"sliding"`
+            (reconocimiento continuo). Default: `PREDICTION_MODE`.
 
     Returns:
         list[str]: Lista de las últimas palabras reconocidas (máximo 3).
     """
     kp_seq, sentence = [], []
 
-    word_ids = fetch_word_ids_with_keypoints()
-    idx_to_word = {}
-    for i, word_id in enumerate(word_ids):
-        result = search_word_id(word_id)
-        if result:
-            _, word, _ = result
-            idx_to_word[i] = word
-
-    model = load_model(MODEL_PATH)
+    model, idx_to_word, _ = get_prediction_model()
+    predict = timed_predictor("console", make_predictor(model))
+    recognizer = SlidingWindowRecognizer(predict, idx_to_word, threshold, model=model)
     recording = False
     cooldown_counter = 0
+    frame_count = 0
 
     with Holistic() as holistic:
         video = cv2.VideoCapture(1)
@@ -113,15 +129,34 @@ def predict_model_from_camera(threshold=0.5):
             if not ret:
                 break
 
+            # La caché recarga el modelo si se promovió otra versión
+            frame_count += 1
+            if frame_count % MODEL_RELOAD_CHECK_FRAMES == 0:
+                current, idx_to_word, _ = get_prediction_model()
+                if current is not model:
+                    model = current
+                    predict = timed_predictor("console", make_predictor(current))
+                    recognizer.set_model(predict, idx_to_word, model)
+
             results = mediapipe_detection(frame, holistic)
 
-            if there_hand(results):
+            if mode == "sliding":
+                hand_present = there_hand(results)
+                emitted = recognizer.update(
+                    extract_keypoints(results) if hand_present else None, hand_present
+                )
+                if emitted:
+                    predicted_word, conf = emitted
+                    sentence.insert(0, f"{predicted_word} ({conf * 100:.2f}%) ✔️")
+                    text_to_speech(predicted_word)
+                    count_prediction("console", mode, True)
+            elif there_hand(results):
                 kp_seq.append(extract_keypoints(results))
                 recording = True
             elif recording:
                 if len(kp_seq) >= MIN_LENGTH_FRAMES and cooldown_counter == 0:
                     normalized = normalize_keypoints(kp_seq, int(MODEL_FRAMES))
-                    res = model.predict(np.expand_dims(normalized, axis=0))[0]
+                    res = predict(normalized)
 
                     max_idx = np.argmax(res)
                     conf = res[max_idx]
@@ -132,6 +167,7 @@ def predict_model_from_camera(threshold=0.5):
                         text_to_speech(predicted_word)
                     else:
                         label = f"{predicted_word} ({conf * 100:.2f}%) ❌"
+                    count_prediction("console", mode, conf > threshold)
 
                     sentence.insert(0, label)
                     cooldown_counter = PREDICTION_COOLDOWN
@@ -162,43 +198,7 @@ def predict_model_from_camera(threshold=0.5):
         return sentence
 
 
-def text_to_speech(text):
-    """
-    Convierte un texto en audio y lo reproduce.
-
-    Utiliza gTTS para generar el archivo de voz y lo reproduce con playsound.
-
-    Args:
-        text (str): Texto a pronunciar.
-
-    Returns:
-        None
-    """
-    print(f"🔊 DICIENDO: {text}")
-    tts = gTTS(text=text, lang="es")
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as fp:
-        tts.save(fp.name)
-        playsound(fp.name)
-        os.unlink(fp.name)
-
-
-def text_to_speech_async(text):
-    """
-    Ejecuta `text_to_speech` en segundo plano.
-
-    Esto permite que la interfaz Flask no se bloquee mientras se reproduce
-    el audio.
-
-    Args:
-        text (str): Texto a pronunciar.
-
-    Returns:
-        None
-    """
-    threading.Thread(target=text_to_speech, args=(text,)).start()
-
-
-def predict_model_from_camera_stream(threshold=0.8):
+def predict_model_from_camera_stream(threshold=0.8, mode=PREDICTION_MODE, stop_event=None):
     """
     Ejecuta la predicción desde cámara en modo streaming Flask.
 
@@ -208,79 +208,113 @@ def predict_model_from_camera_stream(threshold=0.8):
 
     Args:
         threshold (float, optional): Umbral de confianza para aceptar la predicción. Default: 0.8.
+        mode (str, optional): `"segment"` (clasifica al bajar las manos) o `"sliding"`
+            (reconocimiento continuo). Default: `PREDICTION_MODE`.
+        stop_event (threading.Event, optional): Evento de la sesión que detiene la
+            predicción (`app.services.stream_sessions`). Default: None.
 
     Yields:
         bytes: Imágenes JPEG codificadas para streaming tipo multipart.
     """
     kp_seq, sentence = [], []
-    model = load_model(MODEL_PATH)
+    model, idx_to_word, _ = get_prediction_model()
+    tracker = create_tracker("prediction")
+    extract = tracker.wrap("keypoints", extract_keypoints)
+    predict = tracker.wrap("predict", timed_predictor("stream", make_predictor(model)))
+    recognizer = SlidingWindowRecognizer(predict, idx_to_word, threshold, model=model)
     cooldown_counter = 0
     recording = False
-
-    word_ids = fetch_word_ids_with_keypoints()
-    idx_to_word = {}
-    for i, word_id in enumerate(word_ids):
-        result = search_word_id(word_id)
-        if result:
-            _, word, _ = result
-            idx_to_word[i] = word
+    frame_count = 0
 
     with Holistic() as holistic:
         cap = cv2.VideoCapture(1)  # Cambiar a 0 si usás cámara interna
 
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                break
-
-            results = mediapipe_detection(frame, holistic)
-
-            if there_hand(results):
-                kp_seq.append(extract_keypoints(results))
-                recording = True
-            elif recording:
-                if len(kp_seq) >= MODEL_FRAMES and cooldown_counter == 0:
-                    normalized = kp_seq[:MODEL_FRAMES]
-                    res = model.predict(np.expand_dims(normalized, axis=0))[0]
-
-                    max_idx = np.argmax(res)
-                    conf = res[max_idx]
-                    predicted_word = idx_to_word.get(max_idx, f"Palabra {max_idx}")
-
-                    if conf > threshold:
-                        label = f"{predicted_word} ({conf*100:.2f}%) ✔️"
-                        text_to_speech_async(predicted_word)
-                    else:
-                        label = f"{predicted_word} ({conf*100:.2f}%) ❌"
-
-                    sentence.insert(0, label)
-                    cooldown_counter = PREDICTION_COOLDOWN
-
-                recording = False
-                kp_seq = []
-
-            if cooldown_counter > 0:
-                cooldown_counter -= 1
-
-            cv2.rectangle(frame, (0, 0), (640, 35), (245, 117, 16), -1)
-            cv2.putText(
-                frame,
-                " | ".join(sentence[:3]),
-                (10, 30),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                0.8,
-                (255, 255, 255),
-                2,
-            )
-
-            draw_keypoints(frame, results)
-
-            _, buffer = cv2.imencode(".jpg", frame)
-            frame = buffer.tobytes()
-
-            yield (b"--frame\r\nContent-Type: image/jpeg\r\n\r\n" + frame + b"\r\n")
-
-        cap.release()
+        try:
+            while cap.isOpened() and not (stop_event and stop_event.is_set()):
+                tracker.start_frame()
+                ret, frame = cap.read()
+                if not ret:
+                    break
+
+                # La caché recarga el modelo si se promovió otra versión
+                frame_count += 1
+                if frame_count % MODEL_RELOAD_CHECK_FRAMES == 0:
+                    current, idx_to_word, _ = get_prediction_model()
+                    if current is not model:
+                        model = current
+                        predict = tracker.wrap(
+                            "predict", timed_predictor("stream", make_predictor(current))
+                        )
+                        recognizer.set_model(predict, idx_to_word, model)
+                tracker.lap("read")
+
+                results = mediapipe_detection(frame, holistic)
+                tracker.lap("mediapipe")
+
+                if mode == "sliding":
+                    hand_present = there_hand(results)
+                    emitted = recognizer.update(
+                        extract(results) if hand_present else None, hand_present
+                    )
+                    if emitted:
+                        predicted_word, conf = emitted
+                        sentence.insert(0, f"{predicted_word} ({conf * 100:.2f}%) ✔️")
+                        text_to_speech(predicted_word)
+                        tracker.since_frame_start("sign_to_speech")
+                        count_prediction("stream", mode, True)
+                elif there_hand(results):
+                    kp_seq.append(extract(results))
+                    recording = True
+                elif recording:
+                    if len(kp_seq) >= MIN_LENGTH_FRAMES and cooldown_counter == 0:
+                        normalized = normalize_keypoints(kp_seq, int(MODEL_FRAMES))
+                        res = predict(normalized)
+
+                        max_idx = np.argmax(res)
+                        conf = res[max_idx]
+                        predicted_word = idx_to_word.get(max_idx, f"Palabra {max_idx}")
+
+                        if conf > threshold:
+                            label = f"{predicted_word} ({conf*100:.2f}%) ✔️"
+                            text_to_speech(predicted_word)
+                            tracker.since_frame_start("sign_to_speech")
+                        else:
+                            label = f"{predicted_word} ({conf*100:.2f}%) ❌"
+                        count_prediction("stream", mode, conf > threshold)
+
+                        sentence.insert(0, label)
+                        cooldown_counter = PREDICTION_COOLDOWN
+
+                    recording = False
+                    kp_seq = []
+
+                if cooldown_counter > 0:
+                    cooldown_counter -= 1
+                tracker.lap("recognition")
+
+                cv2.rectangle(frame, (0, 0), (640, 35), (245, 117, 16), -1)
+                cv2.putText(
+                    frame,
+                    " | ".join(sentence[:3]),
+                    (10, 30),
+                    cv2.FONT_HERSHEY_SIMPLEX,
+                    0.8,
+                    (255, 255, 255),
+                    2,
+                )
+
+                draw_keypoints(frame, results)
+                tracker.draw_overlay(frame)
+                tracker.lap("draw")
+
+                _, buffer = cv2.imencode(".jpg", frame)
+                frame = buffer.tobytes()
+                tracker.lap("encode")
+                tracker.end_frame()
+
+                yield (b"--frame\r\nContent-Type: image/jpeg\r\n\r\n" + frame + b"\r\n")
+        finally:
+            cap.release()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,209 @@
+"""
+Reconocimiento continuo con ventana deslizante.
+
+El modo por segmentos de `predict_model_from_camera` clasifica una seña solo cuando
+las manos desaparecen, por lo que no reconoce señas encadenadas sin bajar las manos y
+su latencia es la duración completa de la seña. Este módulo reconoce de forma continua:
+
+1. Cada `STREAM_FRAME_STEP` frames de cámara con manos se guarda un vector de keypoints
+   en una ventana circular preasignada de `MODEL_FRAMES` pasos (la ventana cubre
+   `MODEL_FRAMES * STREAM_FRAME_STEP` frames de cámara).
+2. Con la ventana llena, se clasifica cada `STREAM_INFERENCE_EVERY` pasos.
+3. Las últimas `STREAM_VOTES` salidas se suavizan (promedio de probabilidades) y votan:
+   una palabra se emite en cuanto obtiene al menos `STREAM_MIN_VOTES` votos y su
+   probabilidad promedio supera el umbral, sin esperar a que terminen las señas.
+4. Una palabra no se repite mientras se sigue señando; tras `STREAM_IDLE_FRAMES` frames
+   sin manos el reconocedor se reinicia y la misma palabra se puede volver a emitir.
+
+Se elige con `PREDICTION_MODE = "sliding"`. Con `STREAM_INCREMENTAL = True` y un modelo
+recurrente, en lugar de volver a ejecutar la ventana completa se avanza el estado de la
+LSTM/GRU un paso por vez (`ml.prediction.incremental_inference`); ese estado se reinicia
+al emitir cada palabra y tras `STREAM_INCREMENTAL_MAX_WINDOWS` ventanas sin emitir.
+
+Clases:
+- `SlidingWindowRecognizer`: reconocedor de un flujo de keypoints.
+"""
+
+import numpy as np
+
+from collections import deque
+
+from app.config import (
+    LENGTH_KEYPOINTS,
+    MODEL_FRAMES,
+    STREAM_FRAME_STEP,
+    STREAM_IDLE_FRAMES,
+    STREAM_INCREMENTAL,
+    STREAM_INCREMENTAL_MAX_WINDOWS,
+    STREAM_INFERENCE_EVERY,
+    STREAM_MIN_VOTES,
+    STREAM_VOTES,
+)
+from ml.prediction.incremental_inference import make_incremental_predictor
+
+
+class SlidingWindowRecognizer:
+    """
+    Reconoce palabras de un flujo de keypoints con una ventana deslizante y votación.
+
+    Cada flujo de predicción crea su propio reconocedor; no se comparte entre hilos.
+
+    Args:
+        predict (Callable): Predictor de una secuencia `(MODEL_FRAMES, LENGTH_KEYPOINTS)`
+            (`ml.prediction.inference.make_predictor`).
+        idx_to_word (dict[int, str]): Palabra de cada índice de salida del modelo.
+        threshold (float): Probabilidad promedio mínima para emitir una palabra.
+        frame_step (int, optional): Frames de cámara por paso de la ventana. Default: `STREAM_FRAME_STEP`.
+        inference_every (int, optional): Pasos entre inferencias. Default: `STREAM_INFERENCE_EVERY`.
+        votes (int, optional): Salidas consideradas en la votación. Default: `STREAM_VOTES`.
+        min_votes (int, optional): Votos mínimos para emitir. Default: `STREAM_MIN_VOTES`.
+        idle_frames (int, optional): Frames sin manos antes de reiniciar. Default: `STREAM_IDLE_FRAMES`.
+        model (keras.Model | bytes, optional): Modelo de `predict`, necesario para la
+            inferencia incremental. Default: None.
+        incremental (bool, optional): Avanzar el estado del modelo un paso por vez en lugar
+            de ejecutar la ventana completa, si el modelo es recurrente. Default: `STREAM_INCREMENTAL`.
+        max_windows (int, optional): Ventanas de `MODEL_FRAMES` pasos sin emitir tras las
+            que se reinicia el estado incremental. Default: `STREAM_INCREMENTAL_MAX_WINDOWS`.
+    """
+
+    def __init__(
+        self,
+        predict,
+        idx_to_word,
+        threshold,
+        frame_step=STREAM_FRAME_STEP,
+        inference_every=STREAM_INFERENCE_EVERY,
+        votes=STREAM_VOTES,
+        min_votes=STREAM_MIN_VOTES,
+        idle_frames=STREAM_IDLE_FRAMES,
+        model=None,
+        incremental=STREAM_INCREMENTAL,
+        max_windows=STREAM_INCREMENTAL_MAX_WINDOWS,
+    ):
+        self.predict = predict
+        self.idx_to_word = idx_to_word
+        self.threshold = threshold
+        self.frame_step = frame_step
+        self.inference_every = inference_every
+        self.min_votes = min_votes
+        self.idle_frames = idle_frames
+        self.incremental = incremental
+        self.max_steps = max_windows * MODEL_FRAMES
+        self.stepper = self._make_stepper(model)
+
+        self.window = np.zeros((MODEL_FRAMES, LENGTH_KEYPOINTS), dtype="float32")
+        self.history = deque(maxlen=votes)
+        self.reset()
+
+    def reset(self):
+        """
+        Vacía la ventana y la votación, y permite volver a emitir la última palabra.
+        """
+        self.position = 0  # Próxima fila de la ventana circular
+        self.steps = 0  # Pasos guardados desde el último reinicio
+        self.hand_frames = 0
+        self.idle = 0
+        self.last_word = None
+        self.history.clear()
+        if self.stepper is not None:
+            self.stepper.reset()
+
+    def _make_stepper(self, model):
+        """
+        Crea el predictor incremental del modelo, si está habilitado y el modelo lo admite.
+        """
+        if not self.incremental or model is None:
+            return None
+        return make_incremental_predictor(model)
+
+    def set_model(self, predict, idx_to_word, model=None):
+        """
+        Reemplaza el predictor (por ejemplo, tras recargar el modelo) y reinicia el estado.
+        """
+        self.predict = predict
+        self.idx_to_word = idx_to_word
+        self.stepper = self._make_stepper(model)
+        self.reset()
+
+    def _ordered_window(self):
+        """
+        Devuelve la ventana en orden temporal (del paso más viejo al más nuevo).
+        """
+        if self.position == 0:
+            return self.window
+        return np.concatenate((self.window[self.position :], self.window[: self.position]))
+
+    def _vote(self, probabilities):
+        """
+        Agrega una salida a la votación y devuelve la palabra a emitir, si se estabilizó.
+        """
+        self.history.append(probabilities)
+        smoothed = np.mean(self.history, axis=0)
+        best = int(np.argmax(smoothed))
+        votes = sum(int(np.argmax(output)) == best for output in self.history)
+
+        if votes < self.min_votes or smoothed[best] < self.threshold:
+            return None
+        word = self.idx_to_word.get(best, f"Palabra {best}")
+        if word == self.last_word:
+            return None
+
+        self.last_word = word
+        self.history.clear()
+        return word, float(smoothed[best])
+
+    def update(self, keypoints, hand_present=True):
+        """
+        Procesa un frame de cámara.
+
+        Args:
+            keypoints (array-like): Vector de keypoints del frame (`LENGTH_KEYPOINTS`).
+            hand_present (bool, optional): Si hay manos en el frame. Default: True.
+
+        Returns:
+            tuple[str, float] | None: Palabra emitida y su probabilidad promedio, o None.
+        """
+        if not hand_present:
+            self.idle += 1
+            # `hand_frames` y no `steps`, que vuelve a cero al emitir en modo incremental
+            if self.idle >= self.idle_frames and self.hand_frames:
+                self.reset()
+            return None
+
+        self.idle = 0
+        self.hand_frames += 1
+        if (self.hand_frames - 1) % self.frame_step:
+            return None
+
+        if self.stepper is not None:
+            return self._update_incremental(keypoints)
+
+        self.window[self.position] = keypoints
+        self.position = (self.position + 1) % MODEL_FRAMES
+        self.steps += 1
+
+        if self.steps < MODEL_FRAMES or (self.steps - MODEL_FRAMES) % self.inference_every:
+            return None
+        return self._vote(self.predict(self._ordered_window()))
+
+    def _update_incremental(self, keypoints):
+        """
+        Avanza el estado del modelo un paso y vota con la misma cadencia que la ventana.
+
+        Después de emitir una palabra el estado vuelve a cero, para que la seña siguiente
+        se clasifique desde el principio como las secuencias de entrenamiento. Si pasan
+        `max_windows` ventanas sin emitir, el estado también se reinicia: el modelo se
+        entrenó con secuencias de `MODEL_FRAMES` pasos y un estado que resume una seña
+        mucho más larga deja de parecerse a ellas.
+        """
+        probabilities = self.stepper.step(keypoints)
+        self.steps += 1
+
+        if self.steps < MODEL_FRAMES or (self.steps - MODEL_FRAMES) % self.inference_every:
+            return None
+        emitted = self._vote(probabilities)
+        if emitted or self.steps >= self.max_steps:
+            self.stepper.reset()
+            self.steps = 0
+            self.history.clear()
+        return emitted
@@ -0,0 +1,110 @@
+"""
+Motor de inferencia TensorFlow Lite para la predicción en vivo.
+
+Alternativa al forward compilado de Keras (`ml.prediction.inference`) para los equipos
+de solo CPU: el modelo convertido (`ml.training.export_tflite`) se ejecuta con el
+intérprete de TensorFlow Lite, que usa menos memoria y, con cuantización, menos latencia.
+Se elige con `PREDICTION_ENGINE = "tflite"`.
+
+Si está instalado `tflite_runtime`, el intérprete se toma de ahí y no hace falta
+TensorFlow completo para ejecutar el modelo; si no, se usa `tf.lite.Interpreter`.
+
+Un intérprete no se puede usar desde varios hilos a la vez, por lo que cada predictor
+crea el suyo a partir del mismo modelo en memoria (crear un intérprete cuesta pocos
+milisegundos y sus buffers se reservan una sola vez).
+
+Funciones:
+- `load_tflite_model`: devuelve el modelo TFLite de una versión del registro.
+- `create_interpreter`: crea un intérprete listo para inferir.
+- `make_tflite_predictor`: crea un predictor de una secuencia con su propio intérprete.
+"""
+
+import numpy as np
+
+try:
+    from tflite_runtime.interpreter import Interpreter
+except ImportError:
+    import tensorflow as tf
+
+    Interpreter = tf.lite.Interpreter
+
+from app.config import MODEL_REGISTRY_PATH, TFLITE_QUANTIZATION, TFLITE_THREADS
+from ml.training.model_registry import artifact_file_path
+
+TFLITE_ARTIFACT = "tflite"
+
+
+def load_tflite_model(
+    manifest, quantization=TFLITE_QUANTIZATION, registry_path=MODEL_REGISTRY_PATH
+):
+    """
+    Devuelve el modelo TFLite de una versión del registro.
+
+    Si la versión todavía no tiene un modelo TFLite con la cuantización pedida, lo
+    convierte desde el modelo Keras y lo guarda en el registro (`export_tflite`).
+
+    Args:
+        manifest (dict): Manifiesto de la versión.
+        quantization (str | None, optional): `None`, `"dynamic"` o `"float16"`. Default: `TFLITE_QUANTIZATION`.
+        registry_path (str, optional): Carpeta del registro. Default: `MODEL_REGISTRY_PATH`.
+
+    Returns:
+        bytes: Modelo TFLite.
+    """
+    artifact = manifest.get("artifacts", {}).get(TFLITE_ARTIFACT)
+    if artifact is None or artifact.get("quantization") != quantization:
+        from ml.training.export_tflite import export_tflite
+
+        manifest = export_tflite(
+            manifest["version"],
+            quantization=quantization,
+            model_name=manifest["model_name"],
+            registry_path=registry_path,
+        )
+
+    with open(artifact_file_path(manifest, TFLITE_ARTIFACT, registry_path), "rb") as file:
+        return file.read()
+
+
+def create_interpreter(model_content, num_threads=TFLITE_THREADS):
+    """
+    Crea un intérprete TFLite y reserva sus tensores.
+
+    Args:
+        model_content (bytes): Modelo TFLite.
+        num_threads (int, optional): Hilos del intérprete. Default: `TFLITE_THREADS`.
+
+    Returns:
+        Interpreter: Intérprete listo para `invoke()`.
+    """
+    interpreter = Interpreter(model_content=model_content, num_threads=num_threads)
+    interpreter.allocate_tensors()
+    return interpreter
+
+
+def make_tflite_predictor(model_content, num_threads=TFLITE_THREADS):
+    """
+    Crea un predictor de una secuencia con un intérprete propio.
+
+    Tiene la misma interfaz que `ml.prediction.inference.make_predictor`.
+
+    Args:
+        model_content (bytes): Modelo TFLite.
+        num_threads (int, optional): Hilos del intérprete. Default: `TFLITE_THREADS`.
+
+    Returns:
+        Callable[[array-like], np.ndarray]: Función que recibe una secuencia
+        `(MODEL_FRAMES, LENGTH_KEYPOINTS)` y devuelve la probabilidad de cada palabra.
+    """
+    interpreter = create_interpreter(model_content, num_threads)
+    input_index = interpreter.get_input_details()[0]["index"]
+    output_index = interpreter.get_output_details()[0]["index"]
+    buffer = np.zeros(interpreter.get_input_details()[0]["shape"], dtype="float32")
+
+    def predict(sequence):
+        buffer[0] = sequence
+        interpreter.set_tensor(input_index, buffer)
+        interpreter.invoke()
+        return interpreter.get_tensor(output_index)[0]
+
+    return predict
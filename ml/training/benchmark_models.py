@@ -0,0 +1,156 @@
+"""
+Benchmark de las arquitecturas de modelo disponibles (`MODEL_BUILDERS`).
+
+Compara, para cada arquitectura, el costo de entrenamiento y de inferencia en CPU:
+- Cantidad de parámetros.
+- Segundos por época de entrenamiento (mediana, sin contar la primera época, que incluye
+  la compilación del grafo).
+- Latencia de inferencia de una sola muestra (p50 y p95 en milisegundos), que es el caso
+  de la predicción en vivo desde la cámara.
+
+Los tiempos se miden con datos aleatorios de la forma `(MODEL_FRAMES, LENGTH_KEYPOINTS)`,
+ya que no dependen de los valores. Con `cross_validate=True` se agrega además la accuracy
+de cada arquitectura sobre el dataset real (`ml.training.cross_validation`), para elegir el
+mejor equilibrio entre accuracy y latencia.
+
+Uso:
+    python -m ml.training.benchmark_models --architectures lstm gru conv1d --threads 2
+
+Funciones:
+- `benchmark_architecture`: mide una arquitectura.
+- `benchmark_models`: mide varias arquitecturas y muestra una tabla comparativa.
+"""
+
+import json, time, argparse
+import numpy as np
+
+from ml.training.callbacks import ThroughputLogger
+from ml.training.model import MODEL_BUILDERS, get_model
+from ml.utils.training_utils import limit_cpu_threads
+from app.config import LENGTH_KEYPOINTS, MODEL_FRAMES, TRAINING_BATCH_SIZE
+
+
+def _latency_ms(model, runs, warmup=10):
+    """
+    Mide la latencia de inferencia de una sola muestra llamando al modelo directamente.
+    """
+    sample = np.random.rand(1, MODEL_FRAMES, LENGTH_KEYPOINTS).astype("float32")
+    for _ in range(warmup):
+        model(sample, training=False)
+
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        model(sample, training=False)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def benchmark_architecture(
+    architecture,
+    num_classes=20,
+    samples=256,
+    epochs=3,
+    batch_size=TRAINING_BATCH_SIZE,
+    latency_runs=200,
+    hyperparams=None,
+):
+    """
+    Mide el tamaño, el tiempo de entrenamiento y la latencia de inferencia de una arquitectura.
+
+    Args:
+        architecture (str): Clave de `MODEL_BUILDERS`.
+        num_classes (int, optional): Cantidad de palabras de salida. Default: 20.
+        samples (int, optional): Muestras aleatorias de entrenamiento. Default: 256.
+        epochs (int, optional): Épocas medidas (se entrena una más de calentamiento). Default: 3.
+        batch_size (int, optional): Tamaño de batch. Default: `TRAINING_BATCH_SIZE`.
+        latency_runs (int, optional): Inferencias de una muestra medidas. Default: 200.
+        hyperparams (dict, optional): Hiperparámetros de la arquitectura. Default: None.
+
+    Returns:
+        dict: `architecture`, `params`, `epoch_sec`, `samples_per_sec`, `latency_p50_ms`, `latency_p95_ms`.
+    """
+    model = get_model(num_classes, architecture=architecture, **(hyperparams or {}))
+
+    X = np.random.rand(samples, MODEL_FRAMES, LENGTH_KEYPOINTS).astype("float32")
+    y = np.eye(num_classes, dtype="float32")[np.random.randint(num_classes, size=samples)]
+    history = model.fit(
+        X,
+        y,
+        batch_size=batch_size,
+        epochs=epochs + 1,
+        verbose=0,
+        callbacks=[ThroughputLogger(samples)],
+    )
+    samples_per_sec = float(np.median(history.history["samples_per_sec"][1:]))
+    latencies = _latency_ms(model, latency_runs)
+
+    return {
+        "architecture": architecture,
+        "params": int(model.count_params()),
+        "epoch_sec": round(samples / samples_per_sec, 3),
+        "samples_per_sec": round(samples_per_sec, 1),
+        "latency_p50_ms": round(float(np.percentile(latencies, 50)), 3),
+        "latency_p95_ms": round(float(np.percentile(latencies, 95)), 3),
+    }
+
+
+def benchmark_models(architectures=None, cross_validate=False, **options):
+    """
+    Mide varias arquitecturas y muestra una tabla comparativa.
+
+    Args:
+        architectures (list[str], optional): Arquitecturas a medir. Default: todas las de `MODEL_BUILDERS`.
+        cross_validate (bool, optional): Si es True, agrega la accuracy de validación cruzada
+            de cada arquitectura sobre el dataset real. Default: False.
+        **options: Argumentos para `benchmark_architecture`.
+
+    Returns:
+        list[dict]: Resultado de cada arquitectura.
+    """
+    results = []
+    for architecture in architectures or list(MODEL_BUILDERS):
+        print(f"⏱️ Midiendo arquitectura {architecture}")
+        result = benchmark_architecture(architecture, **options)
+
+        if cross_validate:
+            from ml.training.cross_validation import cross_validate as run_cv
+
+            report = run_cv(params={"architecture": architecture})
+            result["accuracy_mean"] = report.get("accuracy_mean")
+            result["accuracy_std"] = report.get("accuracy_std")
+        results.append(result)
+
+    columns = list(results[0]) if results else []
+    print(" | ".join(columns))
+    for result in results:
+        print(" | ".join(str(result[column]) for column in columns))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de las arquitecturas de modelo")
+    parser.add_argument("--architectures", nargs="+", choices=list(MODEL_BUILDERS))
+    parser.add_argument("--num-classes", type=int, default=20)
+    parser.add_argument("--samples", type=int, default=256)
+    parser.add_argument("--epochs", type=int, default=3)
+    parser.add_argument("--latency-runs", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=None, help="Hilos de cómputo (default: todos)")
+    parser.add_argument("--cross-validate", action="store_true")
+    parser.add_argument("--output", default=None, help="Archivo JSON con los resultados")
+    args = parser.parse_args()
+
+    if args.threads:
+        limit_cpu_threads(args.threads)
+
+    results = benchmark_models(
+        architectures=args.architectures,
+        cross_validate=args.cross_validate,
+        num_classes=args.num_classes,
+        samples=args.samples,
+        epochs=args.epochs,
+        latency_runs=args.latency_runs,
+    )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
@@ -0,0 +1,126 @@
+"""
+Callbacks de Keras para el entrenamiento del modelo.
+
+Funciones y clases:
+- `ThroughputLogger`: mide y registra las muestras por segundo de cada época.
+- `ProgressReporter`: envía las métricas de cada época a una función externa.
+- `CancelOnEvent`: interrumpe el entrenamiento cuando se activa un evento de cancelación.
+- `TrainingCancelled`: excepción lanzada al cancelar un entrenamiento.
+- `MedianPruner`: detiene un entrenamiento que va peor que la mediana de entrenamientos previos.
+"""
+
+import time
+
+from keras.callbacks import Callback
+
+
+class ThroughputLogger(Callback):
+    """
+    Registra el rendimiento del entrenamiento (muestras por segundo) en cada época.
+
+    Solo se mide el tiempo de los batches de entrenamiento (incluida la espera de datos
+    del pipeline), no la validación ni los callbacks de fin de época. El valor se agrega
+    a los `logs` de la época como `samples_per_sec`, por lo que queda disponible en
+    `history.history` y para los callbacks siguientes.
+
+    Args:
+        num_samples (int): Cantidad de muestras de entrenamiento por época.
+    """
+
+    def __init__(self, num_samples):
+        super().__init__()
+        self.num_samples = num_samples
+        self.samples_per_sec = []
+        self._elapsed = 0.0
+        self._batch_start = None
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._elapsed = 0.0
+
+    def on_train_batch_begin(self, batch, logs=None):
+        self._batch_start = time.perf_counter()
+
+    def on_train_batch_end(self, batch, logs=None):
+        self._elapsed += time.perf_counter() - self._batch_start
+
+    def on_epoch_end(self, epoch, logs=None):
+        elapsed = self._elapsed
+        rate = self.num_samples / elapsed if elapsed > 0 else 0.0
+        self.samples_per_sec.append(rate)
+        if logs is not None:
+            logs["samples_per_sec"] = rate
+        print(f"⏱️ Época {epoch + 1}: {rate:.1f} muestras/s ({elapsed:.2f}s)")
+
+
+class TrainingCancelled(Exception):
+    """
+    Se lanza cuando un entrenamiento se cancela antes de terminar.
+    """
+
+
+class ProgressReporter(Callback):
+    """
+    Envía las métricas de cada época a una función externa.
+
+    Se usa para publicar el progreso de un entrenamiento que corre en otro proceso.
+
+    Args:
+        report (callable): Función `report(epoch, metrics)` llamada al final de cada época,
+            con `epoch` desde 1 y `metrics` como diccionario de floats.
+    """
+
+    def __init__(self, report):
+        super().__init__()
+        self.report = report
+
+    def on_epoch_end(self, epoch, logs=None):
+        metrics = {key: float(value) for key, value in (logs or {}).items()}
+        self.report(epoch + 1, metrics)
+
+
+class CancelOnEvent(Callback):
+    """
+    Interrumpe el entrenamiento cuando se activa un evento de cancelación.
+
+    El evento se revisa al final de cada batch, por lo que la cancelación es casi
+    inmediata. Lanza `TrainingCancelled` para que el modelo no se guarde.
+
+    Args:
+        event (threading.Event | multiprocessing.Event): Evento de cancelación.
+    """
+
+    def __init__(self, event):
+        super().__init__()
+        self.event = event
+
+    def on_train_batch_end(self, batch, logs=None):
+        if self.event.is_set():
+            raise TrainingCancelled("Entrenamiento cancelado")
+
+
+class MedianPruner(Callback):
+    """
+    Detiene un entrenamiento cuyo `val_loss` es peor que la mediana de entrenamientos previos.
+
+    Se usa en la búsqueda de hiperparámetros para descartar temprano las configuraciones
+    que no prometen. Solo se evalúa a partir de `warmup` épocas.
+
+    Args:
+        median_curve (list[float]): Mediana de `val_loss` por época de los entrenamientos previos.
+        warmup (int, optional): Épocas antes de empezar a podar. Default: 5.
+    """
+
+    def __init__(self, median_curve, warmup=5):
+        super().__init__()
+        self.median_curve = median_curve
+        self.warmup = warmup
+        self.pruned = False
+
+    def on_epoch_end(self, epoch, logs=None):
+        val_loss = (logs or {}).get("val_loss")
+        if val_loss is None or epoch + 1 < self.warmup or epoch >= len(self.median_curve):
+            return
+        if val_loss > self.median_curve[epoch]:
+            print(f"✂️ Entrenamiento podado en la época {epoch + 1}")
+            self.pruned = True
+            self.model.stop_training = True
@@ -0,0 +1,232 @@
+"""
+Checkpoints y parada temprana del entrenamiento.
+
+Un entrenamiento guarda sus checkpoints en `CHECKPOINT_PATH/<modelo>/`:
+- `best.keras`: el modelo con menor `val_loss` hasta el momento.
+- `last.keras`: checkpoint periódico (cada `CHECKPOINT_EVERY` épocas), que incluye el
+  estado del optimizador para poder continuar el entrenamiento.
+- `state.json`: época del último checkpoint, mejor `val_loss`, épocas sin mejora y la
+  huella del snapshot del dataset con el que se entrenó.
+
+`TrainingController` guarda estos archivos y detiene el entrenamiento cuando `val_loss`
+no mejora durante `EARLY_STOPPING_PATIENCE` épocas. Si el proceso se interrumpe, el
+entrenamiento puede continuar desde `last.keras` siempre que el dataset no haya cambiado.
+
+Funciones y clases:
+- `checkpoint_dir`: devuelve la carpeta de checkpoints de un modelo.
+- `read_checkpoint_state`: lee el estado guardado de un entrenamiento.
+- `load_resume_checkpoint`: carga el último checkpoint si se puede continuar con él.
+- `clear_checkpoints`: elimina los checkpoints de un modelo.
+- `TrainingController`: callback de checkpoints y parada temprana.
+"""
+
+import os, json, shutil
+
+from datetime import datetime
+from keras.callbacks import Callback
+from keras.models import load_model
+
+from app.config import (
+    CHECKPOINT_EVERY,
+    CHECKPOINT_PATH,
+    EARLY_STOPPING_MIN_DELTA,
+    EARLY_STOPPING_PATIENCE,
+    MODEL_NAME,
+)
+
+STATE_FILE = "state.json"
+BEST_FILE = "best.keras"
+LAST_FILE = "last.keras"
+
+
+def checkpoint_dir(model_name=MODEL_NAME):
+    """
+    Devuelve la carpeta de checkpoints de un modelo.
+
+    Args:
+        model_name (str, optional): Nombre del modelo. Default: `MODEL_NAME`.
+
+    Returns:
+        str: Ruta `CHECKPOINT_PATH/<modelo>`.
+    """
+    return os.path.join(CHECKPOINT_PATH, model_name)
+
+
+def read_checkpoint_state(path):
+    """
+    Lee el estado guardado de un entrenamiento.
+
+    Args:
+        path (str): Carpeta de checkpoints.
+
+    Returns:
+        dict | None: Estado del entrenamiento, o None si no existe.
+    """
+    state_path = os.path.join(path, STATE_FILE)
+    if not os.path.exists(state_path):
+        return None
+    with open(state_path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _write_state(path, state):
+    """
+    Escribe `state.json` de forma atómica.
+    """
+    state_path = os.path.join(path, STATE_FILE)
+    tmp_path = f"{state_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(state, file, indent=2)
+    os.replace(tmp_path, state_path)
+
+
+def _save_model_atomic(model, path):
+    """
+    Guarda un modelo en un archivo temporal y lo renombra, para no dejar checkpoints a medias.
+    """
+    tmp_path = path.replace(".keras", ".tmp.keras")
+    model.save(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def clear_checkpoints(path):
+    """
+    Elimina los checkpoints de un entrenamiento anterior.
+
+    Args:
+        path (str): Carpeta de checkpoints.
+    """
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+
+
+def load_resume_checkpoint(path, fingerprint):
+    """
+    Carga el último checkpoint para continuar un entrenamiento interrumpido.
+
+    Solo se continúa si el entrenamiento no había terminado y se hizo con el mismo
+    snapshot del dataset (misma huella), ya que de lo contrario las etiquetas o la
+    cantidad de clases podrían no coincidir.
+
+    Args:
+        path (str): Carpeta de checkpoints.
+        fingerprint (str): Huella del snapshot del dataset actual.
+
+    Returns:
+        tuple[keras.Model, dict] | None: Modelo (con el estado del optimizador) y estado
+        guardado, o None si no se puede continuar.
+    """
+    state = read_checkpoint_state(path)
+    last_path = os.path.join(path, LAST_FILE)
+
+    if state is None or not os.path.exists(last_path):
+        print("⚠️ No hay checkpoints para continuar, se entrenará desde cero.")
+        return None
+    if state.get("completed"):
+        print("⚠️ El último entrenamiento ya había terminado, se entrenará desde cero.")
+        return None
+    if state.get("fingerprint") != fingerprint:
+        print("⚠️ El dataset cambió desde el último checkpoint, se entrenará desde cero.")
+        return None
+
+    print(f"♻️ Continuando entrenamiento desde la época {state['last_epoch']}")
+    return load_model(last_path), state
+
+
+class TrainingController(Callback):
+    """
+    Guarda checkpoints del entrenamiento y lo detiene cuando `val_loss` deja de mejorar.
+
+    - Guarda `best.keras` cada vez que `val_loss` mejora al menos `min_delta`.
+    - Guarda `last.keras` (con el estado del optimizador) cada `every` épocas y al terminar.
+    - Detiene el entrenamiento tras `patience` épocas sin mejora.
+
+    Args:
+        path (str): Carpeta de checkpoints.
+        fingerprint (str): Huella del snapshot del dataset usado.
+        patience (int, optional): Épocas sin mejora antes de detener. Default: `EARLY_STOPPING_PATIENCE`.
+        min_delta (float, optional): Mejora mínima de `val_loss`. Default: `EARLY_STOPPING_MIN_DELTA`.
+        every (int, optional): Épocas entre checkpoints periódicos. Default: `CHECKPOINT_EVERY`.
+        state (dict, optional): Estado guardado, al continuar un entrenamiento.
+    """
+
+    def __init__(
+        self,
+        path,
+        fingerprint,
+        patience=EARLY_STOPPING_PATIENCE,
+        min_delta=EARLY_STOPPING_MIN_DELTA,
+        every=CHECKPOINT_EVERY,
+        state=None,
+    ):
+        super().__init__()
+        self.path = path
+        self.patience = patience
+        self.min_delta = min_delta
+        self.every = every
+        self.best_path = os.path.join(path, BEST_FILE)
+        self.last_path = os.path.join(path, LAST_FILE)
+        self.stopped_early = False
+
+        state = state or {}
+        self.state = {
+            "fingerprint": fingerprint,
+            "last_epoch": state.get("last_epoch", 0),
+            "best_val_loss": state.get("best_val_loss"),
+            "best_epoch": state.get("best_epoch"),
+            "best_metrics": state.get("best_metrics"),
+            "wait": state.get("wait", 0),
+            "completed": False,
+        }
+        os.makedirs(path, exist_ok=True)
+
+    def _save_last(self, epoch):
+        _save_model_atomic(self.model, self.last_path)
+        self.state["last_epoch"] = epoch
+        self._save_state()
+
+    def _save_state(self):
+        self.state["updated_at"] = datetime.now().isoformat(timespec="seconds")
+        _write_state(self.path, self.state)
+
+    def on_epoch_end(self, epoch, logs=None):
+        logs = logs or {}
+        epoch_number = epoch + 1
+        val_loss = logs.get("val_loss")
+        best = self.state["best_val_loss"]
+
+        if val_loss is not None and (best is None or val_loss < best - self.min_delta):
+            _save_model_atomic(self.model, self.best_path)
+            self.state.update(
+                best_val_loss=float(val_loss),
+                best_epoch=epoch_number,
+                best_metrics={key: float(value) for key, value in logs.items()},
+                wait=0,
+            )
+            self._save_state()
+        else:
+            self.state["wait"] += 1
+
+        self._last_epoch = epoch_number
+        if epoch_number % self.every == 0:
+            self._save_last(epoch_number)
+
+        if self.state["wait"] >= self.patience:
+            print(
+                f"⏹️ Sin mejora de val_loss en {self.patience} épocas, "
+                f"mejor época: {self.state['best_epoch']}"
+            )
+            self.stopped_early = True
+            self.model.stop_training = True
+
+    def on_train_end(self, logs=None):
+        last_epoch = getattr(self, "_last_epoch", None)
+        if last_epoch is not None and last_epoch != self.state["last_epoch"]:
+            self._save_last(last_epoch)
+
+    def mark_completed(self):
+        """
+        Marca el entrenamiento como terminado para que no se continúe desde sus checkpoints.
+        """
+        self.state["completed"] = True
+        self._save_state()
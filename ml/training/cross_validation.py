@@ -0,0 +1,317 @@
+"""
+Validación cruzada estratificada del modelo en paralelo.
+
+Con pocas muestras por palabra, el `val_accuracy` de una única división train/validation
+varía mucho entre entrenamientos. Este módulo divide el dataset en `CV_FOLDS` folds
+estratificados (cada fold conserva la proporción de muestras de cada palabra), entrena un
+modelo por fold y evalúa cada uno sobre su fold de test.
+
+Los folds se entrenan en paralelo en un pool de procesos (`run_in_process_pool`), con
+hilos acotados por proceso. Todos leen el mismo snapshot del dataset como memmap. Dentro
+de cada fold se separa una porción del train para la parada temprana, así el fold de test
+no influye en el entrenamiento.
+
+El reporte incluye accuracy y loss de cada fold, su media y desvío, la matriz de confusión
+acumulada de todos los folds y precision/recall por palabra. Se guarda en
+`CROSS_VALIDATION_PATH/<fecha>.json`.
+
+Funciones:
+- `make_folds`: arma los folds estratificados.
+- `run_fold`: entrena y evalúa un fold (se ejecuta dentro de un proceso del pool).
+- `summarize_folds`: combina los resultados de los folds en un reporte.
+- `cross_validate`: ejecuta la validación cruzada completa.
+"""
+
+import os, json, time, argparse
+import numpy as np
+
+from datetime import datetime
+from sklearn.metrics import confusion_matrix
+from sklearn.model_selection import StratifiedKFold
+
+from ml.utils.training_utils import run_in_process_pool, split_indices
+from app.config import (
+    CROSS_VALIDATION_PATH,
+    CV_EPOCHS,
+    CV_FOLDS,
+    CV_PATIENCE,
+    CV_THREADS_PER_FOLD,
+    CV_WORKERS,
+    DATASET_SNAPSHOT_PATH,
+    TRAINING_BATCH_SIZE,
+)
+
+EARLY_STOPPING_SPLIT = 0.1
+
+
+def make_folds(labels, folds=CV_FOLDS, seed=42):
+    """
+    Divide el dataset en folds estratificados.
+
+    Si alguna palabra tiene menos muestras que `folds`, se reduce la cantidad de folds
+    a esa cantidad de muestras.
+
+    Args:
+        labels (np.ndarray): Etiquetas enteras de todo el dataset.
+        folds (int, optional): Cantidad de folds. Default: `CV_FOLDS`.
+        seed (int, optional): Semilla de la división. Default: 42.
+
+    Returns:
+        list[tuple[np.ndarray, np.ndarray]]: Índices de train y de test de cada fold.
+
+    Raises:
+        ValueError: Si alguna palabra tiene menos de dos muestras.
+    """
+    labels = np.asarray(labels)
+    min_samples = int(np.unique(labels, return_counts=True)[1].min())
+    if min_samples < 2:
+        raise ValueError("Cada palabra necesita al menos 2 muestras para la validación cruzada")
+    if min_samples < folds:
+        print(f"⚠️ Hay palabras con {min_samples} muestras, se usarán {min_samples} folds.")
+        folds = min_samples
+
+    splitter = StratifiedKFold(n_splits=folds, shuffle=True, random_state=seed)
+    return list(splitter.split(np.zeros(len(labels)), labels))
+
+
+def run_fold(task):
+    """
+    Entrena un modelo con el train de un fold y lo evalúa sobre su fold de test.
+
+    Se ejecuta dentro de un proceso del pool.
+
+    Args:
+        task (dict): Configuración del fold (`fold`, `train_idx`, `test_idx`, `snapshot_path`,
+            `epochs`, `batch_size`, `patience`, `params`, `seed`).
+
+    Returns:
+        dict: Accuracy, loss, épocas, matriz de confusión y duración del fold.
+    """
+    # Se importan aquí para que TensorFlow se cargue después de limitar los hilos
+    from keras.callbacks import EarlyStopping
+
+    from ml.training.dataset_snapshot import load_snapshot
+    from ml.training.input_pipeline import build_input_pipeline, dataset_from_arrays
+    from ml.training.model import get_model
+
+    start = time.perf_counter()
+    X, labels, word_ids, _ = load_snapshot(task["snapshot_path"])
+    num_classes = len(word_ids)
+    train_idx, test_idx = task["train_idx"], task["test_idx"]
+
+    fit_pos, stop_pos = split_indices(labels[train_idx], EARLY_STOPPING_SPLIT, task["seed"])
+    fit_idx, stop_idx = np.sort(train_idx[fit_pos]), np.sort(train_idx[stop_pos])
+
+    train_dataset = build_input_pipeline(
+        dataset_from_arrays(X[fit_idx], labels[fit_idx]),
+        num_classes,
+        batch_size=task["batch_size"],
+    )
+    stop_dataset = build_input_pipeline(
+        dataset_from_arrays(X[stop_idx], labels[stop_idx]),
+        num_classes,
+        batch_size=task["batch_size"],
+        shuffle=False,
+    )
+
+    model = get_model(num_classes, **task["params"])
+    history = model.fit(
+        train_dataset,
+        validation_data=stop_dataset,
+        epochs=task["epochs"],
+        verbose=0,
+        callbacks=[
+            EarlyStopping(
+                monitor="val_loss", patience=task["patience"], restore_best_weights=True
+            )
+        ],
+    )
+
+    y_test = np.asarray(labels[test_idx])
+    probabilities = model.predict(np.asarray(X[test_idx]), verbose=0)
+    predictions = probabilities.argmax(axis=1)
+    loss = -np.mean(np.log(probabilities[np.arange(len(y_test)), y_test] + 1e-7))
+
+    result = {
+        "fold": task["fold"],
+        "accuracy": float(np.mean(predictions == y_test)),
+        "loss": float(loss),
+        "epochs": len(history.history["loss"]),
+        "test_samples": int(len(y_test)),
+        "confusion_matrix": confusion_matrix(
+            y_test, predictions, labels=list(range(num_classes))
+        ).tolist(),
+        "duration_sec": round(time.perf_counter() - start, 2),
+    }
+    print(
+        f"📂 Fold {task['fold']}: accuracy={result['accuracy']:.4f}, "
+        f"loss={result['loss']:.4f}, {result['epochs']} épocas, {result['duration_sec']}s"
+    )
+    return result
+
+
+def summarize_folds(fold_results, words):
+    """
+    Combina los resultados de los folds en un reporte.
+
+    Args:
+        fold_results (list[dict]): Resultados de `run_fold`.
+        words (list[str]): Nombre de cada palabra, en el orden de las etiquetas.
+
+    Returns:
+        dict: Media y desvío de accuracy y loss, resultados por fold, matriz de confusión
+        acumulada (filas: palabra real, columnas: palabra predicha) y métricas por palabra.
+    """
+    fold_results = sorted(fold_results, key=lambda r: r["fold"])
+    accuracies = np.array([r["accuracy"] for r in fold_results])
+    losses = np.array([r["loss"] for r in fold_results])
+    confusion = np.sum([r["confusion_matrix"] for r in fold_results], axis=0)
+
+    support = confusion.sum(axis=1)
+    predicted = confusion.sum(axis=0)
+    hits = np.diag(confusion)
+    per_word = [
+        {
+            "word": word,
+            "samples": int(support[i]),
+            "recall": round(float(hits[i] / support[i]), 4) if support[i] else None,
+            "precision": round(float(hits[i] / predicted[i]), 4) if predicted[i] else None,
+        }
+        for i, word in enumerate(words)
+    ]
+
+    return {
+        "folds": len(fold_results),
+        "accuracy_mean": round(float(accuracies.mean()), 4),
+        "accuracy_std": round(float(accuracies.std()), 4),
+        "loss_mean": round(float(losses.mean()), 4),
+        "loss_std": round(float(losses.std()), 4),
+        "fold_results": [
+            {k: v for k, v in r.items() if k != "confusion_matrix"} for r in fold_results
+        ],
+        "words": list(words),
+        "confusion_matrix": confusion.tolist(),
+        "per_word": per_word,
+    }
+
+
+def _word_names(word_ids):
+    """
+    Busca el nombre de cada palabra; si la base de datos no está disponible usa su ID.
+    """
+    from app.database.database_utils import search_word_id
+
+    names = []
+    for word_id in word_ids:
+        try:
+            row = search_word_id(word_id)
+        except Exception:
+            row = None
+        names.append(row[1] if row else word_id.hex()[:8])
+    return names
+
+
+def cross_validate(
+    folds=CV_FOLDS,
+    workers=CV_WORKERS,
+    threads=CV_THREADS_PER_FOLD,
+    epochs=CV_EPOCHS,
+    batch_size=TRAINING_BATCH_SIZE,
+    patience=CV_PATIENCE,
+    params=None,
+    seed=42,
+    snapshot_path=DATASET_SNAPSHOT_PATH,
+    report_path=CROSS_VALIDATION_PATH,
+):
+    """
+    Ejecuta la validación cruzada estratificada del modelo.
+
+    Args:
+        folds (int, optional): Cantidad de folds. Default: `CV_FOLDS`.
+        workers (int, optional): Folds en paralelo (0 para ejecutar en este proceso). Default: `CV_WORKERS`.
+        threads (int, optional): Hilos de cómputo por fold. Default: `CV_THREADS_PER_FOLD`.
+        epochs (int, optional): Épocas máximas por fold. Default: `CV_EPOCHS`.
+        batch_size (int, optional): Tamaño de batch. Default: `TRAINING_BATCH_SIZE`.
+        patience (int, optional): Épocas sin mejora antes de detener un fold. Default: `CV_PATIENCE`.
+        params (dict, optional): Hiperparámetros para `get_model` (por ejemplo, los del mejor
+            trial de `ml.training.hyperparameter_search`); si incluye `batch_size`, reemplaza
+            al argumento. Default: los de `get_model`.
+        seed (int, optional): Semilla de la división en folds. Default: 42.
+        snapshot_path (str, optional): Carpeta del snapshot del dataset. Default: `DATASET_SNAPSHOT_PATH`.
+        report_path (str, optional): Carpeta de los reportes. Default: `CROSS_VALIDATION_PATH`.
+
+    Returns:
+        dict: Reporte de la validación cruzada (ver `summarize_folds`), o `{"error": ...}`
+        si no hay datos suficientes.
+    """
+    from ml.training.dataset_snapshot import load_or_build_snapshot
+
+    params = dict(params or {})
+    batch_size = params.pop("batch_size", batch_size)
+
+    dataset = load_or_build_snapshot(snapshot_path)
+    if dataset is None:
+        return {"error": "No hay datos para entrenar"}
+    _, labels, word_ids, manifest = dataset
+
+    try:
+        splits = make_folds(labels, folds, seed)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        return {"error": str(e)}
+
+    print(f"🔀 Validación cruzada: {len(splits)} folds, {workers} procesos x {threads} hilos")
+    tasks = [
+        {
+            "fold": fold,
+            "train_idx": train_idx,
+            "test_idx": test_idx,
+            "snapshot_path": snapshot_path,
+            "epochs": epochs,
+            "batch_size": batch_size,
+            "patience": patience,
+            "params": params,
+            "seed": seed,
+        }
+        for fold, (train_idx, test_idx) in enumerate(splits, start=1)
+    ]
+    fold_results = run_in_process_pool(run_fold, tasks, workers, threads)
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "dataset_fingerprint": manifest.get("fingerprint"),
+        "params": {**params, "batch_size": batch_size},
+        **summarize_folds(fold_results, _word_names(word_ids)),
+    }
+
+    os.makedirs(report_path, exist_ok=True)
+    file_path = os.path.join(report_path, f"{datetime.now():%Y%m%d_%H%M%S}.json")
+    with open(file_path, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2, ensure_ascii=False)
+    report["report_file"] = file_path
+
+    print(
+        f"📊 Accuracy: {report['accuracy_mean']:.4f} ± {report['accuracy_std']:.4f} | "
+        f"Loss: {report['loss_mean']:.4f} ± {report['loss_std']:.4f}"
+    )
+    for entry in sorted(report["per_word"], key=lambda e: e["recall"] or 0)[:5]:
+        print(f"   🔻 {entry['word']}: recall={entry['recall']}, precision={entry['precision']}")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validación cruzada estratificada del modelo")
+    parser.add_argument("--folds", type=int, default=CV_FOLDS)
+    parser.add_argument("--workers", type=int, default=CV_WORKERS)
+    parser.add_argument("--threads", type=int, default=CV_THREADS_PER_FOLD)
+    parser.add_argument("--epochs", type=int, default=CV_EPOCHS)
+    parser.add_argument("--params", type=json.loads, default=None, help="Hiperparámetros en JSON")
+    args = parser.parse_args()
+
+    cross_validate(
+        folds=args.folds,
+        workers=args.workers,
+        threads=args.threads,
+        epochs=args.epochs,
+        params=args.params,
+    )
@@ -0,0 +1,452 @@
+"""
+Snapshots en disco del dataset de entrenamiento.
+
+Construir el dataset implica leer todos los keypoints desde PostgreSQL, agruparlos por
+muestra y ajustar su longitud con `pad_sequences`. Este módulo guarda el resultado
+`(X, y, word_ids)` en disco para que los entrenamientos siguientes lo lean con
+`numpy.memmap`, sin volver a consultar la base.
+
+Cada snapshot se identifica con una huella (`fingerprint`) calculada a partir del mayor
+`keypoints_id`, la cantidad de registros y el conjunto de palabras con keypoints. Cuando la
+huella cambia, el snapshot se actualiza de forma incremental: solo se leen los keypoints
+con ID mayor a la marca de agua (`max_keypoints_id`) del manifiesto, las nuevas muestras
+se agregan al final de `X.dat` y, si aparece una palabra nueva, las etiquetas existentes
+se reasignan al nuevo orden de `word_ids`.
+
+La reconstrucción completa (compactación) solo ocurre si la actualización incremental no
+es segura (se eliminaron registros, una muestra quedó partida entre dos lecturas o se
+eliminó una palabra) o cada `SNAPSHOT_COMPACT_EVERY` actualizaciones incrementales.
+
+Varios procesos pueden pedir el snapshot a la vez (entrenamientos, ajustes incrementales,
+validación cruzada, búsqueda de hiperparámetros, benchmarks). `load_or_build_snapshot`
+hace la comparación de huellas y la actualización con un bloqueo exclusivo (`fcntl.flock`
+sobre `snapshot.lock`): el resto espera y, al obtenerlo, vuelve a leer el manifiesto, por
+lo que nunca dos procesos agregan o truncan filas de `X.dat` al mismo tiempo.
+
+Estructura en disco (`DATASET_SNAPSHOT_PATH/`):
+- `manifest.json`: versión del formato, huella, forma y tipo de los arrays, `word_ids` ordenados
+  y cantidad de muestras por palabra (`class_counts`).
+- `X.dat`: secuencias `(muestras, MODEL_FRAMES, LENGTH_KEYPOINTS)` en float16.
+- `y.dat`: etiquetas enteras (índice de la palabra en `word_ids`) en int32.
+- `snapshot.lock`: archivo del bloqueo entre procesos (sin contenido).
+
+Funciones:
+- `compute_fingerprint`: calcula la huella de un estado de la base.
+- `build_snapshot`: reconstruye el snapshot completo desde la base.
+- `append_to_snapshot`: agrega al snapshot las muestras nuevas desde la marca de agua.
+- `load_snapshot`: abre un snapshot existente como arrays memory-mapped.
+- `load_or_build_snapshot`: devuelve el snapshot vigente, actualizándolo solo si cambió la huella.
+- `snapshot_class_counts`: devuelve las muestras por palabra sin consultar la base.
+"""
+
+import os, json, fcntl, hashlib
+import numpy as np
+
+from datetime import datetime
+from contextlib import contextmanager
+from tensorflow.keras.preprocessing.sequence import pad_sequences
+
+from ml.utils.training_utils import get_sequences_and_labels
+from ml.utils.keypoints_utils import group_keypoints_by_word_and_sample
+from app.database.database_utils import (
+    fetch_keypoints_since,
+    fetch_keypoints_stats,
+    fetch_word_ids_with_keypoints,
+)
+from app.config import (
+    DATASET_SNAPSHOT_PATH,
+    LENGTH_KEYPOINTS,
+    MODEL_FRAMES,
+    SNAPSHOT_COMPACT_EVERY,
+)
+
+SNAPSHOT_FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+X_FILE = "X.dat"
+Y_FILE = "y.dat"
+LOCK_FILE = "snapshot.lock"
+X_DTYPE = "float16"
+Y_DTYPE = "int32"
+
+
+def compute_fingerprint(word_ids, max_keypoints_id, total_rows):
+    """
+    Calcula la huella que identifica un estado de la tabla `keypoints`.
+
+    Incluye la versión del formato y la forma de las secuencias, de modo que un cambio
+    en `MODEL_FRAMES` o `LENGTH_KEYPOINTS` también invalida el snapshot.
+
+    Args:
+        word_ids (list[bytes]): IDs de palabras con keypoints, en el orden usado para las etiquetas.
+        max_keypoints_id (int): Mayor `keypoints_id` de la tabla.
+        total_rows (int): Cantidad de registros de la tabla.
+
+    Returns:
+        str: Huella en formato hexadecimal (SHA256).
+    """
+    digest = hashlib.sha256(
+        f"{SNAPSHOT_FORMAT_VERSION}|{MODEL_FRAMES}|{LENGTH_KEYPOINTS}|"
+        f"{max_keypoints_id}|{total_rows}|".encode("utf-8")
+    )
+    for word_id in word_ids:
+        digest.update(bytes(word_id))
+    return digest.hexdigest()
+
+
+def _current_fingerprint():
+    """
+    Calcula la huella del estado actual de la base de datos.
+
+    Returns:
+        tuple[str, list[bytes], int, int]: Huella, `word_ids`, mayor `keypoints_id` y total de registros.
+    """
+    word_ids = [bytes(word_id) for word_id in fetch_word_ids_with_keypoints()]
+    max_keypoints_id, total_rows = fetch_keypoints_stats()
+    fingerprint = compute_fingerprint(word_ids, max_keypoints_id, total_rows)
+    return fingerprint, word_ids, max_keypoints_id, total_rows
+
+
+@contextmanager
+def _snapshot_lock(snapshot_path):
+    """
+    Toma el bloqueo exclusivo del snapshot, esperando si otro proceso lo tiene.
+
+    El sistema operativo lo libera si el proceso termina sin soltarlo.
+
+    Args:
+        snapshot_path (str): Carpeta del snapshot.
+    """
+    os.makedirs(snapshot_path, exist_ok=True)
+    with open(os.path.join(snapshot_path, LOCK_FILE), "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _write_atomic(path, data):
+    """
+    Escribe bytes en un archivo reemplazándolo de forma atómica.
+
+    Los procesos que ya tenían el archivo anterior abierto (o mapeado en memoria)
+    siguen leyendo la versión anterior hasta que lo vuelvan a abrir.
+
+    Args:
+        path (str): Ruta final del archivo.
+        data (bytes): Contenido a escribir.
+
+    Returns:
+        None
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(data)
+    os.replace(tmp_path, path)
+
+
+def _write_manifest(snapshot_path, manifest):
+    """
+    Guarda el manifiesto del snapshot de forma atómica.
+
+    Args:
+        snapshot_path (str): Carpeta del snapshot.
+        manifest (dict): Contenido del manifiesto.
+
+    Returns:
+        None
+    """
+    data = json.dumps(manifest, indent=2, ensure_ascii=False).encode("utf-8")
+    _write_atomic(os.path.join(snapshot_path, MANIFEST_FILE), data)
+
+
+def read_manifest(snapshot_path=DATASET_SNAPSHOT_PATH):
+    """
+    Lee el manifiesto de un snapshot.
+
+    Args:
+        snapshot_path (str, optional): Carpeta del snapshot. Default: `DATASET_SNAPSHOT_PATH`.
+
+    Returns:
+        dict | None: Manifiesto, o None si no existe o tiene una versión de formato distinta.
+    """
+    manifest_path = os.path.join(snapshot_path, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return None
+
+    with open(manifest_path, "r", encoding="utf-8") as file:
+        manifest = json.load(file)
+
+    if manifest.get("version") != SNAPSHOT_FORMAT_VERSION:
+        print("⚠️ Snapshot con formato desactualizado, se reconstruirá.")
+        return None
+    return manifest
+
+
+def _pad(sequences):
+    """
+    Ajusta todas las secuencias a `MODEL_FRAMES` frames con el mismo criterio del entrenamiento.
+
+    Args:
+        sequences (list[list]): Secuencias de keypoints de longitud variable.
+
+    Returns:
+        np.ndarray: Array `(muestras, MODEL_FRAMES, LENGTH_KEYPOINTS)` en float16.
+    """
+    return np.asarray(
+        pad_sequences(
+            sequences,
+            maxlen=int(MODEL_FRAMES),
+            padding="pre",
+            truncating="post",
+            dtype=X_DTYPE,
+        ),
+        dtype=X_DTYPE,
+    )
+
+
+def _class_counts(y, num_classes):
+    """
+    Cuenta las muestras de cada palabra a partir de las etiquetas.
+    """
+    return np.bincount(np.asarray(y), minlength=num_classes).astype(int).tolist()
+
+
+def build_snapshot(snapshot_path=DATASET_SNAPSHOT_PATH):
+    """
+    Reconstruye el snapshot completo a partir de la base de datos.
+
+    Args:
+        snapshot_path (str, optional): Carpeta donde guardar el snapshot. Default: `DATASET_SNAPSHOT_PATH`.
+
+    Returns:
+        dict | None: Manifiesto del snapshot creado, o None si no hay secuencias en la base.
+    """
+    fingerprint, word_ids, max_keypoints_id, total_rows = _current_fingerprint()
+
+    print("📦 Construyendo snapshot del dataset desde la base de datos...")
+    sequences, labels = get_sequences_and_labels(word_ids)
+    if not sequences:
+        print("❌ No hay secuencias de keypoints para crear el snapshot.")
+        return None
+
+    X = _pad(sequences)
+    y = np.asarray(labels, dtype=Y_DTYPE)
+
+    os.makedirs(snapshot_path, exist_ok=True)
+    _write_atomic(os.path.join(snapshot_path, X_FILE), X.tobytes())
+    _write_atomic(os.path.join(snapshot_path, Y_FILE), y.tobytes())
+
+    manifest = {
+        "version": SNAPSHOT_FORMAT_VERSION,
+        "fingerprint": fingerprint,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "max_keypoints_id": max_keypoints_id,
+        "total_rows": total_rows,
+        "samples": int(X.shape[0]),
+        "x_shape": list(X.shape),
+        "x_dtype": X_DTYPE,
+        "y_dtype": Y_DTYPE,
+        "word_ids": [word_id.hex() for word_id in word_ids],
+        "class_counts": _class_counts(y, len(word_ids)),
+        "deltas": 0,
+    }
+    _write_manifest(snapshot_path, manifest)
+
+    print(f"✅ Snapshot creado: {X.shape[0]} muestras, {len(word_ids)} palabras")
+    return manifest
+
+
+def append_to_snapshot(snapshot_path, manifest, state):
+    """
+    Agrega al snapshot las muestras insertadas después de su marca de agua.
+
+    Lee solo los keypoints con `keypoints_id` mayor a `manifest["max_keypoints_id"]`,
+    los agrupa en muestras y agrega las secuencias al final de `X.dat` sin reescribir
+    las existentes. Si aparecen palabras nuevas, las etiquetas ya guardadas se reasignan
+    al nuevo orden de `word_ids` (solo se reescribe `y.dat`, que es pequeño).
+
+    Args:
+        snapshot_path (str): Carpeta del snapshot.
+        manifest (dict): Manifiesto actual del snapshot.
+        state (tuple): Resultado de `_current_fingerprint()` (huella, word_ids, mayor ID, total).
+
+    Returns:
+        dict | None: Manifiesto actualizado, o None si la actualización incremental no es
+        segura y se debe reconstruir el snapshot completo.
+    """
+    fingerprint, word_ids, max_keypoints_id, total_rows = state
+    old_word_ids = [bytes.fromhex(word_id) for word_id in manifest["word_ids"]]
+
+    if manifest.get("deltas", 0) >= SNAPSHOT_COMPACT_EVERY:
+        print("🧹 Límite de actualizaciones incrementales alcanzado, compactando snapshot.")
+        return None
+    if not set(old_word_ids).issubset(word_ids):
+        print("⚠️ Se eliminaron palabras con keypoints, se reconstruirá el snapshot.")
+        return None
+
+    rows = fetch_keypoints_since(manifest["max_keypoints_id"])
+    if len(rows) != total_rows - manifest["total_rows"]:
+        print("⚠️ Se eliminaron keypoints desde el último snapshot, se reconstruirá.")
+        return None
+
+    records = [
+        (bytes(word_id), sample_id, frame, keypoints)
+        for _, word_id, sample_id, frame, keypoints in rows
+    ]
+    first_frames = {}
+    for _, sample_id, frame, _ in records:
+        first_frames[sample_id] = min(frame, first_frames.get(sample_id, frame))
+    if any(frame != 1 for frame in first_frames.values()):
+        print("⚠️ Hay muestras partidas entre dos lecturas, se reconstruirá el snapshot.")
+        return None
+
+    sequences, labels = group_keypoints_by_word_and_sample(records, word_ids)
+    X_new = _pad(sequences) if sequences else np.empty((0, MODEL_FRAMES, LENGTH_KEYPOINTS), X_DTYPE)
+
+    # Reasigna las etiquetas existentes si cambió el orden de las palabras
+    y_path = os.path.join(snapshot_path, Y_FILE)
+    old_samples = manifest["samples"]
+    y_old = np.fromfile(y_path, dtype=manifest["y_dtype"], count=old_samples)
+    if old_word_ids != word_ids:
+        new_index = {word_id: i for i, word_id in enumerate(word_ids)}
+        remap = np.array([new_index[word_id] for word_id in old_word_ids], dtype=Y_DTYPE)
+        y_old = remap[y_old]
+        print(f"🔀 Etiquetas reasignadas para {len(word_ids) - len(old_word_ids)} palabras nuevas")
+
+    # Agrega las secuencias nuevas al final de X.dat, descartando restos de escrituras interrumpidas
+    x_path = os.path.join(snapshot_path, X_FILE)
+    row_bytes = MODEL_FRAMES * LENGTH_KEYPOINTS * np.dtype(X_DTYPE).itemsize
+    with open(x_path, "r+b") as file:
+        file.truncate(old_samples * row_bytes)
+        file.seek(0, os.SEEK_END)
+        file.write(X_new.tobytes())
+
+    y = np.concatenate([y_old, np.asarray(labels, dtype=Y_DTYPE)])
+    _write_atomic(y_path, y.astype(Y_DTYPE).tobytes())
+
+    samples = old_samples + int(X_new.shape[0])
+    manifest = {
+        **manifest,
+        "fingerprint": fingerprint,
+        "updated_at": datetime.now().isoformat(timespec="seconds"),
+        "max_keypoints_id": max_keypoints_id,
+        "total_rows": total_rows,
+        "samples": samples,
+        "x_shape": [samples, MODEL_FRAMES, LENGTH_KEYPOINTS],
+        "word_ids": [word_id.hex() for word_id in word_ids],
+        "class_counts": _class_counts(y, len(word_ids)),
+        "deltas": manifest.get("deltas", 0) + 1,
+    }
+    _write_manifest(snapshot_path, manifest)
+
+    print(f"✅ Snapshot actualizado: +{X_new.shape[0]} muestras ({samples} en total)")
+    return manifest
+
+
+def load_snapshot(snapshot_path=DATASET_SNAPSHOT_PATH, manifest=None):
+    """
+    Abre un snapshot existente como arrays memory-mapped de solo lectura.
+
+    Args:
+        snapshot_path (str, optional): Carpeta del snapshot. Default: `DATASET_SNAPSHOT_PATH`.
+        manifest (dict, optional): Manifiesto ya leído; si es None se lee desde disco. Default: None.
+
+    Returns:
+        tuple[np.memmap, np.memmap, list[bytes], dict] | None:
+            - X: secuencias `(muestras, MODEL_FRAMES, LENGTH_KEYPOINTS)`.
+            - y: etiquetas enteras.
+            - word_ids: IDs de palabras en el orden de las etiquetas.
+            - manifest: manifiesto del snapshot.
+            None si el snapshot no existe.
+    """
+    manifest = manifest or read_manifest(snapshot_path)
+    if manifest is None:
+        return None
+
+    x_shape = tuple(manifest["x_shape"])
+    X = np.memmap(
+        os.path.join(snapshot_path, X_FILE),
+        dtype=manifest["x_dtype"],
+        mode="r",
+        shape=x_shape,
+    )
+    y = np.memmap(
+        os.path.join(snapshot_path, Y_FILE),
+        dtype=manifest["y_dtype"],
+        mode="r",
+        shape=(x_shape[0],),
+    )
+    word_ids = [bytes.fromhex(word_id) for word_id in manifest["word_ids"]]
+    return X, y, word_ids, manifest
+
+
+def load_or_build_snapshot(snapshot_path=DATASET_SNAPSHOT_PATH, force_rebuild=False):
+    """
+    Devuelve el snapshot vigente del dataset, actualizándolo solo si cambió la base.
+
+    Compara la huella guardada en el manifiesto con la huella actual de la base
+    (dos consultas livianas). Si coinciden, abre el snapshot existente sin leer keypoints.
+    Si cambiaron, intenta primero una actualización incremental (`append_to_snapshot`)
+    y solo reconstruye el snapshot completo cuando esa actualización no es posible.
+
+    Todo ocurre con el bloqueo del snapshot tomado: si otro proceso lo está actualizando,
+    se espera y se usa el manifiesto que dejó.
+
+    Args:
+        snapshot_path (str, optional): Carpeta del snapshot. Default: `DATASET_SNAPSHOT_PATH`.
+        force_rebuild (bool, optional): Si es True, reconstruye aunque la huella coincida. Default: False.
+
+    Returns:
+        tuple[np.memmap, np.memmap, list[bytes], dict] | None: Ver `load_snapshot`.
+        None si no hay datos para entrenar.
+    """
+    with _snapshot_lock(snapshot_path):
+        manifest = read_manifest(snapshot_path)
+        state = _current_fingerprint()
+
+        if not force_rebuild and manifest is not None:
+            if manifest["fingerprint"] == state[0]:
+                print(f"♻️ Usando snapshot existente ({manifest['samples']} muestras)")
+                return load_snapshot(snapshot_path, manifest)
+
+            if state[2] > manifest["max_keypoints_id"]:
+                updated = append_to_snapshot(snapshot_path, manifest, state)
+                if updated is not None:
+                    return load_snapshot(snapshot_path, updated)
+
+        manifest = build_snapshot(snapshot_path)
+        if manifest is None:
+            return None
+        return load_snapshot(snapshot_path, manifest)
+
+
+def snapshot_class_counts(snapshot_path=DATASET_SNAPSHOT_PATH, manifest=None):
+    """
+    Devuelve la cantidad de muestras de cada palabra del snapshot, sin consultar la base.
+
+    Usa los conteos del manifiesto; si no están (snapshots creados antes de guardarlos),
+    los calcula desde `y.dat`.
+
+    Args:
+        snapshot_path (str, optional): Carpeta del snapshot. Default: `DATASET_SNAPSHOT_PATH`.
+        manifest (dict, optional): Manifiesto ya leído; si es None se lee desde disco. Default: None.
+
+    Returns:
+        dict[str, int]: Muestras por palabra (ID en hexadecimal), en el orden de `word_ids`.
+        Vacío si no hay snapshot.
+    """
+    if manifest is None:
+        manifest = read_manifest(snapshot_path)
+    if manifest is None:
+        return {}
+
+    counts = manifest.get("class_counts")
+    if counts is None:
+        y = np.fromfile(
+            os.path.join(snapshot_path, Y_FILE),
+            dtype=manifest["y_dtype"],
+            count=manifest["samples"],
+        )
+        counts = _class_counts(y, len(manifest["word_ids"]))
+    return dict(zip(manifest["word_ids"], counts))
@@ -0,0 +1,297 @@
+"""
+Exportación de modelos del registro a TensorFlow Lite.
+
+Convierte una versión del registro de modelos a TFLite y la guarda junto al modelo
+Keras (`manifest["artifacts"]["tflite"]`), para ejecutarla con el motor de
+`ml.prediction.tflite_engine` (`PREDICTION_ENGINE = "tflite"`).
+
+El modelo se exporta con una firma de entrada fija `(1, MODEL_FRAMES, LENGTH_KEYPOINTS)`:
+la predicción en vivo clasifica una secuencia a la vez, y con el tamaño de batch fijo las
+capas recurrentes (LSTM, GRU) se convierten a operaciones nativas de TFLite sin depender
+de operaciones de TensorFlow. Cuantizaciones disponibles (`TFLITE_QUANTIZATION`):
+- `None`: pesos en float32, mismo resultado que Keras.
+- `"dynamic"`: pesos en int8 (cuantización de rango dinámico), ~4 veces más chico y más rápido.
+- `"float16"`: pesos en float16, ~2 veces más chico.
+
+`compare_tflite` verifica que el modelo convertido prediga lo mismo que el modelo Keras
+sobre la partición de validación del snapshot del dataset, y compara latencia, tamaño
+y memoria de ambos motores.
+
+Uso:
+    python -m ml.training.export_tflite --quantization dynamic --compare
+
+Funciones:
+- `convert_to_tflite`: convierte un modelo Keras a TFLite.
+- `export_tflite`: convierte una versión del registro y la guarda como artefacto.
+- `compare_tflite`: compara accuracy, latencia y memoria entre Keras y TFLite.
+"""
+
+import os, json, time, tempfile, argparse
+import numpy as np
+
+from sklearn.model_selection import train_test_split
+
+from ml.training.model_registry import (
+    add_version_artifact,
+    artifact_file_path,
+    get_production_version,
+    model_file_path,
+    read_version_manifest,
+)
+from app.config import (
+    DATASET_SNAPSHOT_PATH,
+    LENGTH_KEYPOINTS,
+    MODEL_FRAMES,
+    MODEL_NAME,
+    MODEL_REGISTRY_PATH,
+    TFLITE_QUANTIZATION,
+    TFLITE_THREADS,
+)
+
+QUANTIZATIONS = (None, "dynamic", "float16")
+
+
+def convert_to_tflite(model, quantization=None):
+    """
+    Convierte un modelo Keras a TensorFlow Lite con entrada de una sola secuencia.
+
+    Args:
+        model (keras.Model): Modelo entrenado.
+        quantization (str | None, optional): `None`, `"dynamic"` o `"float16"`. Default: None.
+
+    Returns:
+        bytes: Modelo TFLite.
+
+    Raises:
+        ValueError: Si la cuantización no es una de `QUANTIZATIONS`.
+    """
+    import keras
+    import tensorflow as tf
+
+    if quantization not in QUANTIZATIONS:
+        raise ValueError(f"Cuantización desconocida: {quantization}. Opciones: {QUANTIZATIONS}")
+
+    with tempfile.TemporaryDirectory() as export_path:
+        archive = keras.export.ExportArchive()
+        archive.track(model)
+        archive.add_endpoint(
+            "serve",
+            lambda sequence: model(sequence, training=False),
+            input_signature=[
+                tf.TensorSpec((1, MODEL_FRAMES, LENGTH_KEYPOINTS), tf.float32)
+            ],
+        )
+        archive.write_out(export_path, verbose=False)
+
+        converter = tf.lite.TFLiteConverter.from_saved_model(export_path)
+        if quantization is not None:
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        if quantization == "float16":
+            converter.target_spec.supported_types = [tf.float16]
+        return converter.convert()
+
+
+def export_tflite(
+    version=None,
+    quantization=TFLITE_QUANTIZATION,
+    model_name=MODEL_NAME,
+    registry_path=MODEL_REGISTRY_PATH,
+):
+    """
+    Convierte una versión del registro a TFLite y la guarda como artefacto de esa versión.
+
+    Args:
+        version (str, optional): Versión a exportar. Default: la versión en producción.
+        quantization (str | None, optional): `None`, `"dynamic"` o `"float16"`. Default: `TFLITE_QUANTIZATION`.
+        model_name (str, optional): Nombre del modelo. Default: `MODEL_NAME`.
+        registry_path (str, optional): Carpeta del registro. Default: `MODEL_REGISTRY_PATH`.
+
+    Returns:
+        dict: Manifiesto actualizado de la versión.
+
+    Raises:
+        ValueError: Si no hay versión en producción o la versión no existe.
+    """
+    from keras.models import load_model
+
+    version = version or get_production_version(model_name, registry_path)
+    manifest = None
+    if version is not None:
+        manifest = read_version_manifest(version, model_name, registry_path)
+    if manifest is None:
+        raise ValueError(f"No hay una versión de {model_name} para exportar")
+
+    model = load_model(model_file_path(manifest, registry_path))
+    content = convert_to_tflite(model, quantization)
+    file_name = f"model_{quantization}.tflite" if quantization else "model.tflite"
+
+    manifest = add_version_artifact(
+        version,
+        "tflite",
+        file_name,
+        content,
+        {"quantization": quantization},
+        model_name=model_name,
+        registry_path=registry_path,
+    )
+    print(
+        f"📦 {model_name} {version} exportado a TFLite "
+        f"({len(content) / 1e6:.2f} MB, cuantización {quantization})"
+    )
+    return manifest
+
+
+def _rss_mb():
+    """
+    Devuelve la memoria residente del proceso en MB (lee `/proc/self/status`, solo Linux).
+    """
+    try:
+        with open("/proc/self/status", "r", encoding="utf-8") as file:
+            for line in file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def _evaluate(predict, X, labels):
+    """
+    Predice cada secuencia de a una y mide accuracy y latencia.
+    """
+    outputs, times = [], []
+    for sequence in X:
+        start = time.perf_counter()
+        outputs.append(predict(np.asarray(sequence, dtype="float32")))
+        times.append((time.perf_counter() - start) * 1000)
+    outputs = np.array(outputs)
+    return outputs, {
+        "accuracy": round(float(np.mean(np.argmax(outputs, axis=1) == labels)), 4),
+        "latency_p50_ms": round(float(np.percentile(times, 50)), 3),
+        "latency_p99_ms": round(float(np.percentile(times, 99)), 3),
+    }
+
+
+def compare_tflite(
+    version=None,
+    quantization=TFLITE_QUANTIZATION,
+    num_threads=TFLITE_THREADS,
+    validation_split=0.05,
+    snapshot_path=DATASET_SNAPSHOT_PATH,
+    model_name=MODEL_NAME,
+    registry_path=MODEL_REGISTRY_PATH,
+):
+    """
+    Compara el modelo Keras de una versión con su conversión a TFLite.
+
+    Usa la misma partición de validación que `training_model` sobre el snapshot del
+    dataset. Las etiquetas del snapshot se traducen al orden de palabras del modelo y
+    se descartan las muestras de palabras que el modelo no conoce. La memoria es el
+    aumento de memoria residente del proceso al cargar cada motor, por lo que es
+    aproximada.
+
+    Args:
+        version (str, optional): Versión a comparar. Default: la versión en producción.
+        quantization (str | None, optional): Cuantización del modelo TFLite. Default: `TFLITE_QUANTIZATION`.
+        num_threads (int, optional): Hilos del intérprete TFLite. Default: `TFLITE_THREADS`.
+        validation_split (float, optional): Fracción de validación. Default: 0.05.
+        snapshot_path (str, optional): Carpeta del snapshot. Default: `DATASET_SNAPSHOT_PATH`.
+        model_name (str, optional): Nombre del modelo. Default: `MODEL_NAME`.
+        registry_path (str, optional): Carpeta del registro. Default: `MODEL_REGISTRY_PATH`.
+
+    Returns:
+        dict: Métricas de cada motor (`keras`, `tflite`), coincidencia de la palabra
+        predicha (`agreement`) y máxima diferencia de probabilidades (`max_abs_diff`).
+    """
+    from keras.models import load_model
+    from ml.training.dataset_snapshot import load_snapshot
+    from ml.prediction.inference import make_predictor
+    from ml.prediction.tflite_engine import create_interpreter, make_tflite_predictor
+
+    dataset = load_snapshot(snapshot_path)
+    if dataset is None:
+        raise ValueError("No hay un snapshot del dataset para comparar")
+    X, labels, word_ids, _ = dataset
+
+    manifest = export_tflite(version, quantization, model_name, registry_path)
+    tflite_path = artifact_file_path(manifest, "tflite", registry_path)
+
+    # Partición de validación de `training_model`, en el orden de salidas del modelo
+    _, val_indices = train_test_split(
+        np.arange(len(labels)), test_size=validation_split, random_state=42
+    )
+    model_index = {word_id: i for i, word_id in enumerate(manifest["word_ids"])}
+    output_labels = np.array([model_index.get(word_ids[label].hex(), -1) for label in labels])
+    val_indices = np.sort(val_indices[output_labels[val_indices] >= 0])
+    X_val = np.asarray(X[val_indices], dtype="float32")
+    y_val = output_labels[val_indices]
+
+    rss = _rss_mb()
+    with open(tflite_path, "rb") as file:
+        content = file.read()
+    create_interpreter(content, num_threads)
+    tflite_memory = _rss_mb() - rss
+
+    rss = _rss_mb()
+    model = load_model(model_file_path(manifest, registry_path))
+    keras_predict = make_predictor(model, batching=False)
+    keras_predict(X_val[0])
+    keras_memory = _rss_mb() - rss
+
+    keras_outputs, keras_metrics = _evaluate(keras_predict, X_val, y_val)
+    tflite_outputs, tflite_metrics = _evaluate(
+        make_tflite_predictor(content, num_threads), X_val, y_val
+    )
+
+    report = {
+        "version": manifest["version"],
+        "quantization": quantization,
+        "samples": int(len(y_val)),
+        "keras": {
+            **keras_metrics,
+            "file_mb": round(os.path.getsize(model_file_path(manifest, registry_path)) / 1e6, 3),
+            "memory_mb": round(keras_memory, 1),
+        },
+        "tflite": {
+            **tflite_metrics,
+            "file_mb": round(len(content) / 1e6, 3),
+            "memory_mb": round(tflite_memory, 1),
+        },
+        "agreement": round(
+            float(np.mean(np.argmax(keras_outputs, 1) == np.argmax(tflite_outputs, 1))), 4
+        ),
+        "max_abs_diff": float(np.max(np.abs(keras_outputs - tflite_outputs))),
+    }
+
+    print("motor | accuracy | p50 ms | p99 ms | archivo MB | memoria MB")
+    for engine in ("keras", "tflite"):
+        metrics = report[engine]
+        print(
+            f"{engine} | {metrics['accuracy']} | {metrics['latency_p50_ms']} | "
+            f"{metrics['latency_p99_ms']} | {metrics['file_mb']} | {metrics['memory_mb']}"
+        )
+    print(f"Coincidencia de palabra predicha: {report['agreement'] * 100:.2f}%")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exportación del modelo a TensorFlow Lite")
+    parser.add_argument("--version", default=None, help="Versión del registro (default: producción)")
+    parser.add_argument(
+        "--quantization",
+        default=TFLITE_QUANTIZATION or "none",
+        choices=["none", "dynamic", "float16"],
+    )
+    parser.add_argument("--threads", type=int, default=TFLITE_THREADS)
+    parser.add_argument("--compare", action="store_true", help="Comparar con el modelo Keras")
+    parser.add_argument("--output", default=None, help="Archivo JSON con la comparación")
+    args = parser.parse_args()
+    quantization = None if args.quantization == "none" else args.quantization
+
+    if args.compare:
+        report = compare_tflite(args.version, quantization, args.threads)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as file:
+                json.dump(report, file, indent=2)
+    else:
+        export_tflite(args.version, quantization)
@@ -0,0 +1,262 @@
+"""
+Ajuste incremental (fine-tuning) del modelo cuando se agregan palabras al vocabulario.
+
+Reentrenar desde cero cada vez que se agrega una palabra repite todo el trabajo ya hecho.
+Este módulo parte del modelo en producción del registro y:
+
+1. Expande la capa de salida (softmax) para las palabras nuevas, conservando los pesos
+   de las palabras que el modelo ya conocía y de todas las capas anteriores.
+2. Arma un *replay buffer* con todas las muestras de las palabras nuevas y una muestra
+   aleatoria de `REPLAY_SAMPLES_PER_CLASS` secuencias por cada palabra anterior, para que
+   el modelo no olvide el vocabulario previo.
+3. Ajusta el modelo sobre ese buffer con una tasa de aprendizaje baja, parada temprana
+   y checkpoints, y lo registra como una nueva versión.
+
+Funciones:
+- `expand_output_layer`: agrega salidas para palabras nuevas conservando los pesos existentes.
+- `build_replay_indices`: selecciona las muestras del replay buffer.
+- `fine_tune_model`: ejecuta el ajuste incremental completo.
+"""
+
+import numpy as np
+import keras
+
+from sklearn.model_selection import train_test_split
+from keras.models import load_model
+
+from ml.training.callbacks import ThroughputLogger
+from ml.training.checkpoints import TrainingController, checkpoint_dir, clear_checkpoints
+from ml.training.dataset_snapshot import load_or_build_snapshot
+from ml.training.input_pipeline import (
+    build_input_pipeline,
+    build_training_pipeline,
+    compute_class_weights,
+    dataset_from_arrays,
+)
+from ml.training.runtime import configure_training_runtime
+from ml.training.model_registry import (
+    load_production_manifest,
+    model_file_path,
+    promote_model,
+    register_model,
+)
+from app.config import (
+    AUTO_PROMOTE_MODELS,
+    FINE_TUNE_EPOCHS,
+    FINE_TUNE_LEARNING_RATE,
+    FINE_TUNE_PATIENCE,
+    LENGTH_KEYPOINTS,
+    MODEL_ARCHITECTURE,
+    MODEL_FRAMES,
+    MODEL_NAME,
+    REPLAY_SAMPLES_PER_CLASS,
+    TRAINING_BATCH_SIZE,
+    TRAINING_CLASS_WEIGHTS,
+    TRAINING_SAMPLING,
+    TRAINING_XLA,
+)
+
+
+def expand_output_layer(model, old_word_ids, new_word_ids, learning_rate=FINE_TUNE_LEARNING_RATE):
+    """
+    Crea un modelo con una salida por cada palabra de `new_word_ids`, a partir de `model`.
+
+    Todas las capas salvo la de salida se reutilizan con sus pesos entrenados. En la nueva
+    capa de salida, la columna de cada palabra ya conocida copia los pesos de su columna
+    anterior (aunque cambie de posición); las palabras nuevas arrancan con pesos aleatorios
+    y un bias igual al bias medio de las palabras anteriores.
+
+    Args:
+        model (keras.Sequential): Modelo entrenado con una salida por palabra de `old_word_ids`.
+        old_word_ids (list[bytes]): Orden de salidas del modelo actual.
+        new_word_ids (list[bytes]): Orden de salidas del nuevo modelo.
+        learning_rate (float, optional): Tasa de aprendizaje del ajuste. Default: `FINE_TUNE_LEARNING_RATE`.
+
+    Returns:
+        keras.Sequential: Modelo compilado con `len(new_word_ids)` salidas.
+    """
+    old_output = model.layers[-1]
+    old_kernel, old_bias = old_output.get_weights()
+
+    expanded = keras.Sequential(name=model.name)
+    expanded.add(keras.Input(shape=(MODEL_FRAMES, LENGTH_KEYPOINTS)))
+    for layer in model.layers[:-1]:
+        expanded.add(layer)
+    expanded.add(
+        keras.layers.Dense(
+            len(new_word_ids), activation="softmax", name="output", dtype="float32"
+        )
+    )
+
+    kernel, bias = expanded.layers[-1].get_weights()
+    bias[:] = old_bias.mean()
+    old_index = {word_id: i for i, word_id in enumerate(old_word_ids)}
+    for i, word_id in enumerate(new_word_ids):
+        if word_id in old_index:
+            kernel[:, i] = old_kernel[:, old_index[word_id]]
+            bias[i] = old_bias[old_index[word_id]]
+    expanded.layers[-1].set_weights([kernel, bias])
+
+    expanded.compile(
+        optimizer=keras.optimizers.Adam(learning_rate=learning_rate),
+        loss="categorical_crossentropy",
+        metrics=["accuracy"],
+        jit_compile=TRAINING_XLA,
+    )
+    return expanded
+
+
+def build_replay_indices(labels, new_classes, per_class=REPLAY_SAMPLES_PER_CLASS, seed=42):
+    """
+    Selecciona los índices de las muestras del replay buffer.
+
+    Incluye todas las muestras de las clases nuevas y hasta `per_class` muestras
+    aleatorias de cada clase anterior.
+
+    Args:
+        labels (np.ndarray): Etiquetas enteras de todo el dataset.
+        new_classes (set[int]): Índices de las clases nuevas.
+        per_class (int, optional): Muestras por clase anterior. Default: `REPLAY_SAMPLES_PER_CLASS`.
+        seed (int, optional): Semilla del muestreo. Default: 42.
+
+    Returns:
+        np.ndarray: Índices ordenados de las muestras seleccionadas.
+    """
+    labels = np.asarray(labels)
+    rng = np.random.default_rng(seed)
+    selected = []
+    for label in np.unique(labels):
+        indices = np.flatnonzero(labels == label)
+        if label not in new_classes and len(indices) > per_class:
+            indices = rng.choice(indices, per_class, replace=False)
+        selected.append(indices)
+    return np.sort(np.concatenate(selected))
+
+
+def fine_tune_model(
+    epochs=FINE_TUNE_EPOCHS,
+    batch_size=TRAINING_BATCH_SIZE,
+    callbacks=None,
+    patience=FINE_TUNE_PATIENCE,
+    augment=False,
+    sampling=TRAINING_SAMPLING,
+    class_weights=TRAINING_CLASS_WEIGHTS,
+):
+    """
+    Ajusta el modelo en producción al vocabulario actual sin reentrenar desde cero.
+
+    Args:
+        epochs (int, optional): Épocas máximas de ajuste. Default: `FINE_TUNE_EPOCHS`.
+        batch_size (int, optional): Tamaño de batch. Default: `TRAINING_BATCH_SIZE`.
+        callbacks (list, optional): Callbacks de Keras adicionales.
+        patience (int, optional): Épocas sin mejora de `val_loss` antes de detener. Default: `FINE_TUNE_PATIENCE`.
+        augment (bool, optional): Si es True, aumenta las secuencias del buffer. Default: False.
+        sampling (str, optional): Armado de los batches (`"shuffle"`, `"balanced"` o
+            `"temperature"`). Default: `TRAINING_SAMPLING`.
+        class_weights (bool, optional): Si es True, pesa la loss por la inversa de las
+            muestras de cada palabra del buffer. Default: `TRAINING_CLASS_WEIGHTS`.
+
+    Returns:
+        dict: Métricas de la mejor época, versión registrada y palabras agregadas,
+        o `{"error": ...}` si no se puede ajustar.
+    """
+    runtime = configure_training_runtime()
+
+    print("✅ ----- Obteniendo modelo en producción")
+    base = load_production_manifest()
+    if base is None:
+        print("❌ Error: No hay un modelo en producción para ajustar.")
+        return {"error": "No hay un modelo en producción para ajustar"}
+
+    print("✅ ----- Obteniendo dataset")
+    dataset = load_or_build_snapshot()
+    if dataset is None:
+        print("❌ Error: No se encontraron secuencias de keypoints.")
+        return {"error": "No hay datos para entrenar"}
+
+    X, labels, word_ids, manifest = dataset
+    old_word_ids = [bytes.fromhex(word_id) for word_id in base["word_ids"]]
+    new_classes = {i for i, word_id in enumerate(word_ids) if word_id not in old_word_ids}
+    print(f"🆕 Palabras nuevas: {len(new_classes)} (modelo base {base['version']})")
+
+    model = expand_output_layer(load_model(model_file_path(base)), old_word_ids, word_ids)
+
+    # --- Replay buffer ---
+    indices = build_replay_indices(labels, new_classes)
+    X_buffer, y_buffer = np.asarray(X[indices]), np.asarray(labels[indices])
+    print(f"🔁 Replay buffer: {len(indices)} de {len(labels)} muestras")
+
+    X_train, X_val, y_train, y_val = train_test_split(
+        X_buffer, y_buffer, test_size=0.1, random_state=42
+    )
+    train_dataset = build_training_pipeline(
+        X_train,
+        y_train,
+        len(word_ids),
+        batch_size=batch_size,
+        augment=augment,
+        sampling=sampling,
+    )
+    class_weight = (
+        compute_class_weights(y_train, len(word_ids)) if class_weights else None
+    )
+    val_dataset = build_input_pipeline(
+        dataset_from_arrays(X_val, y_val),
+        len(word_ids),
+        batch_size=batch_size,
+        shuffle=False,
+    )
+
+    checkpoints_path = checkpoint_dir(f"{MODEL_NAME}_fine_tune")
+    clear_checkpoints(checkpoints_path)
+    fingerprint = manifest.get("fingerprint")
+    controller = TrainingController(checkpoints_path, fingerprint, patience=patience)
+
+    print("✅ ----- Ajustando modelo")
+    history = model.fit(
+        train_dataset,
+        validation_data=val_dataset,
+        epochs=epochs,
+        verbose=2,
+        callbacks=[ThroughputLogger(len(X_train)), controller, *(callbacks or [])],
+        class_weight=class_weight,
+    )
+
+    best_metrics = controller.state["best_metrics"]
+    if best_metrics:
+        model = load_model(controller.best_path)
+    else:
+        best_metrics = {key: values[-1] for key, values in history.history.items()}
+
+    metrics = {
+        "accuracy": round(float(best_metrics["accuracy"]), 4),
+        "val_accuracy": round(float(best_metrics["val_accuracy"]), 4),
+        "loss": round(float(best_metrics["loss"]), 4),
+        "val_loss": round(float(best_metrics["val_loss"]), 4),
+        "best_epoch": controller.state["best_epoch"],
+        "epochs_trained": controller.state["last_epoch"],
+        "stopped_early": controller.stopped_early,
+        "replay_samples": int(len(indices)),
+        "architecture": base.get("metrics", {}).get("architecture", MODEL_ARCHITECTURE),
+        "precision": runtime["precision"],
+        "sampling": sampling,
+        "class_weights": class_weights,
+    }
+
+    print("✅ ----- Registrando modelo")
+    version = register_model(
+        model, word_ids, metrics, fingerprint, parent_version=base["version"]
+    )["version"]
+    if AUTO_PROMOTE_MODELS:
+        promote_model(version)
+    controller.mark_completed()
+
+    return {
+        **metrics,
+        "params": model.count_params(),
+        "layers": len(model.layers),
+        "version": version,
+        "promoted": AUTO_PROMOTE_MODELS,
+        "base_version": base["version"],
+        "new_words": len(new_classes),
+    }
@@ -0,0 +1,464 @@
+"""
+Búsqueda de hiperparámetros del modelo LSTM en paralelo.
+
+Evalúa configuraciones alternativas de `get_model` (unidades LSTM, dropout, regularización
+L2, tasa de aprendizaje, tamaño de batch) sin modificar el código del modelo. Cada
+configuración es un *trial* que se entrena en un pool de procesos locales; cada proceso
+limita sus hilos de cómputo (`SEARCH_THREADS_PER_TRIAL`) para que los trials en paralelo
+no compitan por los mismos núcleos.
+
+Todos los trials leen el mismo snapshot del dataset (`ml.training.dataset_snapshot`) como
+memmap, sin consultar la base de datos, y usan la misma división train/validation.
+
+Estrategias:
+- `random`: muestrea `trials` configuraciones del espacio de búsqueda. Un trial se poda
+  (`MedianPruner`) si su `val_loss` es peor que la mediana de los trials ya terminados.
+- `halving` (successive halving): entrena todas las configuraciones con pocas épocas,
+  conserva el mejor tercio (`eta=3`), continúa su entrenamiento con el triple de épocas
+  y repite hasta `max_epochs`.
+
+Los resultados se guardan en `SEARCH_PATH/<búsqueda>/`: un modelo y un `trial.json` por
+trial, y el ranking en `leaderboard.json` y `leaderboard.csv`. El mejor modelo se puede
+registrar y promover a producción en el registro de modelos.
+
+Funciones:
+- `sample_params`: muestrea una configuración del espacio de búsqueda.
+- `run_trial`: entrena un trial (se ejecuta dentro de un proceso del pool).
+- `run_search`: ejecuta una búsqueda completa y escribe el leaderboard.
+- `promote_best_trial`: registra el mejor trial en el registro de modelos.
+"""
+
+import os, csv, json, math, time, argparse
+import numpy as np
+
+from datetime import datetime
+
+from ml.utils.training_utils import run_in_process_pool, split_indices
+from app.config import (
+    DATASET_SNAPSHOT_PATH,
+    SEARCH_MAX_EPOCHS,
+    SEARCH_PATH,
+    SEARCH_PATIENCE,
+    SEARCH_PRUNE_WARMUP,
+    SEARCH_THREADS_PER_TRIAL,
+    SEARCH_VALIDATION_SPLIT,
+    SEARCH_WORKERS,
+)
+
+# Cada hiperparámetro se declara como ("choice", valores), ("uniform", min, max)
+# o ("loguniform", min, max). Para buscar sobre otra arquitectura de `MODEL_BUILDERS`
+# se usa un espacio con sus propios hiperparámetros.
+SEARCH_SPACE = {
+    "architecture": ("choice", ["lstm"]),
+    "lstm_units_1": ("choice", [32, 64, 128]),
+    "lstm_units_2": ("choice", [64, 128, 256]),
+    "dropout": ("uniform", 0.2, 0.6),
+    "l2_first": ("loguniform", 1e-4, 1e-1),
+    "l2_rest": ("loguniform", 1e-5, 1e-2),
+    "dense_units": ("choice", [32, 64, 128]),
+    "learning_rate": ("loguniform", 1e-4, 3e-3),
+    "batch_size": ("choice", [8, 16, 32]),
+}
+
+MIN_TRIALS_FOR_PRUNING = 3
+MODEL_FILE = "model.keras"
+TRIAL_FILE = "trial.json"
+
+
+def sample_params(space, rng):
+    """
+    Muestrea una configuración del espacio de búsqueda.
+
+    Args:
+        space (dict): Espacio de búsqueda (ver `SEARCH_SPACE`).
+        rng (np.random.Generator): Generador aleatorio.
+
+    Returns:
+        dict: Valor de cada hiperparámetro, con tipos nativos de Python.
+    """
+    params = {}
+    for name, (kind, *args) in space.items():
+        if kind == "choice":
+            params[name] = args[0][int(rng.integers(len(args[0])))]
+        elif kind == "uniform":
+            params[name] = float(rng.uniform(args[0], args[1]))
+        elif kind == "loguniform":
+            params[name] = float(
+                math.exp(rng.uniform(math.log(args[0]), math.log(args[1])))
+            )
+        else:
+            raise ValueError(f"Tipo de hiperparámetro desconocido: {kind}")
+    return params
+
+
+def median_curve(curves):
+    """
+    Calcula la mediana de `val_loss` por época de varios trials.
+
+    Solo incluye las épocas alcanzadas por al menos `MIN_TRIALS_FOR_PRUNING` trials.
+
+    Args:
+        curves (list[list[float]]): `val_loss` por época de cada trial.
+
+    Returns:
+        list[float]: Mediana por época.
+    """
+    median = []
+    for epoch in range(max((len(curve) for curve in curves), default=0)):
+        values = [curve[epoch] for curve in curves if len(curve) > epoch]
+        if len(values) < MIN_TRIALS_FOR_PRUNING:
+            break
+        median.append(float(np.median(values)))
+    return median
+
+
+def run_trial(task):
+    """
+    Entrena un trial y guarda su modelo y resultado en `task["trial_dir"]`.
+
+    Se ejecuta dentro de un proceso del pool. Si `task["initial_epoch"]` es mayor a
+    cero, continúa el entrenamiento del modelo guardado en una ronda anterior.
+
+    Args:
+        task (dict): Configuración del trial (`trial_id`, `params`, `snapshot_path`,
+            `train_idx`, `val_idx`, `epochs`, `initial_epoch`, `curve`, `median_curve`, ...).
+
+    Returns:
+        dict: Resultado del trial (`status`, `best_val_loss`, `best_val_accuracy`, `curve`, ...).
+    """
+    # Se importan aquí para que TensorFlow se cargue después de limitar los hilos
+    from keras.callbacks import EarlyStopping
+    from keras.models import load_model
+
+    from ml.training.callbacks import MedianPruner
+    from ml.training.dataset_snapshot import load_snapshot
+    from ml.training.input_pipeline import build_input_pipeline, dataset_from_arrays
+    from ml.training.model import get_model
+
+    start = time.perf_counter()
+    params = task["params"]
+    model_path = os.path.join(task["trial_dir"], MODEL_FILE)
+    result = {
+        "trial_id": task["trial_id"],
+        "params": params,
+        "model_path": model_path,
+        "curve": list(task.get("curve", [])),
+        "accuracy_curve": list(task.get("accuracy_curve", [])),
+    }
+
+    try:
+        X, labels, word_ids, _ = load_snapshot(task["snapshot_path"])
+        train_idx, val_idx = task["train_idx"], task["val_idx"]
+        train_dataset = build_input_pipeline(
+            dataset_from_arrays(X[train_idx], labels[train_idx]),
+            len(word_ids),
+            batch_size=params["batch_size"],
+        )
+        val_dataset = build_input_pipeline(
+            dataset_from_arrays(X[val_idx], labels[val_idx]),
+            len(word_ids),
+            batch_size=params["batch_size"],
+            shuffle=False,
+        )
+
+        if task["initial_epoch"] > 0:
+            model = load_model(model_path)
+        else:
+            model_params = {k: v for k, v in params.items() if k != "batch_size"}
+            model = get_model(len(word_ids), **model_params)
+
+        pruner = MedianPruner(task.get("median_curve", []), warmup=task["prune_warmup"])
+        history = model.fit(
+            train_dataset,
+            validation_data=val_dataset,
+            epochs=task["epochs"],
+            initial_epoch=task["initial_epoch"],
+            verbose=0,
+            callbacks=[
+                EarlyStopping(
+                    monitor="val_loss",
+                    patience=task["patience"],
+                    restore_best_weights=True,
+                ),
+                pruner,
+            ],
+        )
+        model.save(model_path)
+
+        result["curve"] += [float(v) for v in history.history["val_loss"]]
+        result["accuracy_curve"] += [float(v) for v in history.history["val_accuracy"]]
+        best_epoch = int(np.argmin(result["curve"]))
+        result.update(
+            status="pruned" if pruner.pruned else "complete",
+            best_val_loss=result["curve"][best_epoch],
+            best_val_accuracy=result["accuracy_curve"][best_epoch],
+            best_epoch=best_epoch + 1,
+            epochs=len(result["curve"]),
+        )
+    except Exception as e:
+        result.update(status="error", error=str(e), best_val_loss=None)
+
+    result["duration_sec"] = round(
+        task.get("duration_sec", 0.0) + time.perf_counter() - start, 2
+    )
+    with open(os.path.join(task["trial_dir"], TRIAL_FILE), "w", encoding="utf-8") as file:
+        json.dump(result, file, indent=2)
+
+    print(
+        f"🧪 Trial {task['trial_id']}: {result['status']}, "
+        f"val_loss={result['best_val_loss']}, {result['duration_sec']}s"
+    )
+    return result
+
+
+def _rank(records):
+    """
+    Ordena los trials: primero los completos, luego los podados, por menor `val_loss`.
+    """
+    order = {"complete": 0, "pruned": 1}
+    return sorted(
+        records,
+        key=lambda r: (
+            order.get(r["status"], 2),
+            r["best_val_loss"] if r["best_val_loss"] is not None else float("inf"),
+        ),
+    )
+
+
+def write_leaderboard(search_dir, records):
+    """
+    Escribe el ranking de trials en `leaderboard.json` y `leaderboard.csv`.
+
+    Args:
+        search_dir (str): Carpeta de la búsqueda.
+        records (list[dict]): Resultados de los trials.
+
+    Returns:
+        list[dict]: Trials ordenados del mejor al peor.
+    """
+    ranked = _rank(records)
+    with open(os.path.join(search_dir, "leaderboard.json"), "w", encoding="utf-8") as file:
+        json.dump(ranked, file, indent=2)
+
+    param_names = sorted({name for record in ranked for name in record["params"]})
+    columns = ["rank", "trial_id", "status", "best_val_loss", "best_val_accuracy", "epochs", "duration_sec"]
+    with open(os.path.join(search_dir, "leaderboard.csv"), "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(columns + param_names)
+        for rank, record in enumerate(ranked, start=1):
+            writer.writerow(
+                [rank] + [record.get(column) for column in columns[1:]]
+                + [record["params"].get(name) for name in param_names]
+            )
+    return ranked
+
+
+def _halving_budgets(min_epochs, max_epochs, eta):
+    """
+    Calcula las épocas acumuladas de cada ronda de successive halving.
+    """
+    budgets = []
+    budget = min_epochs
+    while budget < max_epochs:
+        budgets.append(budget)
+        budget *= eta
+    budgets.append(max_epochs)
+    return budgets
+
+
+def run_search(
+    strategy="random",
+    trials=20,
+    workers=SEARCH_WORKERS,
+    threads=SEARCH_THREADS_PER_TRIAL,
+    max_epochs=SEARCH_MAX_EPOCHS,
+    min_epochs=10,
+    eta=3,
+    patience=SEARCH_PATIENCE,
+    space=SEARCH_SPACE,
+    seed=42,
+    search_path=SEARCH_PATH,
+    snapshot_path=DATASET_SNAPSHOT_PATH,
+    promote=False,
+):
+    """
+    Ejecuta una búsqueda de hiperparámetros y escribe el leaderboard.
+
+    Args:
+        strategy (str, optional): `"random"` o `"halving"`. Default: `"random"`.
+        trials (int, optional): Cantidad de configuraciones a evaluar. Default: 20.
+        workers (int, optional): Trials en paralelo (0 para ejecutar en este proceso). Default: `SEARCH_WORKERS`.
+        threads (int, optional): Hilos de cómputo por trial. Default: `SEARCH_THREADS_PER_TRIAL`.
+        max_epochs (int, optional): Épocas máximas por trial. Default: `SEARCH_MAX_EPOCHS`.
+        min_epochs (int, optional): Épocas de la primera ronda de `halving`. Default: 10.
+        eta (int, optional): Factor de reducción de `halving`. Default: 3.
+        patience (int, optional): Épocas sin mejora antes de detener un trial. Default: `SEARCH_PATIENCE`.
+        space (dict, optional): Espacio de búsqueda. Default: `SEARCH_SPACE`.
+        seed (int, optional): Semilla del muestreo y de la división train/validation. Default: 42.
+        search_path (str, optional): Carpeta de resultados. Default: `SEARCH_PATH`.
+        snapshot_path (str, optional): Carpeta del snapshot del dataset. Default: `DATASET_SNAPSHOT_PATH`.
+        promote (bool, optional): Si es True, registra y promueve el mejor trial. Default: False.
+
+    Returns:
+        dict: Carpeta de la búsqueda, leaderboard ordenado y versión promovida (si corresponde),
+        o `{"error": ...}` si no hay datos.
+    """
+    from ml.training.dataset_snapshot import load_or_build_snapshot
+
+    if strategy not in ("random", "halving"):
+        raise ValueError(f"Estrategia desconocida: {strategy}")
+
+    dataset = load_or_build_snapshot(snapshot_path)
+    if dataset is None:
+        return {"error": "No hay datos para entrenar"}
+    _, labels, word_ids, manifest = dataset
+
+    train_idx, val_idx = split_indices(labels, SEARCH_VALIDATION_SPLIT, seed)
+    search_dir = os.path.join(
+        search_path, f"{datetime.now():%Y%m%d_%H%M%S}_{strategy}"
+    )
+    os.makedirs(search_dir, exist_ok=True)
+    print(f"🔎 Búsqueda {strategy}: {trials} trials, {workers} procesos x {threads} hilos")
+
+    rng = np.random.default_rng(seed)
+    tasks = []
+    for trial_id in range(1, trials + 1):
+        trial_dir = os.path.join(search_dir, f"trial_{trial_id:03d}")
+        os.makedirs(trial_dir, exist_ok=True)
+        tasks.append(
+            {
+                "trial_id": trial_id,
+                "params": sample_params(space, rng),
+                "trial_dir": trial_dir,
+                "snapshot_path": snapshot_path,
+                "train_idx": train_idx,
+                "val_idx": val_idx,
+                "epochs": max_epochs,
+                "initial_epoch": 0,
+                "patience": patience,
+                "prune_warmup": SEARCH_PRUNE_WARMUP,
+            }
+        )
+
+    if strategy == "random":
+
+        def with_median(task, results):
+            curves = [r["curve"] for r in results if r["status"] != "error"]
+            return {**task, "median_curve": median_curve(curves)}
+
+        records = run_in_process_pool(
+            run_trial, tasks, workers, threads, prepare=with_median
+        )
+    else:
+        records = _run_halving(tasks, workers, threads, min_epochs, max_epochs, eta)
+
+    leaderboard = write_leaderboard(search_dir, records)
+    result = {"search_dir": search_dir, "leaderboard": leaderboard, "version": None}
+    print(f"🏆 Mejor trial: {leaderboard[0]['trial_id']} (val_loss={leaderboard[0]['best_val_loss']})")
+
+    if promote:
+        result["version"] = promote_best_trial(leaderboard, word_ids, manifest.get("fingerprint"))
+    return result
+
+
+def _run_halving(tasks, workers, threads, min_epochs, max_epochs, eta):
+    """
+    Ejecuta successive halving: cada ronda continúa el entrenamiento del mejor `1/eta` de los trials.
+    """
+    records = {}
+    alive = tasks
+    previous = 0
+    budgets = _halving_budgets(min_epochs, max_epochs, eta)
+
+    for rung, budget in enumerate(budgets):
+        round_tasks = []
+        for task in alive:
+            last = records.get(task["trial_id"], {})
+            round_tasks.append(
+                {
+                    **task,
+                    "epochs": budget,
+                    "initial_epoch": previous,
+                    "curve": last.get("curve", []),
+                    "accuracy_curve": last.get("accuracy_curve", []),
+                    "duration_sec": last.get("duration_sec", 0.0),
+                }
+            )
+        print(f"🪜 Ronda {rung + 1}: {len(round_tasks)} trials hasta {budget} épocas")
+
+        for result in run_in_process_pool(run_trial, round_tasks, workers, threads):
+            records[result["trial_id"]] = result
+
+        if budget == max_epochs:
+            break
+
+        ranked = _rank([records[task["trial_id"]] for task in alive])
+        keep = {r["trial_id"] for r in ranked[: max(1, len(ranked) // eta)] if r["status"] != "error"}
+        for record in ranked:
+            if record["trial_id"] not in keep and record["status"] == "complete":
+                record["status"] = "pruned"
+        alive = [task for task in alive if task["trial_id"] in keep]
+        if not alive:
+            break
+        if len(alive) == 1:
+            # Un único trial restante: se entrena directamente hasta `max_epochs`
+            budgets[rung + 1 :] = [max_epochs]
+        previous = budget
+
+    return list(records.values())
+
+
+def promote_best_trial(leaderboard, word_ids, dataset_fingerprint):
+    """
+    Registra el mejor trial en el registro de modelos y lo promueve a producción.
+
+    Args:
+        leaderboard (list[dict]): Trials ordenados del mejor al peor.
+        word_ids (list[bytes]): IDs de palabras en el orden del snapshot.
+        dataset_fingerprint (str | None): Huella del snapshot usado.
+
+    Returns:
+        str | None: Versión registrada, o None si ningún trial terminó correctamente.
+    """
+    from keras.models import load_model
+    from ml.training.model_registry import promote_model, register_model
+
+    best = next((r for r in leaderboard if r["status"] == "complete"), None)
+    if best is None:
+        print("❌ Ningún trial terminó correctamente, no se promueve ningún modelo.")
+        return None
+
+    metrics = {
+        "val_loss": round(best["best_val_loss"], 4),
+        "val_accuracy": round(best["best_val_accuracy"], 4),
+        "best_epoch": best["best_epoch"],
+        "hyperparameters": best["params"],
+        "search_trial": best["trial_id"],
+    }
+    manifest = register_model(
+        load_model(best["model_path"]), word_ids, metrics, dataset_fingerprint
+    )
+    promote_model(manifest["version"])
+    return manifest["version"]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Búsqueda de hiperparámetros del modelo LSTM")
+    parser.add_argument("--strategy", choices=["random", "halving"], default="random")
+    parser.add_argument("--trials", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=SEARCH_WORKERS)
+    parser.add_argument("--threads", type=int, default=SEARCH_THREADS_PER_TRIAL)
+    parser.add_argument("--max-epochs", type=int, default=SEARCH_MAX_EPOCHS)
+    parser.add_argument("--min-epochs", type=int, default=10)
+    parser.add_argument("--promote", action="store_true")
+    args = parser.parse_args()
+
+    run_search(
+        strategy=args.strategy,
+        trials=args.trials,
+        workers=args.workers,
+        threads=args.threads,
+        max_epochs=args.max_epochs,
+        min_epochs=args.min_epochs,
+        promote=args.promote,
+    )
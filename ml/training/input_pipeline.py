@@ -0,0 +1,288 @@
+"""
+Pipeline de entrada `tf.data` para el entrenamiento del modelo.
+
+Separa la preparación de los datos del cómputo del modelo: mientras la red entrena un
+batch, `tf.data` prepara el siguiente en paralelo (`prefetch`). El pipeline aplica las
+etapas en este orden:
+
+1. Conversión de etiquetas a one-hot y de keypoints a float32.
+2. `cache`: guarda en memoria las muestras ya preparadas después de la primera época.
+3. `shuffle`: mezcla las muestras en cada época.
+4. `map` de aumentación (opcional), ejecutado en paralelo con `AUTOTUNE`.
+5. `batch` con tamaño configurable (`TRAINING_BATCH_SIZE`).
+6. `prefetch`, para solapar la preparación de datos con el entrenamiento.
+
+Las muestras provienen del snapshot en disco (`dataset_from_arrays`). Aunque el snapshot
+se abre como `np.memmap`, el dataset completo termina en RAM: la división en
+entrenamiento y validación (`train_test_split`, o la indexación por folds en la validación
+cruzada y la búsqueda de hiperparámetros) copia las secuencias, y
+`from_tensor_slices` las guarda como un tensor en memoria. En float16 ocupa
+`muestras × MODEL_FRAMES × LENGTH_KEYPOINTS × 2` bytes, más la copia en float32 de la
+etapa `cache`.
+
+Como algunas palabras tienen muchas más muestras que otras, el entrenamiento puede armar
+los batches por palabra (`TRAINING_SAMPLING`) en lugar de mezclar todo el dataset:
+- `balanced`: cada palabra tiene la misma probabilidad en cada batch.
+- `temperature`: la probabilidad de cada palabra es proporcional a `n^(1/T)`, un punto
+  intermedio entre el orden natural (`T=1`) y el balanceado (`T` grande).
+Además, `compute_class_weights` calcula pesos por palabra para la loss (`class_weight`).
+
+Funciones:
+- `dataset_from_arrays`: crea un `tf.data.Dataset` desde arrays (o memmaps) `(X, labels)`.
+- `augment_sequence`: aplica ruido gaussiano y escala aleatoria a una secuencia.
+- `build_input_pipeline`: aplica las etapas cache, shuffle, map, batch y prefetch.
+- `class_sampling_weights`: calcula la probabilidad de muestreo de cada palabra.
+- `compute_class_weights`: calcula los pesos por palabra para la loss.
+- `build_balanced_pipeline`: arma batches muestreando por palabra.
+- `build_training_pipeline`: elige el pipeline según `TRAINING_SAMPLING`.
+"""
+
+import numpy as np
+import tensorflow as tf
+
+from app.config import (
+    AUGMENT_NOISE_STD,
+    AUGMENT_SCALE_RANGE,
+    TRAINING_BATCH_SIZE,
+    TRAINING_SAMPLING,
+    TRAINING_SAMPLING_TEMPERATURE,
+    TRAINING_SHUFFLE_BUFFER,
+)
+
+SAMPLING_MODES = ("shuffle", "balanced", "temperature")
+
+
+def dataset_from_arrays(X, labels):
+    """
+    Crea un `tf.data.Dataset` de pares `(secuencia, etiqueta)` desde arrays en memoria.
+
+    Acepta los `np.memmap` devueltos por `load_or_build_snapshot`, pero los copia
+    completos a memoria (`from_tensor_slices` no lee el archivo de a partes).
+
+    Args:
+        X (np.ndarray): Secuencias `(muestras, MODEL_FRAMES, LENGTH_KEYPOINTS)`.
+        labels (np.ndarray): Etiquetas enteras de cada secuencia.
+
+    Returns:
+        tf.data.Dataset: Dataset de pares `(secuencia, etiqueta)` sin procesar.
+    """
+    return tf.data.Dataset.from_tensor_slices(
+        (np.asarray(X), np.asarray(labels, dtype="int32"))
+    )
+
+
+def augment_sequence(sequence, label):
+    """
+    Aumenta una secuencia de keypoints con una escala aleatoria y ruido gaussiano.
+
+    Los frames de relleno (todo ceros) se mantienen en cero para no inventar detecciones.
+
+    Args:
+        sequence (tf.Tensor): Secuencia `(MODEL_FRAMES, LENGTH_KEYPOINTS)` en float32.
+        label (tf.Tensor): Etiqueta one-hot (no se modifica).
+
+    Returns:
+        tuple[tf.Tensor, tf.Tensor]: Secuencia aumentada y la misma etiqueta.
+    """
+    scale = tf.random.uniform(
+        [], 1.0 - AUGMENT_SCALE_RANGE, 1.0 + AUGMENT_SCALE_RANGE
+    )
+    noise = tf.random.normal(tf.shape(sequence), stddev=AUGMENT_NOISE_STD)
+    mask = tf.cast(tf.reduce_any(sequence != 0.0, axis=-1, keepdims=True), tf.float32)
+    return (sequence * scale + noise) * mask, label
+
+
+def build_input_pipeline(
+    dataset,
+    num_classes,
+    batch_size=TRAINING_BATCH_SIZE,
+    shuffle=True,
+    augment=False,
+    cache=True,
+    shuffle_buffer=TRAINING_SHUFFLE_BUFFER,
+    seed=42,
+):
+    """
+    Aplica las etapas de preparación, cache, shuffle, aumentación, batch y prefetch.
+
+    Args:
+        dataset (tf.data.Dataset): Dataset de pares `(secuencia, etiqueta entera)`.
+        num_classes (int): Cantidad de palabras (longitud del vector one-hot).
+        batch_size (int, optional): Tamaño de batch. Default: `TRAINING_BATCH_SIZE`.
+        shuffle (bool, optional): Si es True, mezcla las muestras en cada época. Default: True.
+        augment (bool, optional): Si es True, aplica `augment_sequence` en paralelo. Default: False.
+        cache (bool, optional): Si es True, guarda en memoria las muestras preparadas. Default: True.
+        shuffle_buffer (int, optional): Tamaño del buffer de mezcla. Default: `TRAINING_SHUFFLE_BUFFER`.
+        seed (int, optional): Semilla del shuffle. Default: 42.
+
+    Returns:
+        tf.data.Dataset: Dataset de batches `(secuencias float32, etiquetas one-hot)`.
+    """
+    dataset = dataset.map(
+        lambda sequence, label: (
+            tf.cast(sequence, tf.float32),
+            tf.one_hot(label, num_classes),
+        ),
+        num_parallel_calls=tf.data.AUTOTUNE,
+    )
+    if cache:
+        dataset = dataset.cache()
+    if shuffle:
+        dataset = dataset.shuffle(
+            shuffle_buffer, seed=seed, reshuffle_each_iteration=True
+        )
+    if augment:
+        dataset = dataset.map(augment_sequence, num_parallel_calls=tf.data.AUTOTUNE)
+
+    return dataset.batch(batch_size).prefetch(tf.data.AUTOTUNE)
+
+
+def class_sampling_weights(counts, temperature=None):
+    """
+    Calcula la probabilidad de muestrear cada palabra al armar un batch.
+
+    Args:
+        counts (array-like): Muestras de cada palabra.
+        temperature (float | None, optional): Con None todas las palabras con muestras tienen
+            la misma probabilidad; si no, la probabilidad es proporcional a `n^(1/temperature)`.
+            Default: None.
+
+    Returns:
+        np.ndarray: Probabilidad de cada palabra (suma 1; cero para palabras sin muestras).
+    """
+    counts = np.asarray(counts, dtype="float64")
+    if temperature is None:
+        weights = (counts > 0).astype("float64")
+    else:
+        weights = counts ** (1.0 / temperature)
+    return weights / weights.sum()
+
+
+def compute_class_weights(labels, num_classes):
+    """
+    Calcula el peso de cada palabra en la loss, inversamente proporcional a sus muestras.
+
+    Con `N` muestras y `K` palabras, el peso de una palabra con `n` muestras es `N / (K * n)`,
+    por lo que una palabra con la cantidad media de muestras pesa 1.
+
+    Args:
+        labels (np.ndarray): Etiquetas enteras de las muestras de entrenamiento.
+        num_classes (int): Cantidad de palabras.
+
+    Returns:
+        dict[int, float]: Peso de cada palabra, para `model.fit(class_weight=...)`.
+    """
+    counts = np.bincount(np.asarray(labels), minlength=num_classes)
+    total, classes = counts.sum(), np.count_nonzero(counts)
+    return {
+        label: float(total / (classes * count)) if count else 0.0
+        for label, count in enumerate(counts)
+    }
+
+
+def build_balanced_pipeline(
+    X,
+    labels,
+    num_classes,
+    batch_size=TRAINING_BATCH_SIZE,
+    temperature=None,
+    augment=False,
+    seed=42,
+):
+    """
+    Arma batches muestreando primero una palabra y luego una de sus muestras.
+
+    Cada palabra tiene su propio dataset (en cache y mezclado en cada pasada), y
+    `sample_from_datasets` elige de cuál tomar cada muestra según `class_sampling_weights`.
+    Una época tiene la misma cantidad de batches que recorrer el dataset una vez, por lo
+    que las palabras con pocas muestras se repiten y las frecuentes se submuestrean.
+
+    Args:
+        X (np.ndarray): Secuencias `(muestras, MODEL_FRAMES, LENGTH_KEYPOINTS)`.
+        labels (np.ndarray): Etiquetas enteras de cada secuencia.
+        num_classes (int): Cantidad de palabras (longitud del vector one-hot).
+        batch_size (int, optional): Tamaño de batch. Default: `TRAINING_BATCH_SIZE`.
+        temperature (float | None, optional): Ver `class_sampling_weights`. Default: None (balanceado).
+        augment (bool, optional): Si es True, aplica `augment_sequence` en paralelo. Default: False.
+        seed (int, optional): Semilla del muestreo. Default: 42.
+
+    Returns:
+        tf.data.Dataset: Dataset finito de batches `(secuencias float32, etiquetas one-hot)`.
+    """
+    labels = np.asarray(labels)
+    counts = np.bincount(labels, minlength=num_classes)
+    weights = class_sampling_weights(counts, temperature)
+
+    datasets, dataset_weights = [], []
+    for label in np.flatnonzero(counts):
+        indices = np.flatnonzero(labels == label)
+        dataset = (
+            dataset_from_arrays(X[indices], labels[indices])
+            .map(
+                lambda sequence, label: (
+                    tf.cast(sequence, tf.float32),
+                    tf.one_hot(label, num_classes),
+                )
+            )
+            .cache()
+            .shuffle(len(indices), seed=seed + int(label), reshuffle_each_iteration=True)
+        )
+        datasets.append(dataset.repeat())
+        dataset_weights.append(float(weights[label]))
+
+    dataset = tf.data.Dataset.sample_from_datasets(
+        datasets, weights=dataset_weights, seed=seed, rerandomize_each_iteration=True
+    )
+    if augment:
+        dataset = dataset.map(augment_sequence, num_parallel_calls=tf.data.AUTOTUNE)
+
+    steps = int(np.ceil(len(labels) / batch_size))
+    return dataset.batch(batch_size).take(steps).prefetch(tf.data.AUTOTUNE)
+
+
+def build_training_pipeline(
+    X,
+    labels,
+    num_classes,
+    batch_size=TRAINING_BATCH_SIZE,
+    augment=False,
+    sampling=TRAINING_SAMPLING,
+    temperature=TRAINING_SAMPLING_TEMPERATURE,
+):
+    """
+    Arma el pipeline de entrenamiento según el modo de muestreo.
+
+    Args:
+        X (np.ndarray): Secuencias de entrenamiento.
+        labels (np.ndarray): Etiquetas enteras de cada secuencia.
+        num_classes (int): Cantidad de palabras.
+        batch_size (int, optional): Tamaño de batch. Default: `TRAINING_BATCH_SIZE`.
+        augment (bool, optional): Si es True, aumenta las secuencias. Default: False.
+        sampling (str, optional): `"shuffle"`, `"balanced"` o `"temperature"`. Default: `TRAINING_SAMPLING`.
+        temperature (float, optional): Temperatura del modo `"temperature"`. Default: `TRAINING_SAMPLING_TEMPERATURE`.
+
+    Returns:
+        tf.data.Dataset: Dataset de batches de entrenamiento.
+
+    Raises:
+        ValueError: Si el modo de muestreo no existe.
+    """
+    if sampling not in SAMPLING_MODES:
+        raise ValueError(
+            f"Modo de muestreo desconocido: {sampling} (disponibles: {', '.join(SAMPLING_MODES)})"
+        )
+    if sampling == "shuffle":
+        return build_input_pipeline(
+            dataset_from_arrays(X, labels),
+            num_classes,
+            batch_size=batch_size,
+            augment=augment,
+        )
+    return build_balanced_pipeline(
+        X,
+        labels,
+        num_classes,
+        batch_size=batch_size,
+        temperature=temperature if sampling == "temperature" else None,
+        augment=augment,
+    )
@@ -1,64 +1,243 @@
 """
-Definición del modelo LSTM para clasificación de lenguaje de señas.
+Definición de los modelos secuenciales para clasificación de lenguaje de señas.
 
-Este módulo construye y compila una red neuronal secuencial con arquitectura LSTM,
-diseñada para procesar secuencias de keypoints extraídos mediante MediaPipe.
+Este módulo construye y compila una red neuronal secuencial diseñada para procesar
+secuencias de keypoints extraídos mediante MediaPipe.
 
 Se utiliza como modelo base para entrenar el sistema de reconocimiento de señas,
 permitiendo clasificar cada muestra en una de las palabras del vocabulario.
 
-Funciones:
-- `get_model(output_length)`: Retorna un modelo LSTM compilado, listo para entrenamiento.
+Hay varias arquitecturas disponibles en `MODEL_BUILDERS`, todas con la misma entrada
+`(MODEL_FRAMES, LENGTH_KEYPOINTS)` y una salida softmax por palabra. La arquitectura se
+elige con `MODEL_ARCHITECTURE` (o el argumento `architecture` de `get_model`):
+- `lstm` (por defecto): dos capas LSTM con Dropout y regularización L2, Dense (ReLU) x2.
+- `gru`: igual que `lstm` pero con capas GRU, con menos parámetros por unidad.
+- `conv1d`: convoluciones temporales 1D y pooling global; no tiene pasos recurrentes,
+  por lo que es la más rápida en CPU para la inferencia en vivo.
+
+Los hiperparámetros de cada arquitectura se pueden cambiar por argumento, por ejemplo
+desde la búsqueda de hiperparámetros (`ml.training.hyperparameter_search`).
+
+La capa de salida siempre calcula en float32, para que el softmax sea estable también
+con precisión mixta bfloat16 (`ml.training.runtime`).
 
-Arquitectura del modelo:
-- LSTM (64 unidades) con Dropout y regularización L2
-- LSTM (128 unidades) con Dropout
-- Dense (64 unidades, ReLU) x2
-- Capa de salida Dense (Softmax) con longitud igual al número de clases
+Funciones:
+- `get_model(output_length, architecture, learning_rate, jit_compile, **hyperparams)`: Retorna un modelo compilado, listo para entrenamiento.
+- `build_lstm_model` / `build_gru_model` / `build_conv1d_model`: construyen cada arquitectura sin compilar.
 """
 
 
+from keras import Input
 from keras.models import Sequential
-from keras.layers import LSTM, Dense, Dropout
+from keras.layers import (
+    GRU,
+    LSTM,
+    Conv1D,
+    Dense,
+    Dropout,
+    GlobalAveragePooling1D,
+)
+from keras.optimizers import Adam
 from keras.regularizers import l2
 
-from app.config import LENGTH_KEYPOINTS, MODEL_FRAMES
+from app.config import LENGTH_KEYPOINTS, MODEL_ARCHITECTURE, MODEL_FRAMES, TRAINING_XLA
 
 
-def get_model(output_length: int):
+def build_lstm_model(
+    output_length,
+    lstm_units_1=64,
+    lstm_units_2=128,
+    dropout=0.5,
+    l2_first=0.01,
+    l2_rest=0.001,
+    dense_units=64,
+):
     """
-    Construye y compila un modelo LSTM para clasificación multiclase.
+    Construye el modelo LSTM (sin compilar).
 
     La arquitectura del modelo es:
-    - Capa LSTM (64 unidades) con regularización L2 y Dropout.
-    - Capa LSTM (128 unidades) con regularización L2 y Dropout.
-    - Dos capas Dense ocultas (64 unidades, activación ReLU).
+    - Capa LSTM (`lstm_units_1` unidades) con regularización L2 y Dropout.
+    - Capa LSTM (`lstm_units_2` unidades) con regularización L2 y Dropout.
+    - Dos capas Dense ocultas (`dense_units` unidades, activación ReLU).
     - Capa de salida Dense con activación softmax.
 
     Args:
         output_length (int): Número de clases de salida (longitud del vector softmax).
+        lstm_units_1 (int, optional): Unidades de la primera LSTM. Default: 64.
+        lstm_units_2 (int, optional): Unidades de la segunda LSTM. Default: 128.
+        dropout (float, optional): Tasa de Dropout después de cada LSTM. Default: 0.5.
+        l2_first (float, optional): Regularización L2 de la primera LSTM. Default: 0.01.
+        l2_rest (float, optional): Regularización L2 del resto de las capas. Default: 0.001.
+        dense_units (int, optional): Unidades de las capas Dense ocultas. Default: 64.
 
     Returns:
-        keras.models.Sequential: Modelo compilado listo para entrenamiento.
+        keras.models.Sequential: Modelo sin compilar.
     """
-    model = Sequential()
+    model = Sequential(name="lstm_classifier")
 
     model.add(
         LSTM(
-            64,
+            lstm_units_1,
             return_sequences=True,
             input_shape=(MODEL_FRAMES, LENGTH_KEYPOINTS),
-            kernel_regularizer=l2(0.01),
+            kernel_regularizer=l2(l2_first),
         )
     )
-    model.add(Dropout(0.5))
-    model.add(LSTM(128, return_sequences=False, kernel_regularizer=l2(0.001)))
-    model.add(Dropout(0.5))
-    model.add(Dense(64, activation="relu", kernel_regularizer=l2(0.001)))
-    model.add(Dense(64, activation="relu", kernel_regularizer=l2(0.001)))
-    model.add(Dense(output_length, activation="softmax"))
+    model.add(Dropout(dropout))
+    model.add(LSTM(lstm_units_2, return_sequences=False, kernel_regularizer=l2(l2_rest)))
+    model.add(Dropout(dropout))
+    model.add(Dense(dense_units, activation="relu", kernel_regularizer=l2(l2_rest)))
+    model.add(Dense(dense_units, activation="relu", kernel_regularizer=l2(l2_rest)))
+    model.add(Dense(output_length, activation="softmax", dtype="float32"))
+
+    return model
+
+
+def build_gru_model(
+    output_length,
+    gru_units_1=64,
+    gru_units_2=128,
+    dropout=0.5,
+    l2_first=0.01,
+    l2_rest=0.001,
+    dense_units=64,
+):
+    """
+    Construye el modelo GRU (sin compilar).
+
+    Tiene la misma estructura que `build_lstm_model`, con capas GRU en lugar de LSTM
+    (tres compuertas en lugar de cuatro, por lo que cada paso es más barato).
+
+    Args:
+        output_length (int): Número de clases de salida (longitud del vector softmax).
+        gru_units_1 (int, optional): Unidades de la primera GRU. Default: 64.
+        gru_units_2 (int, optional): Unidades de la segunda GRU. Default: 128.
+        dropout (float, optional): Tasa de Dropout después de cada GRU. Default: 0.5.
+        l2_first (float, optional): Regularización L2 de la primera GRU. Default: 0.01.
+        l2_rest (float, optional): Regularización L2 del resto de las capas. Default: 0.001.
+        dense_units (int, optional): Unidades de las capas Dense ocultas. Default: 64.
+
+    Returns:
+        keras.models.Sequential: Modelo sin compilar.
+    """
+    return Sequential(
+        [
+            Input(shape=(MODEL_FRAMES, LENGTH_KEYPOINTS)),
+            GRU(gru_units_1, return_sequences=True, kernel_regularizer=l2(l2_first)),
+            Dropout(dropout),
+            GRU(gru_units_2, return_sequences=False, kernel_regularizer=l2(l2_rest)),
+            Dropout(dropout),
+            Dense(dense_units, activation="relu", kernel_regularizer=l2(l2_rest)),
+            Dense(dense_units, activation="relu", kernel_regularizer=l2(l2_rest)),
+            Dense(output_length, activation="softmax", dtype="float32"),
+        ],
+        name="gru_classifier",
+    )
+
+
+def build_conv1d_model(
+    output_length,
+    filters_1=64,
+    filters_2=128,
+    kernel_size=3,
+    dropout=0.3,
+    l2_first=0.01,
+    l2_rest=0.001,
+    dense_units=64,
+):
+    """
+    Construye el modelo de convoluciones temporales 1D (sin compilar).
+
+    La arquitectura del modelo es:
+    - Capa Conv1D (`filters_1` filtros) sobre los frames, con regularización L2 y Dropout.
+    - Capa Conv1D (`filters_2` filtros, dilatación 2) para ampliar el contexto temporal.
+    - Pooling promedio global sobre los frames.
+    - Capa Dense oculta (`dense_units` unidades, activación ReLU).
+    - Capa de salida Dense con activación softmax.
+
+    Args:
+        output_length (int): Número de clases de salida (longitud del vector softmax).
+        filters_1 (int, optional): Filtros de la primera convolución. Default: 64.
+        filters_2 (int, optional): Filtros de la segunda convolución. Default: 128.
+        kernel_size (int, optional): Frames que abarca cada filtro. Default: 3.
+        dropout (float, optional): Tasa de Dropout después de cada convolución. Default: 0.3.
+        l2_first (float, optional): Regularización L2 de la primera convolución. Default: 0.01.
+        l2_rest (float, optional): Regularización L2 del resto de las capas. Default: 0.001.
+        dense_units (int, optional): Unidades de la capa Dense oculta. Default: 64.
+
+    Returns:
+        keras.models.Sequential: Modelo sin compilar.
+    """
+    return Sequential(
+        [
+            Input(shape=(MODEL_FRAMES, LENGTH_KEYPOINTS)),
+            Conv1D(
+                filters_1,
+                kernel_size,
+                padding="same",
+                activation="relu",
+                kernel_regularizer=l2(l2_first),
+            ),
+            Dropout(dropout),
+            Conv1D(
+                filters_2,
+                kernel_size,
+                padding="same",
+                dilation_rate=2,
+                activation="relu",
+                kernel_regularizer=l2(l2_rest),
+            ),
+            Dropout(dropout),
+            GlobalAveragePooling1D(),
+            Dense(dense_units, activation="relu", kernel_regularizer=l2(l2_rest)),
+            Dense(output_length, activation="softmax", dtype="float32"),
+        ],
+        name="conv1d_classifier",
+    )
+
+
+MODEL_BUILDERS = {
+    "lstm": build_lstm_model,
+    "gru": build_gru_model,
+    "conv1d": build_conv1d_model,
+}
+
+
+def get_model(
+    output_length: int,
+    architecture=MODEL_ARCHITECTURE,
+    learning_rate=0.001,
+    jit_compile=TRAINING_XLA,
+    **hyperparams,
+):
+    """
+    Construye y compila un modelo para clasificación multiclase.
+
+    Args:
+        output_length (int): Número de clases de salida (longitud del vector softmax).
+        architecture (str, optional): Clave de `MODEL_BUILDERS`. Default: `MODEL_ARCHITECTURE`.
+        learning_rate (float, optional): Tasa de aprendizaje de Adam. Default: 0.001.
+        jit_compile (bool, optional): Compilar el paso de entrenamiento con XLA. Default: `TRAINING_XLA`.
+        **hyperparams: Hiperparámetros de la arquitectura (ver cada `build_*_model`).
+
+    Returns:
+        keras.models.Sequential: Modelo compilado listo para entrenamiento.
+
+    Raises:
+        ValueError: Si la arquitectura no existe.
+    """
+    if architecture not in MODEL_BUILDERS:
+        raise ValueError(
+            f"Arquitectura desconocida: {architecture} "
+            f"(disponibles: {', '.join(MODEL_BUILDERS)})"
+        )
+
+    model = MODEL_BUILDERS[architecture](output_length, **hyperparams)
     model.compile(
-        optimizer="adam", loss="categorical_crossentropy", metrics=["accuracy"]
+        optimizer=Adam(learning_rate=learning_rate),
+        loss="categorical_crossentropy",
+        metrics=["accuracy"],
+        jit_compile=jit_compile,
     )
 
     return model
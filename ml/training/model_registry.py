@@ -0,0 +1,354 @@
+"""
+Registro versionado de modelos entrenados.
+
+Cada entrenamiento se guarda como una versión nueva en lugar de sobrescribir un único
+archivo. Cada versión incluye un manifiesto con todo lo necesario para usar el modelo
+sin depender del estado actual de la base de datos, en particular el orden de las
+palabras (el índice de salida del softmax).
+
+Estructura en disco (`MODEL_REGISTRY_PATH/`):
+- `<modelo>/v0001/model.keras`: modelo entrenado.
+- `<modelo>/v0001/manifest.json`: `word_ids` ordenados, conjunto de features,
+  `MODEL_FRAMES`, métricas, huella del snapshot del dataset y archivos derivados
+  (`artifacts`).
+- `<modelo>/production.json`: versión en producción. Se reemplaza de forma atómica
+  (`os.replace`), por lo que los procesos de predicción nunca leen un estado intermedio.
+
+Funciones:
+- `register_model`: guarda un modelo como nueva versión.
+- `promote_model`: marca una versión como la de producción.
+- `list_versions`: lista los manifiestos de todas las versiones.
+- `read_version_manifest`: lee el manifiesto de una versión.
+- `get_production_version`: devuelve la versión en producción.
+- `load_production_manifest`: devuelve el manifiesto de la versión en producción.
+- `model_file_path`: devuelve la ruta del archivo del modelo de una versión.
+- `add_version_artifact`: agrega a una versión un archivo derivado del modelo (por ejemplo,
+  su conversión a TensorFlow Lite).
+- `artifact_file_path`: devuelve la ruta de un archivo derivado de una versión.
+"""
+
+import os, json, tempfile
+
+from datetime import datetime
+
+from app.config import (
+    LENGTH_KEYPOINTS,
+    MODEL_FRAMES,
+    MODEL_NAME,
+    MODEL_REGISTRY_PATH,
+)
+
+MANIFEST_FILE = "manifest.json"
+MODEL_FILE = "model.keras"
+PRODUCTION_FILE = "production.json"
+FEATURE_SET = "mediapipe_holistic"
+
+
+def _model_root(model_name, registry_path):
+    return os.path.join(registry_path, model_name)
+
+
+def _write_json_atomic(path, data):
+    """
+    Escribe un JSON en un archivo temporal y lo renombra sobre el destino.
+
+    Cada escritura usa su propio archivo temporal (`tempfile.mkstemp`), por lo que dos
+    workers que registran o promueven a la vez nunca publican un JSON a medio escribir.
+    """
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path), prefix=f"{os.path.basename(path)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=2)
+        os.chmod(tmp_path, 0o644)  # mkstemp crea el archivo solo para el dueño
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _next_version_dir(root):
+    """
+    Reserva la carpeta de la próxima versión (`v0001`, `v0002`, ...).
+
+    La carpeta se crea con `os.mkdir`, que falla si ya existe, por lo que dos
+    entrenamientos simultáneos nunca reciben la misma versión.
+    """
+    os.makedirs(root, exist_ok=True)
+    existing = [
+        int(name[1:])
+        for name in os.listdir(root)
+        if name.startswith("v") and name[1:].isdigit()
+    ]
+    number = max(existing, default=0) + 1
+    while True:
+        version = f"v{number:04d}"
+        try:
+            os.mkdir(os.path.join(root, version))
+            return version
+        except FileExistsError:
+            number += 1
+
+
+def register_model(
+    model,
+    word_ids,
+    metrics,
+    dataset_fingerprint,
+    model_name=MODEL_NAME,
+    registry_path=MODEL_REGISTRY_PATH,
+    parent_version=None,
+):
+    """
+    Guarda un modelo entrenado como una nueva versión del registro.
+
+    El manifiesto se escribe al final, por lo que una versión sin manifiesto es una
+    versión incompleta y se ignora en `list_versions`.
+
+    Args:
+        model (keras.Model): Modelo entrenado.
+        word_ids (list[bytes]): IDs de palabras en el orden de las salidas del modelo.
+        metrics (dict): Métricas del entrenamiento.
+        dataset_fingerprint (str | None): Huella del snapshot del dataset usado.
+        model_name (str, optional): Nombre del modelo. Default: `MODEL_NAME`.
+        registry_path (str, optional): Carpeta del registro. Default: `MODEL_REGISTRY_PATH`.
+        parent_version (str, optional): Versión de la que parte el modelo, si se obtuvo
+            por ajuste incremental. Default: None.
+
+    Returns:
+        dict: Manifiesto de la versión registrada.
+    """
+    root = _model_root(model_name, registry_path)
+    version = _next_version_dir(root)
+    version_path = os.path.join(root, version)
+
+    model.save(os.path.join(version_path, MODEL_FILE))
+
+    manifest = {
+        "version": version,
+        "model_name": model_name,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "model_file": MODEL_FILE,
+        "word_ids": [word_id.hex() for word_id in word_ids],
+        "feature_set": FEATURE_SET,
+        "length_keypoints": LENGTH_KEYPOINTS,
+        "model_frames": MODEL_FRAMES,
+        "metrics": metrics,
+        "dataset_fingerprint": dataset_fingerprint,
+        "parent_version": parent_version,
+    }
+    _write_json_atomic(os.path.join(version_path, MANIFEST_FILE), manifest)
+
+    print(f"📦 Modelo registrado: {model_name} {version}")
+    return manifest
+
+
+def read_version_manifest(
+    version, model_name=MODEL_NAME, registry_path=MODEL_REGISTRY_PATH
+):
+    """
+    Lee el manifiesto de una versión.
+
+    Args:
+        version (str): Versión (por ejemplo, `v0003`).
+        model_name (str, optional): Nombre del modelo. Default: `MODEL_NAME`.
+        registry_path (str, optional): Carpeta del registro. Default: `MODEL_REGISTRY_PATH`.
+
+    Returns:
+        dict | None: Manifiesto, o None si la versión no existe o está incompleta.
+    """
+    path = os.path.join(_model_root(model_name, registry_path), version, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def list_versions(model_name=MODEL_NAME, registry_path=MODEL_REGISTRY_PATH):
+    """
+    Lista las versiones registradas de un modelo, de la más antigua a la más nueva.
+
+    Args:
+        model_name (str, optional): Nombre del modelo. Default: `MODEL_NAME`.
+        registry_path (str, optional): Carpeta del registro. Default: `MODEL_REGISTRY_PATH`.
+
+    Returns:
+        list[dict]: Manifiestos de las versiones completas, con la clave `production`
+        indicando cuál está en producción.
+    """
+    root = _model_root(model_name, registry_path)
+    if not os.path.isdir(root):
+        return []
+
+    production = get_production_version(model_name, registry_path)
+    versions = []
+    for name in sorted(os.listdir(root)):
+        manifest = read_version_manifest(name, model_name, registry_path)
+        if manifest is not None:
+            versions.append({**manifest, "production": name == production})
+    return versions
+
+
+def promote_model(version, model_name=MODEL_NAME, registry_path=MODEL_REGISTRY_PATH):
+    """
+    Marca una versión como la versión en producción.
+
+    El puntero `production.json` se reemplaza de forma atómica. Los procesos de
+    predicción detectan el cambio y recargan el modelo sin reiniciar Flask.
+
+    Args:
+        version (str): Versión a promover.
+        model_name (str, optional): Nombre del modelo. Default: `MODEL_NAME`.
+        registry_path (str, optional): Carpeta del registro. Default: `MODEL_REGISTRY_PATH`.
+
+    Returns:
+        dict: Manifiesto de la versión promovida.
+
+    Raises:
+        ValueError: Si la versión no existe o no es compatible con la configuración actual.
+    """
+    manifest = read_version_manifest(version, model_name, registry_path)
+    if manifest is None:
+        raise ValueError(f"La versión {version} no existe en el registro")
+    if (
+        manifest["model_frames"] != MODEL_FRAMES
+        or manifest["length_keypoints"] != LENGTH_KEYPOINTS
+    ):
+        raise ValueError(
+            f"La versión {version} usa {manifest['model_frames']} frames de "
+            f"{manifest['length_keypoints']} keypoints y no es compatible con la configuración actual"
+        )
+
+    _write_json_atomic(
+        os.path.join(_model_root(model_name, registry_path), PRODUCTION_FILE),
+        {"version": version, "promoted_at": datetime.now().isoformat(timespec="seconds")},
+    )
+    print(f"🚀 Versión {version} de {model_name} promovida a producción")
+    return manifest
+
+
+def get_production_version(model_name=MODEL_NAME, registry_path=MODEL_REGISTRY_PATH):
+    """
+    Devuelve la versión en producción de un modelo.
+
+    Es una lectura pequeña, pensada para consultarse periódicamente desde los
+    procesos de predicción.
+
+    Args:
+        model_name (str, optional): Nombre del modelo. Default: `MODEL_NAME`.
+        registry_path (str, optional): Carpeta del registro. Default: `MODEL_REGISTRY_PATH`.
+
+    Returns:
+        str | None: Versión en producción, o None si no hay ninguna.
+    """
+    path = os.path.join(_model_root(model_name, registry_path), PRODUCTION_FILE)
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)["version"]
+    except FileNotFoundError:
+        return None
+
+
+def load_production_manifest(model_name=MODEL_NAME, registry_path=MODEL_REGISTRY_PATH):
+    """
+    Devuelve el manifiesto de la versión en producción.
+
+    Args:
+        model_name (str, optional): Nombre del modelo. Default: `MODEL_NAME`.
+        registry_path (str, optional): Carpeta del registro. Default: `MODEL_REGISTRY_PATH`.
+
+    Returns:
+        dict | None: Manifiesto, o None si no hay versión en producción.
+    """
+    version = get_production_version(model_name, registry_path)
+    if version is None:
+        return None
+    return read_version_manifest(version, model_name, registry_path)
+
+
+def model_file_path(manifest, registry_path=MODEL_REGISTRY_PATH):
+    """
+    Devuelve la ruta del archivo del modelo de una versión.
+
+    Args:
+        manifest (dict): Manifiesto de la versión.
+        registry_path (str, optional): Carpeta del registro. Default: `MODEL_REGISTRY_PATH`.
+
+    Returns:
+        str: Ruta del archivo `.keras`.
+    """
+    return os.path.join(
+        _model_root(manifest["model_name"], registry_path),
+        manifest["version"],
+        manifest["model_file"],
+    )
+
+
+def add_version_artifact(
+    version,
+    key,
+    file_name,
+    content,
+    info=None,
+    model_name=MODEL_NAME,
+    registry_path=MODEL_REGISTRY_PATH,
+):
+    """
+    Guarda un archivo derivado del modelo en la carpeta de una versión y lo anota en su manifiesto.
+
+    El archivo y el manifiesto se escriben de forma atómica, por lo que un proceso de
+    predicción nunca ve un artefacto anotado pero incompleto.
+
+    Args:
+        version (str): Versión existente.
+        key (str): Nombre del artefacto en `manifest["artifacts"]` (por ejemplo, `"tflite"`).
+        file_name (str): Nombre del archivo dentro de la carpeta de la versión.
+        content (bytes): Contenido del archivo.
+        info (dict, optional): Datos adicionales a anotar junto al archivo. Default: None.
+        model_name (str, optional): Nombre del modelo. Default: `MODEL_NAME`.
+        registry_path (str, optional): Carpeta del registro. Default: `MODEL_REGISTRY_PATH`.
+
+    Returns:
+        dict: Manifiesto actualizado.
+
+    Raises:
+        ValueError: Si la versión no existe.
+    """
+    manifest = read_version_manifest(version, model_name, registry_path)
+    if manifest is None:
+        raise ValueError(f"La versión {version} de {model_name} no existe")
+
+    version_path = os.path.join(_model_root(model_name, registry_path), version)
+    tmp_path = os.path.join(version_path, f"{file_name}.tmp")
+    with open(tmp_path, "wb") as file:
+        file.write(content)
+    os.replace(tmp_path, os.path.join(version_path, file_name))
+
+    artifacts = manifest.setdefault("artifacts", {})
+    artifacts[key] = {"file": file_name, "bytes": len(content), **(info or {})}
+    _write_json_atomic(os.path.join(version_path, MANIFEST_FILE), manifest)
+    return manifest
+
+
+def artifact_file_path(manifest, key, registry_path=MODEL_REGISTRY_PATH):
+    """
+    Devuelve la ruta de un archivo derivado de una versión.
+
+    Args:
+        manifest (dict): Manifiesto de la versión.
+        key (str): Nombre del artefacto en `manifest["artifacts"]`.
+        registry_path (str, optional): Carpeta del registro. Default: `MODEL_REGISTRY_PATH`.
+
+    Returns:
+        str | None: Ruta del archivo, o None si la versión no tiene ese artefacto.
+    """
+    artifact = manifest.get("artifacts", {}).get(key)
+    if artifact is None:
+        return None
+    return os.path.join(
+        _model_root(manifest["model_name"], registry_path),
+        manifest["version"],
+        artifact["file"],
+    )
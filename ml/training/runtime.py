@@ -0,0 +1,241 @@
+"""
+Configuración del runtime de TensorFlow para entrenar en CPU.
+
+Los hosts de entrenamiento no tienen GPU, por lo que el tiempo por época depende de
+cómo TensorFlow usa la CPU. Este módulo aplica, antes de crear el modelo:
+- Pools de hilos explícitos (`TRAINING_INTRA_OP_THREADS`, `TRAINING_INTER_OP_THREADS`).
+- Precisión mixta bfloat16 (`TRAINING_MIXED_PRECISION`), solo si la CPU tiene
+  instrucciones bfloat16 (AVX512_BF16 o AMX). Los pesos se mantienen en float32 y la capa
+  de salida calcula el softmax en float32.
+- Semilla global y operaciones deterministas (`TRAINING_SEED`, `TRAINING_DETERMINISTIC`)
+  para entrenamientos reproducibles.
+
+La compilación XLA del paso de entrenamiento (`TRAINING_XLA`) se aplica al compilar el
+modelo (`get_model(jit_compile=...)`), ya que Keras la desactiva por defecto en CPU.
+
+Los pools de hilos solo se pueden fijar antes de que TensorFlow ejecute su primera
+operación, por lo que `configure_training_runtime` debe llamarse al inicio del proceso de
+entrenamiento. `benchmark_runtime` mide cada configuración en un proceso nuevo.
+
+Uso:
+    python -m ml.training.runtime --threads 4
+
+Funciones:
+- `cpu_supports_bfloat16`: indica si la CPU tiene instrucciones bfloat16.
+- `configure_training_runtime`: aplica la configuración del runtime.
+- `benchmark_runtime`: compara el tiempo por época entre configuraciones.
+"""
+
+import os, argparse
+import numpy as np
+import multiprocessing as mp
+
+from concurrent.futures import ProcessPoolExecutor
+
+from app.config import (
+    TRAINING_BATCH_SIZE,
+    TRAINING_DETERMINISTIC,
+    TRAINING_INTER_OP_THREADS,
+    TRAINING_INTRA_OP_THREADS,
+    TRAINING_MIXED_PRECISION,
+    TRAINING_SEED,
+)
+
+BF16_CPU_FLAGS = ("avx512_bf16", "amx_bf16")
+
+
+def cpu_supports_bfloat16():
+    """
+    Indica si la CPU tiene instrucciones bfloat16 (lee `/proc/cpuinfo`, solo Linux).
+
+    Returns:
+        bool: True si la CPU declara AVX512_BF16 o AMX_BF16.
+    """
+    try:
+        with open("/proc/cpuinfo", "r", encoding="utf-8") as file:
+            for line in file:
+                if line.startswith("flags"):
+                    flags = line.split(":", 1)[1].split()
+                    return any(flag in flags for flag in BF16_CPU_FLAGS)
+    except OSError:
+        pass
+    return False
+
+
+def configure_training_runtime(
+    intra_op_threads=TRAINING_INTRA_OP_THREADS,
+    inter_op_threads=TRAINING_INTER_OP_THREADS,
+    mixed_precision=TRAINING_MIXED_PRECISION,
+    seed=TRAINING_SEED,
+    deterministic=TRAINING_DETERMINISTIC,
+):
+    """
+    Aplica la configuración del runtime de TensorFlow para el proceso actual.
+
+    Args:
+        intra_op_threads (int, optional): Hilos por operación (0: automático). Default: `TRAINING_INTRA_OP_THREADS`.
+        inter_op_threads (int, optional): Operaciones en paralelo (0: automático). Default: `TRAINING_INTER_OP_THREADS`.
+        mixed_precision (bool, optional): Usar bfloat16 mixto si la CPU lo soporta. Default: `TRAINING_MIXED_PRECISION`.
+        seed (int | None, optional): Semilla global (None: sin fijar). Default: `TRAINING_SEED`.
+        deterministic (bool, optional): Activar operaciones deterministas. Default: `TRAINING_DETERMINISTIC`.
+
+    Returns:
+        dict: Configuración efectivamente aplicada (`intra_op_threads`, `inter_op_threads`,
+        `precision`, `seed`, `deterministic`).
+    """
+    import keras
+    import tensorflow as tf
+
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(intra_op_threads)
+        tf.config.threading.set_inter_op_parallelism_threads(inter_op_threads)
+    except RuntimeError:
+        # TensorFlow ya ejecutó operaciones en este proceso
+        if intra_op_threads or inter_op_threads:
+            print("⚠️ TensorFlow ya estaba inicializado, no se pudieron fijar sus hilos.")
+
+    precision = "float32"
+    if mixed_precision:
+        if cpu_supports_bfloat16():
+            precision = "mixed_bfloat16"
+        else:
+            print("⚠️ La CPU no soporta bfloat16, se entrenará en float32.")
+    keras.mixed_precision.set_global_policy(precision)
+
+    if seed is not None:
+        keras.utils.set_random_seed(seed)
+    if deterministic:
+        tf.config.experimental.enable_op_determinism()
+
+    settings = {
+        "intra_op_threads": tf.config.threading.get_intra_op_parallelism_threads(),
+        "inter_op_threads": tf.config.threading.get_inter_op_parallelism_threads(),
+        "precision": precision,
+        "seed": seed,
+        "deterministic": deterministic,
+    }
+    print(f"⚙️ Runtime de entrenamiento: {settings}")
+    return settings
+
+
+def _measure_epoch_time(task):
+    """
+    Aplica una configuración y mide el tiempo por época. Se ejecuta en un proceso nuevo.
+    """
+    from ml.training.callbacks import ThroughputLogger
+    from ml.training.model import get_model
+    from app.config import LENGTH_KEYPOINTS, MODEL_FRAMES
+
+    settings = configure_training_runtime(
+        intra_op_threads=task["threads"],
+        inter_op_threads=task["inter_op_threads"],
+        mixed_precision=task["mixed_precision"],
+        seed=0,
+    )
+    samples, num_classes = task["samples"], task["num_classes"]
+    X = np.random.rand(samples, MODEL_FRAMES, LENGTH_KEYPOINTS).astype("float16")
+    y = np.eye(num_classes, dtype="float32")[np.random.randint(num_classes, size=samples)]
+
+    model = get_model(
+        num_classes, architecture=task["architecture"], jit_compile=task["xla"]
+    )
+    history = model.fit(
+        X,
+        y,
+        batch_size=task["batch_size"],
+        epochs=task["epochs"] + 1,
+        verbose=0,
+        callbacks=[ThroughputLogger(samples)],
+    )
+    # La primera época incluye la compilación del grafo y no se cuenta
+    samples_per_sec = float(np.median(history.history["samples_per_sec"][1:]))
+    return {
+        "name": task["name"],
+        **settings,
+        "xla": task["xla"],
+        "epoch_sec": round(samples / samples_per_sec, 3),
+        "samples_per_sec": round(samples_per_sec, 1),
+    }
+
+
+def benchmark_runtime(
+    threads=None,
+    architecture="lstm",
+    num_classes=20,
+    samples=512,
+    epochs=3,
+    batch_size=TRAINING_BATCH_SIZE,
+):
+    """
+    Compara el tiempo por época de entrenamiento entre configuraciones del runtime.
+
+    Cada configuración se mide en un proceso nuevo (`spawn`), porque los pools de hilos y
+    la política de precisión no se pueden cambiar una vez que TensorFlow se inicializa.
+    Las configuraciones con bfloat16 se omiten si la CPU no lo soporta.
+
+    Args:
+        threads (int, optional): Hilos por operación de las configuraciones ajustadas. Default: `os.cpu_count()`.
+        architecture (str, optional): Arquitectura del modelo. Default: `"lstm"`.
+        num_classes (int, optional): Cantidad de palabras de salida. Default: 20.
+        samples (int, optional): Muestras aleatorias de entrenamiento. Default: 512.
+        epochs (int, optional): Épocas medidas por configuración. Default: 3.
+        batch_size (int, optional): Tamaño de batch. Default: `TRAINING_BATCH_SIZE`.
+
+    Returns:
+        list[dict]: Resultado de cada configuración.
+    """
+    threads = threads or os.cpu_count()
+    settings = [
+        ("default", 0, 0, False, False),
+        ("threads", threads, 1, False, False),
+        ("threads+xla", threads, 1, False, True),
+    ]
+    if cpu_supports_bfloat16():
+        settings += [
+            ("threads+bf16", threads, 1, True, False),
+            ("threads+bf16+xla", threads, 1, True, True),
+        ]
+
+    results = []
+    for name, intra, inter, mixed, xla in settings:
+        print(f"⏱️ Midiendo configuración {name}")
+        task = {
+            "name": name,
+            "threads": intra,
+            "inter_op_threads": inter,
+            "mixed_precision": mixed,
+            "xla": xla,
+            "architecture": architecture,
+            "num_classes": num_classes,
+            "samples": samples,
+            "epochs": epochs,
+            "batch_size": batch_size,
+        }
+        with ProcessPoolExecutor(1, mp_context=mp.get_context("spawn")) as executor:
+            results.append(executor.submit(_measure_epoch_time, task).result())
+
+    baseline = results[0]["epoch_sec"]
+    print("configuración | hilos | precisión | xla | s/época | speedup")
+    for result in results:
+        result["speedup"] = round(baseline / result["epoch_sec"], 2)
+        print(
+            f"{result['name']} | {result['intra_op_threads']} | {result['precision']} | "
+            f"{result['xla']} | {result['epoch_sec']} | {result['speedup']}x"
+        )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark del runtime de entrenamiento en CPU")
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--architecture", default="lstm")
+    parser.add_argument("--samples", type=int, default=512)
+    parser.add_argument("--epochs", type=int, default=3)
+    args = parser.parse_args()
+
+    benchmark_runtime(
+        threads=args.threads,
+        architecture=args.architecture,
+        samples=args.samples,
+        epochs=args.epochs,
+    )
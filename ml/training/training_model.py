@@ -1,93 +1,189 @@
 """
 Entrenamiento del modelo de reconocimiento de lenguaje de señas.
 
-Este módulo carga los keypoints almacenados en la base de datos, prepara los datos
-(ajustando secuencias y etiquetas), entrena un modelo LSTM y guarda el modelo final.
+Este módulo carga el dataset de keypoints, entrena un modelo LSTM y registra el modelo final.
 
 Incluye:
-- Carga y preprocesamiento de los datos (padded sequences, one-hot labels)
+- Carga del dataset desde el snapshot en disco (`ml.training.dataset_snapshot`), que solo
+  se reconstruye desde la base de datos cuando cambian los keypoints
 - División en training y validation sets
-- Entrenamiento del modelo LSTM definido en `ml.training.model`
-- Guardado del modelo en `MODEL_PATH`
+- Pipeline de entrada `tf.data` (`ml.training.input_pipeline`) con cache, shuffle,
+  aumentación opcional, batch y prefetch, o con batches balanceados por palabra
+  (`TRAINING_SAMPLING`) y pesos por palabra en la loss (`TRAINING_CLASS_WEIGHTS`)
+- Registro del rendimiento (muestras por segundo) en cada época
+- Configuración del runtime de TensorFlow en CPU (`ml.training.runtime`): hilos, precisión
+  mixta bfloat16, XLA y semilla
+- Entrenamiento del modelo definido en `ml.training.model`, con la arquitectura `MODEL_ARCHITECTURE`
+- Parada temprana sobre `val_loss` y checkpoints (`ml.training.checkpoints`), con opción
+  de continuar un entrenamiento interrumpido desde el último checkpoint
+- Registro del mejor modelo como nueva versión en el registro de modelos
+  (`ml.training.model_registry`) y promoción a producción si `AUTO_PROMOTE_MODELS`
 - Retorno de métricas finales para visualización en interfaz web
 
 Funciones:
-- training_model(epochs=500): ejecuta todo el pipeline de entrenamiento y retorna métricas clave.
+- training_model(epochs=500, batch_size=TRAINING_BATCH_SIZE, augment=TRAINING_AUGMENT, callbacks=None, resume=False, patience=EARLY_STOPPING_PATIENCE, architecture=MODEL_ARCHITECTURE, sampling=TRAINING_SAMPLING, class_weights=TRAINING_CLASS_WEIGHTS): ejecuta todo el pipeline de entrenamiento y retorna métricas clave.
 """
 
 
+
+import os
 import numpy as np
 
-from tensorflow.keras.preprocessing.sequence import pad_sequences
 from sklearn.model_selection import train_test_split
-from keras.utils import to_categorical
+from keras.models import load_model
 
 from ml.training.model import get_model
-from ml.utils.training_utils import get_sequences_and_labels
-from app.database.database_utils import fetch_word_ids_with_keypoints
-from app.config import MODEL_FRAMES, MODEL_PATH
-
-
-def training_model(epochs=500):
+from ml.training.callbacks import ThroughputLogger
+from ml.training.checkpoints import (
+    TrainingController,
+    checkpoint_dir,
+    clear_checkpoints,
+    load_resume_checkpoint,
+)
+from ml.training.model_registry import promote_model, register_model
+from ml.training.runtime import configure_training_runtime
+from ml.training.dataset_snapshot import load_or_build_snapshot
+from ml.training.input_pipeline import (
+    build_input_pipeline,
+    build_training_pipeline,
+    compute_class_weights,
+    dataset_from_arrays,
+)
+from app.config import (
+    AUTO_PROMOTE_MODELS,
+    EARLY_STOPPING_PATIENCE,
+    MODEL_ARCHITECTURE,
+    TRAINING_AUGMENT,
+    TRAINING_BATCH_SIZE,
+    TRAINING_CLASS_WEIGHTS,
+    TRAINING_SAMPLING,
+)
+from app.services.metrics import track_training
+
+
+@track_training
+def training_model(
+    epochs=500,
+    batch_size=TRAINING_BATCH_SIZE,
+    augment=TRAINING_AUGMENT,
+    callbacks=None,
+    resume=False,
+    patience=EARLY_STOPPING_PATIENCE,
+    architecture=MODEL_ARCHITECTURE,
+    sampling=TRAINING_SAMPLING,
+    class_weights=TRAINING_CLASS_WEIGHTS,
+):
     """
     Ejecuta el pipeline completo de entrenamiento del modelo LSTM.
 
-    Incluye la carga de datos, preparación de secuencias, entrenamiento
-    y guardado del modelo. Retorna un resumen con métricas finales.
+    Incluye la carga de datos (desde el snapshot del dataset), entrenamiento
+    y guardado del modelo. El entrenamiento se detiene antes de `epochs` si `val_loss`
+    no mejora durante `patience` épocas, y se guarda el modelo de la mejor época.
+    Retorna un resumen con las métricas de esa época. Cada ejecución y su duración se
+    registran en las métricas de `/metrics` (`app.services.metrics`).
 
     Args:
         epochs (int): Cantidad de épocas de entrenamiento (por defecto 500).
+        batch_size (int): Tamaño de batch (por defecto `TRAINING_BATCH_SIZE`).
+        augment (bool): Si es True, aumenta las secuencias de entrenamiento en cada época.
+        callbacks (list, optional): Callbacks de Keras adicionales (por ejemplo, para
+            reportar el progreso o cancelar el entrenamiento).
+        resume (bool): Si es True, continúa desde el último checkpoint si el dataset no cambió.
+        patience (int): Épocas sin mejora de `val_loss` antes de detener el entrenamiento.
+        architecture (str): Arquitectura del modelo (ver `MODEL_BUILDERS`, por defecto `MODEL_ARCHITECTURE`).
+        sampling (str): Armado de los batches: `"shuffle"`, `"balanced"` o `"temperature"`
+            (por defecto `TRAINING_SAMPLING`).
+        class_weights (bool): Si es True, pesa la loss por la inversa de las muestras de cada palabra.
 
     Returns:
-        dict: Diccionario con métricas finales: accuracy, val_accuracy, loss, val_loss, etc.
+        dict: Diccionario con métricas de la mejor época: accuracy, val_accuracy, loss,
+        val_loss, best_epoch, epochs_trained, etc.
     """
 
-    print("✅ ----- Obteniendo words ids")
-    word_ids = fetch_word_ids_with_keypoints()
-    print("IDs de palabras con keypoints:", word_ids)
+    runtime = configure_training_runtime()
 
-    print("✅ ----- obteniendo secuencias y etiquetas")
-    sequences, labels = get_sequences_and_labels(word_ids)
+    print("✅ ----- Obteniendo dataset")
+    dataset = load_or_build_snapshot()
 
-    if not sequences:
+    if dataset is None:
         print("❌ Error: No se encontraron secuencias de keypoints.")
         return {"error": "No hay datos para entrenar"}
 
-    # --- Preprocesamiento ---
-    sequences = pad_sequences(
-        sequences,
-        maxlen=int(MODEL_FRAMES),
-        padding="pre",
-        truncating="post",
-        dtype="float16",
+    X, labels, word_ids, manifest = dataset
+    print("IDs de palabras con keypoints:", [word_id.hex() for word_id in word_ids])
+
+    class_counts = np.bincount(labels, minlength=len(word_ids))
+    print(
+        f"📊 Muestras por palabra: mín {class_counts.min()}, "
+        f"máx {class_counts.max()}, muestreo {sampling}"
     )
-    X = np.array(sequences)
-    y = to_categorical(labels).astype(int)
 
     # --- Split ---
     X_train, X_val, y_train, y_val = train_test_split(
-        X, y, test_size=0.05, random_state=42
+        X, labels, test_size=0.05, random_state=42
+    )
+
+    # --- Pipeline de entrada ---
+    train_dataset = build_training_pipeline(
+        X_train,
+        y_train,
+        len(word_ids),
+        batch_size=batch_size,
+        augment=augment,
+        sampling=sampling,
+    )
+    class_weight = (
+        compute_class_weights(y_train, len(word_ids)) if class_weights else None
     )
+    val_dataset = build_input_pipeline(
+        dataset_from_arrays(X_val, y_val),
+        len(word_ids),
+        batch_size=batch_size,
+        shuffle=False,
+    )
+    throughput = ThroughputLogger(len(X_train))
 
     print("✅ ----- Obteniendo modelo")
-    model = get_model(len(word_ids))
+    checkpoints_path = checkpoint_dir()
+    fingerprint = manifest.get("fingerprint")
+    checkpoint = load_resume_checkpoint(checkpoints_path, fingerprint) if resume else None
+
+    if checkpoint is not None:
+        model, state = checkpoint
+        initial_epoch = state["last_epoch"]
+    else:
+        clear_checkpoints(checkpoints_path)
+        model, state = get_model(len(word_ids), architecture=architecture), None
+        initial_epoch = 0
     print(model)
 
+    controller = TrainingController(
+        checkpoints_path, fingerprint, patience=patience, state=state
+    )
+
     print("✅ ----- Entrenando modelo")
     history = model.fit(
-        X_train,
-        y_train,
-        validation_data=(X_val, y_val),
+        train_dataset,
+        validation_data=val_dataset,
         epochs=epochs,
-        batch_size=8,
+        initial_epoch=initial_epoch,
         verbose=2,
+        callbacks=[throughput, controller, *(callbacks or [])],
+        class_weight=class_weight,
     )
 
+    # Nos quedamos con el modelo de la mejor época
+    best_metrics = controller.state["best_metrics"]
+    if best_metrics and os.path.exists(controller.best_path):
+        model = load_model(controller.best_path)
+    else:
+        best_metrics = {key: values[-1] for key, values in history.history.items()}
+
     # Guardamos métricas
-    final_acc = float(history.history["accuracy"][-1])
-    final_val_acc = float(history.history["val_accuracy"][-1])
-    final_loss = float(history.history["loss"][-1])
-    final_val_loss = float(history.history["val_loss"][-1])
+    final_acc = float(best_metrics["accuracy"])
+    final_val_acc = float(best_metrics["val_accuracy"])
+    final_loss = float(best_metrics["loss"])
+    final_val_loss = float(best_metrics["val_loss"])
 
     print("Historial de entrenamiento:")
     print("Accuracy final:", final_acc)
@@ -96,15 +192,31 @@ def training_model(epochs=500):
     print("✅ ----- Resumiendo modelo")
     model.summary()
 
-    print("✅ ----- Guardando modelo")
-    model.save(MODEL_PATH)
-
-    # 👇 Retornamos un diccionario solo con lo útil para el HTML
-    return {
+    metrics = {
         "accuracy": round(final_acc, 4),
         "val_accuracy": round(final_val_acc, 4),
         "loss": round(final_loss, 4),
         "val_loss": round(final_val_loss, 4),
+        "best_epoch": controller.state["best_epoch"],
+        "epochs_trained": controller.state["last_epoch"],
+        "stopped_early": controller.stopped_early,
+        "architecture": architecture,
+        "precision": runtime["precision"],
+        "sampling": sampling,
+        "class_weights": class_weights,
+    }
+
+    print("✅ ----- Registrando modelo")
+    version = register_model(model, word_ids, metrics, fingerprint)["version"]
+    if AUTO_PROMOTE_MODELS:
+        promote_model(version)
+    controller.mark_completed()
+
+    # 👇 Retornamos un diccionario solo con lo útil para el HTML
+    return {
+        **metrics,
         "params": model.count_params(),  # total parámetros entrenables
         "layers": len(model.layers),  # cantidad de capas
+        "version": version,
+        "promoted": AUTO_PROMOTE_MODELS,
     }
@@ -1,12 +1,13 @@
 """
-Funciones generales de soporte para detección con MediaPipe, manejo de carpetas
-y lectura de archivos JSON.
+Funciones generales de soporte para detección con MediaPipe, manejo de carpetas,
+lectura de archivos JSON y cálculo de hashes de contenido.
 
 Estas utilidades se utilizan durante el preprocesamiento, detección y organización
 de los datos en el sistema de reconocimiento de señas.
 """
 
-import os, json, cv2
+import os, json, cv2, hashlib
+import numpy as np
 
 
 def mediapipe_detection(image, model):
@@ -97,3 +98,45 @@ def clean_word(word):
         str: Palabra limpia y normalizada en minúsculas.
     """
     return word.strip().lower()
+
+
+def hash_file(path, chunk_size=1024 * 1024):
+    """
+    Calcula el hash SHA256 del contenido de un archivo.
+
+    Lee el archivo por bloques para no cargarlo completo en memoria,
+    lo que permite hashear videos grandes con una sola pasada.
+
+    Args:
+        path (str): Ruta al archivo.
+        chunk_size (int, optional): Tamaño de cada bloque de lectura en bytes. Default: 1 MiB.
+
+    Returns:
+        bytes: Digest SHA256 del archivo (32 bytes).
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def hash_keypoints(keypoints_sequence, decimals=5):
+    """
+    Calcula el hash SHA256 de una secuencia de keypoints.
+
+    Los valores se redondean antes de hashear para que diferencias numéricas
+    mínimas entre ejecuciones de MediaPipe no generen hashes distintos.
+
+    Args:
+        keypoints_sequence (list[np.ndarray] | np.ndarray): Secuencia de vectores de keypoints.
+        decimals (int, optional): Cantidad de decimales conservados. Default: 5.
+
+    Returns:
+        bytes: Digest SHA256 de la secuencia (32 bytes).
+    """
+    array = np.round(np.asarray(keypoints_sequence, dtype=np.float64), decimals)
+    array = np.ascontiguousarray(array.astype(np.float32))
+    digest = hashlib.sha256(str(array.shape).encode("utf-8"))
+    digest.update(array.tobytes())
+    return digest.digest()
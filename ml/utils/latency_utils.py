@@ -0,0 +1,270 @@
+"""
+Medición de latencia por etapa de los generadores de captura y predicción.
+
+Cada generador crea un medidor (`create_tracker`) y marca el fin de cada etapa del frame
+(`lap`): leer la cámara, MediaPipe, reconocimiento, dibujo y codificación JPEG. Las
+funciones costosas que no corren en todos los frames (extracción de keypoints,
+inferencia) se envuelven con `wrap`, que mide cada llamada. Además se registra el tiempo
+total de cada frame, el intervalo entre frames (FPS) y, en la predicción, el tiempo
+desde la lectura del frame que cierra una seña hasta que la palabra se encola para voz
+(`sign_to_speech`).
+
+Cada etapa guarda sus últimas `LATENCY_WINDOW` mediciones en un buffer circular
+preasignado, por lo que la memoria no crece con el tiempo. Con `LATENCY_TRACKING = False`
+los generadores reciben un medidor nulo cuyos métodos no hacen nada y `wrap` devuelve la
+misma función, así que la medición no agrega costo.
+
+Los datos se consultan en `/latency` (`latency_report`, agregado por tipo de flujo) y, con
+`LATENCY_OVERLAY = True`, se dibujan sobre cada frame (`LatencyTracker.draw_overlay`).
+
+Clases:
+- `LatencyTracker`: buffers circulares por etapa de un flujo.
+
+Funciones:
+- `create_tracker`: devuelve un medidor para un flujo, o el medidor nulo si está desactivado.
+- `latency_report`: percentiles por etapa de los flujos activos.
+"""
+
+import time, weakref, threading
+import numpy as np
+
+from app.config import LATENCY_OVERLAY, LATENCY_TRACKING, LATENCY_WINDOW
+
+_trackers = weakref.WeakSet()
+_lock = threading.Lock()
+
+
+class _Ring:
+    """
+    Buffer circular de mediciones en milisegundos.
+    """
+
+    def __init__(self, size):
+        self.values = np.zeros(size, dtype="float64")
+        self.index = 0
+        self.count = 0
+
+    def add(self, value):
+        self.values[self.index] = value
+        self.index = (self.index + 1) % len(self.values)
+        self.count = min(self.count + 1, len(self.values))
+
+    def samples(self):
+        return self.values[: self.count].copy()
+
+
+def _summary(samples):
+    """
+    Resume mediciones en milisegundos: cantidad, promedio y percentiles.
+    """
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+    return {
+        "count": int(len(samples)),
+        "mean_ms": round(float(np.mean(samples)), 3),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "max_ms": round(float(np.max(samples)), 3),
+    }
+
+
+class LatencyTracker:
+    """
+    Mide la latencia de cada etapa de los frames de un flujo.
+
+    Lo usa un solo generador (un solo hilo); `latency_report` lo lee desde otros hilos.
+
+    Args:
+        kind (str): Tipo de flujo (`"capture"` o `"prediction"`).
+        window (int, optional): Mediciones guardadas por etapa. Default: `LATENCY_WINDOW`.
+        overlay (bool, optional): Dibujar las latencias sobre el frame. Default: `LATENCY_OVERLAY`.
+    """
+
+    enabled = True
+
+    def __init__(self, kind, window=LATENCY_WINDOW, overlay=LATENCY_OVERLAY):
+        self.kind = kind
+        self.window = window
+        self.overlay = overlay
+        self.stages = {}
+        self.frame_start = None
+        self.last = None
+
+    def _ring(self, stage):
+        ring = self.stages.get(stage)
+        if ring is None:
+            ring = self.stages[stage] = _Ring(self.window)
+        return ring
+
+    def record(self, stage, milliseconds):
+        """
+        Registra una medición de una etapa.
+        """
+        self._ring(stage).add(milliseconds)
+
+    def start_frame(self):
+        """
+        Marca el inicio de un frame y registra el intervalo desde el frame anterior.
+        """
+        now = time.perf_counter()
+        if self.frame_start is not None:
+            self.record("interval", (now - self.frame_start) * 1000)
+        self.frame_start = self.last = now
+
+    def lap(self, stage):
+        """
+        Registra el tiempo desde la marca anterior como duración de `stage`.
+        """
+        now = time.perf_counter()
+        self.record(stage, (now - self.last) * 1000)
+        self.last = now
+
+    def end_frame(self):
+        """
+        Registra el tiempo total del frame (sin contar la espera del cliente).
+        """
+        self.record("frame", (time.perf_counter() - self.frame_start) * 1000)
+
+    def since_frame_start(self, stage):
+        """
+        Registra el tiempo desde el inicio del frame como duración de `stage`.
+        """
+        self.record(stage, (time.perf_counter() - self.frame_start) * 1000)
+
+    def wrap(self, stage, function):
+        """
+        Devuelve `function` midiendo la duración de cada llamada como `stage`.
+        """
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.record(stage, (time.perf_counter() - start) * 1000)
+
+        return timed
+
+    def summary(self):
+        """
+        Devuelve el resumen de cada etapa con mediciones.
+
+        Returns:
+            dict[str, dict]: Cantidad, promedio y percentiles p50/p95/p99 por etapa.
+        """
+        return {
+            stage: _summary(ring.samples()) for stage, ring in self.stages.items() if ring.count
+        }
+
+    def draw_overlay(self, frame):
+        """
+        Dibuja la mediana de cada etapa y los FPS en la parte inferior del frame.
+
+        Args:
+            frame (np.ndarray): Imagen BGR a anotar.
+        """
+        if not self.overlay:
+            return
+        import cv2
+
+        medians = {
+            stage: float(np.median(ring.samples()))
+            for stage, ring in self.stages.items()
+            if ring.count
+        }
+        interval = medians.pop("interval", 0)
+        text = " | ".join(f"{stage} {value:.1f}" for stage, value in medians.items())
+        if interval:
+            text += f" | {1000 / interval:.0f} FPS"
+
+        height, width = frame.shape[:2]
+        cv2.rectangle(frame, (0, height - 22), (width, height), (0, 0, 0), -1)
+        cv2.putText(
+            frame, text, (5, height - 7), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 255), 1
+        )
+
+
+class _NullTracker:
+    """
+    Medidor que no mide nada, para cuando `LATENCY_TRACKING` está desactivado.
+    """
+
+    enabled = False
+
+    def record(self, stage, milliseconds):
+        pass
+
+    def start_frame(self):
+        pass
+
+    def lap(self, stage):
+        pass
+
+    def end_frame(self):
+        pass
+
+    def since_frame_start(self, stage):
+        pass
+
+    def wrap(self, stage, function):
+        return function
+
+    def summary(self):
+        return {}
+
+    def draw_overlay(self, frame):
+        pass
+
+
+NULL_TRACKER = _NullTracker()
+
+
+def create_tracker(kind, enabled=LATENCY_TRACKING):
+    """
+    Crea el medidor de un flujo y lo registra para `latency_report`.
+
+    Args:
+        kind (str): Tipo de flujo (`"capture"` o `"prediction"`).
+        enabled (bool, optional): Medir latencias. Default: `LATENCY_TRACKING`.
+
+    Returns:
+        LatencyTracker | _NullTracker: Medidor del flujo, o el medidor nulo.
+    """
+    if not enabled:
+        return NULL_TRACKER
+    tracker = LatencyTracker(kind)
+    with _lock:
+        _trackers.add(tracker)
+    return tracker
+
+
+def latency_report():
+    """
+    Resume las latencias de los flujos activos, agregadas por tipo de flujo.
+
+    Returns:
+        dict: `enabled` y, por tipo de flujo, `streams` (flujos activos), `fps` (según la
+        mediana del intervalo entre frames) y `stages` (resumen de cada etapa).
+    """
+    with _lock:
+        trackers = list(_trackers)
+
+    report = {"enabled": LATENCY_TRACKING}
+    for tracker in trackers:
+        entry = report.setdefault(tracker.kind, {"streams": 0, "_samples": {}})
+        entry["streams"] += 1
+        for stage, ring in list(tracker.stages.items()):
+            entry["_samples"].setdefault(stage, []).append(ring.samples())
+
+    for kind, entry in report.items():
+        if kind == "enabled":
+            continue
+        samples = {
+            stage: np.concatenate(values)
+            for stage, values in entry.pop("_samples").items()
+            if sum(len(value) for value in values)
+        }
+        entry["stages"] = {stage: _summary(values) for stage, values in samples.items()}
+        interval = entry["stages"].get("interval", {}).get("p50_ms")
+        entry["fps"] = round(1000 / interval, 1) if interval else None
+    return report
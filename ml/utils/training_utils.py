@@ -4,8 +4,20 @@ Utilidades de entrenamiento para modelos de reconocimiento de lenguaje de señas
 Este módulo facilita la preparación de los datos de entrenamiento. Recupera los keypoints
 desde la base de datos, los agrupa por muestra y los convierte en secuencias listas para
 entrenar modelos de clasificación.
+
+También incluye utilidades para ejecutar varios entrenamientos en paralelo sin que
+compitan por los mismos núcleos:
+- `limit_cpu_threads`: acota los hilos de cómputo del proceso actual.
+- `run_in_process_pool`: ejecuta tareas en un pool de procesos con hilos acotados.
+- `split_indices`: divide los índices del dataset en train/validation estratificados.
 """
 
+import os
+import numpy as np
+import multiprocessing as mp
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from sklearn.model_selection import train_test_split
 
 from ml.utils.keypoints_utils import group_keypoints_by_word_and_sample
 
@@ -31,3 +43,104 @@ def get_sequences_and_labels(word_ids):
     """
     keypoints_data = fetch_keypoints_by_words(word_ids)
     return group_keypoints_by_word_and_sample(keypoints_data, word_ids)
+
+
+def limit_cpu_threads(threads):
+    """
+    Limita la cantidad de hilos de cómputo que usa el proceso actual.
+
+    Debe llamarse antes de importar TensorFlow (por ejemplo, al iniciar un proceso
+    trabajador): fija las variables de entorno de OpenMP/BLAS y los pools intra-op
+    e inter-op de TensorFlow.
+
+    Args:
+        threads (int): Hilos de cómputo para el proceso.
+    """
+    for variable in (
+        "OMP_NUM_THREADS",
+        "OPENBLAS_NUM_THREADS",
+        "MKL_NUM_THREADS",
+        "TF_NUM_INTRAOP_THREADS",
+    ):
+        os.environ[variable] = str(threads)
+    os.environ["TF_NUM_INTEROP_THREADS"] = "1"
+
+    import tensorflow as tf
+
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(threads)
+        tf.config.threading.set_inter_op_parallelism_threads(1)
+    except RuntimeError:
+        # TensorFlow ya se inicializó en este proceso; quedan los valores de entorno
+        print("⚠️ TensorFlow ya estaba inicializado, no se pudieron limitar sus hilos.")
+
+
+def run_in_process_pool(function, tasks, workers, threads, prepare=None):
+    """
+    Ejecuta `function(task)` para cada tarea en un pool de procesos (`spawn`).
+
+    Cada proceso limita sus hilos con `limit_cpu_threads(threads)`. Las tareas se envían
+    a medida que se libera un proceso, por lo que `prepare(task, results)` puede usar los
+    resultados ya recibidos. Con `workers=0` las tareas se ejecutan en el proceso actual,
+    una por vez.
+
+    Args:
+        function (callable): Función a nivel de módulo (debe poder serializarse).
+        tasks (list[dict]): Tareas a ejecutar.
+        workers (int): Procesos del pool.
+        threads (int): Hilos de cómputo por proceso.
+        prepare (callable, optional): Función `prepare(task, results)` aplicada antes de enviar cada tarea.
+
+    Returns:
+        list: Resultados en orden de finalización.
+    """
+    prepare = prepare or (lambda task, results: task)
+    results = []
+
+    if workers <= 0:
+        for task in tasks:
+            results.append(function(prepare(task, results)))
+        return results
+
+    queued = list(tasks)
+    pending = set()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=mp.get_context("spawn"),
+        initializer=limit_cpu_threads,
+        initargs=(threads,),
+    ) as executor:
+        while queued or pending:
+            while queued and len(pending) < workers:
+                task = prepare(queued.pop(0), results)
+                pending.add(executor.submit(function, task))
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            results.extend(future.result() for future in done)
+    return results
+
+
+def split_indices(labels, validation_split, seed=42):
+    """
+    Divide los índices del dataset en train/validation, estratificando si es posible.
+
+    Si alguna clase tiene una sola muestra, o la validación es demasiado chica para
+    incluir todas las clases, la división se hace sin estratificar.
+
+    Args:
+        labels (np.ndarray): Etiquetas enteras de las muestras.
+        validation_split (float): Fracción de muestras de validación.
+        seed (int, optional): Semilla de la división. Default: 42.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Índices de train y de validation.
+    """
+    labels = np.asarray(labels)
+    indices = np.arange(len(labels))
+    _, counts = np.unique(labels, return_counts=True)
+    stratify = labels if counts.min() >= 2 else None
+    try:
+        return train_test_split(
+            indices, test_size=validation_split, random_state=seed, stratify=stratify
+        )
+    except ValueError:
+        return train_test_split(indices, test_size=validation_split, random_state=seed)
@@ -2,7 +2,8 @@
 Fixture de pytest para limpiar la base de datos antes de ejecutar tests.
 
 Este módulo define una función `clean_test_database` que se encarga de 
-resetear las tablas principales (`categories`, `words`, `samples`, `keypoints`)
+resetear las tablas principales (`categories`, `words`, `samples`, `keypoints`,
+`ingestion_ledger`)
 dejando la base en un estado limpio para pruebas controladas.
 """
 
@@ -18,7 +19,7 @@ def clean_test_database():
 
     Esta fixture se conecta a la base de datos definida en `DB_CONFIG`, desactiva
     temporalmente las restricciones de claves foráneas y trunca las tablas
-    `keypoints`, `samples`, `words` y `categories` para garantizar un entorno
+    `ingestion_ledger`, `keypoints`, `samples`, `words` y `categories` para garantizar un entorno
     limpio y consistente en cada ejecución de prueba.
 
     Returns:
@@ -32,7 +33,7 @@ def clean_test_database():
     cur.execute("SET session_replication_role = replica;")
 
     # Truncado en orden para evitar errores de dependencia
-    tables = ["keypoints", "samples", "words", "categories"]
+    tables = ["ingestion_ledger", "keypoints", "samples", "words", "categories"]
     for table in tables:
         cur.execute(f"TRUNCATE TABLE {table} RESTART IDENTITY CASCADE;")
 
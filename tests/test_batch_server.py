@@ -0,0 +1,129 @@
+"""
+Tests para el servidor de inferencia por lotes (`ml.prediction.batch_server`).
+
+Este módulo valida que:
+- Las secuencias de varios flujos se agrupen en lotes y cada flujo reciba su resultado.
+- Los resultados coincidan con el predictor de una secuencia.
+- Los histogramas de tamaño de lote y profundidad de la cola cuenten cada lote.
+- `make_predictor` use el servidor del proceso y lo reemplace cuando cambia el modelo.
+- Ningún pedido quede esperando para siempre si el servidor falla o no responde.
+- La prueba de carga informe ambos modos.
+"""
+
+import numpy as np
+import pytest
+
+from concurrent.futures import TimeoutError
+
+from ml.prediction import batch_server
+from ml.prediction.batch_server import BatchInferenceServer, load_test
+from ml.prediction.inference import make_predictor
+from ml.training.model import get_model
+from app.config import LENGTH_KEYPOINTS, MODEL_FRAMES
+
+
+@pytest.fixture(scope="module")
+def model():
+    return get_model(3, lstm_units_1=4, lstm_units_2=4, dense_units=4)
+
+
+@pytest.fixture
+def server(model):
+    server = BatchInferenceServer(model, max_batch_size=4, max_wait_ms=200).start()
+    server.ready.wait()
+    yield server
+    server.stop()
+
+
+def test_lotes_con_resultados_por_flujo(model, server):
+    """
+    Verifica que las secuencias encoladas juntas se ejecuten en un lote y den lo mismo
+    que el predictor de una secuencia.
+    """
+    X = np.random.rand(6, MODEL_FRAMES, LENGTH_KEYPOINTS).astype("float32")
+
+    futures = [server.submit(sequence) for sequence in X]
+    outputs = np.array([future.result(timeout=30) for future in futures])
+
+    predict = make_predictor(model, batching=False)
+    expected = np.array([predict(sequence) for sequence in X])
+    np.testing.assert_allclose(outputs, expected, atol=1e-5)
+
+    stats = server.stats()
+    assert stats["requests"] == 6
+    assert stats["batch_size_histogram"] == {2: 1, 4: 1}
+    assert sum(stats["queue_depth_histogram"].values()) == stats["batches"] == 2
+    assert stats["mean_batch_size"] == 3.0
+
+
+def test_predict_despues_de_detener(server):
+    """
+    Verifica que un predictor de un servidor detenido siga respondiendo.
+    """
+    server.stop()
+
+    output = server.predict(np.zeros((MODEL_FRAMES, LENGTH_KEYPOINTS)))
+
+    assert output.shape == (3,)
+
+
+def test_error_del_servidor_resuelve_los_pendientes(model):
+    """
+    Verifica que si el hilo falla al compilar, los pedidos reciban el error y no esperen.
+    """
+
+    def broken(sequences):
+        raise RuntimeError("compilación fallida")
+
+    server = BatchInferenceServer(model)
+    server.forward = broken
+    pending = server.submit(np.zeros((MODEL_FRAMES, LENGTH_KEYPOINTS)))
+    server.start()
+
+    with pytest.raises(RuntimeError):
+        pending.result(timeout=5)
+    server.thread.join(timeout=5)
+    assert server.stopped
+    with pytest.raises(RuntimeError):
+        server.predict(np.zeros((MODEL_FRAMES, LENGTH_KEYPOINTS)), timeout=5)
+
+
+def test_predict_con_limite_de_espera(model):
+    """
+    Verifica que `predict` no bloquee indefinidamente si nadie atiende la cola.
+    """
+    server = BatchInferenceServer(model)
+
+    with pytest.raises(TimeoutError):
+        server.predict(np.zeros((MODEL_FRAMES, LENGTH_KEYPOINTS)), timeout=0.05)
+
+
+def test_make_predictor_usa_el_servidor_del_proceso(model):
+    """
+    Verifica que `make_predictor` comparta el servidor y lo reemplace con otro modelo.
+    """
+    try:
+        predict = make_predictor(model, batching=True)
+        server = batch_server._server["instance"]
+        assert predict(np.zeros((MODEL_FRAMES, LENGTH_KEYPOINTS))).shape == (3,)
+        assert batch_server.get_batch_server_stats()["requests"] == 1
+
+        other = get_model(2, lstm_units_1=4, lstm_units_2=4, dense_units=4)
+        make_predictor(other, batching=True)
+        assert batch_server._server["instance"] is not server
+        assert server.stopped
+    finally:
+        batch_server.stop_batch_server()
+
+    assert batch_server.get_batch_server_stats() == {"enabled": False}
+
+
+def test_load_test(model):
+    """
+    Verifica el reporte de la prueba de carga con pocos flujos.
+    """
+    report = load_test(model, streams=3, requests_per_stream=4, max_batch_size=4)
+
+    assert set(report) == {"per_stream", "batched", "stats"}
+    assert report["stats"]["requests"] == 12
+    assert report["batched"]["throughput"] > 0
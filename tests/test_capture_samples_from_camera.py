@@ -65,3 +65,50 @@ def test_save_sample_crea_carpeta_con_imagenes():
         for img in saved_images:
             path = os.path.join(sample_folder, img)
             assert os.path.exists(path), f"La imagen {img} no fue encontrada."
+
+
+def test_captura_se_detiene_con_el_evento_de_la_sesion(monkeypatch):
+    """
+    Verifica que la captura termine al activarse el evento de su sesión y libere la cámara.
+    """
+    import threading
+    from ml.features import capture_samples
+
+    class FakeCapture:
+        released = False
+
+        def __init__(self, index):
+            pass
+
+        def isOpened(self):
+            return not self.released
+
+        def read(self):
+            return True, np.zeros((48, 64, 3), dtype=np.uint8)
+
+        def release(self):
+            FakeCapture.released = True
+
+    class FakeHolistic:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            return False
+
+    monkeypatch.setattr(capture_samples.cv2, "VideoCapture", FakeCapture)
+    monkeypatch.setattr(capture_samples, "Holistic", FakeHolistic)
+    monkeypatch.setattr(capture_samples, "mediapipe_detection", lambda frame, model: None)
+    monkeypatch.setattr(capture_samples, "there_hand", lambda results: False)
+    monkeypatch.setattr(capture_samples, "draw_keypoints", lambda image, results: None)
+
+    stop_event = threading.Event()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        frames = 0
+        for _ in capture_samples.capture_samples_from_camera(tmpdir, stop_event=stop_event):
+            frames += 1
+            if frames == 2:
+                stop_event.set()
+
+    assert frames == 2
+    assert FakeCapture.released
@@ -3,13 +3,19 @@ Tests para la función `capture_samples_from_video`.
 
 Este módulo crea un video artificial con contenido simulado (una figura negra como mano)
 y verifica que la función capture correctamente una secuencia de muestras desde el video.
+
+También valida el modo de muestreo `seek`, que solo decodifica los intervalos con manos
+y respeta `margin_frames`, `delay_frames` y `debug` como el modo completo.
 """
 
 import os
 import cv2
 import numpy as np
 import pytest
-from ml.features.capture_samples_video import capture_samples_from_video
+from ml.features.capture_samples_video import (
+    capture_samples_from_video,
+    find_hand_intervals,
+)
 from unittest.mock import patch, MagicMock
 
 
@@ -98,3 +104,168 @@ def test_capture_samples_from_video_crea_muestras_mock(dummy_video):
     for carpeta in muestras:
         imgs = os.listdir(os.path.join(output_path, carpeta))
         assert len(imgs) > 0, f"La muestra {carpeta} está vacía"
+
+
+@pytest.fixture
+def idle_video(tmp_path):
+    """
+    Crea un video de 90 frames en el que solo los frames 30 a 59 simulan una seña.
+
+    Los frames "sin seña" son blancos y los frames "con seña" son oscuros, de modo que
+    la detección simulada puede decidir la presencia de manos a partir del brillo.
+
+    Args:
+        tmp_path (Path): Carpeta temporal generada por pytest.
+
+    Returns:
+        tuple[str, str]: Ruta al archivo de video generado y ruta de la carpeta de salida.
+    """
+    video_path = str(tmp_path / "idle_video.avi")
+    output_path = str(tmp_path / "output_seek")
+    os.makedirs(output_path, exist_ok=True)
+
+    height, width = 240, 320
+    out = cv2.VideoWriter(
+        video_path, cv2.VideoWriter_fourcc(*"XVID"), 10.0, (width, height)
+    )
+    for i in range(90):
+        color = 20 if 30 <= i < 60 else 235
+        out.write(np.full((height, width, 3), color, dtype=np.uint8))
+    out.release()
+    return video_path, output_path
+
+
+def _deteccion_por_brillo(image, model):
+    """
+    Simula MediaPipe: devuelve True (mano presente) si la imagen es oscura.
+    """
+    return image.mean() < 128
+
+
+def test_find_hand_intervals_ubica_la_sena(idle_video):
+    """
+    Verifica que la pasada rápida ubique un único intervalo que cubra la seña simulada.
+    """
+    video_path, _ = idle_video
+
+    with patch(
+        "ml.features.capture_samples_video.mediapipe_detection",
+        side_effect=_deteccion_por_brillo,
+    ) as mock_detect, patch(
+        "ml.features.capture_samples_video.there_hand", side_effect=bool
+    ), patch(
+        "ml.features.capture_samples_video.Holistic"
+    ):
+        intervals = find_hand_intervals(video_path, stride=5, scale=0.25)
+
+    assert len(intervals) == 1
+    start, end = intervals[0]
+    assert start <= 30 and end >= 59
+    assert mock_detect.call_count == 18, "Solo debe analizarse 1 de cada 5 frames"
+
+
+def test_capture_samples_from_video_seek_crea_una_muestra(idle_video):
+    """
+    Verifica que el modo `seek` guarde una muestra por intervalo, decodificando
+    solo los frames necesarios dentro del intervalo.
+    """
+    video_path, output_path = idle_video
+
+    with patch(
+        "ml.features.capture_samples_video.mediapipe_detection",
+        side_effect=_deteccion_por_brillo,
+    ) as mock_detect, patch(
+        "ml.features.capture_samples_video.there_hand", side_effect=bool
+    ), patch(
+        "ml.features.capture_samples_video.Holistic"
+    ):
+        capture_samples_from_video(
+            video_path=video_path, path=output_path, min_frames=5, sampling="seek"
+        )
+
+    muestras = os.listdir(output_path)
+    assert len(muestras) == 1, "Debe crearse una sola muestra"
+    imgs = os.listdir(os.path.join(output_path, muestras[0]))
+    assert 5 <= len(imgs) <= 30
+    assert mock_detect.call_count < 90, "No debe procesarse el video completo"
+
+
+def _capturar_seek(video_path, output_path, **kwargs):
+    """
+    Ejecuta el modo `seek` con la detección simulada por brillo y devuelve la cantidad
+    de imágenes de cada muestra guardada.
+    """
+    with patch(
+        "ml.features.capture_samples_video.mediapipe_detection",
+        side_effect=_deteccion_por_brillo,
+    ), patch(
+        "ml.features.capture_samples_video.there_hand", side_effect=bool
+    ), patch(
+        "ml.features.capture_samples_video.Holistic"
+    ):
+        capture_samples_from_video(
+            video_path=video_path, path=output_path, sampling="seek", **kwargs
+        )
+    return [
+        len(os.listdir(os.path.join(output_path, muestra)))
+        for muestra in os.listdir(output_path)
+    ]
+
+
+def test_seek_respeta_margin_frames(idle_video, tmp_path):
+    """
+    Verifica que el modo `seek` descarte `margin_frames` frames de cada extremo de la muestra.
+    """
+    video_path, output_path = idle_video
+    sin_margen = str(tmp_path / "sin_margen")
+    os.makedirs(sin_margen)
+
+    completa = _capturar_seek(video_path, sin_margen, margin_frames=0)
+    recortada = _capturar_seek(video_path, output_path, margin_frames=2)
+
+    assert len(completa) == len(recortada) == 1
+    assert recortada[0] == completa[0] - 4
+
+
+def test_find_hand_intervals_tolera_huecos(tmp_path):
+    """
+    Verifica que un hueco sin manos de hasta `gap` frames no separe la seña en dos intervalos.
+    """
+    video_path = str(tmp_path / "gap_video.avi")
+    out = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*"XVID"), 10.0, (320, 240))
+    for i in range(90):
+        color = 20 if 30 <= i < 60 and not 43 <= i < 48 else 235
+        out.write(np.full((240, 320, 3), color, dtype=np.uint8))
+    out.release()
+
+    with patch(
+        "ml.features.capture_samples_video.mediapipe_detection",
+        side_effect=_deteccion_por_brillo,
+    ), patch(
+        "ml.features.capture_samples_video.there_hand", side_effect=bool
+    ), patch(
+        "ml.features.capture_samples_video.Holistic"
+    ):
+        separados = find_hand_intervals(video_path, stride=5, scale=0.25)
+        unidos = find_hand_intervals(video_path, stride=5, scale=0.25, gap=5)
+
+    assert len(separados) == 2
+    assert len(unidos) == 1
+
+
+def test_seek_muestra_frames_en_debug(idle_video):
+    """
+    Verifica que el modo `seek` muestre los frames procesados cuando `debug=True`.
+    """
+    video_path, output_path = idle_video
+
+    with patch("ml.features.capture_samples_video.cv2.imshow") as mock_show, patch(
+        "ml.features.capture_samples_video.cv2.waitKey", return_value=-1
+    ), patch("ml.features.capture_samples_video.cv2.destroyAllWindows") as mock_close, patch(
+        "ml.features.capture_samples_video.draw_keypoints"
+    ):
+        muestras = _capturar_seek(video_path, output_path, debug=True)
+
+    assert len(muestras) == 1
+    assert mock_show.call_count > 0
+    mock_close.assert_called_once()
@@ -0,0 +1,84 @@
+"""
+Tests para los checkpoints y la parada temprana del entrenamiento.
+
+Este módulo valida que `TrainingController`:
+- Guarde el mejor modelo cuando mejora `val_loss` y checkpoints periódicos.
+- Detenga el entrenamiento tras `patience` épocas sin mejora.
+
+Y que `load_resume_checkpoint` solo permita continuar un entrenamiento interrumpido
+con el mismo dataset.
+
+Se usa un modelo Keras mínimo para no depender del modelo LSTM completo.
+"""
+
+import os
+import pytest
+import keras
+
+from ml.training.checkpoints import (
+    TrainingController,
+    load_resume_checkpoint,
+    read_checkpoint_state,
+)
+
+
+@pytest.fixture
+def tiny_model():
+    """
+    Crea un modelo Keras mínimo y compilado.
+
+    Returns:
+        keras.Model: Modelo de una capa densa.
+    """
+    model = keras.Sequential([keras.Input((4,)), keras.layers.Dense(2, activation="softmax")])
+    model.compile(optimizer="adam", loss="categorical_crossentropy")
+    return model
+
+
+def _run_epochs(controller, val_losses):
+    """
+    Simula el final de varias épocas con los `val_loss` dados.
+    """
+    controller.on_train_begin()
+    for epoch, val_loss in enumerate(val_losses):
+        controller.on_epoch_end(epoch, {"loss": val_loss, "val_loss": val_loss})
+        if controller.model.stop_training:
+            break
+    controller.on_train_end()
+
+
+def test_controller_guarda_mejor_modelo_y_detiene(tiny_model, tmp_path):
+    """
+    Verifica que se guarde la mejor época y que el entrenamiento se detenga sin mejora.
+    """
+    controller = TrainingController(str(tmp_path), "huella", patience=2, every=2)
+    controller.set_model(tiny_model)
+
+    _run_epochs(controller, [1.0, 0.5, 0.6, 0.7, 0.1])
+
+    state = read_checkpoint_state(str(tmp_path))
+    assert controller.stopped_early
+    assert state["best_epoch"] == 2
+    assert state["best_val_loss"] == 0.5
+    assert state["last_epoch"] == 4
+    assert os.path.exists(controller.best_path)
+    assert os.path.exists(controller.last_path)
+
+
+def test_resume_solo_con_el_mismo_dataset(tiny_model, tmp_path):
+    """
+    Verifica que se pueda continuar desde el último checkpoint solo si el dataset
+    no cambió y el entrenamiento no había terminado.
+    """
+    controller = TrainingController(str(tmp_path), "huella", patience=10, every=3)
+    controller.set_model(tiny_model)
+    _run_epochs(controller, [1.0, 0.9, 0.8])
+
+    assert load_resume_checkpoint(str(tmp_path), "otra_huella") is None
+
+    model, state = load_resume_checkpoint(str(tmp_path), "huella")
+    assert state["last_epoch"] == 3
+    assert model.optimizer is not None
+
+    controller.mark_completed()
+    assert load_resume_checkpoint(str(tmp_path), "huella") is None
@@ -0,0 +1,90 @@
+"""
+Tests para la validación cruzada (`ml.training.cross_validation`).
+
+Este módulo valida que:
+- Los folds sean estratificados, disjuntos y cubran todo el dataset.
+- La cantidad de folds se reduzca cuando alguna palabra tiene pocas muestras.
+- El reporte combine media, desvío, matriz de confusión y métricas por palabra.
+- Una validación cruzada pequeña termine y guarde su reporte.
+"""
+
+import os, json
+import numpy as np
+import pytest
+
+import ml.training.cross_validation as cross_validation
+import ml.training.dataset_snapshot as dataset_snapshot
+from app.config import LENGTH_KEYPOINTS, MODEL_FRAMES
+
+
+def test_make_folds_estratificados():
+    """
+    Verifica que cada fold tenga la misma proporción de cada palabra y que no se solapen.
+    """
+    labels = np.array([0] * 10 + [1] * 5)
+
+    folds = cross_validation.make_folds(labels, folds=5)
+
+    assert len(folds) == 5
+    test_indices = np.concatenate([test for _, test in folds])
+    assert sorted(test_indices) == list(range(len(labels)))
+    for train, test in folds:
+        assert not set(train) & set(test)
+        assert list(np.bincount(labels[test])) == [2, 1]
+
+
+def test_make_folds_reduce_folds_y_valida_muestras():
+    """
+    Verifica que se usen menos folds si faltan muestras, y el error con una sola muestra.
+    """
+    assert len(cross_validation.make_folds(np.array([0] * 10 + [1] * 3), folds=5)) == 3
+    with pytest.raises(ValueError):
+        cross_validation.make_folds(np.array([0, 0, 1]))
+
+
+def test_summarize_folds():
+    """
+    Verifica las métricas agregadas y por palabra del reporte.
+    """
+    results = [
+        {"fold": 2, "accuracy": 0.5, "loss": 1.0, "confusion_matrix": [[1, 1], [0, 0]]},
+        {"fold": 1, "accuracy": 1.0, "loss": 0.2, "confusion_matrix": [[1, 0], [0, 2]]},
+    ]
+
+    report = cross_validation.summarize_folds(results, ["hola", "chau"])
+
+    assert report["accuracy_mean"] == 0.75 and report["accuracy_std"] == 0.25
+    assert report["loss_mean"] == 0.6
+    assert report["confusion_matrix"] == [[2, 1], [0, 2]]
+    assert [r["fold"] for r in report["fold_results"]] == [1, 2]
+    assert report["per_word"][0] == {"word": "hola", "samples": 3, "recall": 0.6667, "precision": 1.0}
+    assert report["per_word"][1]["precision"] == 0.6667
+
+
+def test_cross_validate_en_proceso(tmp_path, monkeypatch):
+    """
+    Ejecuta una validación cruzada pequeña en el proceso actual y valida el reporte guardado.
+    """
+    rng = np.random.default_rng(0)
+    X = rng.random((12, MODEL_FRAMES, LENGTH_KEYPOINTS), dtype=np.float32)
+    labels = np.array([0, 1] * 6)
+    dataset = (X, labels, [b"\x01" * 32, b"\x02" * 32], {"fingerprint": "abc"})
+    monkeypatch.setattr(dataset_snapshot, "load_or_build_snapshot", lambda path: dataset)
+    monkeypatch.setattr(dataset_snapshot, "load_snapshot", lambda path: dataset)
+    monkeypatch.setattr(cross_validation, "_word_names", lambda word_ids: ["a", "b"])
+
+    report = cross_validation.cross_validate(
+        folds=3,
+        workers=0,
+        epochs=2,
+        params={"lstm_units_1": 4, "lstm_units_2": 4, "dense_units": 4, "batch_size": 4},
+        report_path=str(tmp_path),
+    )
+
+    assert report["folds"] == 3
+    assert sum(r["test_samples"] for r in report["fold_results"]) == 12
+    assert np.sum(report["confusion_matrix"]) == 12
+    assert report["params"]["batch_size"] == 4
+    with open(report["report_file"], encoding="utf-8") as file:
+        assert json.load(file)["accuracy_mean"] == report["accuracy_mean"]
+    assert os.path.dirname(report["report_file"]) == str(tmp_path)
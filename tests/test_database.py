@@ -25,6 +25,9 @@ from app.database.database_utils import (
     fetch_all_words,
     fetch_all_categories,
     search_word,
+    fetch_ingestion_record,
+    insert_ingestion_record,
+    fetch_video_sample_ids,
 )
 from app.config import words, categories, DB_CONFIG
 
@@ -189,3 +192,56 @@ def test_search_word_not_found(setup_test_schema):
     """
     result = search_word("NoExiste")
     assert result is None
+
+
+def test_ingestion_ledger_detecta_contenido_repetido(setup_test_schema):
+    """
+    Verifica que `ingestion_ledger` registre un hash y lo encuentre en una segunda ingesta.
+
+    - Registra el hash de un video para la palabra "hola".
+    - Comprueba que el mismo hash se encuentra para esa palabra.
+    - Comprueba que un hash distinto no se encuentra.
+    - Valida que registrar dos veces el mismo hash no genera error.
+
+    Returns:
+        None: Usa aserciones para validar el comportamiento esperado.
+    """
+    word_id = hashlib.sha256("hola".encode("utf-8")).digest()
+    content_hash = hashlib.sha256(b"video de prueba").digest()
+
+    assert fetch_ingestion_record(content_hash, word_id) is None
+
+    insert_ingestion_record(content_hash, word_id, "video", source="hola.mp4")
+    insert_ingestion_record(content_hash, word_id, "video", source="hola.mp4")
+
+    record = fetch_ingestion_record(content_hash, word_id)
+    assert record is not None
+    assert record[0] == "video"
+    assert record[2] == "hola.mp4"
+
+    otro_hash = hashlib.sha256(b"otro video").digest()
+    assert fetch_ingestion_record(otro_hash, word_id) is None
+
+
+def test_registro_de_video_vinculado_a_sus_muestras(setup_test_schema):
+    """
+    Verifica que un registro de video sin muestras se complete al vincularlo y que se
+    encuentren las muestras generadas desde ese video.
+    """
+    word_id = hashlib.sha256("hola".encode("utf-8")).digest()
+    video_hash = hashlib.sha256(b"video con muestras").digest()
+    sample_id = insert_sample(word_id)
+
+    insert_ingestion_record(video_hash, word_id, "video", source="hola.mp4")
+    insert_ingestion_record(
+        hashlib.sha256(b"secuencia").digest(),
+        word_id,
+        "sample",
+        sample_id=sample_id,
+        source="hola.mp4",
+    )
+    insert_ingestion_record(video_hash, word_id, "video", sample_id=sample_id, source="hola.mp4")
+
+    assert fetch_ingestion_record(video_hash, word_id)[1] == sample_id
+    assert fetch_video_sample_ids(word_id, "hola.mp4") == [sample_id]
+    assert fetch_video_sample_ids(word_id, "otro.mp4") == []
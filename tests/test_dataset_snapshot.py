@@ -0,0 +1,194 @@
+"""
+Tests para los snapshots en disco del dataset de entrenamiento.
+
+Este módulo valida que `ml.training.dataset_snapshot`:
+- Construya el snapshot a partir de las secuencias de la base de datos.
+- Lo abra como arrays memory-mapped con la forma y etiquetas correctas.
+- Lo reutilice mientras la huella de la base no cambie, y lo reconstruya cuando cambia.
+- Agregue las muestras nuevas de forma incremental, reasignando etiquetas si aparecen palabras.
+- Informe las muestras por palabra desde el manifiesto, sin consultar la base.
+- Espere el bloqueo del snapshot mientras otro proceso lo actualiza.
+
+Las consultas a la base de datos se mockean para aislar la lógica del snapshot.
+"""
+
+import os
+import fcntl
+import threading
+import numpy as np
+import pytest
+from unittest.mock import patch
+
+from ml.training.dataset_snapshot import (
+    LOCK_FILE,
+    compute_fingerprint,
+    load_or_build_snapshot,
+    snapshot_class_counts,
+)
+from app.config import LENGTH_KEYPOINTS, MODEL_FRAMES
+
+
+@pytest.fixture
+def fake_db():
+    """
+    Mockea las consultas a la base usadas por el snapshot.
+
+    Simula dos palabras con dos muestras cada una. El estado de la tabla `keypoints`
+    (mayor ID y cantidad de registros) se puede modificar desde el test.
+
+    Returns:
+        dict: Mocks (`word_ids`, `stats`, `sequences`, `since`) para controlar y verificar las llamadas.
+    """
+    word_ids = [b"\x01" * 32, b"\x02" * 32]
+    sequences = [np.random.rand(MODEL_FRAMES, LENGTH_KEYPOINTS) for _ in range(4)]
+    labels = [0, 0, 1, 1]
+
+    with patch(
+        "ml.training.dataset_snapshot.fetch_word_ids_with_keypoints",
+        return_value=word_ids,
+    ) as mock_word_ids, patch(
+        "ml.training.dataset_snapshot.fetch_keypoints_stats",
+        return_value=(60, 60),
+    ) as mock_stats, patch(
+        "ml.training.dataset_snapshot.get_sequences_and_labels",
+        return_value=(sequences, labels),
+    ) as mock_sequences, patch(
+        "ml.training.dataset_snapshot.fetch_keypoints_since",
+        return_value=[],
+    ) as mock_since:
+        yield {
+            "word_ids": mock_word_ids,
+            "stats": mock_stats,
+            "sequences": mock_sequences,
+            "since": mock_since,
+        }
+
+
+def test_compute_fingerprint_cambia_con_los_datos():
+    """
+    Verifica que la huella cambie si cambia el mayor ID, la cantidad de registros o las palabras.
+    """
+    base = compute_fingerprint([b"a", b"b"], 10, 10)
+    assert base == compute_fingerprint([b"a", b"b"], 10, 10)
+    assert base != compute_fingerprint([b"a", b"b"], 11, 11)
+    assert base != compute_fingerprint([b"a", b"b"], 10, 9)
+    assert base != compute_fingerprint([b"a", b"c"], 10, 10)
+
+
+def test_snapshot_se_construye_y_abre_como_memmap(fake_db, tmp_path):
+    """
+    Verifica que el snapshot se construya y se abra como `np.memmap` con la forma esperada.
+    """
+    X, y, word_ids, manifest = load_or_build_snapshot(str(tmp_path))
+
+    assert isinstance(X, np.memmap)
+    assert X.shape == (4, MODEL_FRAMES, LENGTH_KEYPOINTS)
+    assert X.dtype == np.float16
+    assert list(y) == [0, 0, 1, 1]
+    assert word_ids == [b"\x01" * 32, b"\x02" * 32]
+    assert manifest["samples"] == 4
+
+
+def test_snapshot_solo_se_reconstruye_si_cambia_la_huella(fake_db, tmp_path):
+    """
+    Verifica que el snapshot se reutilice mientras la base no cambie y se
+    reconstruya cuando aparecen nuevos keypoints.
+    """
+    load_or_build_snapshot(str(tmp_path))
+    load_or_build_snapshot(str(tmp_path))
+    assert fake_db["sequences"].call_count == 1, "No debe releer la base sin cambios"
+
+    fake_db["stats"].return_value = (75, 75)
+    load_or_build_snapshot(str(tmp_path))
+    assert fake_db["sequences"].call_count == 2, "Debe reconstruir al cambiar la huella"
+
+
+def test_snapshot_agrega_muestras_nuevas_sin_reconstruir(fake_db, tmp_path):
+    """
+    Verifica que una muestra de una palabra nueva se agregue al final del snapshot
+    sin releer toda la base, y que las etiquetas existentes se reasignen al nuevo orden.
+    """
+    load_or_build_snapshot(str(tmp_path))
+
+    new_word = b"\x00" * 32
+    fake_db["word_ids"].return_value = [new_word, b"\x01" * 32, b"\x02" * 32]
+    fake_db["stats"].return_value = (70, 70)
+    fake_db["since"].return_value = [
+        (60 + frame, new_word, 9, frame, [0.5] * LENGTH_KEYPOINTS)
+        for frame in range(1, 11)
+    ]
+
+    X, y, word_ids, manifest = load_or_build_snapshot(str(tmp_path))
+
+    assert fake_db["sequences"].call_count == 1, "No debe reconstruir el snapshot"
+    fake_db["since"].assert_called_once_with(60)
+    assert X.shape == (5, MODEL_FRAMES, LENGTH_KEYPOINTS)
+    assert list(y) == [1, 1, 2, 2, 0]
+    assert word_ids[0] == new_word
+    assert manifest["deltas"] == 1
+    assert manifest["max_keypoints_id"] == 70
+
+
+def test_snapshot_se_reconstruye_si_faltan_registros(fake_db, tmp_path):
+    """
+    Verifica que se reconstruya el snapshot completo si la cantidad de registros nuevos
+    no coincide con la diferencia de totales (por ejemplo, tras eliminar keypoints).
+    """
+    load_or_build_snapshot(str(tmp_path))
+
+    fake_db["stats"].return_value = (70, 65)
+    fake_db["since"].return_value = [
+        (60 + frame, b"\x01" * 32, 9, frame, [0.5] * LENGTH_KEYPOINTS)
+        for frame in range(1, 11)
+    ]
+
+    _, _, _, manifest = load_or_build_snapshot(str(tmp_path))
+
+    assert fake_db["sequences"].call_count == 2
+    assert manifest["deltas"] == 0
+
+
+def test_snapshot_informa_muestras_por_palabra(fake_db, tmp_path):
+    """
+    Verifica los conteos por palabra del manifiesto, también tras una actualización
+    incremental, y que se calculen desde `y.dat` si el manifiesto no los tiene.
+    """
+    _, _, _, manifest = load_or_build_snapshot(str(tmp_path))
+    assert snapshot_class_counts(str(tmp_path)) == {"01" * 32: 2, "02" * 32: 2}
+
+    fake_db["stats"].return_value = (70, 70)
+    fake_db["since"].return_value = [
+        (60 + frame, b"\x02" * 32, 9, frame, [0.5] * LENGTH_KEYPOINTS)
+        for frame in range(1, 11)
+    ]
+    _, _, _, manifest = load_or_build_snapshot(str(tmp_path))
+    assert snapshot_class_counts(str(tmp_path)) == {"01" * 32: 2, "02" * 32: 3}
+
+    del manifest["class_counts"]
+    assert snapshot_class_counts(str(tmp_path), manifest) == {"01" * 32: 2, "02" * 32: 3}
+
+
+def test_snapshot_espera_el_bloqueo(fake_db, tmp_path):
+    """
+    Verifica que `load_or_build_snapshot` no consulte la huella ni escriba mientras otro
+    proceso tiene el bloqueo, y que al obtenerlo use el snapshot que ese proceso dejó.
+    """
+    load_or_build_snapshot(str(tmp_path))
+    fake_db["sequences"].reset_mock()
+    fake_db["stats"].reset_mock()
+
+    results = []
+    with open(os.path.join(tmp_path, LOCK_FILE), "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        worker = threading.Thread(
+            target=lambda: results.append(load_or_build_snapshot(str(tmp_path)))
+        )
+        worker.start()
+        worker.join(timeout=0.5)
+        assert worker.is_alive(), "Debe esperar a que se libere el bloqueo"
+        fake_db["stats"].assert_not_called()
+        fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    worker.join(timeout=5)
+    assert results[0][0].shape[0] == 4
+    fake_db["sequences"].assert_not_called()
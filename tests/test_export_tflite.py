@@ -0,0 +1,124 @@
+"""
+Tests para la exportación a TensorFlow Lite (`ml.training.export_tflite`) y su motor de
+inferencia (`ml.prediction.tflite_engine`).
+
+Este módulo valida que:
+- Un modelo LSTM se convierta a TFLite con y sin cuantización, prediciendo lo mismo que Keras.
+- La exportación guarde el modelo TFLite como artefacto de la versión en el registro, y
+  el motor la genere si todavía no existe.
+- `make_predictor` use el intérprete TFLite cuando recibe un modelo TFLite.
+- La comparación sobre el snapshot informe accuracy, latencia y memoria de ambos motores.
+"""
+
+import numpy as np
+import pytest
+
+import ml.training.dataset_snapshot as dataset_snapshot
+from ml.prediction.inference import make_predictor
+from ml.prediction.tflite_engine import load_tflite_model
+from ml.training import model_registry
+from ml.training.export_tflite import compare_tflite, convert_to_tflite, export_tflite
+from ml.training.model import get_model
+from app.config import LENGTH_KEYPOINTS, MODEL_FRAMES
+
+WORD_IDS = [b"\x01" * 32, b"\x02" * 32, b"\x03" * 32]
+
+
+@pytest.fixture(scope="module")
+def model():
+    """
+    Modelo LSTM pequeño, para cubrir la conversión de las capas recurrentes.
+    """
+    return get_model(3, lstm_units_1=4, lstm_units_2=4, dense_units=4)
+
+
+@pytest.fixture
+def registry(model, tmp_path):
+    """
+    Registro temporal con el modelo en producción.
+
+    Returns:
+        str: Carpeta del registro.
+    """
+    registry_path = str(tmp_path / "registry")
+    manifest = model_registry.register_model(
+        model, WORD_IDS, {}, "huella", registry_path=registry_path
+    )
+    model_registry.promote_model(manifest["version"], registry_path=registry_path)
+    return registry_path
+
+
+@pytest.mark.parametrize("quantization", [None, "dynamic", "float16"])
+def test_conversion_coincide_con_keras(model, quantization):
+    """
+    Verifica que el modelo TFLite prediga las mismas probabilidades que el modelo Keras.
+    """
+    X = np.random.rand(5, MODEL_FRAMES, LENGTH_KEYPOINTS).astype("float32")
+    predict = make_predictor(convert_to_tflite(model, quantization))
+
+    expected = model.predict(X, verbose=0)
+    outputs = np.array([predict(sequence) for sequence in X])
+
+    atol = 1e-5 if quantization is None else 0.05
+    np.testing.assert_allclose(outputs, expected, atol=atol)
+
+
+def test_cuantizacion_desconocida(model):
+    """
+    Verifica que una cuantización inexistente lance ValueError.
+    """
+    with pytest.raises(ValueError):
+        convert_to_tflite(model, "int4")
+
+
+def test_exportacion_se_guarda_en_el_registro(registry):
+    """
+    Verifica que la exportación quede anotada en el manifiesto y se pueda cargar.
+    """
+    manifest = export_tflite(quantization="dynamic", registry_path=registry)
+
+    artifact = manifest["artifacts"]["tflite"]
+    assert artifact["file"] == "model_dynamic.tflite"
+    assert artifact["quantization"] == "dynamic"
+
+    path = model_registry.artifact_file_path(manifest, "tflite", registry_path=registry)
+    with open(path, "rb") as file:
+        content = file.read()
+    assert len(content) == artifact["bytes"]
+
+    assert load_tflite_model(manifest, "dynamic", registry_path=registry) == content
+
+
+def test_motor_tflite_exporta_si_falta(registry):
+    """
+    Verifica que el motor convierta la versión si todavía no tiene modelo TFLite.
+    """
+    manifest = model_registry.load_production_manifest(registry_path=registry)
+
+    content = load_tflite_model(manifest, None, registry_path=registry)
+
+    manifest = model_registry.load_production_manifest(registry_path=registry)
+    assert manifest["artifacts"]["tflite"]["quantization"] is None
+    assert make_predictor(content)(np.zeros((MODEL_FRAMES, LENGTH_KEYPOINTS))).shape == (3,)
+
+
+def test_compare_tflite(registry, monkeypatch):
+    """
+    Verifica la comparación entre motores sobre la validación de un snapshot falso.
+    """
+    rng = np.random.default_rng(0)
+    X = rng.random((40, MODEL_FRAMES, LENGTH_KEYPOINTS), dtype=np.float32)
+    # El snapshot ordena las palabras distinto que el modelo y tiene una palabra nueva
+    snapshot_word_ids = [WORD_IDS[2], WORD_IDS[0], WORD_IDS[1], b"\x04" * 32]
+    labels = np.arange(40) % 4
+    dataset = (X, labels, snapshot_word_ids, {})
+    monkeypatch.setattr(dataset_snapshot, "load_snapshot", lambda path: dataset)
+
+    report = compare_tflite(validation_split=0.5, registry_path=registry)
+
+    assert 0 < report["samples"] < 20
+    assert report["agreement"] == 1.0
+    assert report["max_abs_diff"] < 1e-5
+    assert report["keras"]["accuracy"] == report["tflite"]["accuracy"]
+    assert report["tflite"]["file_mb"] > 0
+    assert report["tflite"]["latency_p50_ms"] > 0
@@ -0,0 +1,59 @@
+"""
+Tests para el ajuste incremental del modelo (`ml.training.fine_tune`).
+
+Este módulo valida que:
+- La capa de salida se expanda para las palabras nuevas conservando los pesos de las
+  palabras conocidas (aunque cambien de posición) y de las capas anteriores.
+- El replay buffer incluya todas las muestras de las palabras nuevas y un máximo de
+  muestras por cada palabra anterior.
+"""
+
+import numpy as np
+import keras
+
+from ml.training.fine_tune import build_replay_indices, expand_output_layer
+from app.config import LENGTH_KEYPOINTS, MODEL_FRAMES
+
+
+def test_expand_output_layer_conserva_pesos():
+    """
+    Verifica que las palabras conocidas mantengan sus pesos en la nueva posición.
+    """
+    model = keras.Sequential(
+        [
+            keras.Input((MODEL_FRAMES, LENGTH_KEYPOINTS)),
+            keras.layers.GlobalAveragePooling1D(),
+            keras.layers.Dense(8, activation="relu"),
+            keras.layers.Dense(2, activation="softmax"),
+        ]
+    )
+    old_kernel, old_bias = model.layers[-1].get_weights()
+    hidden = model.layers[-2].get_weights()[0].copy()
+
+    a, b, c = b"\x0a" * 32, b"\x0b" * 32, b"\x0c" * 32
+    expanded = expand_output_layer(model, [a, b], [c, a, b])
+
+    kernel, bias = expanded.layers[-1].get_weights()
+    assert kernel.shape == (8, 3)
+    np.testing.assert_allclose(kernel[:, 1], old_kernel[:, 0])
+    np.testing.assert_allclose(kernel[:, 2], old_kernel[:, 1])
+    np.testing.assert_allclose(bias[1:], old_bias)
+    np.testing.assert_allclose(expanded.layers[-2].get_weights()[0], hidden)
+
+    X = np.random.rand(2, MODEL_FRAMES, LENGTH_KEYPOINTS).astype("float32")
+    assert expanded.predict(X, verbose=0).shape == (2, 3)
+
+
+def test_replay_buffer_limita_clases_anteriores():
+    """
+    Verifica que el buffer tenga todas las muestras nuevas y como máximo `per_class` por clase anterior.
+    """
+    labels = np.array([0] * 10 + [1] * 3 + [2] * 6)
+
+    indices = build_replay_indices(labels, new_classes={2}, per_class=4)
+    selected = labels[indices]
+
+    assert (selected == 0).sum() == 4
+    assert (selected == 1).sum() == 3
+    assert (selected == 2).sum() == 6
+    assert list(indices) == sorted(indices)
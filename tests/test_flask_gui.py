@@ -117,3 +117,212 @@ def test_save_samples_route(client, monkeypatch):
 def test_404_route(client):
     response = client.get("/ruta_inexistente")
     assert response.status_code == 404
+
+
+def test_stream_upload_rechaza_extension(client):
+    response = client.post(
+        "/training/upload_video/stream/testid/testword",
+        data=b"contenido",
+        headers={"X-Filename": "video.txt"},
+    )
+    assert response.status_code == 400
+    assert response.get_json()["success"] is False
+
+
+def test_stream_upload_rechaza_tamano_excedido(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(flask_gui, "MAX_UPLOAD_BYTES", 4)
+    response = client.post(
+        "/training/upload_video/stream/testid/testword",
+        data=b"contenido demasiado grande",
+        headers={"X-Filename": "video.mp4"},
+    )
+    assert response.status_code == 413
+    assert response.get_json()["success"] is False
+
+
+def test_stream_upload_rechaza_video_vacio(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        flask_gui, "build_video_path", lambda word, filename: str(tmp_path / "video.mp4")
+    )
+    response = client.post(
+        "/training/upload_video/stream/testid/testword",
+        data=b"",
+        headers={"X-Filename": "video.mp4"},
+    )
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "El video recibido está vacío."
+    assert not (tmp_path / "video.mp4").exists()
+
+
+def test_stream_upload_escribe_a_disco(client, monkeypatch, tmp_path):
+    video_path = tmp_path / "video.mp4"
+    monkeypatch.setattr(
+        flask_gui, "build_video_path", lambda word, filename: str(video_path)
+    )
+    monkeypatch.setattr(
+        flask_gui,
+        "_ingest_video",
+        lambda word_id, word, path, content_hash: f"/save_samples/{word}/{word_id}",
+    )
+    response = client.post(
+        "/training/upload_video/stream/abc123/hola",
+        data=b"0123456789" * 1000,
+        headers={"X-Filename": "video%20se%C3%B1a.mp4"},
+    )
+    data = response.get_json()
+    assert response.status_code == 200
+    assert data["success"] is True
+    assert data["redirect"] == "/save_samples/hola/abc123"
+    assert video_path.read_bytes() == b"0123456789" * 1000
+    assert not (tmp_path / "video.mp4.part").exists()
+
+
+def test_train_model_lanza_job_en_segundo_plano(client, monkeypatch):
+    monkeypatch.setattr(
+        flask_gui,
+        "start_training_job",
+        lambda **options: {"id": "job1", "status": "pending", "options": options},
+    )
+    response = client.post("/train_model", json={"epochs": 3})
+    data = response.get_json()
+    assert response.status_code == 200
+    assert data["success"] is True
+    assert data["output"]["id"] == "job1"
+    assert data["output"]["options"] == {"epochs": 3}
+
+
+def test_train_model_rechaza_segundo_entrenamiento(client, monkeypatch):
+    def fake_start(**options):
+        raise RuntimeError("Ya hay un entrenamiento en curso")
+
+    monkeypatch.setattr(flask_gui, "start_training_job", fake_start)
+    monkeypatch.setattr(flask_gui, "get_active_job", lambda: {"id": "job1"})
+    response = client.post("/train_model")
+    assert response.status_code == 409
+    assert response.get_json()["output"]["id"] == "job1"
+
+
+def test_train_model_status_inexistente(client):
+    response = client.get("/train_model/status/no-existe")
+    assert response.status_code == 404
+
+
+def test_train_model_events_transmite_progreso(client, monkeypatch):
+    monkeypatch.setattr(flask_gui, "job_status", lambda job_id: {"id": job_id})
+    monkeypatch.setattr(
+        flask_gui,
+        "iter_job_events",
+        lambda job_id: iter([{"status": "running"}, {"status": "done"}]),
+    )
+    response = client.get("/train_model/events/job1")
+    assert response.mimetype == "text/event-stream"
+    assert response.data.count(b"data: ") == 2
+    assert b'"done"' in response.data
+
+
+def test_models_lista_versiones(client, monkeypatch):
+    monkeypatch.setattr(
+        flask_gui, "list_versions", lambda: [{"version": "v0001", "production": True}]
+    )
+    response = client.get("/models")
+    assert response.status_code == 200
+    assert response.get_json()["versions"][0]["version"] == "v0001"
+
+
+def test_promote_model_version_inexistente(client, monkeypatch):
+    def fake_promote(version):
+        raise ValueError(f"La versión {version} no existe en el registro")
+
+    monkeypatch.setattr(flask_gui, "promote_model", fake_promote)
+    response = client.post("/models/promote/v0099")
+    assert response.status_code == 404
+    assert response.get_json()["success"] is False
+
+
+def test_prediction_stats_sin_servidor(client, monkeypatch):
+    monkeypatch.setattr(flask_gui, "get_batch_server_stats", lambda: {"enabled": False})
+    response = client.get("/prediction/stats")
+    assert response.status_code == 200
+    assert response.get_json() == {"enabled": False}
+
+
+def test_stop_capture_detiene_solo_la_sesion_del_navegador(client, monkeypatch):
+    stopped = []
+    monkeypatch.setattr(
+        flask_gui,
+        "stop_stream_session",
+        lambda session_id, kind: stopped.append((session_id, kind)),
+    )
+    other = flask_gui.app.test_client()
+
+    client.post("/stop_capture", data={})
+    other.post("/stop_capture", data={})
+
+    assert [kind for _, kind in stopped] == ["capture", "capture"]
+    assert stopped[0][0] != stopped[1][0]
+
+
+def test_latency_report(client, monkeypatch):
+    monkeypatch.setattr(flask_gui, "latency_report", lambda: {"enabled": False})
+    response = client.get("/latency")
+    assert response.status_code == 200
+    assert response.get_json() == {"enabled": False}
+
+
+def test_metrics_prometheus(client):
+    client.get("/latency")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.content_type.startswith("text/plain")
+    text = response.get_data(as_text=True)
+    assert 'pojoaju_http_requests_total{endpoint="/latency",method="GET",status="200"}' in text
+
+
+def test_ingest_video_rechaza_video_con_muestras(client, monkeypatch, tmp_path):
+    video_path = tmp_path / "video.mp4"
+    video_path.write_bytes(b"video")
+    monkeypatch.setattr(
+        flask_gui, "fetch_ingestion_record", lambda h, w: ("video", 7, "video.mp4", None)
+    )
+    monkeypatch.setattr(flask_gui, "fetch_video_sample_ids", lambda w, source: [7, 8])
+    monkeypatch.setattr(
+        flask_gui, "create_samples_from_video", lambda **kwargs: pytest.fail("reprocesado")
+    )
+    word_id = "ab" * 32
+
+    with flask_gui.app.test_request_context():
+        url = flask_gui._ingest_video(word_id, "hola", str(video_path), b"\x01" * 32)
+
+    assert "/upload_video/" in url
+    assert not video_path.exists()
+
+
+def test_ingest_video_sin_muestras_se_reprocesa(client, monkeypatch, tmp_path):
+    video_path = tmp_path / "video.mp4"
+    video_path.write_bytes(b"video")
+    processed = []
+    monkeypatch.setattr(
+        flask_gui, "fetch_ingestion_record", lambda h, w: ("video", None, "video.mp4", None)
+    )
+    monkeypatch.setattr(
+        flask_gui, "create_samples_from_video", lambda **kwargs: processed.append(kwargs)
+    )
+    word_id = "ab" * 32
+
+    with flask_gui.app.test_request_context():
+        url = flask_gui._ingest_video(word_id, "hola", str(video_path), b"\x01" * 32)
+
+    assert len(processed) == 1
+    assert url.startswith(f"/save_samples/hola/{word_id}?")
+    assert "video=" + "01" * 32 in url
+
+
+def test_save_samples_pasa_el_video_de_origen(client, monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        flask_gui, "save_keypoints", lambda *args, **kwargs: calls.append(kwargs)
+    )
+    response = client.get(f"/save_samples/hola/abc?video={'01' * 32}&source=video.mp4")
+
+    assert response.status_code == 200
+    assert calls == [{"video_hash": b"\x01" * 32, "video_source": "video.mp4"}]
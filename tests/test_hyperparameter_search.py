@@ -0,0 +1,113 @@
+"""
+Tests para la búsqueda de hiperparámetros (`ml.training.hyperparameter_search`).
+
+Este módulo valida que:
+- El muestreo respete los rangos del espacio de búsqueda y sea reproducible.
+- La mediana por época solo use épocas alcanzadas por suficientes trials.
+- El leaderboard ordene los trials completos por `val_loss` antes que los podados.
+- Una búsqueda pequeña (aleatoria y successive halving) termine y escriba sus resultados.
+"""
+
+import os, csv, json
+import numpy as np
+import pytest
+
+import ml.training.dataset_snapshot as dataset_snapshot
+import ml.training.hyperparameter_search as search
+from app.config import LENGTH_KEYPOINTS, MODEL_FRAMES
+
+
+def test_sample_params_respeta_el_espacio():
+    """
+    Verifica los rangos de cada tipo de hiperparámetro y que la semilla sea reproducible.
+    """
+    space = {
+        "units": ("choice", [16, 32]),
+        "dropout": ("uniform", 0.2, 0.6),
+        "learning_rate": ("loguniform", 1e-4, 1e-2),
+    }
+    samples = [search.sample_params(space, np.random.default_rng(i)) for i in range(50)]
+
+    assert all(s["units"] in (16, 32) for s in samples)
+    assert all(0.2 <= s["dropout"] <= 0.6 for s in samples)
+    assert all(1e-4 <= s["learning_rate"] <= 1e-2 for s in samples)
+    assert search.sample_params(space, np.random.default_rng(7)) == search.sample_params(
+        space, np.random.default_rng(7)
+    )
+
+
+def test_median_curve_requiere_suficientes_trials():
+    """
+    Verifica que la curva mediana se corte en la primera época con menos de 3 trials.
+    """
+    curves = [[1.0, 0.8, 0.5], [2.0, 1.0], [3.0, 0.6]]
+
+    assert search.median_curve(curves) == [2.0, 0.8]
+    assert search.median_curve(curves[:2]) == []
+
+
+def test_leaderboard_ordena_por_val_loss(tmp_path):
+    """
+    Verifica el orden del leaderboard y las columnas del CSV.
+    """
+    records = [
+        {"trial_id": 1, "status": "pruned", "best_val_loss": 0.1, "params": {"dropout": 0.3}},
+        {"trial_id": 2, "status": "complete", "best_val_loss": 0.9, "params": {"dropout": 0.4}},
+        {"trial_id": 3, "status": "error", "best_val_loss": None, "params": {"dropout": 0.5}},
+        {"trial_id": 4, "status": "complete", "best_val_loss": 0.5, "params": {"dropout": 0.2}},
+    ]
+
+    ranked = search.write_leaderboard(str(tmp_path), records)
+
+    assert [r["trial_id"] for r in ranked] == [4, 2, 1, 3]
+    with open(tmp_path / "leaderboard.csv", encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+    assert rows[0]["trial_id"] == "4" and rows[0]["dropout"] == "0.2"
+
+
+def test_halving_budgets():
+    """
+    Verifica las épocas acumuladas de cada ronda de successive halving.
+    """
+    assert search._halving_budgets(10, 100, 3) == [10, 30, 90, 100]
+    assert search._halving_budgets(5, 5, 3) == [5]
+
+
+@pytest.mark.parametrize("strategy", ["random", "halving"])
+def test_run_search_en_proceso(tmp_path, monkeypatch, strategy):
+    """
+    Ejecuta una búsqueda pequeña en el proceso actual y valida los resultados en disco.
+    """
+    rng = np.random.default_rng(0)
+    X = rng.random((12, MODEL_FRAMES, LENGTH_KEYPOINTS), dtype=np.float32)
+    labels = np.array([0, 1] * 6)
+    dataset = (X, labels, [b"\x01" * 32, b"\x02" * 32], {"fingerprint": "abc"})
+    monkeypatch.setattr(dataset_snapshot, "load_or_build_snapshot", lambda path: dataset)
+    monkeypatch.setattr(dataset_snapshot, "load_snapshot", lambda path: dataset)
+
+    space = {
+        "lstm_units_1": ("choice", [4]),
+        "lstm_units_2": ("choice", [4]),
+        "dense_units": ("choice", [4]),
+        "dropout": ("uniform", 0.1, 0.3),
+        "learning_rate": ("loguniform", 1e-3, 1e-2),
+        "batch_size": ("choice", [4]),
+    }
+    result = search.run_search(
+        strategy=strategy,
+        trials=3,
+        workers=0,
+        max_epochs=3,
+        min_epochs=1,
+        space=space,
+        search_path=str(tmp_path),
+    )
+
+    leaderboard = result["leaderboard"]
+    assert len(leaderboard) == 3
+    assert all(r["status"] in ("complete", "pruned") for r in leaderboard)
+    assert leaderboard[0]["status"] == "complete"
+    assert leaderboard[0]["epochs"] == 3
+    assert os.path.exists(leaderboard[0]["model_path"])
+    with open(os.path.join(result["search_dir"], "leaderboard.json"), encoding="utf-8") as file:
+        assert [r["trial_id"] for r in json.load(file)] == [r["trial_id"] for r in leaderboard]
@@ -0,0 +1,156 @@
+"""
+Tests para la inferencia incremental de los modelos recurrentes (`ml.prediction.incremental_inference`).
+
+Este módulo valida que:
+- Avanzar el estado paso a paso sobre una secuencia dé las mismas probabilidades que el
+  modelo Keras sobre la secuencia completa, para las arquitecturas `lstm` y `gru`.
+- Los modelos sin pasos recurrentes no se ejecuten de forma incremental.
+- El reconocedor continuo use el predictor incremental y lo reinicie al emitir una palabra.
+- Tras emitir, bajar las manos permita volver a emitir la misma palabra.
+- El estado incremental se reinicie tras `max_windows` ventanas sin emitir.
+"""
+
+import numpy as np
+import pytest
+
+from ml.prediction.incremental_inference import (
+    IncrementalPredictor,
+    benchmark_incremental,
+    make_incremental_predictor,
+    supports_incremental,
+)
+from ml.prediction.streaming_recognizer import SlidingWindowRecognizer
+from ml.training.model import get_model
+from app.config import LENGTH_KEYPOINTS, MODEL_FRAMES
+
+SMALL = {
+    "lstm": dict(lstm_units_1=8, lstm_units_2=6, dense_units=4),
+    "gru": dict(gru_units_1=8, gru_units_2=6, dense_units=4),
+}
+
+
+@pytest.mark.parametrize("architecture", ["lstm", "gru"])
+def test_pasos_coinciden_con_keras(architecture):
+    """
+    Verifica que el último paso dé las probabilidades del modelo sobre la secuencia completa.
+    """
+    model = get_model(3, architecture=architecture, **SMALL[architecture])
+    X = np.random.rand(2, MODEL_FRAMES, LENGTH_KEYPOINTS).astype("float32")
+    expected = model.predict(X, verbose=0)
+
+    predictor = IncrementalPredictor(model)
+    for sequence, probabilities in zip(X, expected):
+        predictor.reset()
+        for keypoints in sequence:
+            output = predictor.step(keypoints)
+        np.testing.assert_allclose(output, probabilities, atol=1e-5)
+    assert predictor.steps == MODEL_FRAMES
+
+
+def test_modelo_no_recurrente():
+    """
+    Verifica que un modelo `conv1d` no admita la inferencia incremental.
+    """
+    model = get_model(3, architecture="conv1d", filters_1=4, filters_2=4, dense_units=4)
+
+    assert not supports_incremental(model)
+    assert make_incremental_predictor(model) is None
+    with pytest.raises(ValueError):
+        IncrementalPredictor(model)
+
+
+def test_reconocedor_incremental():
+    """
+    Verifica que el reconocedor emita con el predictor incremental, sin ejecutar la ventana.
+    """
+    model = get_model(2, **SMALL["lstm"])
+    window_calls = []
+    recognizer = SlidingWindowRecognizer(
+        lambda window: window_calls.append(window),
+        {0: "hola", 1: "chau"},
+        0.0,
+        frame_step=1,
+        inference_every=1,
+        votes=1,
+        min_votes=1,
+        model=model,
+        incremental=True,
+    )
+    keypoints = np.random.rand(LENGTH_KEYPOINTS)
+
+    emitted = [recognizer.update(keypoints) for _ in range(MODEL_FRAMES)]
+
+    assert emitted[-1] is not None and not any(emitted[:-1])
+    assert recognizer.stepper.steps == 0
+    assert window_calls == []
+
+
+class FakeStepper:
+    """
+    Predictor incremental falso que devuelve siempre la misma salida.
+    """
+
+    def __init__(self, output):
+        self.output = np.array(output)
+        self.steps = 0
+
+    def reset(self):
+        self.steps = 0
+
+    def step(self, keypoints):
+        self.steps += 1
+        return self.output
+
+
+def _incremental_recognizer(output, threshold=0.5, **kwargs):
+    options = dict(frame_step=1, inference_every=1, votes=1, min_votes=1, idle_frames=2)
+    options.update(kwargs)
+    recognizer = SlidingWindowRecognizer(
+        None, {0: "hola", 1: "chau"}, threshold, incremental=True, **options
+    )
+    recognizer.stepper = FakeStepper(output)
+    return recognizer
+
+
+def test_misma_palabra_tras_bajar_las_manos():
+    """
+    Verifica que bajar las manos justo después de una emisión incremental reinicie la
+    votación y permita repetir la palabra.
+    """
+    recognizer = _incremental_recognizer([0.9, 0.1])
+    keypoints = np.random.rand(LENGTH_KEYPOINTS)
+
+    first = [recognizer.update(keypoints) for _ in range(MODEL_FRAMES)]
+    recognizer.update(None, hand_present=False)
+    recognizer.update(None, hand_present=False)
+    second = [recognizer.update(keypoints) for _ in range(MODEL_FRAMES)]
+
+    assert first[-1][0] == "hola" and second[-1][0] == "hola"
+    assert recognizer.last_word == "hola"
+
+
+def test_estado_incremental_acotado_sin_emitir():
+    """
+    Verifica que sin emisiones el estado se reinicie tras `max_windows` ventanas.
+    """
+    recognizer = _incremental_recognizer([0.6, 0.4], threshold=0.9, max_windows=2)
+    keypoints = np.random.rand(LENGTH_KEYPOINTS)
+
+    for _ in range(2 * MODEL_FRAMES - 1):
+        assert recognizer.update(keypoints) is None
+    assert recognizer.stepper.steps == 2 * MODEL_FRAMES - 1
+
+    recognizer.update(keypoints)
+    assert recognizer.stepper.steps == 0 and recognizer.steps == 0
+
+
+def test_benchmark_incremental():
+    """
+    Verifica el formato del reporte del benchmark.
+    """
+    model = get_model(3, **SMALL["lstm"])
+
+    results = benchmark_incremental(model=model, runs=5)
+
+    assert [result["method"] for result in results] == ["ventana", "incremental"]
+    assert all(result["p50_ms"] > 0 for result in results)
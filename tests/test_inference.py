@@ -0,0 +1,85 @@
+"""
+Tests para la inferencia de una sola secuencia (`ml.prediction.inference`).
+
+Este módulo valida que:
+- El forward compilado, con y sin XLA, devuelva lo mismo que `model.predict`.
+- El forward compilado se cree una sola vez por modelo y se comparta entre predictores.
+- Cada predictor use su propio buffer de entrada.
+- Un modelo reemplazado se libere aunque se haya compilado su forward.
+- El benchmark informe p50 y p99 de cada método.
+"""
+
+import gc
+import weakref
+import numpy as np
+import pytest
+
+from ml.prediction import inference
+from ml.prediction.inference import benchmark_inference, compile_forward, make_predictor
+from ml.training.model import get_model
+from app.config import LENGTH_KEYPOINTS, MODEL_FRAMES
+
+
+@pytest.fixture(scope="module")
+def model():
+    """
+    Modelo conv1d pequeño para que los tests sean rápidos.
+    """
+    return get_model(4, architecture="conv1d", filters_1=4, filters_2=4, dense_units=4)
+
+
+@pytest.mark.parametrize("jit_compile", [False, True])
+def test_predictor_coincide_con_predict(model, jit_compile):
+    """
+    Verifica que el predictor compilado devuelva las mismas probabilidades que `model.predict`.
+    """
+    sequence = np.random.rand(MODEL_FRAMES, LENGTH_KEYPOINTS).astype("float32")
+    predict = make_predictor(model, jit_compile=jit_compile)
+
+    expected = model.predict(sequence[np.newaxis], verbose=0)[0]
+
+    np.testing.assert_allclose(predict(sequence), expected, rtol=1e-4, atol=1e-6)
+
+
+def test_forward_compartido_y_buffers_propios(model):
+    """
+    Verifica que dos predictores del mismo modelo compartan la función compilada
+    pero no el buffer de entrada.
+    """
+    assert compile_forward(model, False) is compile_forward(model, False)
+
+    first, second = make_predictor(model, False), make_predictor(model, False)
+    a = np.random.rand(MODEL_FRAMES, LENGTH_KEYPOINTS).astype("float32")
+    b = np.random.rand(MODEL_FRAMES, LENGTH_KEYPOINTS).astype("float32")
+
+    result_a = first(a)
+    second(b)
+
+    np.testing.assert_allclose(first(a), result_a, rtol=1e-6)
+    assert compile_forward(model, False).experimental_get_tracing_count() == 1
+
+
+def test_modelo_recargado_se_libera():
+    """
+    Verifica que el forward compilado no mantenga vivo a un modelo que ya no se usa.
+    """
+    reloaded = get_model(4, architecture="conv1d", filters_1=4, filters_2=4, dense_units=4)
+    predict = make_predictor(reloaded, jit_compile=False)
+    predict(np.random.rand(MODEL_FRAMES, LENGTH_KEYPOINTS).astype("float32"))
+    alive = weakref.ref(reloaded)
+    assert reloaded in inference._forward_functions
+
+    del reloaded, predict
+    gc.collect()
+
+    assert alive() is None
+
+
+def test_benchmark_inference(model):
+    """
+    Verifica las métricas del benchmark con pocas inferencias.
+    """
+    results = benchmark_inference(model=model, runs=5)
+
+    assert [result["method"] for result in results][0] == "model.predict"
+    assert all(0 < result["p50_ms"] <= result["p99_ms"] for result in results)
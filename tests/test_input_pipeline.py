@@ -0,0 +1,132 @@
+"""
+Tests para el pipeline de entrada `tf.data` del entrenamiento.
+
+Este módulo valida que `ml.training.input_pipeline`:
+- Genere batches con la forma y etiquetas one-hot esperadas.
+- Recorra todas las muestras en cada época, mezclándolas.
+- Aplique la aumentación sin modificar los frames de relleno.
+- Arme batches balanceados o ponderados por temperatura cuando las palabras tienen
+  cantidades de muestras muy distintas, y calcule los pesos por palabra de la loss.
+
+También valida que `ThroughputLogger` registre las muestras por segundo de cada época
+midiendo solo los batches de entrenamiento.
+"""
+
+import numpy as np
+import pytest
+import tensorflow as tf
+from unittest.mock import patch
+
+from ml.training import callbacks
+from ml.training.callbacks import ThroughputLogger
+from ml.training.input_pipeline import (
+    augment_sequence,
+    build_input_pipeline,
+    build_training_pipeline,
+    class_sampling_weights,
+    compute_class_weights,
+    dataset_from_arrays,
+)
+from app.config import LENGTH_KEYPOINTS, MODEL_FRAMES
+
+
+def test_pipeline_genera_batches_one_hot():
+    """
+    Verifica que el pipeline agrupe las muestras en batches y convierta las etiquetas a one-hot.
+    """
+    X = np.random.rand(10, MODEL_FRAMES, LENGTH_KEYPOINTS).astype("float16")
+    labels = np.array([0, 1, 2, 0, 1, 2, 0, 1, 2, 0], dtype="int32")
+
+    dataset = build_input_pipeline(dataset_from_arrays(X, labels), 3, batch_size=4)
+    batches = list(dataset)
+
+    assert [int(batch[0].shape[0]) for batch in batches] == [4, 4, 2]
+    assert batches[0][0].dtype == tf.float32
+    assert batches[0][1].shape == (4, 3)
+
+    seen = np.concatenate([np.argmax(batch[1], axis=1) for batch in batches])
+    assert sorted(seen.tolist()) == sorted(labels.tolist())
+
+
+def test_augment_sequence_mantiene_frames_de_relleno():
+    """
+    Verifica que la aumentación modifique los frames con datos y deje en cero el relleno.
+    """
+    sequence = np.zeros((MODEL_FRAMES, LENGTH_KEYPOINTS), dtype="float32")
+    sequence[5:] = 0.5
+
+    augmented, label = augment_sequence(tf.constant(sequence), tf.constant([1.0]))
+    augmented = augmented.numpy()
+
+    assert augmented.shape == sequence.shape
+    assert np.all(augmented[:5] == 0.0)
+    assert not np.allclose(augmented[5:], sequence[5:])
+    assert label.numpy().tolist() == [1.0]
+
+
+def test_throughput_logger_registra_muestras_por_segundo():
+    """
+    Verifica que `ThroughputLogger` agregue `samples_per_sec` a los logs de la época
+    midiendo solo los batches de entrenamiento, sin la validación.
+    """
+    logger = ThroughputLogger(num_samples=100)
+    logs = {}
+
+    with patch.object(callbacks.time, "perf_counter", side_effect=[0.0, 0.5, 0.5, 1.0]):
+        logger.on_epoch_begin(0)
+        for batch in range(2):
+            logger.on_train_batch_begin(batch)
+            logger.on_train_batch_end(batch)
+        logger.on_test_begin()  # La validación no se mide
+        logger.on_epoch_end(0, logs)
+
+    assert logs["samples_per_sec"] == pytest.approx(100.0)
+    assert logger.samples_per_sec == [logs["samples_per_sec"]]
+
+
+def test_class_sampling_weights():
+    """
+    Verifica los pesos de muestreo uniforme y por temperatura.
+    """
+    counts = [90, 10, 0]
+
+    np.testing.assert_allclose(class_sampling_weights(counts), [0.5, 0.5, 0.0])
+    np.testing.assert_allclose(class_sampling_weights(counts, temperature=1), [0.9, 0.1, 0.0])
+    np.testing.assert_allclose(class_sampling_weights(counts, temperature=2), [0.75, 0.25, 0.0])
+
+
+def test_compute_class_weights():
+    """
+    Verifica que las palabras con menos muestras pesen más en la loss.
+    """
+    labels = np.array([0] * 6 + [1] * 2)
+
+    weights = compute_class_weights(labels, 3)
+
+    assert weights == {0: pytest.approx(8 / 12), 1: pytest.approx(2.0), 2: 0.0}
+
+
+def test_pipeline_balanceado_equilibra_las_palabras():
+    """
+    Verifica que con muestreo balanceado cada palabra aparezca con la misma frecuencia
+    aunque tenga muchas menos muestras, manteniendo los pasos por época.
+    """
+    X = np.random.rand(100, MODEL_FRAMES, LENGTH_KEYPOINTS).astype("float16")
+    labels = np.array([0] * 90 + [1] * 10, dtype="int32")
+
+    dataset = build_training_pipeline(X, labels, 2, batch_size=10, sampling="balanced")
+    batches = list(dataset)
+    seen = np.concatenate([np.argmax(batch[1], axis=1) for batch in batches])
+
+    assert len(batches) == 10
+    assert batches[0][1].shape == (10, 2)
+    assert 0.35 < np.mean(seen == 1) < 0.65
+
+
+def test_pipeline_modo_desconocido():
+    """
+    Verifica que un modo de muestreo inexistente lance ValueError.
+    """
+    X = np.zeros((2, MODEL_FRAMES, LENGTH_KEYPOINTS), dtype="float16")
+    with pytest.raises(ValueError):
+        build_training_pipeline(X, np.array([0, 1]), 2, batch_size=2, sampling="oversample")
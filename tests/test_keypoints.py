@@ -9,6 +9,7 @@ Incluye validaciones de:
 - Procesamiento de carpetas con múltiples frames.
 - Inserción de secuencias en DataFrame.
 - Agrupación de keypoints por palabra y muestra.
+- Hash de contenido de secuencias de keypoints.
 """
 
 import os, cv2
@@ -22,6 +23,7 @@ from ml.utils.keypoints_utils import (
     insert_keypoints_sequence,
     group_keypoints_by_word_and_sample,
 )
+from ml.utils.common_utils import hash_keypoints
 
 
 def _crear_frame_dummy():
@@ -125,3 +127,21 @@ def test_group_keypoints_by_word_and_sample():
     assert labels == [0, 1]
     assert all(isinstance(seq, list) for seq in sequences)
     assert all(isinstance(val, int) for val in labels)
+
+
+def test_hash_keypoints_es_estable():
+    """
+    Verifica que `hash_keypoints` identifique secuencias iguales y distinga las distintas.
+
+    Una misma secuencia (incluso con ruido numérico despreciable) debe producir el mismo
+    hash, mientras que una secuencia diferente debe producir otro.
+
+    Returns:
+        None: Usa aserciones para validar el resultado.
+    """
+    seq = np.random.rand(15, 1662)
+
+    assert hash_keypoints(seq) == hash_keypoints(seq.copy())
+    assert hash_keypoints(seq) == hash_keypoints(list(seq + 1e-12))
+    assert hash_keypoints(seq) != hash_keypoints(seq[::-1])
+    assert len(hash_keypoints(seq)) == 32
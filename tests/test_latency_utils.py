@@ -0,0 +1,100 @@
+"""
+Tests para la medición de latencia por etapa (`ml.utils.latency_utils`).
+
+Este módulo valida que:
+- El medidor nulo no mida nada y `wrap` devuelva la misma función.
+- Las etapas se registren con `lap`, `wrap` y `since_frame_start` en buffers acotados.
+- El reporte agregue los flujos activos por tipo y calcule los FPS.
+- El overlay se dibuje sobre el frame.
+"""
+
+import gc
+import time
+import numpy as np
+
+from ml.utils import latency_utils
+from ml.utils.latency_utils import LatencyTracker, create_tracker, latency_report
+
+
+def test_medidor_nulo():
+    """
+    Verifica que con la medición desactivada no se registre nada.
+    """
+    tracker = create_tracker("prediction", enabled=False)
+
+    def function(x):
+        return x
+
+    assert tracker is latency_utils.NULL_TRACKER
+    assert tracker.wrap("predict", function) is function
+    tracker.start_frame()
+    tracker.lap("read")
+    assert tracker.summary() == {}
+
+
+def test_etapas_y_buffer_circular():
+    """
+    Verifica las etapas de cada frame y que el buffer guarde solo las últimas mediciones.
+    """
+    tracker = LatencyTracker("prediction", window=4)
+    predict = tracker.wrap("predict", lambda x: time.sleep(0.002) or x)
+
+    for _ in range(6):
+        tracker.start_frame()
+        tracker.lap("read")
+        assert predict(1) == 1
+        tracker.lap("recognition")
+        tracker.since_frame_start("sign_to_speech")
+        tracker.end_frame()
+
+    summary = tracker.summary()
+    assert set(summary) == {
+        "interval",
+        "read",
+        "predict",
+        "recognition",
+        "sign_to_speech",
+        "frame",
+    }
+    assert summary["read"]["count"] == 4
+    assert summary["interval"]["count"] == 4
+    assert summary["predict"]["p50_ms"] >= 2
+    assert summary["frame"]["p50_ms"] >= summary["recognition"]["p50_ms"]
+
+
+def test_reporte_por_tipo_de_flujo():
+    """
+    Verifica que el reporte agregue los flujos activos y olvide los terminados.
+    """
+    trackers = [create_tracker("prediction", enabled=True) for _ in range(2)]
+    capture = create_tracker("capture", enabled=True)
+    for tracker in trackers:
+        for _ in range(3):
+            tracker.start_frame()
+            tracker.lap("read")
+    capture.record("read", 1.0)
+
+    report = latency_report()
+    assert report["prediction"]["streams"] >= 2
+    assert report["prediction"]["stages"]["read"]["count"] >= 6
+    assert report["prediction"]["fps"] > 0
+    assert report["capture"]["stages"]["read"]["p50_ms"] == 1.0
+
+    del trackers, capture, tracker
+    gc.collect()
+    assert "capture" not in latency_report()
+
+
+def test_overlay():
+    """
+    Verifica que el overlay dibuje la franja inferior del frame.
+    """
+    tracker = LatencyTracker("capture", overlay=True)
+    tracker.start_frame()
+    tracker.lap("read")
+    frame = np.full((120, 160, 3), 255, dtype=np.uint8)
+
+    tracker.draw_overlay(frame)
+
+    assert frame[-1].max() < 255
+    assert frame[0].min() == 255
@@ -0,0 +1,199 @@
+"""
+Tests para las métricas de Prometheus (`app.services.metrics`).
+
+Este módulo valida que:
+- Las consultas de `_execute_query` se cuenten por operación y resultado.
+- `insert_keypoints` cuente los frames insertados.
+- Las ejecuciones de entrenamiento y los jobs se cuenten por estado.
+- La función de predicción medida registre cada inferencia.
+- `generate_metrics` devuelva el formato de texto de Prometheus.
+- Con `PROMETHEUS_MULTIPROC_DIR`, `/metrics` sume los valores de varios procesos.
+
+La base de datos se reemplaza por mocks para no requerir PostgreSQL.
+"""
+
+import os
+import sys
+import subprocess
+import numpy as np
+import pytest
+from unittest.mock import MagicMock, patch
+from prometheus_client import REGISTRY
+
+from app.database import database_utils
+from app.services import metrics
+from app.services import training_jobs
+
+
+def value(name, **labels):
+    """
+    Devuelve el valor actual de una métrica del registro del proceso (0 si no existe).
+    """
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_consultas_por_operacion_y_resultado():
+    """
+    Verifica que `_execute_query` registre las consultas exitosas y las fallidas.
+    """
+    ok_before = value("pojoaju_db_queries_total", operation="SELECT", status="ok")
+    error_before = value("pojoaju_db_queries_total", operation="INSERT", status="error")
+    count_before = value("pojoaju_db_query_duration_seconds_count", operation="SELECT")
+
+    connection = MagicMock()
+    connection.cursor.return_value.fetchone.return_value = (1,)
+    with patch.object(database_utils, "get_connection", return_value=connection):
+        assert database_utils._execute_query("\n  SELECT 1;", fetch_one=True) == (1,)
+
+        connection.cursor.return_value.execute.side_effect = RuntimeError("sin conexión")
+        with pytest.raises(RuntimeError):
+            database_utils._execute_query("INSERT INTO words VALUES (%s);", ("a",))
+
+    assert value("pojoaju_db_queries_total", operation="SELECT", status="ok") == ok_before + 1
+    assert (
+        value("pojoaju_db_queries_total", operation="INSERT", status="error")
+        == error_before + 1
+    )
+    assert (
+        value("pojoaju_db_query_duration_seconds_count", operation="SELECT")
+        == count_before + 1
+    )
+
+
+def test_operacion_desconocida_se_agrupa():
+    """
+    Verifica que las consultas sin una operación conocida no creen series nuevas.
+    """
+    before = value("pojoaju_db_queries_total", operation="OTHER", status="ok")
+    metrics.observe_query("TRUNCATE keypoints;", "ok", 0.001)
+    assert value("pojoaju_db_queries_total", operation="OTHER", status="ok") == before + 1
+
+
+def test_insert_keypoints_cuenta_frames():
+    """
+    Verifica que se cuenten los frames insertados y la duración de cada muestra.
+    """
+    frames_before = value("pojoaju_keypoint_frames_inserted_total")
+    samples_before = value("pojoaju_keypoints_insert_duration_seconds_count")
+
+    with patch.object(database_utils, "_execute_query") as execute:
+        database_utils.insert_keypoints(b"w", 1, [np.zeros(3), np.ones(3)])
+
+    assert execute.call_count == 2
+    assert value("pojoaju_keypoint_frames_inserted_total") == frames_before + 2
+    assert value("pojoaju_keypoints_insert_duration_seconds_count") == samples_before + 1
+
+
+def test_track_training_por_estado():
+    """
+    Verifica que el decorador cuente los entrenamientos completos, sin datos y con error.
+    """
+    before = {
+        status: value("pojoaju_training_runs_total", status=status)
+        for status in ("completed", "no_data", "error")
+    }
+
+    @metrics.track_training
+    def train(result):
+        if result is None:
+            raise RuntimeError("falló")
+        return result
+
+    assert train({"accuracy": 0.9}) == {"accuracy": 0.9}
+    train({"error": "No hay datos para entrenar"})
+    with pytest.raises(RuntimeError):
+        train(None)
+
+    for status in before:
+        assert value("pojoaju_training_runs_total", status=status) == before[status] + 1
+
+
+def test_job_terminado_se_cuenta_una_vez(tmp_path):
+    """
+    Verifica que el estado final de un job se registre una sola vez.
+    """
+    training_jobs._jobs.clear()
+    before = value("pojoaju_training_jobs_total", status="done")
+
+    with patch.object(training_jobs, "TRAINING_JOBS_PATH", str(tmp_path)), patch.object(
+        training_jobs, "_spawn_worker"
+    ):
+        job_id = training_jobs.start_training_job("modelo_metricas")["id"]
+        job = training_jobs.get_job(job_id)
+        training_jobs._apply_event(job, {"type": "done", "result": {}})
+        training_jobs._apply_event(job, {"type": "done", "result": {}})
+
+    assert value("pojoaju_training_jobs_total", status="done") == before + 1
+    training_jobs._jobs.clear()
+
+
+def test_predictor_medido_y_predicciones():
+    """
+    Verifica que cada inferencia y cada seña reconocida se registren.
+    """
+    inferences_before = value("pojoaju_inference_duration_seconds_count", loop="console")
+    rejected_before = value(
+        "pojoaju_predictions_total", loop="console", mode="segment", result="rejected"
+    )
+
+    predict = metrics.timed_predictor("console", lambda sequence: sequence * 2)
+    assert predict(3) == 6
+    metrics.count_prediction("console", "segment", False)
+
+    assert (
+        value("pojoaju_inference_duration_seconds_count", loop="console")
+        == inferences_before + 1
+    )
+    assert (
+        value("pojoaju_predictions_total", loop="console", mode="segment", result="rejected")
+        == rejected_before + 1
+    )
+
+
+def test_generate_metrics_formato_texto():
+    """
+    Verifica que las métricas se devuelvan en el formato de texto de Prometheus.
+    """
+    metrics.observe_http_request("GET", "/metrics", 200, 0.01)
+    body, content_type = metrics.generate_metrics()
+    text = body.decode("utf-8")
+
+    assert content_type.startswith("text/plain")
+    assert "# TYPE pojoaju_db_queries_total counter" in text
+    assert "# TYPE pojoaju_inference_duration_seconds histogram" in text
+    assert 'pojoaju_http_requests_total{endpoint="/metrics",method="GET",status="200"}' in text
+
+
+WORKER = """
+from app.services.metrics import observe_query
+for _ in range({count}):
+    observe_query("SELECT 1", "ok", 0.002)
+"""
+
+COLLECT = """
+from app.services.metrics import generate_metrics
+print(generate_metrics()[0].decode("utf-8"))
+"""
+
+
+def test_agregacion_multiproceso(tmp_path):
+    """
+    Verifica que con `PROMETHEUS_MULTIPROC_DIR` se sumen las métricas de varios procesos.
+    """
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+
+    def run(code):
+        return subprocess.run(
+            [sys.executable, "-c", code],
+            env=env,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+
+    run(WORKER.format(count=2))
+    run(WORKER.format(count=3))
+    text = run(COLLECT)
+
+    assert 'pojoaju_db_queries_total{operation="SELECT",status="ok"} 5.0' in text
+    assert 'pojoaju_db_query_duration_seconds_count{operation="SELECT"} 5.0' in text
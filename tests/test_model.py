@@ -0,0 +1,59 @@
+"""
+Tests para las arquitecturas de modelo (`ml.training.model`) y su benchmark.
+
+Este módulo valida que:
+- Todas las arquitecturas de `MODEL_BUILDERS` acepten la misma entrada y devuelvan una
+  probabilidad por palabra.
+- Se rechace una arquitectura desconocida.
+- El benchmark informe parámetros, tiempo por época y latencia.
+"""
+
+import numpy as np
+import pytest
+
+from ml.training.benchmark_models import benchmark_architecture
+from ml.training.model import MODEL_BUILDERS, get_model
+from app.config import LENGTH_KEYPOINTS, MODEL_FRAMES
+
+
+@pytest.mark.parametrize("architecture", list(MODEL_BUILDERS))
+def test_arquitecturas_comparten_entrada_y_salida(architecture):
+    """
+    Verifica la forma de la salida y que sea una distribución de probabilidad.
+    """
+    model = get_model(5, architecture=architecture)
+    X = np.random.rand(3, MODEL_FRAMES, LENGTH_KEYPOINTS).astype("float32")
+
+    output = model.predict(X, verbose=0)
+
+    assert model.input_shape == (None, MODEL_FRAMES, LENGTH_KEYPOINTS)
+    assert output.shape == (3, 5)
+    np.testing.assert_allclose(output.sum(axis=1), 1.0, rtol=1e-5)
+    assert model.optimizer is not None
+
+
+def test_arquitectura_desconocida():
+    """
+    Verifica que una arquitectura inexistente lance ValueError.
+    """
+    with pytest.raises(ValueError):
+        get_model(5, architecture="transformer")
+
+
+def test_benchmark_architecture():
+    """
+    Verifica las métricas del benchmark con un modelo pequeño.
+    """
+    result = benchmark_architecture(
+        "conv1d",
+        num_classes=3,
+        samples=16,
+        epochs=1,
+        latency_runs=5,
+        hyperparams={"filters_1": 4, "filters_2": 4, "dense_units": 4},
+    )
+
+    assert result["architecture"] == "conv1d"
+    assert result["params"] > 0
+    assert result["epoch_sec"] > 0
+    assert 0 < result["latency_p50_ms"] <= result["latency_p95_ms"]
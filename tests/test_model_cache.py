@@ -0,0 +1,131 @@
+"""
+Tests para la caché del modelo de predicción (`ml.prediction.model_cache`).
+
+Este módulo valida que:
+- El modelo se cargue y caliente una sola vez por proceso, aunque lo pidan varios hilos.
+- Solo se recargue cuando cambia la versión en producción del registro.
+- No se revise el registro más de una vez cada `MODEL_CACHE_CHECK_SECONDS`.
+- Una recarga fallida mantenga el modelo anterior.
+
+La carga del modelo y el registro se mockean para aislar la lógica de la caché.
+"""
+
+import threading
+import pytest
+from unittest.mock import MagicMock, patch
+
+import ml.prediction.model_cache as model_cache
+
+
+@pytest.fixture
+def fake_registry():
+    """
+    Mockea el registro de modelos, la carga del modelo y la búsqueda de palabras.
+
+    Returns:
+        dict: Manifiesto en producción (modificable) y mocks de `load_model` y `warm_up_model`.
+    """
+    manifest = {
+        "version": "v0001",
+        "model_name": "actions_15",
+        "model_file": "model.keras",
+        "word_ids": [(b"\x01" * 32).hex()],
+    }
+    model_cache.clear_model_cache()
+    with patch.object(
+        model_cache, "load_production_manifest", side_effect=lambda: dict(manifest)
+    ), patch.object(
+        model_cache, "load_model", side_effect=lambda path: MagicMock()
+    ) as mock_load_model, patch.object(
+        model_cache, "search_word_id", return_value=(b"\x01" * 32, "hola", "saludo")
+    ), patch.object(
+        model_cache, "warm_up_model"
+    ) as mock_warm_up, patch.object(
+        model_cache, "MODEL_CACHE_CHECK_SECONDS", 0
+    ):
+        yield {
+            "manifest": manifest,
+            "load_model": mock_load_model,
+            "warm_up": mock_warm_up,
+        }
+    model_cache.clear_model_cache()
+
+
+def test_modelo_se_carga_y_calienta_una_vez(fake_registry):
+    """
+    Verifica que llamadas repetidas y concurrentes compartan el mismo modelo calentado.
+    """
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(model_cache.get_prediction_model()))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results.append(model_cache.get_prediction_model())
+
+    assert fake_registry["load_model"].call_count == 1
+    model, idx_to_word, version = results[0]
+    assert all(result[0] is model for result in results)
+    assert idx_to_word == {0: "hola"}
+    assert version == "v0001"
+    fake_registry["warm_up"].assert_called_once_with(model)
+
+
+def test_modelo_se_recarga_al_cambiar_la_version(fake_registry):
+    """
+    Verifica que se recargue el modelo solo cuando se promueve otra versión.
+    """
+    first, _, _ = model_cache.get_prediction_model()
+    fake_registry["manifest"]["version"] = "v0002"
+
+    second, _, version = model_cache.get_prediction_model()
+
+    assert version == "v0002"
+    assert second is not first
+    assert fake_registry["load_model"].call_count == 2
+
+
+def test_revision_limitada_por_intervalo(fake_registry):
+    """
+    Verifica que dentro del intervalo de revisión no se consulte el registro.
+    """
+    model_cache.get_prediction_model()
+    fake_registry["manifest"]["version"] = "v0002"
+
+    with patch.object(model_cache, "MODEL_CACHE_CHECK_SECONDS", 3600):
+        _, _, version = model_cache.get_prediction_model()
+
+    assert version == "v0001"
+    assert fake_registry["load_model"].call_count == 1
+
+
+def test_recarga_fallida_mantiene_el_modelo_anterior(fake_registry):
+    """
+    Verifica que si falla la carga de una versión nueva se siga usando la anterior.
+    """
+    first, _, _ = model_cache.get_prediction_model()
+    fake_registry["manifest"]["version"] = "v0002"
+    fake_registry["load_model"].side_effect = OSError("archivo dañado")
+
+    with patch.object(model_cache, "MODEL_CACHE_CHECK_SECONDS", 60):
+        model_cache._state["checked_at"] = 0.0
+        model, _, version = model_cache.get_prediction_model()
+        assert model is first and version == "v0001"
+        assert model_cache._state["checked_at"] > 0
+
+        # No se reintenta hasta la próxima revisión
+        model_cache.get_prediction_model()
+    assert fake_registry["load_model"].call_count == 2
+
+
+def test_primera_carga_fallida_se_informa(fake_registry):
+    """
+    Verifica que sin un modelo anterior el error de carga se propague.
+    """
+    fake_registry["load_model"].side_effect = OSError("archivo dañado")
+
+    with pytest.raises(OSError):
+        model_cache.get_prediction_model()
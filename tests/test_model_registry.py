@@ -0,0 +1,119 @@
+"""
+Tests para el registro versionado de modelos (`ml.training.model_registry`).
+
+Este módulo valida que:
+- Cada modelo registrado reciba una versión nueva con su manifiesto.
+- La promoción a producción actualice el puntero `production.json`.
+- No se puedan promover versiones inexistentes.
+- Las escrituras simultáneas de un mismo JSON no se pisen.
+- La predicción use el orden de palabras del manifiesto en producción.
+
+El modelo Keras se reemplaza por un mock que solo escribe un archivo.
+"""
+
+import os
+import json
+import threading
+import pytest
+from unittest.mock import MagicMock, patch
+
+from ml.training import model_registry
+from ml.prediction.model_cache import load_prediction_model
+
+
+def _fake_model():
+    """
+    Crea un modelo falso cuyo `save` escribe un archivo vacío.
+    """
+    model = MagicMock()
+    model.save.side_effect = lambda path: open(path, "wb").close()
+    return model
+
+
+def test_registrar_y_promover_versiones(tmp_path):
+    """
+    Verifica que se creen versiones consecutivas y que la promoción cambie la versión en producción.
+    """
+    registry = str(tmp_path)
+    word_ids = [b"\x02" * 32, b"\x01" * 32]
+
+    first = model_registry.register_model(
+        _fake_model(), word_ids, {"val_accuracy": 0.8}, "huella", registry_path=registry
+    )
+    second = model_registry.register_model(
+        _fake_model(), word_ids, {"val_accuracy": 0.9}, "huella", registry_path=registry
+    )
+
+    assert (first["version"], second["version"]) == ("v0001", "v0002")
+    assert first["word_ids"] == [word_id.hex() for word_id in word_ids]
+    assert model_registry.get_production_version(registry_path=registry) is None
+
+    model_registry.promote_model("v0001", registry_path=registry)
+    assert model_registry.get_production_version(registry_path=registry) == "v0001"
+
+    model_registry.promote_model("v0002", registry_path=registry)
+    versions = model_registry.list_versions(registry_path=registry)
+    assert [v["production"] for v in versions] == [False, True]
+    assert model_registry.load_production_manifest(registry_path=registry)["metrics"] == {
+        "val_accuracy": 0.9
+    }
+
+
+def test_promover_version_inexistente(tmp_path):
+    """
+    Verifica que promover una versión que no existe lance `ValueError`.
+    """
+    with pytest.raises(ValueError):
+        model_registry.promote_model("v0042", registry_path=str(tmp_path))
+
+
+@patch("ml.prediction.model_cache.search_word_id")
+@patch("ml.prediction.model_cache.load_model")
+@patch("ml.prediction.model_cache.load_production_manifest")
+def test_prediccion_usa_orden_del_manifiesto(
+    mock_manifest, mock_load_model, mock_search_word
+):
+    """
+    Verifica que la predicción tome el orden de palabras del manifiesto en producción
+    y no el de la base de datos.
+    """
+    mock_manifest.return_value = {
+        "version": "v0003",
+        "model_name": "actions_15",
+        "model_file": "model.keras",
+        "word_ids": [(b"\x02" * 32).hex(), (b"\x01" * 32).hex()],
+    }
+    names = {b"\x01" * 32: "hola", b"\x02" * 32: "chau"}
+    mock_search_word.side_effect = lambda word_id: (word_id, names[word_id], "cat")
+
+    _, idx_to_word, version = load_prediction_model()
+
+    assert version == "v0003"
+    assert idx_to_word == {0: "chau", 1: "hola"}
+
+
+def test_escrituras_json_simultaneas(tmp_path):
+    """
+    Verifica que varias escrituras simultáneas del mismo JSON terminen sin errores,
+    dejen un archivo válido y no dejen temporales.
+    """
+    path = str(tmp_path / "production.json")
+    errors = []
+
+    def write(version):
+        try:
+            for _ in range(50):
+                model_registry._write_json_atomic(path, {"version": version})
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(f"v{i:04d}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    with open(path, encoding="utf-8") as file:
+        assert json.load(file)["version"].startswith("v")
+    assert os.listdir(tmp_path) == ["production.json"]
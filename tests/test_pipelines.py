@@ -16,7 +16,7 @@ from unittest.mock import patch
 
 from ml.features.pipelines import create_samples_from_camera, save_keypoints
 from ml.utils.common_utils import create_folder
-from app.database.database_utils import fetch_keypoints_by_words
+from app.database.database_utils import fetch_ingestion_record, fetch_keypoints_by_words
 from app.database.connection import get_connection
 
 
@@ -97,6 +97,31 @@ def test_save_keypoints_inserta_en_db(dummy_sample_folder):
     assert len(resultados) > 0, "No se insertaron keypoints en la base de datos"
 
 
+def test_save_keypoints_registra_el_video_con_sus_muestras(dummy_sample_folder):
+    """
+    Verifica que el video de origen se registre vinculado a una muestra, y que un video
+    sin muestras no se registre (para poder volver a subirlo).
+    """
+    from hashlib import sha256
+
+    word_name = dummy_sample_folder.name
+    root_path = str(dummy_sample_folder.parent)
+    word_id = sha256(word_name.encode()).digest()
+    video_hash = sha256(b"video con muestras").digest()
+    empty_hash = sha256(b"video sin muestras").digest()
+
+    save_keypoints(
+        word_name, word_id, root_path, video_hash=video_hash, video_source="video.mp4"
+    )
+    save_keypoints(
+        word_name, word_id, root_path, video_hash=empty_hash, video_source="vacio.mp4"
+    )
+
+    record = fetch_ingestion_record(video_hash, word_id)
+    assert record[0] == "video" and record[1] is not None
+    assert fetch_ingestion_record(empty_hash, word_id) is None
+
+
 def test_create_samples_from_camera_debug_true():
     """
     Verifica que `create_samples_from_camera` ejecuta el generador completo en modo debug.
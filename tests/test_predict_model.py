@@ -10,21 +10,26 @@ No se requiere hardware real ni modelo entrenado: todas las dependencias se mock
 para aislar la lógica principal.
 """
 
+import keras
 import numpy as np
 from unittest.mock import patch, MagicMock
 
+from app.config import LENGTH_KEYPOINTS, MODEL_FRAMES
+
+from ml.prediction.model_cache import clear_model_cache
 from ml.prediction.predict_model_from_camera import predict_model_from_camera
 
 
 @patch("ml.prediction.predict_model_from_camera.draw_keypoints")
 @patch("ml.prediction.predict_model_from_camera.text_to_speech")
 @patch("ml.prediction.predict_model_from_camera.there_hand")
-@patch("ml.prediction.predict_model_from_camera.fetch_word_ids_with_keypoints")
-@patch("ml.prediction.predict_model_from_camera.search_word_id")
+@patch("ml.prediction.model_cache.load_production_manifest", return_value=None)
+@patch("ml.prediction.model_cache.fetch_word_ids_with_keypoints")
+@patch("ml.prediction.model_cache.search_word_id")
 @patch("ml.prediction.predict_model_from_camera.mediapipe_detection")
 @patch("ml.prediction.predict_model_from_camera.extract_keypoints")
 @patch("ml.prediction.predict_model_from_camera.Holistic")
-@patch("ml.prediction.predict_model_from_camera.load_model")
+@patch("ml.prediction.model_cache.load_model")
 def test_predict_model_desde_video(
     mock_load_model,
     mock_Holistic,
@@ -32,6 +37,7 @@ def test_predict_model_desde_video(
     mock_detection,
     mock_search_word,
     mock_fetch_ids,
+    mock_manifest,
     mock_there_hand,
     mock_tts,
     mock_draw,
@@ -40,7 +46,8 @@ def test_predict_model_desde_video(
     Verifica que `predict_model_from_camera()` procese frames simulados y genere una predicción válida.
 
     El test:
-    - Mockea el modelo LSTM (`load_model`) para que siempre prediga "hola".
+    - Reemplaza el modelo LSTM (`load_model`) por un modelo Keras de una sola salida,
+      que siempre predice "hola" y pasa por el forward compilado real.
     - Simula 15 frames con detección de mano y 5 sin mano.
     - Mockea la cámara (`cv2.VideoCapture`) para devolver un número fijo de frames.
     - Desactiva la visualización (`cv2.imshow`, `cv2.waitKey`).
@@ -54,10 +61,14 @@ def test_predict_model_desde_video(
     mock_fetch_ids.return_value = ["id1"]
     mock_search_word.return_value = ("id1", "hola", "saludo")
 
-    # Modelo falso: siempre devuelve una predicción de alta confianza
-    model_fake = MagicMock()
-    model_fake.predict.return_value = np.array([[0.99]])
-    mock_load_model.return_value = model_fake
+    # Modelo con una sola palabra: siempre devuelve una predicción de confianza 1
+    mock_load_model.return_value = keras.Sequential(
+        [
+            keras.Input((MODEL_FRAMES, LENGTH_KEYPOINTS)),
+            keras.layers.Flatten(),
+            keras.layers.Dense(1, activation="softmax"),
+        ]
+    )
 
     # Resultados de MediaPipe (con mano presente)
     results_fake = MagicMock()
@@ -66,7 +77,7 @@ def test_predict_model_desde_video(
 
     # Secuencia simulada de detección de mano
     mock_there_hand.side_effect = [True] * 15 + [False] * 5
-    mock_extract_keypoints.side_effect = [np.random.rand(1662) for _ in range(15)]
+    mock_extract_keypoints.side_effect = [np.random.rand(LENGTH_KEYPOINTS) for _ in range(15)]
 
     # Mock del modelo Holistic y de VideoCapture
     mock_Holistic.return_value.__enter__.return_value = MagicMock()
@@ -77,6 +88,7 @@ def test_predict_model_desde_video(
     mock_capture = MagicMock(return_value=mock_video)
 
     # --- Ejecución ---
+    clear_model_cache()
     with patch("cv2.VideoCapture", mock_capture), patch("cv2.imshow"), patch(
         "cv2.waitKey", return_value=-1
     ), patch("cv2.destroyAllWindows"):
@@ -87,3 +99,4 @@ def test_predict_model_desde_video(
     assert any(
         "hola" in s for s in result
     ), f"No se encontró 'hola' en el resultado: {result}"
+    clear_model_cache()
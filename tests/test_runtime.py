@@ -0,0 +1,64 @@
+"""
+Tests para la configuración del runtime de entrenamiento (`ml.training.runtime`).
+
+Este módulo valida que:
+- La precisión mixta bfloat16 solo se active si la CPU la soporta.
+- Con precisión mixta, la capa de salida del modelo siga calculando en float32.
+- La semilla haga reproducible la inicialización del modelo.
+"""
+
+import keras
+import numpy as np
+import pytest
+
+import ml.training.runtime as runtime
+from ml.training.model import get_model
+
+
+@pytest.fixture(autouse=True)
+def restore_policy():
+    """
+    Restaura la política de precisión global después de cada test.
+    """
+    yield
+    keras.mixed_precision.set_global_policy("float32")
+
+
+def test_bfloat16_requiere_soporte_de_cpu(monkeypatch):
+    """
+    Verifica que sin soporte de CPU se entrene en float32.
+    """
+    monkeypatch.setattr(runtime, "cpu_supports_bfloat16", lambda: False)
+
+    settings = runtime.configure_training_runtime(mixed_precision=True)
+
+    assert settings["precision"] == "float32"
+    assert keras.mixed_precision.global_policy().name == "float32"
+
+
+def test_bfloat16_mantiene_salida_en_float32(monkeypatch):
+    """
+    Verifica la política mixta y que el softmax de salida quede en float32.
+    """
+    monkeypatch.setattr(runtime, "cpu_supports_bfloat16", lambda: True)
+
+    settings = runtime.configure_training_runtime(mixed_precision=True)
+    model = get_model(3, architecture="conv1d", filters_1=4, filters_2=4, dense_units=4)
+
+    assert settings["precision"] == "mixed_bfloat16"
+    assert model.layers[0].compute_dtype == "bfloat16"
+    assert model.layers[0].variable_dtype == "float32"
+    assert model.layers[-1].compute_dtype == "float32"
+
+
+def test_semilla_reproducible():
+    """
+    Verifica que la misma semilla genere los mismos pesos iniciales.
+    """
+    weights = []
+    for _ in range(2):
+        runtime.configure_training_runtime(seed=123)
+        model = get_model(3, architecture="conv1d", filters_1=4, filters_2=4, dense_units=4)
+        weights.append(model.layers[0].get_weights()[0])
+
+    np.testing.assert_array_equal(weights[0], weights[1])
@@ -0,0 +1,119 @@
+"""
+Tests para las sesiones de captura y predicción por navegador (`app.services.stream_sessions`).
+
+Este módulo valida que:
+- Detener la sesión de un navegador no afecte a las sesiones de otros navegadores.
+- Abrir una sesión del mismo tipo detenga la anterior del mismo navegador.
+- Al terminar el stream se cierre el generador y la sesión salga del registro.
+- Las sesiones inactivas se detengan y se quiten del registro.
+"""
+
+import time
+import pytest
+
+from app.services import stream_sessions
+from app.services.stream_sessions import (
+    cleanup_idle_sessions,
+    get_stream_session,
+    list_stream_sessions,
+    open_stream_session,
+    stop_stream_session,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    stream_sessions._sessions.clear()
+    yield
+    stream_sessions._sessions.clear()
+
+
+def _frames(stop_event, closed):
+    """
+    Generador de frames falso que se detiene con el evento de su sesión.
+    """
+    try:
+        while not stop_event.is_set():
+            yield b"frame"
+    finally:
+        closed.append(True)
+
+
+def test_sesiones_aisladas_por_navegador():
+    """
+    Verifica que detener la captura de un navegador no detenga la de otro ni su predicción.
+    """
+    a = open_stream_session("a", "capture")
+    b = open_stream_session("b", "capture")
+    prediction = open_stream_session("a", "prediction")
+
+    assert stop_stream_session("a", "capture")
+
+    assert a.stop_event.is_set()
+    assert not b.stop_event.is_set() and not prediction.stop_event.is_set()
+    assert get_stream_session("a", "capture") is None
+    assert not stop_stream_session("a", "capture")
+
+
+def test_nueva_sesion_detiene_la_anterior():
+    """
+    Verifica que recargar el stream en el mismo navegador detenga el anterior.
+    """
+    first = open_stream_session("a", "capture")
+    second = open_stream_session("a", "capture")
+
+    assert first.stop_event.is_set()
+    assert get_stream_session("a", "capture") is second
+
+
+def test_stream_cierra_el_generador():
+    """
+    Verifica que al detener la sesión el stream termine, cierre el generador y la
+    quite del registro.
+    """
+    session = open_stream_session("a", "prediction")
+    closed = []
+    frames = []
+
+    for frame in session.stream(_frames(session.stop_event, closed)):
+        frames.append(frame)
+        if len(frames) == 3:
+            session.stop()
+
+    assert len(frames) == 3 and session.frames == 3
+    assert closed == [True]
+    assert get_stream_session("a", "prediction") is None
+
+
+def test_desconexion_del_cliente_cierra_el_generador():
+    """
+    Verifica que cerrar el stream (cliente desconectado) libere el generador de la sesión.
+    """
+    session = open_stream_session("a", "capture")
+    closed = []
+    stream = session.stream(_frames(session.stop_event, closed))
+
+    next(stream)
+    stream.close()
+
+    assert closed == [True]
+    assert list_stream_sessions() == []
+
+
+def test_limpieza_de_sesiones_inactivas():
+    """
+    Verifica que solo las sesiones sin frames recientes se detengan.
+    """
+    idle = open_stream_session("a", "capture")
+    active = open_stream_session("b", "capture")
+    idle.last_seen = time.monotonic() - 100
+
+    assert cleanup_idle_sessions(timeout=10) == 1
+
+    assert idle.stop_event.is_set() and not active.stop_event.is_set()
+    assert [status["session"] for status in list_stream_sessions()] == ["b"]
+
+
+def test_tipo_de_sesion_desconocido():
+    with pytest.raises(ValueError):
+        open_stream_session("a", "upload")
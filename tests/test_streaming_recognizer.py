@@ -0,0 +1,112 @@
+"""
+Tests para el reconocimiento continuo con ventana deslizante (`ml.prediction.streaming_recognizer`).
+
+Este módulo valida que:
+- Una palabra se emita recién cuando la votación se estabiliza y supera el umbral.
+- La misma palabra no se repita mientras se sigue señando, pero sí tras un reinicio por inactividad.
+- La inferencia respete el paso de la ventana y la cadencia configurados.
+- La ventana se entregue al predictor en orden temporal.
+"""
+
+import numpy as np
+
+from ml.prediction.streaming_recognizer import SlidingWindowRecognizer
+from app.config import LENGTH_KEYPOINTS, MODEL_FRAMES
+
+IDX_TO_WORD = {0: "hola", 1: "chau"}
+
+
+class FakePredict:
+    """
+    Predictor falso que devuelve siempre la misma salida y registra las ventanas recibidas.
+    """
+
+    def __init__(self, output):
+        self.output = np.array(output)
+        self.windows = []
+
+    def __call__(self, window):
+        self.windows.append(np.array(window))
+        return self.output
+
+
+def _recognizer(predict, **kwargs):
+    options = dict(frame_step=1, inference_every=1, votes=3, min_votes=3, idle_frames=2)
+    options.update(kwargs)
+    return SlidingWindowRecognizer(predict, IDX_TO_WORD, 0.8, **options)
+
+
+def _feed(recognizer, frames, hand_present=True):
+    """
+    Procesa `frames` frames iguales y devuelve las palabras emitidas.
+    """
+    keypoints = np.ones(LENGTH_KEYPOINTS)
+    emitted = [recognizer.update(keypoints, hand_present) for _ in range(frames)]
+    return [result for result in emitted if result]
+
+
+def test_emite_cuando_la_votacion_se_estabiliza():
+    """
+    Verifica que la palabra se emita con la ventana llena y `min_votes` votos.
+    """
+    predict = FakePredict([0.9, 0.1])
+    recognizer = _recognizer(predict)
+
+    assert _feed(recognizer, MODEL_FRAMES + 1) == []
+    emitted = _feed(recognizer, 1)
+
+    assert emitted[0][0] == "hola"
+    assert abs(emitted[0][1] - 0.9) < 1e-6
+
+
+def test_no_emite_bajo_el_umbral():
+    """
+    Verifica que una palabra con probabilidad promedio baja no se emita.
+    """
+    recognizer = _recognizer(FakePredict([0.6, 0.4]))
+
+    assert _feed(recognizer, MODEL_FRAMES + 20) == []
+
+
+def test_no_repite_mientras_se_sigue_senando():
+    """
+    Verifica que la misma palabra se emita una sola vez hasta el reinicio por inactividad.
+    """
+    recognizer = _recognizer(FakePredict([0.9, 0.1]))
+
+    assert len(_feed(recognizer, MODEL_FRAMES + 30)) == 1
+
+    _feed(recognizer, 1, hand_present=False)
+    assert _feed(recognizer, MODEL_FRAMES + 30) == []
+
+    _feed(recognizer, 2, hand_present=False)
+    assert len(_feed(recognizer, MODEL_FRAMES + 30)) == 1
+
+
+def test_cadencia_de_inferencia():
+    """
+    Verifica el muestreo de frames y la cantidad de inferencias con la ventana llena.
+    """
+    predict = FakePredict([0.5, 0.5])
+    recognizer = _recognizer(predict, frame_step=2, inference_every=3)
+
+    _feed(recognizer, 2 * MODEL_FRAMES - 1)
+    assert len(predict.windows) == 1
+
+    _feed(recognizer, 2 * 6)
+    assert len(predict.windows) == 3
+
+
+def test_ventana_en_orden_temporal():
+    """
+    Verifica que el predictor reciba los pasos del más viejo al más nuevo.
+    """
+    predict = FakePredict([0.5, 0.5])
+    recognizer = _recognizer(predict)
+
+    for step in range(MODEL_FRAMES + 3):
+        recognizer.update(np.full(LENGTH_KEYPOINTS, step))
+
+    window = predict.windows[-1]
+    assert window.shape == (MODEL_FRAMES, LENGTH_KEYPOINTS)
+    np.testing.assert_array_equal(window[:, 0], np.arange(3, MODEL_FRAMES + 3))
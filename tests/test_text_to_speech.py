@@ -0,0 +1,143 @@
+"""
+Tests para el servicio de voz (`app.services.text_to_speech`).
+
+Este módulo valida que:
+- `speak` vuelva de inmediato y el audio se reproduzca en el hilo del servicio.
+- Las palabras repetidas pendientes o sonando se coalescan y la cola descarta la más vieja.
+- El audio de cada palabra se sintetice una sola vez y se tome de la caché en disco.
+- El precalentamiento genere el audio de las palabras que faltan sin reproducirlas.
+
+Los tests no usan un motor de voz real: la síntesis escribe un archivo de texto y la
+reproducción se registra en una lista.
+"""
+
+import os
+import threading
+import pytest
+
+from app.services.text_to_speech import SpeechService
+
+
+class FakePlayer:
+    """
+    Reproductor falso que registra cada audio y puede quedar bloqueado hasta `release`.
+    """
+
+    def __init__(self, blocked=False):
+        self.played = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        if not blocked:
+            self.release.set()
+
+    def __call__(self, path):
+        with open(path, encoding="utf-8") as file:
+            self.played.append(file.read())
+        self.started.set()
+        self.release.wait(5)
+
+
+@pytest.fixture
+def make_service(tmp_path):
+    services = []
+
+    def make(player, max_pending=3):
+        service = SpeechService(
+            engine="gtts", cache_path=str(tmp_path), max_pending=max_pending, play=player
+        )
+
+        def synthesize(text, path):
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(text)
+
+        service._synthesize = synthesize
+        services.append(service)
+        return service
+
+    yield make
+    for service in services:
+        service.stop()
+
+
+def test_reproduce_en_segundo_plano_con_cache(make_service):
+    """
+    Verifica que la palabra se reproduzca y que la segunda vez salga de la caché.
+    """
+    player = FakePlayer()
+    service = make_service(player)
+
+    assert service.speak("hola")
+    assert service.wait_idle(5)
+    assert service.speak("hola")
+    assert service.wait_idle(5)
+
+    assert player.played == ["hola", "hola"]
+    assert service.stats()["synthesized"] == 1
+    assert os.path.exists(service.audio_path("Hola "))
+
+
+def test_coalesce_y_descarta_la_mas_vieja(make_service):
+    """
+    Verifica que las repeticiones no se encolen y que la cola llena descarte la más vieja.
+    """
+    player = FakePlayer(blocked=True)
+    service = make_service(player, max_pending=2)
+
+    service.speak("hola")
+    assert player.started.wait(5)  # "hola" está sonando
+
+    assert not service.speak("hola")
+    assert service.speak("casa")
+    assert not service.speak("casa")
+    assert service.speak("perro")
+    assert service.speak("gato")  # Descarta "casa"
+
+    player.release.set()
+    assert service.wait_idle(5)
+
+    assert player.played == ["hola", "perro", "gato"]
+    stats = service.stats()
+    assert stats["coalesced"] == 2 and stats["dropped"] == 1 and stats["pending"] == 0
+
+
+def test_precalentamiento_sin_reproducir(make_service):
+    """
+    Verifica que el precalentamiento solo genere el audio de las palabras que faltan.
+    """
+    player = FakePlayer()
+    service = make_service(player)
+
+    assert service.warm_up(["hola", "casa"]) == 2
+    assert service.wait_idle(5)
+    assert service.warm_up(["hola", "casa", "perro"]) == 1
+    assert service.wait_idle(5)
+
+    assert player.played == []
+    assert service.stats()["synthesized"] == 3
+
+
+def test_error_de_sintesis_no_detiene_el_servicio(make_service):
+    """
+    Verifica que un error al generar el audio se registre y el servicio siga funcionando.
+    """
+    player = FakePlayer()
+    service = make_service(player)
+    synthesize = service._synthesize
+
+    def failing(text, path):
+        if text == "error":
+            raise RuntimeError("sin motor de voz")
+        synthesize(text, path)
+
+    service._synthesize = failing
+    service.speak("error")
+    service.speak("hola")
+    assert service.wait_idle(5)
+
+    assert player.played == ["hola"]
+    assert service.stats()["errors"] == 1
+
+
+def test_motor_desconocido():
+    with pytest.raises(ValueError):
+        SpeechService(engine="festival")
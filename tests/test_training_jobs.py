@@ -0,0 +1,272 @@
+"""
+Tests para los entrenamientos en segundo plano (`app.services.training_jobs`).
+
+Este módulo valida el registro y el ciclo de vida de los jobs de entrenamiento:
+- Solo puede haber un entrenamiento activo por modelo.
+- Los eventos del proceso de entrenamiento actualizan el historial y el estado.
+- La cancelación activa el evento del proceso.
+- `iter_job_events` emite solo las épocas nuevas y termina con el job.
+- Otro worker ve el estado, respeta el entrenamiento activo y puede pedir la cancelación
+  a través del estado compartido en disco.
+- Los jobs terminados más viejos se descartan.
+
+El proceso de entrenamiento se reemplaza por un mock para no ejecutar TensorFlow.
+"""
+
+import os
+import json
+import queue
+import threading
+import pytest
+from unittest.mock import MagicMock, patch
+
+import app.services.training_jobs as training_jobs
+
+
+@pytest.fixture
+def fake_worker(tmp_path):
+    """
+    Reemplaza la creación del proceso de entrenamiento, limpia el registro de jobs y
+    guarda el estado compartido en una carpeta temporal.
+
+    Returns:
+        MagicMock: Mock de `_spawn_worker`.
+    """
+    training_jobs._jobs.clear()
+
+    def spawn(job, options):
+        job["_cancel"] = threading.Event()
+
+    with patch.object(training_jobs, "TRAINING_JOBS_PATH", str(tmp_path)), patch.object(
+        training_jobs, "_spawn_worker", side_effect=spawn
+    ) as mock_spawn:
+        yield mock_spawn
+    training_jobs._jobs.clear()
+
+
+def other_worker():
+    """
+    Simula otro worker WSGI: un registro de jobs en memoria vacío.
+    """
+    return patch.object(training_jobs, "_jobs", {})
+
+
+def test_un_solo_entrenamiento_activo_por_modelo(fake_worker):
+    """
+    Verifica que no se pueda lanzar un segundo entrenamiento del mismo modelo.
+    """
+    job = training_jobs.start_training_job("modelo_a", epochs=5)
+    assert job["status"] == "pending"
+    fake_worker.assert_called_once()
+
+    with pytest.raises(RuntimeError):
+        training_jobs.start_training_job("modelo_a")
+
+    otro = training_jobs.start_training_job("modelo_b")
+    assert otro["id"] != job["id"]
+    assert training_jobs.get_active_job("modelo_a")["id"] == job["id"]
+
+
+def test_eventos_actualizan_historial_y_estado(fake_worker):
+    """
+    Verifica que los eventos del proceso actualicen el historial de épocas y el estado final.
+    """
+    job_id = training_jobs.start_training_job("modelo_a")["id"]
+    job = training_jobs.get_job(job_id)
+
+    training_jobs._apply_event(job, {"type": "running"})
+    training_jobs._apply_event(
+        job, {"type": "epoch", "epoch": 1, "metrics": {"loss": 1.0}}
+    )
+    training_jobs._apply_event(
+        job, {"type": "epoch", "epoch": 2, "metrics": {"loss": 0.5}}
+    )
+
+    status = training_jobs.job_status(job_id, since_epoch=1)
+    assert status["status"] == "running"
+    assert status["epochs_done"] == 2
+    assert status["history"] == [{"epoch": 2, "loss": 0.5}]
+
+    training_jobs._apply_event(job, {"type": "done", "result": {"accuracy": 0.9}})
+    status = training_jobs.job_status(job_id)
+    assert status["active"] is False
+    assert status["result"] == {"accuracy": 0.9}
+    assert training_jobs.get_active_job("modelo_a") is None
+    assert "_cancel" not in status
+
+
+def test_cancelar_entrenamiento(fake_worker):
+    """
+    Verifica que la cancelación active el evento del proceso y permita un nuevo entrenamiento.
+    """
+    job_id = training_jobs.start_training_job("modelo_a")["id"]
+    job = training_jobs.get_job(job_id)
+
+    with patch.object(training_jobs, "TRAINING_CANCEL_TIMEOUT", 0):
+        assert training_jobs.cancel_training_job(job_id) is True
+    assert job["_cancel"].is_set()
+    assert job["status"] == "cancelling"
+
+    training_jobs._apply_event(job, {"type": "cancelled"})
+    assert training_jobs.cancel_training_job(job_id) is False
+    assert training_jobs.start_training_job("modelo_a")["id"] != job_id
+
+
+def test_iter_job_events_emite_epocas_nuevas(fake_worker):
+    """
+    Verifica que `iter_job_events` emita las épocas nuevas y termine al finalizar el job.
+    """
+    job_id = training_jobs.start_training_job("modelo_a")["id"]
+    job = training_jobs.get_job(job_id)
+    training_jobs._apply_event(
+        job, {"type": "epoch", "epoch": 1, "metrics": {"loss": 1.0}}
+    )
+
+    events = training_jobs.iter_job_events(job_id, poll_interval=0)
+    first = next(events)
+    assert [entry["epoch"] for entry in first["history"]] == [1]
+
+    training_jobs._apply_event(
+        job, {"type": "epoch", "epoch": 2, "metrics": {"loss": 0.5}}
+    )
+    training_jobs._apply_event(job, {"type": "done", "result": {}})
+    rest = list(events)
+    assert [entry["epoch"] for entry in rest[0]["history"]] == [2]
+    assert rest[-1]["status"] == "done"
+
+
+def test_iter_job_events_con_entrenamiento_retomado(fake_worker):
+    """
+    Verifica que un entrenamiento retomado (épocas desde 41) emita cada época una sola vez.
+    """
+    job_id = training_jobs.start_training_job("modelo_a", resume=True)["id"]
+    job = training_jobs.get_job(job_id)
+    training_jobs._apply_event(
+        job, {"type": "epoch", "epoch": 41, "metrics": {"loss": 1.0}}
+    )
+
+    events = training_jobs.iter_job_events(job_id, poll_interval=0)
+    first = next(events)
+    assert first["epochs_done"] == 41
+
+    for epoch in (42, 43):
+        training_jobs._apply_event(
+            job, {"type": "epoch", "epoch": epoch, "metrics": {"loss": 0.5}}
+        )
+        assert [entry["epoch"] for entry in next(events)["history"]] == [epoch]
+    training_jobs._apply_event(job, {"type": "done", "result": {}})
+
+    emitted = [entry["epoch"] for entry in first["history"]]
+    for status in events:
+        emitted += [entry["epoch"] for entry in status["history"]]
+    assert emitted == [41]
+    assert training_jobs.job_status(job_id, since_epoch=43)["history"] == []
+
+
+def test_ajuste_incremental_ignora_resume():
+    """
+    Verifica que el ajuste incremental no reciba `resume`, que solo acepta `training_model`.
+    """
+    import queue
+    import ml.training.fine_tune as fine_tune
+
+    received = {}
+
+    def fake_fine_tune(epochs=1, callbacks=None):
+        received.update(epochs=epochs)
+        return {"accuracy": 1.0}
+
+    events = queue.Queue()
+    with patch.object(fine_tune, "fine_tune_model", fake_fine_tune):
+        training_jobs._training_worker(
+            events, threading.Event(), {"mode": "fine_tune", "resume": False, "epochs": 3}
+        )
+
+    types = []
+    while not events.empty():
+        types.append(events.get()["type"])
+    assert types == ["running", "done"]
+    assert received == {"epochs": 3}
+
+
+def test_estado_compartido_con_otro_worker(fake_worker):
+    """
+    Verifica que otro worker vea el estado del job y no pueda lanzar otro entrenamiento
+    del mismo modelo.
+    """
+    job_id = training_jobs.start_training_job("modelo_a")["id"]
+    job = training_jobs.get_job(job_id)
+    training_jobs._apply_event(job, {"type": "running"})
+    training_jobs._apply_event(
+        job, {"type": "epoch", "epoch": 1, "metrics": {"loss": 1.0}}
+    )
+
+    with other_worker():
+        status = training_jobs.job_status(job_id)
+        assert status["status"] == "running"
+        assert status["epochs_done"] == 1
+        assert training_jobs.get_active_job("modelo_a")["id"] == job_id
+        with pytest.raises(RuntimeError):
+            training_jobs.start_training_job("modelo_a")
+
+    training_jobs._apply_event(job, {"type": "done", "result": {}})
+    with other_worker():
+        assert training_jobs.job_status(job_id)["active"] is False
+        assert training_jobs.get_active_job("modelo_a") is None
+        assert training_jobs.start_training_job("modelo_a")["id"] != job_id
+
+
+def test_cancelar_desde_otro_worker(fake_worker):
+    """
+    Verifica que la cancelación pedida en otro worker la aplique el worker dueño del job.
+    """
+    job_id = training_jobs.start_training_job("modelo_a")["id"]
+    job = training_jobs.get_job(job_id)
+
+    with other_worker():
+        assert training_jobs.cancel_training_job(job_id) is True
+
+    job["_process"] = MagicMock(exitcode=-15)
+    job["_process"].is_alive.return_value = False
+    job["_events"] = queue.Queue()
+    with patch.object(training_jobs, "TRAINING_CANCEL_TIMEOUT", 0):
+        training_jobs._collect_events(job)
+
+    assert job["_cancel"].is_set()
+    assert training_jobs.job_status(job_id)["status"] == "cancelled"
+    assert not os.path.exists(training_jobs._job_file(f"{job_id}.cancel"))
+    with other_worker():
+        assert training_jobs.cancel_training_job(job_id) is False
+
+
+def test_lock_abandonado_se_descarta(fake_worker):
+    """
+    Verifica que el lock de un job que ya no está activo no bloquee un entrenamiento nuevo.
+    """
+    with open(training_jobs._job_file("modelo_a.lock"), "w") as f:
+        json.dump({"job_id": "perdido", "pid": os.getpid()}, f)
+
+    job = training_jobs.start_training_job("modelo_a")
+    with open(training_jobs._job_file("modelo_a.lock")) as f:
+        assert json.load(f)["job_id"] == job["id"]
+
+
+def test_jobs_terminados_se_descartan(fake_worker):
+    """
+    Verifica que solo se conserven los últimos `TRAINING_JOBS_KEEP` jobs terminados.
+    """
+    with patch.object(training_jobs, "TRAINING_JOBS_KEEP", 1):
+        ids = []
+        for _ in range(3):
+            job_id = training_jobs.start_training_job("modelo_a")["id"]
+            training_jobs._apply_event(
+                training_jobs.get_job(job_id), {"type": "done", "result": {}}
+            )
+            ids.append(job_id)
+        active_id = training_jobs.start_training_job("modelo_a")["id"]
+
+    assert set(training_jobs._jobs) == {ids[-1], active_id}
+    assert training_jobs.job_status(ids[0]) is None
+    assert sorted(os.listdir(training_jobs.TRAINING_JOBS_PATH)) == sorted(
+        [f"{ids[-1]}.json", f"{active_id}.json", "modelo_a.lock"]
+    )
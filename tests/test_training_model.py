@@ -15,21 +15,28 @@ from unittest.mock import patch, MagicMock
 from ml.training.training_model import training_model
 
 
-@patch("ml.training.training_model.fetch_word_ids_with_keypoints")
-@patch("ml.training.training_model.get_sequences_and_labels")
+@patch("ml.training.training_model.promote_model")
+@patch("ml.training.training_model.register_model")
+@patch("ml.training.training_model.checkpoint_dir")
+@patch("ml.training.training_model.load_or_build_snapshot")
 @patch("ml.training.training_model.get_model")
 def test_training_model_devuelve_metricas(
     mock_get_model,
-    mock_get_sequences_and_labels,
-    mock_fetch_word_ids_with_keypoints,
+    mock_load_or_build_snapshot,
+    mock_checkpoint_dir,
+    mock_register_model,
+    mock_promote_model,
+    tmp_path,
 ):
     """
     Verifica que `training_model()` retorne métricas correctas simulando un entrenamiento exitoso.
 
     El test:
-    - Mockea la carga de secuencias y etiquetas (`get_sequences_and_labels`).
+    - Mockea la carga del dataset (`load_or_build_snapshot`).
     - Mockea el modelo (`get_model`) para devolver un objeto falso con un historial de entrenamiento.
-    - Simula la existencia de IDs de palabras con keypoints.
+    - Simula la existencia de IDs de palabras con keypoints en el snapshot.
+    - Redirige los checkpoints a una carpeta temporal.
+    - Mockea el registro de modelos (`register_model`, `promote_model`).
     - Valida que la función devuelva un diccionario con las métricas esperadas.
 
     Returns:
@@ -37,13 +44,14 @@ def test_training_model_devuelve_metricas(
     """
 
     # --- Preparación de mocks ---
-    mock_fetch_word_ids = ["id1", "id2", "id3"]
-    mock_fetch_word_ids_with_keypoints.return_value = mock_fetch_word_ids
+    word_ids_fake = [b"id1", b"id2", b"id3"]
 
-    # Simulamos que existen secuencias y etiquetas
-    X_fake = [np.random.rand(15, 1662) for _ in range(3)]
-    y_fake = [0, 1, 2]
-    mock_get_sequences_and_labels.return_value = (X_fake, y_fake)
+    # Simulamos un snapshot con secuencias y etiquetas
+    X_fake = np.random.rand(3, 15, 1662).astype("float16")
+    y_fake = np.array([0, 1, 2], dtype="int32")
+    mock_load_or_build_snapshot.return_value = (X_fake, y_fake, word_ids_fake, {})
+    mock_checkpoint_dir.return_value = str(tmp_path / "checkpoints")
+    mock_register_model.return_value = {"version": "v0001"}
 
     # Mock del modelo con historial simulado
     model_mock = MagicMock()
@@ -69,3 +77,7 @@ def test_training_model_devuelve_metricas(
     assert result["val_accuracy"] == 0.9
     assert result["params"] == 15000
     assert result["layers"] == 6
+    assert result["version"] == "v0001"
+    mock_register_model.assert_called_once()
+    assert mock_register_model.call_args[0][1] == word_ids_fake
+    mock_promote_model.assert_called_once_with("v0001")